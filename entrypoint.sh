@@ -7,8 +7,16 @@ source /opt/venv/bin/activate
 if [ "$1" = "production" ]; then
     echo "Starting in PRODUCTION mode..."
     uv run manage.py migrate --noinput && \
-    uv run manage.py collectstatic --noinput && \
-    uv run gunicorn orcamento_2026.wsgi:application --bind 0.0.0.0:8000 --workers 2 --threads 4 --max-requests 100 --max-requests-jitter 20
+    uv run manage.py collectstatic --noinput
+    # ASGI (padrão): views assíncronas aguardam o Ollama sem ocupar threads.
+    # Workers são reciclados a cada WORKER_MAX_REQUESTS requisições (recriando o pool de conexões).
+    # Cada worker do uvicorn faz o warm-up ao importar orcamento_2026.asgi (ASGI_WARMUP=False desliga).
+    # SERVER_INTERFACE=wsgi volta ao gunicorn com threads (--preload e warm-up em gunicorn.conf.py).
+    if [ "${SERVER_INTERFACE:-asgi}" = "wsgi" ]; then
+        exec uv run gunicorn orcamento_2026.wsgi:application --config gunicorn.conf.py --bind 0.0.0.0:8000 --workers 2 --threads 4 --max-requests "${WORKER_MAX_REQUESTS:-1000}" --max-requests-jitter 50
+    else
+        exec uv run uvicorn orcamento_2026.asgi:application --host 0.0.0.0 --port 8000 --workers 2 --limit-max-requests "${WORKER_MAX_REQUESTS:-1000}" --limit-max-requests-jitter 50
+    fi
 elif [ "$1" = "development" ]; then
     echo "Starting in DEVELOPMENT mode..."
     exec uv run manage.py runserver 0.0.0.0:8000
@@ -0,0 +1,30 @@
+"""
+Configuração do gunicorn (SERVER_INTERFACE=wsgi); opções da linha de comando têm precedência.
+
+Com preload_app a aplicação é carregada e aquecida uma vez no master e os
+workers, inclusive os reciclados por --max-requests, nascem por fork já com
+URLconf, templates e bibliotecas carregados. Todo nome de módulo aqui é
+lido como opção do gunicorn: por isso `decouple.config` e não `config`.
+"""
+
+import decouple
+
+preload_app = decouple.config("GUNICORN_PRELOAD", default=True, cast=bool)
+
+
+def _warm_up(log) -> None:
+    from orcamento_2026.core.warmup import log_warm_up
+
+    log_warm_up(log)
+
+
+def when_ready(server):
+    # Com preload a aplicação já foi carregada no master e os workers ainda não existem
+    if server.cfg.preload_app:
+        _warm_up(server.log)
+
+
+def post_worker_init(worker):
+    # Sem preload cada worker se aquece antes de aceitar requisições
+    if not worker.cfg.preload_app:
+        _warm_up(worker.log)
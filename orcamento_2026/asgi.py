@@ -1,7 +1,15 @@
+import logging
 import os
 
+from decouple import config
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orcamento_2026.settings")
 
 application = get_asgi_application()
+
+# O uvicorn não tem --preload: cada worker importa este módulo e se aquece antes de aceitar conexões
+if config("ASGI_WARMUP", default=True, cast=bool):
+    from orcamento_2026.core.warmup import log_warm_up
+
+    log_warm_up(logging.getLogger("uvicorn.error"))
@@ -6,8 +6,13 @@ from django.contrib import admin
 
 from orcamento_2026.core.models import (
     Account,
+    BillingCycle,
+    Budget,
     Category,
     Expense,
+    Merchant,
+    MerchantAlias,
+    RecurringCharge,
     SubCategory,
     Transaction,
     User,
@@ -25,12 +30,21 @@ class UserAdmin(admin.ModelAdmin):
     pass
 
 
+class BillingCycleInline(admin.TabularInline):
+    """Inline para o ciclo de faturamento dentro de contas."""
+
+    model = BillingCycle
+    extra = 0
+    max_num = 1
+
+
 @admin.register(Account)
 class AccountAdmin(admin.ModelAdmin):
     """Admin para o modelo Account."""
 
     list_display: tuple[str, str] = ("name", "type")
     search_fields: tuple[str] = ("name",)
+    inlines: list[type[admin.TabularInline]] = [BillingCycleInline]
 
 
 @admin.register(Category)
@@ -95,3 +109,73 @@ class ExpenseAdmin(admin.ModelAdmin):
     def get_date(self, obj: Expense) -> "date | None":
         """Retorna a data da transação associada."""
         return obj.transaction.date if obj.transaction else None
+
+
+@admin.register(Budget)
+class BudgetAdmin(admin.ModelAdmin):
+    """Admin para o modelo Budget (o realizado é calculado, não editável)."""
+
+    list_display: tuple[str, str, str, str, str] = ("subcategory", "month", "limit", "actual", "get_remaining")
+    list_filter: tuple[str, str] = ("month", "subcategory__category")
+    search_fields: tuple[str] = ("subcategory__name",)
+    autocomplete_fields: list[str] = ["subcategory"]
+    list_select_related: tuple[str] = ("subcategory__category",)
+
+    @admin.display(description="Saldo")
+    def get_remaining(self, obj: Budget) -> "Decimal":
+        """Retorna quanto ainda resta do orçamento (negativo se estourado)."""
+        return obj.remaining
+
+
+@admin.register(RecurringCharge)
+class RecurringChargeAdmin(admin.ModelAdmin):
+    """Admin para o modelo RecurringCharge (detectado automaticamente, somente leitura)."""
+
+    list_display: tuple[str, ...] = (
+        "description",
+        "account",
+        "cadence",
+        "amount",
+        "occurrences",
+        "last_date",
+        "next_date",
+        "get_is_active",
+    )
+    list_filter: tuple[str, str] = ("cadence", "account")
+    search_fields: tuple[str, str] = ("description", "memo_key")
+    list_select_related: tuple[str] = ("account",)
+
+    @admin.display(description="Ativa", boolean=True)
+    def get_is_active(self, obj: RecurringCharge) -> bool:
+        """Retorna se a recorrência segue ativa hoje (calculado pela próxima cobrança prevista)."""
+        from orcamento_2026.core.services.recurring import is_active
+
+        return is_active(obj)
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+
+class MerchantAliasInline(admin.TabularInline):
+    """Inline (somente leitura) para as variações de memo de um estabelecimento."""
+
+    model = MerchantAlias
+    fields: tuple[str] = ("memo_key",)
+    readonly_fields: tuple[str] = ("memo_key",)
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None) -> bool:
+        return False
+
+
+@admin.register(Merchant)
+class MerchantAdmin(admin.ModelAdmin):
+    """Admin para o modelo Merchant (agrupado automaticamente pelas variações de memo)."""
+
+    list_display: tuple[str] = ("name",)
+    search_fields: tuple[str, str] = ("name", "aliases__memo_key")
+    inlines: list[type[admin.TabularInline]] = [MerchantAliasInline]
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "orcamento_2026.core"
+
+    def ready(self):
+        from orcamento_2026.core import signals  # noqa: F401
+        from orcamento_2026.core.services.search import ensure_search_schema_on_migrate
+
+        post_migrate.connect(ensure_search_schema_on_migrate, sender=self)
@@ -0,0 +1,105 @@
+"""
+Benchmarks de desempenho executados pelo comando `benchmark`.
+
+Cada módulo listado em SUITE_MODULES registra suas suítes com @register.
+Uma suíte recebe as opções do comando (iterations, rows) e devolve um
+dicionário de métricas.
+Os dados criados pelas suítes ficam dentro de `rollback()` e nunca são gravados.
+"""
+
+import importlib
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from django.db import transaction
+
+SUITE_MODULES: list[str] = [
+    "orcamento_2026.core.benchmarks.lookups",
+    "orcamento_2026.core.benchmarks.consolidation",
+    "orcamento_2026.core.benchmarks.import_ofx",
+    "orcamento_2026.core.benchmarks.views",
+    "orcamento_2026.core.benchmarks.similar_expenses",
+    "orcamento_2026.core.benchmarks.suggestions",
+    "orcamento_2026.core.benchmarks.concurrency",
+    "orcamento_2026.core.benchmarks.connections",
+    "orcamento_2026.core.benchmarks.startup",
+    "orcamento_2026.core.benchmarks.reports",
+    "orcamento_2026.core.benchmarks.analytics",
+    "orcamento_2026.core.benchmarks.recurring",
+    "orcamento_2026.core.benchmarks.transfers",
+    "orcamento_2026.core.benchmarks.memos",
+    "orcamento_2026.core.benchmarks.partitioning",
+]
+
+# Semente dos dados sintéticos: execuções diferentes medem os mesmos dados
+SEED: int = 2026
+
+SUITES: dict[str, Callable[[dict], dict]] = {}
+
+
+class _Rollback(Exception):
+    pass
+
+
+def register(name: str) -> Callable:
+    """Registra a função decorada como a suíte `name`."""
+
+    def decorator(func: Callable[[dict], dict]) -> Callable[[dict], dict]:
+        SUITES[name] = func
+        return func
+
+    return decorator
+
+
+def load_suites() -> dict[str, Callable[[dict], dict]]:
+    """Importa os módulos de benchmark e retorna as suítes registradas."""
+    for module in SUITE_MODULES:
+        importlib.import_module(module)
+    return SUITES
+
+
+def measure(func: Callable[[], object], iterations: int) -> dict[str, float]:
+    """
+    Executa `func` `iterations` vezes e mede o tempo total.
+
+    Returns:
+        Dicionário com iterations, seconds e per_second
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    return {
+        "iterations": iterations,
+        "seconds": round(elapsed, 6),
+        "per_second": round(iterations / elapsed, 1) if elapsed else float("inf"),
+    }
+
+
+def measure_batch(func: Callable[[], object], rows: int) -> dict[str, float]:
+    """
+    Executa `func` uma vez, considerando que ela processa `rows` itens.
+
+    Returns:
+        Dicionário com rows, seconds e per_second
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 6),
+        "per_second": round(rows / elapsed, 1) if elapsed else float("inf"),
+    }
+
+
+@contextmanager
+def rollback() -> Iterator[None]:
+    """Executa o bloco numa transação que é sempre desfeita ao final."""
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
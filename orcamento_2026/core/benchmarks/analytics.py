@@ -0,0 +1,124 @@
+"""
+Benchmark do snapshot analítico contra as agregações no banco.
+
+Os mesmos períodos aleatórios (de 1 a 24 meses) são agregados pelo caminho
+SQL — as queries que o dashboard fazia antes do snapshot, com Decimal e
+TruncMonth (`sql`) e com as colunas inteiras amount_cents e month_key
+(`sql_integer`) — e por
+dashboard_data(), que com o snapshot já carregado só revalida a versão dos
+dados (e ainda calcula a comparação e a média móvel). Também mede a carga completa,
+o acréscimo incremental de um lote novo e a memória do DataFrame.
+"""
+
+import random
+import statistics
+import time
+from datetime import date
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.db.models import Sum
+from django.db.models.functions import Abs, TruncMonth
+
+from orcamento_2026.core.benchmarks import SEED, register, rollback
+from orcamento_2026.core.services.analytics import dashboard_data, snapshot
+from orcamento_2026.core.services.synthetic import generate_dataset
+from orcamento_2026.core.services.utils.date_utils import month_key
+
+ROWS: int = 20_000
+ITERATIONS: int = 50
+
+
+def _sql_summary(start: date, end: date) -> dict:
+    from orcamento_2026.core.models import Expense
+
+    expenses = Expense.objects.filter(reference_month__gte=start, reference_month__lte=end, is_ignored=False)
+    total = Sum(Abs("transaction__amount"))
+    return {
+        "total_expenses": expenses.count(),
+        "total_amount": expenses.aggregate(total=total)["total"] or Decimal("0"),
+        "expenses_by_category": list(expenses.values("subcategory__category__name").annotate(total=total).order_by("-total")),
+        "monthly_data": list(
+            expenses.annotate(month=TruncMonth("reference_month")).values("month").annotate(total=total).order_by("month")
+        ),
+        "top_subcategories": list(expenses.values("subcategory__name").annotate(total=total).order_by("-total")[:10]),
+        "expenses_by_account": list(expenses.values("transaction__account__name").annotate(total=total).order_by("-total")),
+    }
+
+
+def _sql_summary_integer(start: date, end: date) -> dict:
+    """As mesmas agregações somando centavos inteiros e agrupando pela chave AAAAMM."""
+    from orcamento_2026.core.models import Expense
+
+    expenses = Expense.objects.filter(month_key__gte=month_key(start), month_key__lte=month_key(end), is_ignored=False)
+    total = Sum(Abs("transaction__amount_cents"))
+    return {
+        "total_expenses": expenses.count(),
+        "total_amount": expenses.aggregate(total=total)["total"] or 0,
+        "expenses_by_category": list(expenses.values("subcategory__category__name").annotate(total=total).order_by("-total")),
+        "monthly_data": list(expenses.values("month_key").annotate(total=total).order_by("month_key")),
+        "top_subcategories": list(expenses.values("subcategory__name").annotate(total=total).order_by("-total")[:10]),
+        "expenses_by_account": list(expenses.values("transaction__account__name").annotate(total=total).order_by("-total")),
+    }
+
+
+def _ranges(first: date, last: date, iterations: int) -> list[tuple[date, date]]:
+    rng = random.Random(SEED)
+    months = (last.year - first.year) * 12 + last.month - first.month
+    ranges = []
+    for _ in range(iterations):
+        start = first + relativedelta(months=rng.randrange(months + 1))
+        ranges.append((start, start + relativedelta(months=rng.randint(1, 24), days=-1)))
+    return ranges
+
+
+def _latency(func, ranges: list[tuple[date, date]]) -> dict:
+    samples = []
+    for start, end in ranges:
+        begin = time.perf_counter()
+        func(start, end)
+        samples.append((time.perf_counter() - begin) * 1000)
+    samples.sort()
+    return {
+        "iterations": len(samples),
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+@register("analytics")
+def run(options: dict) -> dict:
+    """Compara a latência do dashboard para períodos arbitrários: agregação SQL x snapshot em memória."""
+    from orcamento_2026.core.models import Expense
+
+    rows = options.get("rows") or ROWS
+    iterations = options.get("iterations") or ITERATIONS
+    with rollback():
+        snapshot.reset()
+        try:
+            generate_dataset(rows, suggestion_ratio=0, seed=SEED)
+            months = Expense.objects.order_by("reference_month").values_list("reference_month", flat=True)
+            ranges = _ranges(months.first(), months.last(), iterations)
+
+            load_ms = _timed(snapshot.refresh)
+            frame = snapshot.refresh()
+            results = {
+                "full_load": {"expenses": len(frame), "memory_kib": round(frame.memory_usage(deep=True).sum() / 1024, 1), "ms": load_ms},
+                "sql": _latency(_sql_summary, ranges),
+                "sql_integer": _latency(_sql_summary_integer, ranges),
+                "snapshot": _latency(dashboard_data, ranges),
+            }
+
+            added = generate_dataset(max(rows // 100, 1), suggestion_ratio=0, seed=SEED + 1)["expenses"]
+            results["append"] = {"expenses": added, "ms": _timed(snapshot.refresh), "mode": snapshot.last_refresh}
+        finally:
+            # O rollback desfaz a versão dos dados, mas não o snapshot em memória
+            snapshot.reset()
+    return results
@@ -0,0 +1,108 @@
+"""
+Benchmark de vazão das views assíncronas enquanto chamadas ao Ollama estão em andamento.
+
+Um POST em suggestion_generate aguarda o stub do Ollama (com latência
+simulada) enquanto outros clientes consultam o badge de sugestões pendentes.
+Com views assíncronas, o badge continua sendo atendido durante a espera.
+"""
+
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+
+from orcamento_2026.core.benchmarks import SEED, register, rollback
+from orcamento_2026.core.benchmarks.suggestions import ollama_stub
+from orcamento_2026.core.services import suggestions
+from orcamento_2026.core.services.synthetic import generate_dataset
+
+ROWS: int = 500
+# Latência simulada de cada chamada ao Ollama, em segundos
+LATENCY: float = 0.25
+# Clientes consultando o badge em paralelo
+CLIENTS: int = 4
+
+
+def _latency_metrics(latencies: list[float], seconds: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "seconds": round(seconds, 6),
+        "per_second": round(len(latencies) / seconds, 1) if seconds else float("inf"),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+async def _poll(client: AsyncClient, url: str, until: asyncio.Event, latencies: list[float]) -> None:
+    while not until.is_set():
+        start = time.perf_counter()
+        response = await client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} respondeu {response.status_code}")
+        latencies.append(time.perf_counter() - start)
+
+
+async def _badge_throughput(client: AsyncClient, duration: float) -> dict:
+    """Vazão do badge sozinho, durante `duration` segundos."""
+    done = asyncio.Event()
+    latencies: list[float] = []
+    url = reverse("pending_suggestions_count")
+    start = time.perf_counter()
+    pollers = asyncio.gather(*(_poll(client, url, done, latencies) for _ in range(CLIENTS)))
+    await asyncio.sleep(duration)
+    done.set()
+    await pollers
+    return _latency_metrics(latencies, time.perf_counter() - start)
+
+
+async def _badge_during_generation(client: AsyncClient) -> tuple[dict, dict]:
+    """Vazão do badge enquanto um POST em suggestion_generate aguarda o Ollama."""
+    done = asyncio.Event()
+    latencies: list[float] = []
+    url = reverse("pending_suggestions_count")
+
+    async def generate() -> float:
+        start = time.perf_counter()
+        try:
+            response = await client.post(reverse("suggestion_generate"))
+        finally:
+            done.set()
+        if response.status_code != 302:
+            raise RuntimeError(f"suggestion_generate respondeu {response.status_code}")
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    generate_seconds, *_ = await asyncio.gather(generate(), *(_poll(client, url, done, latencies) for _ in range(CLIENTS)))
+    return {"seconds": round(generate_seconds, 6)}, _latency_metrics(latencies, time.perf_counter() - start)
+
+
+@register("concurrency")
+def run(options: dict) -> dict:
+    """Mede o badge de sugestões com e sem uma geração de sugestões em andamento (Ollama simulado com latência)."""
+    from django.contrib.auth import get_user_model
+
+    from orcamento_2026.core.models import TransactionSuggestion
+
+    rows = options.get("rows") or ROWS
+
+    # REMOTE_ADDR fora de INTERNAL_IPS para a debug toolbar não entrar na medição
+    client = AsyncClient(REMOTE_ADDR="192.0.2.1")
+    with rollback(), ollama_stub(latency=LATENCY), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        generate_dataset(rows, suggestion_ratio=0, seed=SEED)
+        client.force_login(get_user_model().objects.create_user(username="benchmark", password="benchmark"))
+
+        generation, during = async_to_sync(_badge_during_generation)(client)
+        baseline = async_to_sync(_badge_throughput)(client, generation["seconds"])
+
+        calls = TransactionSuggestion.objects.count()
+        generation.update(
+            ollama_calls=calls,
+            # Tempo das mesmas chamadas feitas uma a uma, como na view síncrona
+            sequential_seconds=round(calls * LATENCY, 6),
+            concurrency=suggestions.OLLAMA_CONCURRENCY,
+        )
+        return {"suggestion_generate": generation, "badge_idle": baseline, "badge_during_generate": during}
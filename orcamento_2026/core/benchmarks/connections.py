@@ -0,0 +1,139 @@
+"""
+Benchmark do custo de abrir conexões com o banco por requisição.
+
+Um servidor WSGI com um pool fixo de threads (como o gunicorn com gthread)
+atende o health check enquanto clientes fazem requisições em paralelo. Cada
+cenário conta as conexões abertas (sinal connection_created) e a latência:
+com CONN_MAX_AGE=0 cada requisição abre uma conexão nova; com conexões
+persistentes cada thread reaproveita a sua. O pool do psycopg 3 só é medido
+quando o banco é PostgreSQL.
+"""
+
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+
+from orcamento_2026.core.benchmarks import register
+from orcamento_2026.core.benchmarks.concurrency import _latency_metrics
+
+# Requisições por cenário
+REQUESTS: int = 400
+# Threads do servidor e clientes simultâneos
+THREADS: int = 4
+
+
+class _ThreadPoolWSGIServer(WSGIServer):
+    """WSGIServer que atende cada requisição numa thread de um pool fixo."""
+
+    daemon_threads = True
+
+    def __init__(self, *args, threads: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="wsgi")
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.submit(connections.close_all)
+        self.executor.shutdown(wait=True)
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def _server(threads: int) -> Iterator[str]:
+    server = _ThreadPoolWSGIServer(("127.0.0.1", 0), _QuietHandler, threads=threads)
+    server.set_app(WSGIHandler())
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/health"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def _database_settings(**overrides) -> Iterator[None]:
+    """Altera a configuração do banco para as conexões abertas dentro do bloco."""
+    settings_dict = connections.settings["default"]
+    previous = {key: settings_dict.get(key) for key in overrides}
+    settings_dict.update(overrides)
+    try:
+        yield
+    finally:
+        settings_dict.update(previous)
+
+
+def _scenario(requests: int, threads: int) -> dict:
+    created = []
+
+    def count(sender, connection, **kwargs):
+        created.append(threading.get_ident())
+
+    latencies: list[float] = []
+
+    def fetch(url: str) -> None:
+        start = time.perf_counter()
+        with urllib.request.urlopen(url) as response:
+            if response.status != 200:
+                raise RuntimeError(f"{url} respondeu {response.status}")
+            response.read()
+        latencies.append(time.perf_counter() - start)
+
+    connection_created.connect(count)
+    try:
+        with _server(threads) as url:
+            fetch(url)  # aquecimento: carrega as URLs e o middleware
+            latencies.clear()
+            created.clear()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as clients:
+                list(clients.map(fetch, [url] * requests))
+            seconds = time.perf_counter() - start
+    finally:
+        connection_created.disconnect(count)
+    return {**_latency_metrics(latencies, seconds), "connections_opened": len(created)}
+
+
+@register("connections")
+def run(options: dict) -> dict:
+    """Mede conexões abertas e latência do health check sem e com reaproveitamento de conexões (--rows = requisições)."""
+    requests = options.get("rows") or REQUESTS
+    # A debug toolbar e o ALLOWED_HOSTS não devem interferir no servidor local
+    with override_settings(DEBUG=False, ALLOWED_HOSTS=["127.0.0.1"]):
+        results = {}
+        with _database_settings(CONN_MAX_AGE=0):
+            results["per_request"] = _scenario(requests, THREADS)
+        with _database_settings(CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=True):
+            results["persistent"] = _scenario(requests, THREADS)
+        if connection.vendor == "postgresql":
+            pool_options = {**connections.settings["default"].get("OPTIONS", {}), "pool": {"min_size": 2, "max_size": THREADS}}
+            try:
+                with _database_settings(CONN_MAX_AGE=0, OPTIONS=pool_options):
+                    results["pool"] = _scenario(requests, THREADS)
+            finally:
+                connection.close_pool()
+        return results
@@ -0,0 +1,61 @@
+"""Benchmark da consolidação: uma transação por vez versus consolidate_transactions em lote."""
+
+from datetime import date
+from decimal import Decimal
+
+from orcamento_2026.core.benchmarks import measure_batch, register, rollback
+from orcamento_2026.core.services.consolidation import BULK_BATCH_SIZE, consolidate_transaction, consolidate_transactions
+
+ROWS: int = 10_000
+# A versão unitária é medida numa amostra, para o benchmark não levar minutos
+SINGLE_SAMPLE: int = 1_000
+
+
+@register("consolidation")
+def run(options: dict) -> dict:
+    """Compara consolidações por segundo: consolidate_transaction em laço e consolidate_transactions."""
+    from orcamento_2026.core.models import Account, Category, SubCategory, Transaction
+
+    rows = options.get("rows") or ROWS
+    sample = min(rows, SINGLE_SAMPLE)
+    reference_month = date(2026, 2, 1)
+    results = {}
+
+    with rollback():
+        account = Account.objects.create(name="Conta Benchmark", type="C")
+        category = Category.objects.create(name="Categoria Benchmark")
+        SubCategory.objects.create(category=category, name="Subcategoria Benchmark")
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    fitid=f"bench-{i}",
+                    account=account,
+                    amount=Decimal("-10.00"),
+                    amount_cents=-1000,
+                    date=date(2026, 2, 15),
+                    memo=f"Compra {i}",
+                )
+                for i in range(rows + sample)
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        transactions = list(Transaction.objects.filter(account=account).order_by("id"))
+        single, bulk = transactions[:sample], transactions[sample:]
+
+        def one_by_one():
+            for tx in single:
+                consolidate_transaction(tx, "categoria benchmark", "SUBCATEGORIA BENCHMARK", tx.memo, reference_month)
+
+        def batch():
+            result = consolidate_transactions(
+                (tx, ("categoria benchmark", "SUBCATEGORIA BENCHMARK"), tx.memo, reference_month) for tx in bulk
+            )
+            assert not result.failures, result.failures[:3]
+
+        results["single"] = measure_batch(one_by_one, sample)
+        results["bulk"] = measure_batch(batch, rows)
+
+    baseline = results["single"]["per_second"]
+    for metrics in results.values():
+        metrics["speedup"] = round(metrics["per_second"] / baseline, 2) if baseline else None
+    return results
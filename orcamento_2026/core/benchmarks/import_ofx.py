@@ -0,0 +1,96 @@
+"""
+Benchmarks da importação de extratos OFX.
+
+`import_ofx` mede um extrato novo e a reimportação do mesmo extrato;
+`parallel_import` mede importações simultâneas em contas diferentes, que
+só disputam o índice único (conta, FITID) nas páginas da própria conta.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+from orcamento_2026.core.benchmarks import SEED, measure_batch, register, rollback
+from orcamento_2026.core.services.import_ofx import import_ofx
+from orcamento_2026.core.services.synthetic import write_ofx
+
+ROWS: int = 2_000
+# Contas importadas em paralelo na suíte parallel_import (uma thread por conta)
+PARALLEL_ACCOUNTS: int = 4
+
+
+@register("import_ofx")
+def run(options: dict) -> dict:
+    """Mede lançamentos importados por segundo num extrato novo e na reimportação do mesmo extrato."""
+    from orcamento_2026.core.models import Account
+
+    rows = options.get("rows") or ROWS
+    fd, path = tempfile.mkstemp(suffix=".ofx")
+    os.close(fd)
+    results = {}
+
+    try:
+        write_ofx(path, rows, seed=SEED)
+        with rollback():
+            account = Account.objects.create(name="Conta Benchmark", type="C")
+            results["new_statement"] = measure_batch(lambda: import_ofx(path, account), rows)
+            # Todos os FITIDs já existem: mede o custo da checagem de duplicatas
+            results["reimport"] = measure_batch(lambda: import_ofx(path, account), rows)
+    finally:
+        os.remove(path)
+    return results
+
+
+def _import_in_thread(path: str, account_id: int) -> int:
+    """Importa o extrato numa conexão própria da thread, fechada ao final."""
+    from orcamento_2026.core.models import Account
+
+    try:
+        return import_ofx(path, Account.objects.get(pk=account_id))["transactions_created"]
+    finally:
+        connection.close()
+
+
+@register("parallel_import")
+def run_parallel(options: dict) -> dict:
+    """
+    Mede a importação do mesmo extrato em várias contas, uma após a outra e em threads paralelas.
+
+    Os FITIDs se repetem entre as contas (o índice único é por conta). O
+    cenário paralelo só é medido no PostgreSQL (o SQLite serializa as
+    escritas); as threads usam conexões próprias, então os dados são
+    gravados de fato e as contas do benchmark são excluídas ao final.
+    """
+    from orcamento_2026.core.models import Account, Transaction
+
+    rows = options.get("rows") or ROWS
+    fd, path = tempfile.mkstemp(suffix=".ofx")
+    os.close(fd)
+    results = {}
+
+    try:
+        write_ofx(path, rows, seed=SEED)
+        with rollback():
+            accounts = [Account.objects.create(name=f"Conta Benchmark {i}", type="C") for i in range(PARALLEL_ACCOUNTS)]
+            results["sequential"] = measure_batch(lambda: [import_ofx(path, account) for account in accounts], rows * PARALLEL_ACCOUNTS)
+            results["sequential"]["transactions"] = Transaction.objects.filter(account__in=accounts).count()
+
+        if connection.vendor == "postgresql":
+            accounts = [Account.objects.create(name=f"Conta Benchmark Paralela {i}", type="C") for i in range(PARALLEL_ACCOUNTS)]
+            try:
+                with ThreadPoolExecutor(max_workers=PARALLEL_ACCOUNTS) as executor:
+                    created: list[int] = []
+                    results["parallel"] = measure_batch(
+                        lambda: created.extend(
+                            executor.map(_import_in_thread, [path] * PARALLEL_ACCOUNTS, [account.pk for account in accounts])
+                        ),
+                        rows * PARALLEL_ACCOUNTS,
+                    )
+                results["parallel"].update(transactions=sum(created), workers=PARALLEL_ACCOUNTS)
+            finally:
+                Account.objects.filter(pk__in=[account.pk for account in accounts]).delete()
+    finally:
+        os.remove(path)
+    return results
@@ -0,0 +1,55 @@
+"""Benchmark dos lookups case/acento-insensitive de categorias e subcategorias."""
+
+from django.db.models.functions import Lower
+
+from orcamento_2026.core.benchmarks import measure, register, rollback
+from orcamento_2026.core.services.catalog import warm_catalog
+from orcamento_2026.core.services.utils.db_utils import case_insensitive_get
+
+CATEGORIES: int = 30
+SUBCATEGORIES_PER_CATEGORY: int = 10
+
+
+def _legacy_get(queryset, field_name: str, value: str, **kwargs):
+    """Implementação anterior: annotate(Lower(campo)) a cada chamada, sem índice."""
+    filtered = queryset.annotate(_lower_field=Lower(field_name)).filter(_lower_field=value.lower())
+    for key, val in kwargs.items():
+        filtered = filtered.filter(**{key: val})
+    return filtered.first()
+
+
+@register("lookups")
+def run(options: dict) -> dict:
+    """Compara lookups por segundo: Lower() legado, name_key indexado e catálogo aquecido."""
+    from orcamento_2026.core.models import Category, SubCategory
+
+    iterations = options.get("iterations") or 2000
+    results = {}
+
+    with rollback():
+        categories = [Category.objects.create(name=f"Categoria Benchmark {i:03d} Ação") for i in range(CATEGORIES)]
+        for category in categories:
+            for j in range(SUBCATEGORIES_PER_CATEGORY):
+                SubCategory.objects.create(category=category, name=f"Subcategoria {j:02d} Saúde")
+
+        target = categories[-1]
+        category_name = target.name.upper()
+        subcategory_name = f"SUBCATEGORIA {SUBCATEGORIES_PER_CATEGORY - 1:02d} SAÚDE"
+
+        def legacy():
+            category = _legacy_get(Category.objects.all(), "name", category_name)
+            _legacy_get(SubCategory.objects.filter(category=category), "name", subcategory_name)
+
+        def indexed():
+            category = case_insensitive_get(Category.objects.all(), "name", category_name)
+            case_insensitive_get(SubCategory.objects.all(), "name", subcategory_name, category=category)
+
+        results["legacy_lower"] = measure(legacy, iterations)
+        results["name_key_index"] = measure(indexed, iterations)
+        with warm_catalog():
+            results["warm_catalog"] = measure(indexed, iterations)
+
+    baseline = results["legacy_lower"]["per_second"]
+    for metrics in results.values():
+        metrics["speedup"] = round(metrics["per_second"] / baseline, 2) if baseline else None
+    return results
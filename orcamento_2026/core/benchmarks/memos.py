@@ -0,0 +1,28 @@
+"""Benchmark da normalização de memos (normalize_memo) gravada em Transaction.memo_normalized."""
+
+import random
+
+from orcamento_2026.core.benchmarks import SEED, measure_batch, register
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
+
+ROWS: int = 200_000
+MERCHANTS: tuple[str, ...] = ("Padaria São João", "UBER *TRIP", "NETFLIX.COM", "Drogasil", "Posto Ipiranga", "Mercado Livre")
+# Sufixos típicos dos extratos: datas, parcelas, final do cartão e códigos de autorização
+SUFFIXES: tuple[str, ...] = ("{day:02d}/{month:02d}", "PARC {day:02d}/12", "CARTAO FINAL {code}", "*{code}", "AUT {code}{day}", "")
+
+
+def _memos(rows: int) -> list[str]:
+    rng = random.Random(SEED)
+    return [
+        f"{rng.choice(MERCHANTS)} {rng.choice(SUFFIXES)}".format(
+            day=rng.randint(1, 28), month=rng.randint(1, 12), code=rng.randint(1000, 9999)
+        )
+        for _ in range(rows)
+    ]
+
+
+@register("memos")
+def run(options: dict) -> dict:
+    """Mede memos normalizados por segundo sobre memos sintéticos em memória."""
+    memos = _memos(options.get("rows") or ROWS)
+    return {"normalize_memo": measure_batch(lambda: [normalize_memo(memo) for memo in memos], len(memos))}
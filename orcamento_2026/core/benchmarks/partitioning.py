@@ -0,0 +1,128 @@
+"""
+Benchmark do particionamento por ano das transações e despesas (PostgreSQL).
+
+Gera um histórico sintético de 10 anos e mede as mesmas consultas por
+período com as tabelas comuns (`plain`) e, no PostgreSQL, depois de
+convertê-las (services.partitioning) dentro da transação desfeita ao final
+(`partitioned`). O EXPLAIN da versão particionada informa quantas partições
+cada consulta leu: as que filtram pela coluna da partição leem só as do
+período. Em outros bancos só a versão comum é medida.
+"""
+
+import random
+import re
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+from django.db import connection
+from django.db.models import QuerySet, Sum
+from django.db.models.functions import Abs
+
+from orcamento_2026.core.benchmarks import SEED, register, rollback
+from orcamento_2026.core.services import partitioning
+from orcamento_2026.core.services.synthetic import generate_dataset
+from orcamento_2026.core.services.utils.date_utils import month_key
+
+ROWS: int = 100_000
+MONTHS: int = 120
+ITERATIONS: int = 30
+
+_PARTITION = re.compile(r"\b(core_(?:transaction|expense)_\d{4})\b")
+
+
+def _budget_month(rng: random.Random, subcategories: list[int], months: list[date]) -> QuerySet:
+    """Realizado de um orçamento: despesas de uma subcategoria num mês (budgets.compute_actual)."""
+    from orcamento_2026.core.models import Expense
+
+    month = rng.choice(months)
+    return (
+        Expense.objects.filter(
+            subcategory_id=rng.choice(subcategories), month_key=month_key(month), reference_month__year=month.year, is_ignored=False
+        )
+        .values("subcategory_id")
+        .annotate(total=Sum(Abs("transaction__amount_cents")))
+    )
+
+
+def _year_report(rng: random.Random, subcategories: list[int], months: list[date]) -> QuerySet:
+    """Total de um ano de transações por conta (exportação de um período)."""
+    from orcamento_2026.core.models import Transaction
+
+    year = rng.choice(months).year
+    return (
+        Transaction.objects.filter(date__gte=date(year, 1, 1), date__lte=date(year, 12, 31))
+        .values("account_id")
+        .annotate(total=Sum("amount_cents"))
+    )
+
+
+def _recent_page(rng: random.Random, subcategories: list[int], months: list[date]) -> QuerySet:
+    """Primeira página da lista de transações filtrada pelos últimos 90 dias."""
+    from orcamento_2026.core.models import Transaction
+
+    return Transaction.objects.filter(date__gte=date.today() - timedelta(days=90)).select_related("account").order_by("-date")[:25]
+
+
+SCENARIOS: dict[str, Callable[[random.Random, list[int], list[date]], QuerySet]] = {
+    "budget_month": _budget_month,
+    "year_report": _year_report,
+    "recent_page": _recent_page,
+}
+
+
+def _latency(scenario, subcategories: list[int], months: list[date], iterations: int) -> list[float]:
+    rng = random.Random(SEED)
+    samples = []
+    for _ in range(iterations):
+        queryset = scenario(rng, subcategories, months)
+        start = time.perf_counter()
+        list(queryset)
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+
+def _percentiles(prefix: str, samples: list[float]) -> dict:
+    return {
+        f"{prefix}_p50_ms": round(statistics.median(samples), 3),
+        f"{prefix}_p95_ms": round(samples[max(int(len(samples) * 0.95) - 1, 0)], 3),
+    }
+
+
+def _partitions_read(queryset: QuerySet) -> int:
+    """Partições que aparecem no plano (EXPLAIN) da consulta."""
+    return len(set(_PARTITION.findall(queryset.explain())))
+
+
+@register("partitioning")
+def run(options: dict) -> dict:
+    """Compara consultas por período num histórico de 10 anos: tabelas comuns x particionadas por ano (PostgreSQL)."""
+    from orcamento_2026.core.models import Expense, SubCategory
+
+    rows = options.get("rows") or ROWS
+    iterations = options.get("iterations") or ITERATIONS
+    results: dict[str, dict] = {}
+    with rollback():
+        try:
+            stats = generate_dataset(rows, months=MONTHS, suggestion_ratio=0, seed=SEED)
+            subcategories = list(SubCategory.objects.values_list("id", flat=True))
+            months = list(Expense.objects.dates("reference_month", "month"))
+            results["dataset"] = {**stats, "years": len({month.year for month in months}), "database": connection.vendor}
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE core_transaction, core_expense")
+            for name, scenario in SCENARIOS.items():
+                results[name] = _percentiles("plain", _latency(scenario, subcategories, months, iterations))
+
+            if connection.vendor == "postgresql":
+                created = partitioning.partition_tables()
+                total = len(created["core_transaction"]) + len(created["core_expense"])
+                for name, scenario in SCENARIOS.items():
+                    results[name].update(_percentiles("partitioned", _latency(scenario, subcategories, months, iterations)))
+                    read = _partitions_read(scenario(random.Random(SEED), subcategories, months))
+                    results[name]["partitions"] = f"{read}/{total}"
+        finally:
+            # O rollback desfaz a conversão, mas não o cache de partições do processo
+            partitioning.reset()
+    return results
@@ -0,0 +1,101 @@
+"""
+Benchmark do detector de cobranças recorrentes.
+
+A detecção roda sobre um DataFrame sintético em memória (por padrão 1 milhão
+de transações, 5% delas em séries mensais ou anuais), o que mede só o custo
+vetorizado de normalizar memos, agrupar e classificar. A varredura completa
+pelo banco (`refresh()`, leitura + detecção + gravação) é medida sobre os
+dados de generate_dataset.
+"""
+
+import time
+from datetime import date
+
+from orcamento_2026.core.benchmarks import SEED, register, rollback
+from orcamento_2026.core.services.recurring import detect, refresh
+from orcamento_2026.core.services.synthetic import generate_dataset
+from orcamento_2026.core.services.utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+
+ROWS: int = 1_000_000
+DB_ROWS: int = 20_000
+ACCOUNTS: int = 4
+MERCHANTS: int = 20_000
+# Fração das transações que pertencem a séries recorrentes, e cobranças por série
+RECURRING_RATIO: float = 0.05
+SERIES_LENGTH: int = 24
+
+
+def _name(index: int) -> str:
+    # Nomes só com letras: normalize_memo descarta números
+    letters = ""
+    while True:
+        index, rest = divmod(index, 26)
+        letters += chr(ord("A") + rest)
+        if not index:
+            return letters
+
+
+def _frame(rows: int):
+    rng = np.random.default_rng(SEED)
+    today = np.datetime64(date.today(), "D")
+
+    # Compras avulsas: estabelecimento, dia e valor aleatórios
+    single = rows - int(rows * RECURRING_RATIO)
+    merchants = np.array([f"COMPRA CARTAO LOJA {_name(i)}" for i in range(MERCHANTS)], dtype=object)
+    dates = today - rng.integers(0, 730, single)
+    memos = merchants[rng.integers(0, MERCHANTS, single)]
+    amounts = -rng.lognormal(8, 1, single).astype("int64") - 1
+
+    # Séries mensais com dia e valor quase fixos e o mês/ano no memo
+    series = max((rows - single) // SERIES_LENGTH, 1)
+    offsets = np.arange(SERIES_LENGTH)
+    months = np.datetime64(date.today(), "M") - offsets[None, :].repeat(series, 0)
+    series_dates = (months.astype("datetime64[D]") + rng.integers(0, 5, (series, SERIES_LENGTH))).ravel()
+    series_memos = np.array(
+        [f"ASSINATURA {_name(s)} {str(month)[5:7]}/{str(month)[2:4]}" for s in range(series) for month in months[s]], dtype=object
+    )
+    series_amounts = (-rng.integers(1_000, 30_000, series)[:, None] * rng.uniform(0.98, 1.02, (series, SERIES_LENGTH))).astype("int64")
+
+    count = single + series * SERIES_LENGTH
+    series_accounts = rng.integers(1, ACCOUNTS + 1, series).repeat(SERIES_LENGTH)
+    return pd.DataFrame(
+        {
+            "id": np.arange(count, dtype="int64"),
+            "account_id": np.concatenate([rng.integers(1, ACCOUNTS + 1, single), series_accounts]),
+            "date": pd.to_datetime(np.concatenate([dates, series_dates])),
+            "amount_cents": np.concatenate([amounts, series_amounts.ravel()]),
+            "memo": np.concatenate([memos, series_memos]),
+        }
+    )
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, round(time.perf_counter() - start, 3)
+
+
+@register("recurring")
+def run(options: dict) -> dict:
+    """Mede a detecção vetorizada em memória e a varredura completa pelo banco."""
+    rows = options.get("rows") or ROWS
+    frame = _frame(rows)
+    charges, seconds = _timed(lambda: detect(frame))
+    results = {
+        "detect": {
+            "transactions": len(frame),
+            "charges": len(charges),
+            "seconds": seconds,
+            "per_second": round(len(frame) / seconds) if seconds else float("inf"),
+        }
+    }
+
+    db_rows = min(rows, DB_ROWS)
+    with rollback():
+        generate_dataset(db_rows, suggestion_ratio=0, seed=SEED)
+        charges, seconds = _timed(refresh)
+        results["full_scan"] = {"transactions": db_rows, "charges": charges, "seconds": seconds}
+    return results
@@ -0,0 +1,79 @@
+"""
+Benchmark da exportação de relatórios: linhas por segundo e pico de memória.
+
+Cada formato exporta as transações do histórico inteiro e só dos últimos seis
+meses: com values_list().iterator() e gravação em lotes o pico de memória
+deve ser o mesmo nos dois casos. `csv_instances` é a referência ingênua, que
+carrega instâncias de modelo com select_related antes de gravar.
+"""
+
+import csv
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+
+from orcamento_2026.core.benchmarks import SEED, register, rollback
+from orcamento_2026.core.services.reports import WRITERS, export
+from orcamento_2026.core.services.synthetic import generate_dataset
+
+ROWS: int = 5_000
+
+
+def _measure(func, rows: int) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 6),
+        "per_second": round(rows / elapsed, 1) if elapsed else float("inf"),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _export(fmt: str, start: date | None = None) -> int:
+    mode = "w+" if fmt == "csv" else "w+b"
+    with tempfile.TemporaryFile(mode, newline="" if fmt == "csv" else None) as f:
+        return export("transacoes", fmt, f, start=start)
+
+
+def _csv_instances() -> None:
+    from orcamento_2026.core.models import Transaction
+
+    with tempfile.TemporaryFile("w+", newline="") as f:
+        writer = csv.writer(f)
+        for tx in list(Transaction.objects.select_related("account", "expense__subcategory__category").order_by("date", "id")):
+            expense = getattr(tx, "expense", None)
+            subcategory = expense.subcategory if expense else None
+            categories = [subcategory.category.name, subcategory.name, expense.description] if expense else [None, None, None]
+            writer.writerow([tx.date, tx.account.name, tx.amount, tx.memo, tx.fitid, tx.reference_date, *categories])
+
+
+@register("reports")
+def run(options: dict) -> dict:
+    """Mede a exportação das transações em cada formato, do histórico inteiro e dos últimos 6 meses."""
+    from orcamento_2026.core.models import Transaction
+
+    rows = options.get("rows") or ROWS
+    results = {}
+    with rollback():
+        generate_dataset(rows, suggestion_ratio=0, seed=SEED)
+        last = Transaction.objects.order_by("-date").values_list("date", flat=True).first()
+        recent = last - relativedelta(months=6)
+        recent_rows = Transaction.objects.filter(date__gte=recent).count()
+
+        for fmt in WRITERS:
+            # Aquecimento: a primeira exportação importa pyarrow/openpyxl e não deve contar no pico
+            _export(fmt, start=last)
+            results[fmt] = _measure(lambda: _export(fmt), rows)
+            results[f"{fmt}_6_months"] = _measure(lambda: _export(fmt, start=recent), recent_rows)
+        results["csv_instances"] = _measure(_csv_instances, rows)
+    return results
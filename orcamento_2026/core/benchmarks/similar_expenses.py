@@ -0,0 +1,24 @@
+"""Benchmark da busca de despesas similares usada no prompt das sugestões."""
+
+import random
+
+from orcamento_2026.core.benchmarks import SEED, measure, register, rollback
+from orcamento_2026.core.services.suggestions import find_similar_expenses
+from orcamento_2026.core.services.synthetic import generate_dataset
+
+ROWS: int = 20_000
+
+
+@register("similar_expenses")
+def run(options: dict) -> dict:
+    """Mede buscas por segundo de find_similar_expenses sobre um histórico sintético."""
+    from orcamento_2026.core.models import Transaction
+
+    rows = options.get("rows") or ROWS
+    iterations = options.get("iterations") or 200
+    rng = random.Random(SEED)
+
+    with rollback():
+        generate_dataset(rows, seed=SEED)
+        memos = list(Transaction.objects.values_list("memo", flat=True)[:500])
+        return {"find_similar_expenses": {"rows": rows, **measure(lambda: find_similar_expenses(rng.choice(memos)), iterations)}}
@@ -0,0 +1,106 @@
+"""
+Benchmark do boot de um worker: tempo de import e tempo até a primeira resposta.
+
+Cada medição roda num processo novo (`python -X importtime`), como um worker
+recém-criado: carrega a aplicação WSGI e atende um GET em /login/. O cenário
+`preload` roda warm_up() antes, como o master do gunicorn com --preload;
+`first_response_ms` é então o que cada worker forkado ainda paga.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+
+from orcamento_2026.core.benchmarks import register
+
+ITERATIONS: int = 3
+# Pacotes que não devem ser importados no boot
+HEAVY_MODULES: tuple[str, ...] = ("plotly.utils", "pandas", "requests", "httpx", "ofxparse", "pyarrow", "openpyxl")
+
+_WORKER_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+timings = {"app_ready_ms": time.perf_counter() - start}
+if sys.argv[1] == "preload":
+    from orcamento_2026.core.warmup import warm_up
+    warm_up()
+    timings["warm_up_ms"] = time.perf_counter() - start - timings["app_ready_ms"]
+boot = time.perf_counter()
+from django.conf import settings
+hosts = [host for host in settings.ALLOWED_HOSTS if host not in ("*", "") and not host.startswith(".")]
+host = hosts[0] if hosts else "localhost"
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": "/login/", "QUERY_STRING": "", "SERVER_NAME": host,
+    "SERVER_PORT": "80", "HTTP_HOST": host, "REMOTE_ADDR": "192.0.2.1", "wsgi.url_scheme": "http",
+    "wsgi.input": __import__("io").BytesIO(), "wsgi.errors": sys.stderr,
+}
+status = []
+b"".join(application(environ, lambda s, headers, exc_info=None: status.append(s)))
+timings["first_response_ms"] = time.perf_counter() - boot
+timings = {key: round(value * 1000, 2) for key, value in timings.items()}
+from orcamento_2026.core.services.utils.lazy_import import is_loaded
+print(json.dumps({**timings, "status": status[0], "loaded": [m for m in sys.argv[2:] if is_loaded(m)]}))
+"""
+
+
+def parse_importtime(stderr: str, top: int = 5) -> dict:
+    """
+    Resume a saída de `python -X importtime`.
+
+    Args:
+        stderr: Saída de erro do processo
+        top: Quantidade de pacotes no ranking
+
+    Returns:
+        Tempo total de import e os pacotes de primeiro nível mais caros (cumulativo, ms)
+    """
+    packages: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if not cumulative.strip().isdigit() or name.startswith("  "):
+            continue
+        # Só os imports de primeiro nível: os aninhados já estão no cumulativo do pai
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(cumulative)
+    ranking = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "import_ms": round(sum(packages.values()) / 1000, 2),
+        "top_imports_ms": {package: round(us / 1000, 2) for package, us in ranking},
+    }
+
+
+def _boot(mode: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _WORKER_SCRIPT, mode, *HEAVY_MODULES],
+        capture_output=True,
+        text=True,
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "orcamento_2026.settings")},
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Worker de benchmark falhou:\n{result.stderr[-2000:]}")
+    return {**json.loads(result.stdout.strip().splitlines()[-1]), **parse_importtime(result.stderr)}
+
+
+def _median(runs: list[dict]) -> dict:
+    metrics = dict(runs[-1])
+    for key in ("import_ms", "app_ready_ms", "warm_up_ms", "first_response_ms"):
+        if key in metrics:
+            metrics[key] = round(statistics.median(run[key] for run in runs), 2)
+    return metrics
+
+
+@register("startup")
+def run(options: dict) -> dict:
+    """Mede o boot de um worker (import e primeira resposta) sem e com o warm-up do --preload."""
+    iterations = options.get("iterations") or ITERATIONS
+    return {mode: _median([_boot(mode) for _ in range(iterations)]) for mode in ("cold", "preload")}
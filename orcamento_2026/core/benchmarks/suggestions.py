@@ -0,0 +1,70 @@
+"""Benchmark da geração de sugestões contra um stub local da API do Ollama."""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from unittest.mock import patch
+
+from orcamento_2026.core.benchmarks import SEED, measure_batch, register, rollback
+from orcamento_2026.core.services import suggestions
+from orcamento_2026.core.services.synthetic import generate_dataset
+
+ROWS: int = 200
+HISTORY_FACTOR: int = 20
+
+STUB_ANSWER: dict[str, str] = {"category": "Alimentação", "subcategory": "Supermercado", "description": "Compra no mercado"}
+
+
+class _OllamaStub(BaseHTTPRequestHandler):
+    """Responde /api/generate após `server.latency` segundos (padrão: imediatamente, isolando o custo da aplicação)."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.latency)
+        body = json.dumps({"response": json.dumps(STUB_ANSWER)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def ollama_stub(latency: float = 0.0) -> Iterator[str]:
+    """Sobe o stub numa porta livre e aponta o serviço de sugestões para ele."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OllamaStub)
+    server.latency = latency
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with patch.object(suggestions, "OLLAMA_URL", url):
+            yield url
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@register("suggestions")
+def run(options: dict) -> dict:
+    """Mede sugestões geradas por segundo (prompt, busca de similares e gravação) com a IA simulada."""
+    from orcamento_2026.core.models import Transaction
+
+    rows = options.get("rows") or ROWS
+
+    with rollback(), ollama_stub():
+        generate_dataset(rows * HISTORY_FACTOR, suggestion_ratio=0, seed=SEED)
+        pending = list(Transaction.objects.filter(expense__isnull=True, suggestion__isnull=True)[:rows])
+
+        def generate():
+            for tx in pending:
+                if suggestions.generate_suggestion_for_transaction(tx) is None:
+                    raise RuntimeError(f"Sugestão não gerada para a transação {tx.id}")
+
+        return {"generate_suggestion": measure_batch(generate, len(pending))}
@@ -0,0 +1,73 @@
+"""
+Benchmark do pareamento de transferências e pagamentos de fatura.
+
+O pareamento roda sobre candidatas sintéticas em memória (por padrão 1
+milhão de transações espalhadas por 5 anos em várias contas, 2% delas em
+pares débito/crédito), o que mede só o hash join por valor e o sort-merge
+por data. A varredura completa pelo banco (`match()`, leitura + pareamento
++ consolidação) é medida sobre os dados de generate_dataset.
+"""
+
+import random
+import time
+from datetime import date, timedelta
+
+from orcamento_2026.core.benchmarks import SEED, register, rollback
+from orcamento_2026.core.services.synthetic import generate_dataset
+from orcamento_2026.core.services.transfers import Candidate, match, pair
+
+ROWS: int = 1_000_000
+DB_ROWS: int = 20_000
+ACCOUNTS: int = 6
+YEARS: int = 5
+WINDOW_DAYS: int = 5
+# Fração das transações que pertence a um par
+PAIR_RATIO: float = 0.02
+
+
+def _candidates(rows: int) -> list[Candidate]:
+    rng = random.Random(SEED)
+    start = date.today() - timedelta(days=365 * YEARS)
+    days = 365 * YEARS
+    pairs = int(rows * PAIR_RATIO) // 2
+    candidates = [
+        Candidate(index, rng.randint(1, ACCOUNTS), start + timedelta(days=rng.randrange(days)), -rng.randint(100, 50_000))
+        for index in range(rows - 2 * pairs)
+    ]
+    for index in range(len(candidates), rows, 2):
+        debit_account = rng.randint(1, ACCOUNTS)
+        credit_account = rng.choice([account for account in range(1, ACCOUNTS + 1) if account != debit_account])
+        day = start + timedelta(days=rng.randrange(days))
+        cents = rng.randint(100_000, 2_000_000)
+        candidates.append(Candidate(index, debit_account, day, -cents))
+        candidates.append(Candidate(index + 1, credit_account, day + timedelta(days=rng.randint(0, WINDOW_DAYS)), cents))
+    return candidates
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, round(time.perf_counter() - start, 3)
+
+
+@register("transfers")
+def run(options: dict) -> dict:
+    """Mede o pareamento em memória e a varredura completa pelo banco."""
+    rows = options.get("rows") or ROWS
+    candidates = _candidates(rows)
+    pairs, seconds = _timed(lambda: pair(candidates, WINDOW_DAYS))
+    results = {
+        "pair": {
+            "transactions": len(candidates),
+            "pairs": len(pairs),
+            "seconds": seconds,
+            "per_second": round(len(candidates) / seconds) if seconds else float("inf"),
+        }
+    }
+
+    db_rows = min(rows, DB_ROWS)
+    with rollback():
+        generate_dataset(db_rows, months=12 * YEARS, consolidated_ratio=0, suggestion_ratio=0, seed=SEED)
+        pairs, seconds = _timed(lambda: match(window_days=WINDOW_DAYS))
+        results["full_scan"] = {"transactions": db_rows, "pairs": pairs, "seconds": seconds}
+    return results
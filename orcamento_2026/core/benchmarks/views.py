@@ -0,0 +1,64 @@
+"""Benchmark das páginas principais, renderizadas de ponta a ponta pelo test client."""
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from orcamento_2026.core.benchmarks import SEED, measure, register, rollback
+from orcamento_2026.core.services.synthetic import generate_dataset
+
+ROWS: int = 5_000
+
+# Nome da URL -> parâmetros GET
+PAGES: dict[str, dict[str, str]] = {
+    "dashboard": {},
+    "transaction_list": {},
+    "expense_list": {},
+    "suggestion_list": {},
+    "category_list": {},
+    "subcategory_list": {},
+    "pending_suggestions_count": {},
+}
+SEARCHES: dict[str, dict[str, str]] = {
+    "transaction_list": {"search": "mercado"},
+    "expense_list": {"search": "mercado"},
+}
+
+
+def _measure_page(client: Client, name: str, params: dict[str, str], iterations: int) -> dict:
+    url = reverse(name)
+    queries = []
+    # execute_wrapper em vez de connection.queries, que é zerado a cada request_started
+    with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+        response = client.get(url, params)
+    if response.status_code != 200:
+        raise RuntimeError(f"{name} respondeu {response.status_code}")
+
+    metrics = measure(lambda: client.get(url, params), iterations)
+    metrics["ms_per_request"] = round(metrics["seconds"] / iterations * 1000, 2)
+    metrics["queries"] = len(queries)
+    return metrics
+
+
+@register("views")
+def run(options: dict) -> dict:
+    """Mede tempo por requisição e número de queries de cada página sobre dados sintéticos."""
+    from django.contrib.auth import get_user_model
+
+    rows = options.get("rows") or ROWS
+    iterations = options.get("iterations") or 10
+    results = {}
+
+    # REMOTE_ADDR fora de INTERNAL_IPS para a debug toolbar não entrar na medição
+    client = Client(REMOTE_ADDR="192.0.2.1")
+    with rollback(), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        generate_dataset(rows, seed=SEED)
+        client.force_login(get_user_model().objects.create_user(username="benchmark", password="benchmark"))
+
+        for name, params in PAGES.items():
+            results[name] = _measure_page(client, name, params, iterations)
+        for name, params in SEARCHES.items():
+            results[f"{name}_search"] = _measure_page(client, name, params, iterations)
+
+    return results
@@ -6,6 +6,8 @@ from django import forms
 from django.db import models
 
 from orcamento_2026.core.models import Account, Category, Expense, SubCategory, Transaction
+from orcamento_2026.core.services.reports import REPORTS
+from orcamento_2026.core.services.utils.text_utils import normalize_key
 
 
 class CategoryForm(forms.ModelForm):
@@ -24,6 +26,13 @@ class CategoryForm(forms.ModelForm):
             )
         }
 
+    def clean_name(self):
+        name = self.cleaned_data["name"]
+        duplicates = Category.objects.filter(name_key=normalize_key(name)).exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise forms.ValidationError("Já existe uma categoria com este nome (ignorando acentos e maiúsculas).")
+        return name
+
 
 class SubCategoryForm(forms.ModelForm):
     """Formulário para SubCategoria."""
@@ -46,6 +55,16 @@ class SubCategoryForm(forms.ModelForm):
             ),
         }
 
+    def clean(self):
+        cleaned_data = super().clean()
+        category = cleaned_data.get("category")
+        name = cleaned_data.get("name")
+        if category and name:
+            duplicates = SubCategory.objects.filter(category=category, name_key=normalize_key(name)).exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                self.add_error("name", "Já existe uma subcategoria com este nome nesta categoria.")
+        return cleaned_data
+
 
 class ExpenseForm(forms.ModelForm):
     """Formulário para Despesa."""
@@ -88,6 +107,8 @@ class ExpenseForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # SubCategory.__str__ lê a categoria: evita uma query por opção
+        self.fields["subcategory"].queryset = SubCategory.objects.select_related("category")
         # Filtrar transações que não têm despesa associada ou a despesa atual
         if self.instance and self.instance.pk:
             self.fields["transaction"].queryset = Transaction.objects.filter(
@@ -130,6 +151,11 @@ class ExpenseManualForm(forms.ModelForm):
             "is_ignored": forms.CheckboxInput(attrs={"class": "h-4 w-4 rounded border-gray-300 text-indigo-600 focus:ring-indigo-600"}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # SubCategory.__str__ lê a categoria: evita uma query por opção
+        self.fields["subcategory"].queryset = SubCategory.objects.select_related("category")
+
 
 class OFXImportForm(forms.Form):
     """Formulário para importação de arquivo OFX."""
@@ -180,7 +206,7 @@ class ConsolidationForm(forms.Form):
         ),
     )
     subcategory = forms.ModelChoiceField(
-        queryset=SubCategory.objects.all(),
+        queryset=SubCategory.objects.select_related("category"),
         label="Subcategoria",
         widget=forms.Select(
             attrs={
@@ -244,3 +270,30 @@ class DashboardFilterForm(forms.Form):
             }
         ),
     )
+
+
+class ReportExportForm(forms.Form):
+    """Formulário de exportação de relatórios."""
+
+    INPUT_CLASS = "block w-full rounded-md border-0 py-1.5 text-gray-900 shadow-sm ring-1 ring-inset ring-gray-300 focus:ring-2 focus:ring-inset focus:ring-indigo-600 sm:text-sm sm:leading-6"
+
+    report = forms.ChoiceField(
+        label="Relatório",
+        choices=[(name, report.description) for name, report in REPORTS.items()],
+        widget=forms.Select(attrs={"class": INPUT_CLASS}),
+    )
+    format = forms.ChoiceField(
+        label="Formato",
+        choices=[("csv", "CSV"), ("xlsx", "Excel (XLSX)"), ("parquet", "Parquet")],
+        widget=forms.Select(attrs={"class": INPUT_CLASS}),
+    )
+    start_date = forms.DateField(required=False, label="Data Inicial", widget=forms.DateInput(attrs={"type": "date", "class": INPUT_CLASS}))
+    end_date = forms.DateField(required=False, label="Data Final", widget=forms.DateInput(attrs={"type": "date", "class": INPUT_CLASS}))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get("start_date")
+        end_date = cleaned_data.get("end_date")
+        if start_date and end_date and start_date > end_date:
+            raise forms.ValidationError("A data inicial deve ser anterior à data final.")
+        return cleaned_data
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from orcamento_2026.core.services.merchants import rebuild
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin, phase
+
+
+class Command(ProfiledCommandMixin, BaseCommand):
+    help = "Refaz os estabelecimentos agrupando as variações de memo de todo o histórico (MinHash/LSH)"
+
+    def handle(self, *args, **options):
+        with phase("rebuild"):
+            created = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{created} estabelecimentos criados."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orcamento_2026.core.services.partitioning import ARCHIVE_SCHEMA, archive, boundary_links
+
+
+class Command(BaseCommand):
+    help = (
+        f"Desanexa as partições anuais de transações e despesas anteriores a --before (PostgreSQL particionado) "
+        f"e as move para o schema '{ARCHIVE_SCHEMA}', com as sugestões e despesas ligadas às suas transações; com --drop, remove-as. "
+        "Contadores, orçamentos e cobranças recorrentes são recalculados na mesma transação"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--before", type=int, required=True, help="Primeiro ano mantido (ex.: 2020 arquiva até 2019)")
+        parser.add_argument("--drop", action="store_true", help="Remove as partições em vez de arquivá-las")
+        parser.add_argument("--dry-run", action="store_true", help="Apenas lista as partições que seriam arquivadas")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Arquiva mesmo com despesas ou sugestões ligadas a transações do outro lado do corte (são arquivadas ou removidas junto)",
+        )
+
+    def handle(self, *args, **options):
+        before = options["before"]
+        links = boundary_links(before)
+        if links and not (options["force"] or options["dry_run"]):
+            raise CommandError(
+                f"{links} despesas e sugestões estão ligadas a transações do outro lado do corte em {before} "
+                "(ex.: compras de dezembro na fatura de janeiro). Use --force para arquivá-las junto."
+            )
+
+        try:
+            names = archive(before, drop=options["drop"], dry_run=options["dry_run"])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        for name in names:
+            self.stdout.write(name)
+        if not names:
+            self.stdout.write(self.style.SUCCESS(f"Nenhuma partição anterior a {before}."))
+        elif options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{len(names)} partições seriam arquivadas ({links} ligações entre os lados do corte)."))
+        else:
+            action = "removidas" if options["drop"] else f"arquivadas no schema '{ARCHIVE_SCHEMA}'"
+            self.stdout.write(self.style.SUCCESS(f"{len(names)} partições {action}."))
@@ -0,0 +1,50 @@
+import json
+import platform
+from datetime import datetime
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from orcamento_2026.core.benchmarks import load_suites
+
+
+class Command(BaseCommand):
+    help = "Executa benchmarks de desempenho (os dados criados são descartados ao final)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("suites", nargs="*", help="Suítes a executar (padrão: todas)")
+        parser.add_argument("--iterations", type=int, default=None, help="Número de iterações por medição")
+        parser.add_argument("--rows", type=int, default=None, help="Tamanho dos dados sintéticos usados pelas suítes")
+        parser.add_argument("--output", default=None, help="Grava os resultados em JSON neste arquivo, para comparar execuções")
+
+    def handle(self, *args, **options):
+        suites = load_suites()
+        selected = options["suites"] or list(suites)
+
+        unknown = [name for name in selected if name not in suites]
+        if unknown:
+            raise CommandError(f"Suítes desconhecidas: {', '.join(unknown)}. Disponíveis: {', '.join(suites)}")
+
+        report = {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "options": {"iterations": options["iterations"], "rows": options["rows"]},
+            "suites": {},
+        }
+        for name in selected:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n[{name}]"))
+            results = suites[name](options)
+            report["suites"][name] = results
+            for case, metrics in results.items():
+                values = ", ".join(f"{key}={value}" for key, value in metrics.items())
+                self.stdout.write(f"  {case}: {values}")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            self.stdout.write(f"\nResultados gravados em {options['output']}")
+
+        self.stdout.write(self.style.SUCCESS("\nBenchmarks concluídos."))
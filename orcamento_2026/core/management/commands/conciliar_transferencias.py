@@ -0,0 +1,25 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orcamento_2026.core.services.transfers import match
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin
+
+
+class Command(ProfiledCommandMixin, BaseCommand):
+    help = "Encontra transferências entre contas e pagamentos de fatura em todo o histórico e os marca como despesas ignoradas"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window",
+            type=int,
+            default=settings.TRANSFER_WINDOW_DAYS,
+            help=f"Distância máxima, em dias, entre os dois lados (padrão: {settings.TRANSFER_WINDOW_DAYS})",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        pairs = match(window_days=options["window"])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"{pairs} transferências encontradas em {elapsed:.1f}s."))
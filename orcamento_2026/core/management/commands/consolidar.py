@@ -1,15 +1,19 @@
 from django.core.management.base import BaseCommand
 from orcamento_2026.core.models import Category, SubCategory
 from orcamento_2026.core.services.consolidation import consolidate_transaction, get_unconsolidated_transactions
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin, phase
 
 
-class Command(BaseCommand):
+class Command(ProfiledCommandMixin, BaseCommand):
     help = "Revisa e consolida transações com sugestões do Larry"
 
     def handle(self, *args, **options):
         # Alterado para buscar todas as transações não consolidadas, não apenas as com sugestão
-        transactions = get_unconsolidated_transactions()
-        total = transactions.count()
+        with phase("select"):
+            transactions = list(
+                get_unconsolidated_transactions().select_related("account", "suggestion__category", "suggestion__subcategory")
+            )
+        total = len(transactions)
 
         if total == 0:
             self.stdout.write(self.style.SUCCESS("Nenhuma transação pendente de consolidação."))
@@ -58,13 +62,14 @@ class Command(BaseCommand):
                         # Aceitar sugestão
                         if suggestion and suggestion.category and suggestion.subcategory and suggestion.description:
                             try:
-                                consolidate_transaction(
-                                    transaction,
-                                    suggestion.category.name if suggestion.category else "",
-                                    suggestion.subcategory.name if suggestion.subcategory else "",
-                                    suggestion.description,
-                                    transaction.reference_date,
-                                )
+                                with phase("consolidate"):
+                                    consolidate_transaction(
+                                        transaction,
+                                        suggestion.category.name if suggestion.category else "",
+                                        suggestion.subcategory.name if suggestion.subcategory else "",
+                                        suggestion.description,
+                                        transaction.reference_date,
+                                    )
                                 self.stdout.write(self.style.SUCCESS("Consolidado e Aceito!"))
                                 break
                             except ValueError as e:
@@ -91,17 +96,18 @@ class Command(BaseCommand):
                         ref_month = transaction.reference_date
 
                         try:
-                            consolidate_transaction(
-                                transaction,
-                                category.name if category else "",
-                                subcategory.name if subcategory else "",
-                                description,
-                                ref_month,
-                            )
-                            # Atualiza sugestão como editada/aceita se existir
-                            if suggestion:
-                                suggestion.status = "EDITED"
-                                suggestion.save()
+                            with phase("consolidate"):
+                                consolidate_transaction(
+                                    transaction,
+                                    category.name if category else "",
+                                    subcategory.name if subcategory else "",
+                                    description,
+                                    ref_month,
+                                )
+                                # Atualiza sugestão como editada/aceita se existir
+                                if suggestion:
+                                    suggestion.status = "EDITED"
+                                    suggestion.save()
 
                             self.stdout.write(self.style.SUCCESS("Consolidado manualmente!"))
                             break
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from orcamento_2026.core.services.dedupe import SCAN_CHUNK_SIZE, duplicate_groups, merge, removable
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin, phase
+
+
+class Command(ProfiledCommandMixin, BaseCommand):
+    help = (
+        "Procura no histórico transações com o mesmo conteúdo (conta, data, valor e memo) vindas de importações diferentes; "
+        "com --merge, pede confirmação e exclui as duplicatas"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--merge", action="store_true", help="Exclui as duplicatas (padrão: apenas lista)")
+        parser.add_argument("--no-input", action="store_false", dest="interactive", help="Com --merge, exclui sem pedir confirmação")
+        parser.add_argument(
+            "--chunk-size", type=int, default=SCAN_CHUNK_SIZE, help=f"Chaves duplicadas lidas por query (padrão: {SCAN_CHUNK_SIZE})"
+        )
+
+    def handle(self, *args, **options):
+        found = []
+        duplicates = 0
+        with phase("scan"):
+            for group in duplicate_groups(options["chunk_size"]):
+                # Repetições da mesma importação são lançamentos legítimos
+                extra = len(removable(group))
+                if not extra:
+                    continue
+                found.append(group)
+                duplicates += extra
+                first = group[0]
+                fitids = ", ".join(tx.fitid for tx in group)
+                self.stdout.write(f"{first.date} {first.amount} {first.memo[:40]} ({first.account_id}): {fitids}")
+
+        if not found:
+            self.stdout.write(self.style.SUCCESS("Nenhuma duplicata encontrada."))
+            return
+        if not options["merge"]:
+            self.stdout.write(self.style.WARNING(f"{len(found)} grupos, {duplicates} duplicatas. Rode com --merge para excluí-las."))
+            return
+        if options["interactive"] and input(f"Excluir {duplicates} duplicatas de {len(found)} grupos? (S/N): ").strip().upper() != "S":
+            self.stdout.write("Nada foi excluído.")
+            return
+
+        removed = 0
+        with phase("merge"):
+            for group in found:
+                removed += len(merge(group))
+        self.stdout.write(self.style.SUCCESS(f"{len(found)} grupos, {removed} duplicatas excluídas."))
@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from orcamento_2026.core.services.recurring import refresh
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin
+
+
+class Command(ProfiledCommandMixin, BaseCommand):
+    help = "Detecta assinaturas e cobranças recorrentes em todo o histórico de transações"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        charges = refresh()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"{charges} cobranças recorrentes detectadas em {elapsed:.1f}s."))
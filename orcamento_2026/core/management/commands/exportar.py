@@ -0,0 +1,50 @@
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from orcamento_2026.core.services.reports import REPORTS, WRITERS, export
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin
+
+
+def _date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError as e:
+        raise CommandError(f"Data inválida: {value} (use AAAA-MM-DD)") from e
+
+
+class Command(ProfiledCommandMixin, BaseCommand):
+    help = "Exporta relatórios de despesas e transações em CSV, XLSX ou Parquet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("report", choices=list(REPORTS), help="Relatório a exportar")
+        parser.add_argument("--format", choices=list(WRITERS), default=None, help="Formato (padrão: extensão de --output, ou csv)")
+        parser.add_argument("--start", type=_date, default=None, help="Início do período, inclusivo (AAAA-MM-DD)")
+        parser.add_argument("--end", type=_date, default=None, help="Fim do período, inclusivo (AAAA-MM-DD)")
+        parser.add_argument("--output", default=None, help="Arquivo de saída (padrão: exports/<relatório>-<data>.<formato>)")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or (Path(options["output"]).suffix.lstrip(".") if options["output"] else "csv")
+        if fmt not in WRITERS:
+            raise CommandError(f"Formato desconhecido: {fmt}. Disponíveis: {', '.join(WRITERS)}")
+
+        path = Path(options["output"] or Path(settings.BASE_DIR) / "exports" / f"{options['report']}-{datetime.now():%Y%m%d-%H%M%S}.{fmt}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        start = time.perf_counter()
+        try:
+            if fmt == "csv":
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    rows = export(options["report"], fmt, f, options["start"], options["end"])
+            else:
+                with open(path, "wb") as f:
+                    rows = export(options["report"], fmt, f, options["start"], options["end"])
+        except ImportError as e:
+            raise CommandError(f"Dependência ausente ({e.name}). Instale as dependências: uv sync") from e
+        elapsed = time.perf_counter() - start
+
+        rate = f" ({rows / elapsed:,.0f} linhas/s)" if elapsed and rows else ""
+        self.stdout.write(self.style.SUCCESS(f"{rows} linhas exportadas para {path} em {elapsed:.2f}s{rate}"))
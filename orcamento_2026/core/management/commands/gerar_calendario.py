@@ -0,0 +1,37 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orcamento_2026.core.models import BillingCycle
+from orcamento_2026.core.services.billing_calendar import ensure_calendar, reassign_reference_dates
+
+
+class Command(BaseCommand):
+    help = "Gera o calendário de ciclos de faturamento (mês de referência de cada dia) e, opcionalmente, recalcula as transações"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=date.fromisoformat, help="Primeiro dia (AAAA-MM-DD; padrão: 5 anos atrás)")
+        parser.add_argument("--end", type=date.fromisoformat, help="Último dia (AAAA-MM-DD; padrão: 5 anos à frente)")
+        parser.add_argument(
+            "--closing-day",
+            type=int,
+            action="append",
+            dest="closing_days",
+            help="Dia de fechamento a gerar (repetível; padrão: o de settings e os das contas)",
+        )
+        parser.add_argument("--reassign", action="store_true", help="Recalcula a data de referência de todas as transações")
+
+    def handle(self, *args, **options):
+        closing_days = options["closing_days"] or {
+            settings.BILLING_CLOSING_DAY,
+            *BillingCycle.objects.values_list("closing_day", flat=True),
+        }
+        for closing_day in sorted(closing_days):
+            created = ensure_calendar(closing_day, options["start"], options["end"])
+            self.stdout.write(f"Fechamento dia {closing_day}: {created} dias gerados.")
+
+        if options["reassign"]:
+            updated = reassign_reference_dates()
+            self.stdout.write(self.style.SUCCESS(f"{updated} transações com data de referência recalculada."))
+        self.stdout.write(self.style.SUCCESS("Calendário gerado."))
@@ -0,0 +1,53 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from orcamento_2026.core.services.synthetic import generate_dataset, write_ofx
+
+
+class Command(BaseCommand):
+    help = "Gera dados sintéticos (transações, despesas, sugestões) e arquivos OFX para testes de carga"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--transactions", type=int, default=10_000, help="Transações a gerar no banco (0 para nenhuma)")
+        parser.add_argument("--months", type=int, default=24, help="Meses de histórico")
+        parser.add_argument("--consolidated-ratio", type=float, default=0.6, help="Fração das transações consolidadas em despesas")
+        parser.add_argument("--suggestion-ratio", type=float, default=0.3, help="Fração das demais transações com sugestão pendente")
+        parser.add_argument("--seed", type=int, default=None, help="Semente para gerar sempre os mesmos dados")
+        parser.add_argument(
+            "--anchor-date",
+            type=date.fromisoformat,
+            default=None,
+            help="Data mais recente dos dados (AAAA-MM-DD, padrão: hoje); com --seed, reproduz o mesmo conjunto em qualquer dia",
+        )
+        parser.add_argument("--ofx", default=None, help="Caminho de um arquivo OFX sintético a gerar")
+        parser.add_argument("--ofx-transactions", type=int, default=1_000, help="Lançamentos no arquivo OFX")
+
+    def handle(self, *args, **options):
+        for ratio in ("consolidated_ratio", "suggestion_ratio"):
+            if not 0 <= options[ratio] <= 1:
+                raise CommandError(f"--{ratio.replace('_', '-')} deve estar entre 0 e 1")
+
+        try:
+            if options["transactions"]:
+                self.stdout.write(f"Gerando {options['transactions']} transações...")
+                stats = generate_dataset(
+                    options["transactions"],
+                    months=options["months"],
+                    consolidated_ratio=options["consolidated_ratio"],
+                    suggestion_ratio=options["suggestion_ratio"],
+                    seed=options["seed"],
+                    anchor=options["anchor_date"],
+                    progress=lambda done: self.stdout.write(f"  {done}/{options['transactions']}"),
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Criadas {stats['transactions']} transações, {stats['expenses']} despesas e {stats['suggestions']} sugestões."
+                    )
+                )
+
+            if options["ofx"]:
+                write_ofx(options["ofx"], options["ofx_transactions"], seed=options["seed"], end_date=options["anchor_date"])
+                self.stdout.write(self.style.SUCCESS(f"Arquivo OFX gerado: {options['ofx']} ({options['ofx_transactions']} lançamentos)"))
+        except ImportError as e:
+            raise CommandError(f"Dependência ausente ({e.name}). Instale as dependências de desenvolvimento: uv sync --group dev") from e
@@ -1,17 +1,19 @@
 import os
 import shutil
 import traceback
+from datetime import date
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from django.core.management import call_command
 from orcamento_2026.core.models import Account
 from orcamento_2026.core.services.import_ofx import import_ofx
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin, phase
 
 
 from orcamento_2026.core.services.utils.date_utils import get_period_options
 
 
-class Command(BaseCommand):
+class Command(ProfiledCommandMixin, BaseCommand):
     help = "Importa arquivos OFX do diretório 'dados/' e gera sugestões de IA"
 
     def handle(self, *args, **options):
@@ -72,38 +74,20 @@ class Command(BaseCommand):
                 account = self.create_account()
 
             # 3. Selecionar Data de Referência
-            self.stdout.write("\nSelecione a Data de Referência (Competência):")
-            period_options = get_period_options()
-            for i, (date_val, label) in enumerate(period_options, 1):
-                self.stdout.write(f"{i}. {label}")
-
-            try:
-                # Default para opção 2 (Mês Corrente - índice 1 do array, mas opção 2 no input)
-                date_choice_input = input(f"Escolha a opção (Padrão 2 - {period_options[1][1]}): ")
-                if not date_choice_input:
-                    date_choice = 2
-                else:
-                    date_choice = int(date_choice_input)
-
-                if 1 <= date_choice <= len(period_options):
-                    reference_date = period_options[date_choice - 1][0]
-                else:
-                    self.stdout.write(self.style.ERROR("Opção inválida. Usando mês corrente."))
-                    reference_date = period_options[1][0]
-            except ValueError:
-                self.stdout.write(self.style.ERROR("Entrada inválida. Usando mês corrente."))
-                reference_date = period_options[1][0]
+            reference_date = self.select_reference_date()
 
             # 4. Executar importação
-            self.stdout.write(f"\nImportando '{selected_file}' para conta '{account.name}' com referência {reference_date}...")
+            reference_label = reference_date or "pelo ciclo de faturamento"
+            self.stdout.write(f"\nImportando '{selected_file}' para conta '{account.name}' com referência {reference_label}...")
 
             try:
                 result = import_ofx(file_path, account, reference_date)
                 new_tx_count = result["transactions_created"]
-                self.stdout.write(self.style.SUCCESS(f"Sucesso! {new_tx_count} transações novas."))
+                self.report_result(result)
 
-                new_filename = f"{reference_date.strftime('%Y%m%d')}_{selected_file}"
-                shutil.move(file_path, os.path.join(path_procesados, new_filename))
+                new_filename = f"{(reference_date or date.today()).strftime('%Y%m%d')}_{selected_file}"
+                with phase("move_file"):
+                    shutil.move(file_path, os.path.join(path_procesados, new_filename))
 
                 # 5. Perguntar se deseja gerar sugestões agora
                 if new_tx_count > 0:
@@ -115,7 +99,8 @@ class Command(BaseCommand):
 
                     if answer == "S":
                         try:
-                            call_command("sugerir")
+                            with phase("suggest"):
+                                call_command("sugerir")
                         except KeyboardInterrupt:
                             self.stdout.write("Operação cancelada pelo usuário.")
                     else:
@@ -130,6 +115,45 @@ class Command(BaseCommand):
         except KeyboardInterrupt:
             self.stdout.write("\nImportação cancelada pelo usuário.")
 
+    def select_reference_date(self) -> date | None:
+        """Pergunta a data de referência; None = mês de cada transação pelo ciclo de faturamento da conta."""
+        self.stdout.write("\nSelecione a Data de Referência (Competência):")
+        period_options = get_period_options()
+        for i, (date_val, label) in enumerate(period_options, 1):
+            self.stdout.write(f"{i}. {label}")
+        automatic = len(period_options) + 1
+        self.stdout.write(f"{automatic}. Automática (pelo ciclo de faturamento da conta, por transação)")
+
+        try:
+            # Default: mês de referência de cada transação pelo ciclo de faturamento
+            date_choice_input = input(f"Escolha a opção (Padrão {automatic} - Automática): ")
+            if not date_choice_input:
+                date_choice = automatic
+            else:
+                date_choice = int(date_choice_input)
+
+            if 1 <= date_choice <= len(period_options):
+                reference_date = period_options[date_choice - 1][0]
+            elif date_choice == automatic:
+                reference_date = None
+            else:
+                self.stdout.write(self.style.ERROR("Opção inválida. Usando o ciclo de faturamento."))
+                reference_date = None
+        except ValueError:
+            self.stdout.write(self.style.ERROR("Entrada inválida. Usando o ciclo de faturamento."))
+            reference_date = None
+        return reference_date
+
+    def report_result(self, result: dict[str, int]) -> None:
+        """Resumo da importação: transações novas, duplicatas descartadas, parcelas e transferências."""
+        self.stdout.write(self.style.SUCCESS(f"Sucesso! {result['transactions_created']} transações novas."))
+        if result.get("duplicates_skipped"):
+            self.stdout.write(self.style.WARNING(f"{result['duplicates_skipped']} transações ignoradas: já importadas com outro FITID."))
+        if result.get("installments_consolidated"):
+            self.stdout.write(f"{result['installments_consolidated']} parcelas consolidadas pela classificação das parcelas anteriores.")
+        if result.get("transfers_matched"):
+            self.stdout.write(f"{result['transfers_matched']} transferências/pagamentos de fatura marcados como ignorados.")
+
     def create_account(self):
         name = input("Nome da nova conta: ")
         while True:
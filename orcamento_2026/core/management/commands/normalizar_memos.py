@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from orcamento_2026.core.models import Transaction
+from orcamento_2026.core.services import installments, merchants, recurring
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin, phase
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
+
+CHUNK_SIZE: int = 5000
+
+
+class Command(ProfiledCommandMixin, BaseCommand):
+    help = (
+        "Recalcula o memo normalizado e a chave das compras parceladas de todas as transações, em blocos por id; "
+        "só as que mudaram são gravadas. Em seguida refaz as cobranças recorrentes e os estabelecimentos, "
+        "que agrupam pelo memo normalizado (rode após alterar as regras de normalize_memo)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"Transações lidas por query (padrão: {CHUNK_SIZE})")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        last_id = scanned = updated = rekeyed = 0
+        transactions = Transaction.objects.order_by("id").only("id", "memo", "memo_normalized", "amount", "date", "installment_key")
+        with phase("memos"):
+            while chunk := list(transactions.filter(id__gt=last_id)[: options["chunk_size"]]):
+                changed = []
+                for tx in chunk:
+                    normalized = normalize_memo(tx.memo)[:255]
+                    key = installments.rebuild_key(tx) if tx.installment_key else None
+                    if normalized != tx.memo_normalized or key != tx.installment_key:
+                        updated += normalized != tx.memo_normalized
+                        rekeyed += key != tx.installment_key
+                        tx.memo_normalized, tx.installment_key = normalized, key
+                        changed.append(tx)
+                Transaction.objects.bulk_update(changed, ["memo_normalized", "installment_key"], batch_size=500)
+                scanned += len(chunk)
+                last_id = chunk[-1].id
+
+        # Recorrências e estabelecimentos são agrupados pelo memo normalizado: chaves antigas ficariam órfãs
+        with phase("recurring"):
+            charges = recurring.refresh()
+        with phase("merchants"):
+            created = merchants.rebuild()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{updated} de {scanned} memos atualizados e {rekeyed} chaves de parcela recalculadas em {elapsed:.1f}s; "
+                f"{charges} cobranças recorrentes e {created} estabelecimentos refeitos."
+            )
+        )
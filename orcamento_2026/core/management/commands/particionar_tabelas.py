@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orcamento_2026.core.services.partitioning import partition_tables
+
+
+class Command(BaseCommand):
+    help = (
+        "Converte as tabelas de transações e despesas em tabelas particionadas por ano (PostgreSQL), "
+        "copiando os dados; tabelas já particionadas são mantidas"
+    )
+
+    def handle(self, *args, **options):
+        try:
+            created = partition_tables()
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        for table, partitions in created.items():
+            if partitions:
+                self.stdout.write(f"{table}: {len(partitions)} partições ({partitions[0]} a {partitions[-1]})")
+            else:
+                self.stdout.write(f"{table}: já particionada")
+        self.stdout.write(self.style.SUCCESS("Particionamento concluído."))
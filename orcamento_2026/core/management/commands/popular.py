@@ -1,8 +1,10 @@
 from django.core.management.base import BaseCommand
 from orcamento_2026.core.models import Account, Category, SubCategory
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin, phase
+from orcamento_2026.core.services.utils.text_utils import normalize_key
 
 
-class Command(BaseCommand):
+class Command(ProfiledCommandMixin, BaseCommand):
     help = "Popula o banco de dados com dados iniciais (Contas e Categorias)"
 
     def handle(self, *args, **options):
@@ -21,12 +23,13 @@ class Command(BaseCommand):
             ("Inter", "C"),
         ]
 
-        for name, acc_type in accounts_data:
-            obj, created = Account.objects.get_or_create(name=name, defaults={"type": acc_type})
-            if created:
-                self.stdout.write(self.style.SUCCESS(f"Conta criada: {name} ({acc_type})"))
-            else:
-                self.stdout.write(f"Conta já existente: {name}")
+        with phase("accounts"):
+            for name, acc_type in accounts_data:
+                obj, created = Account.objects.get_or_create(name=name, defaults={"type": acc_type})
+                if created:
+                    self.stdout.write(self.style.SUCCESS(f"Conta criada: {name} ({acc_type})"))
+                else:
+                    self.stdout.write(f"Conta já existente: {name}")
 
         # 2. Categorias e Subcategorias
         categories_data = [
@@ -46,18 +49,22 @@ class Command(BaseCommand):
             {"category": "Saúde", "subcategories": ["Farmácia", "Suplementos", "Plano de Saúde", "Academia", "Outros"]},
             {"category": "Lazer", "subcategories": ["Cinema", "Viagem", "Streaming", "Jogos", "Outros"]},
             {"category": "Educação", "subcategories": ["Cursos", "Livros", "Materiais", "Outros"]},
-            {"category": "Financeiro", "subcategories": ["Tarifas", "Impostos", "Outros"]},
+            {"category": "Financeiro", "subcategories": ["Tarifas", "Impostos", "Transferências", "Outros"]},
         ]
 
-        for item in categories_data:
-            cat_name = item["category"]
-            category, created = Category.objects.get_or_create(name=cat_name)
-            if created:
-                self.stdout.write(self.style.SUCCESS(f"Categoria criada: {cat_name}"))
+        with phase("categories"):
+            for item in categories_data:
+                cat_name = item["category"]
+                # Pela chave normalizada: "alimentacao" já cadastrada conta como "Alimentação"
+                category, created = Category.objects.get_or_create(name_key=normalize_key(cat_name), defaults={"name": cat_name})
+                if created:
+                    self.stdout.write(self.style.SUCCESS(f"Categoria criada: {cat_name}"))
 
-            for sub_name in item["subcategories"]:
-                sub, sub_created = SubCategory.objects.get_or_create(name=sub_name, category=category)
-                if sub_created:
-                    self.stdout.write(self.style.SUCCESS(f"  - Subcategoria criada: {sub_name}"))
+                for sub_name in item["subcategories"]:
+                    sub, sub_created = SubCategory.objects.get_or_create(
+                        category=category, name_key=normalize_key(sub_name), defaults={"name": sub_name}
+                    )
+                    if sub_created:
+                        self.stdout.write(self.style.SUCCESS(f"  - Subcategoria criada: {sub_name}"))
 
         self.stdout.write(self.style.SUCCESS("População concluída com sucesso!"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from orcamento_2026.core.services.budgets import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recalcula o realizado de todos os orçamentos a partir das despesas"
+
+    def handle(self, *args, **options):
+        total, corrected = rebuild()
+        if corrected:
+            self.stdout.write(self.style.WARNING(f"{corrected} de {total} orçamentos estavam divergentes (corrigidos)"))
+        self.stdout.write(self.style.SUCCESS(f"{total} orçamentos recalculados."))
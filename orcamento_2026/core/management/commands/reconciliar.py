@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orcamento_2026.core.services.counters import COUNTER_SOURCES, reconcile
+
+
+class Command(BaseCommand):
+    help = "Recalcula os contadores desnormalizados a partir dos dados (rode periodicamente, ex.: via cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("counters", nargs="*", help="Contadores a reconciliar (padrão: todos)")
+
+    def handle(self, *args, **options):
+        names = options["counters"] or list(COUNTER_SOURCES)
+
+        unknown = [name for name in names if name not in COUNTER_SOURCES]
+        if unknown:
+            raise CommandError(f"Contadores desconhecidos: {', '.join(unknown)}. Disponíveis: {', '.join(COUNTER_SOURCES)}")
+
+        for name, (previous, value) in reconcile(names).items():
+            if previous == value:
+                self.stdout.write(f"{name}: {value} (ok)")
+            else:
+                self.stdout.write(self.style.WARNING(f"{name}: {previous} -> {value} (corrigido)"))
+
+        self.stdout.write(self.style.SUCCESS("Contadores reconciliados."))
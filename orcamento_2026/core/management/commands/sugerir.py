@@ -1,25 +1,34 @@
 import sys
 from django.core.management.base import BaseCommand
 from orcamento_2026.core.models import Transaction
+from orcamento_2026.core.services.installments import reuse_consolidations
 from orcamento_2026.core.services.suggestions import generate_suggestion_for_transaction
+from orcamento_2026.core.services.utils.profiling import ProfiledCommandMixin, phase
 
 
-class Command(BaseCommand):
+class Command(ProfiledCommandMixin, BaseCommand):
     help = "Gera sugestões de IA para transações não consolidadas"
 
     def handle(self, *args, **options):
+        # Parcelas de compras já classificadas são consolidadas sem chamar o Ollama
+        with phase("installments"):
+            reused = reuse_consolidations()
+        if reused:
+            self.stdout.write(f"{reused} parcelas consolidadas pela classificação de outra parcela da compra.")
+
         # Busca transações sem despesa associada E sem sugestão pendente
         # transactions = Transaction.objects.filter(expense__isnull=True, suggestion__isnull=True).order_by('date')
         # Django 'suggestion__isnull=True' works for reverse OneToOne relation check
 
-        pending_transactions = Transaction.objects.filter(expense__isnull=True).order_by("date")
+        pending_transactions = Transaction.objects.filter(expense__isnull=True).select_related("suggestion").order_by("date")
         transactions_to_process = []
 
         # Filtrar as que já tem sugestão (embora o generate_suggestion_for_transaction já faça check,
         # é bom filtrar antes para contagem correta)
-        for tx in pending_transactions:
-            if not hasattr(tx, "suggestion"):
-                transactions_to_process.append(tx)
+        with phase("select"):
+            for tx in pending_transactions:
+                if not hasattr(tx, "suggestion"):
+                    transactions_to_process.append(tx)
 
         total = len(transactions_to_process)
 
@@ -34,7 +43,8 @@ class Command(BaseCommand):
                 self.stdout.write(f"[{idx}/{total}] Analisando: {tx.memo}...", ending="")
                 sys.stdout.flush()
 
-                suggestion = generate_suggestion_for_transaction(tx)
+                with phase("suggest"):
+                    suggestion = generate_suggestion_for_transaction(tx)
 
                 if suggestion:
                     self.stdout.write(self.style.SUCCESS(" OK"))
@@ -0,0 +1,111 @@
+"""Middlewares do core."""
+
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from orcamento_2026.core.services.metrics import RequestSample, registry
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    """execute_wrapper que conta queries, soma o tempo de banco e registra queries lentas."""
+
+    def __init__(self, slow_query_seconds: float) -> None:
+        self.slow_query_seconds = slow_query_seconds
+        self.queries = 0
+        self.duration = 0.0
+        self.slow = 0
+        self.view = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.duration += elapsed
+            if elapsed >= self.slow_query_seconds:
+                self.slow += 1
+                logger.warning(f"Query lenta ({elapsed * 1000:.0f} ms) em {self.view or '?'}: {sql[:500]}")
+
+
+@contextmanager
+def _recording(recorder: QueryRecorder) -> Iterator[None]:
+    """Instala o recorder em todas as conexões da thread atual."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield
+
+
+class PerformanceMiddleware:
+    """
+    Mede tempo de resposta, número de queries e tempo de banco por view.
+
+    As medições vão para o registro em memória de services.metrics, exposto
+    em /metrics. Requisições e queries acima dos limites configurados
+    (PERF_SLOW_REQUEST_MS, PERF_SLOW_QUERY_MS) são registradas no log.
+
+    Funciona em WSGI e ASGI: sob ASGI o middleware é assíncrono, para não
+    obrigar o Django a ocupar uma thread durante views assíncronas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERF_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_query_seconds = settings.PERF_SLOW_QUERY_MS / 1000
+        self.slow_request_seconds = settings.PERF_SLOW_REQUEST_MS / 1000
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        recorder = request._query_recorder = QueryRecorder(self.slow_query_seconds)
+        start = time.perf_counter()
+        with _recording(recorder):
+            response = self.get_response(request)
+        self._record(request, recorder, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        recorder = request._query_recorder = QueryRecorder(self.slow_query_seconds)
+        start = time.perf_counter()
+        # O ORM assíncrono usa as conexões da thread do sync_to_async: o recorder é instalado lá
+        recording = _recording(recorder)
+        await sync_to_async(recording.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.__exit__)(None, None, None)
+        self._record(request, recorder, time.perf_counter() - start)
+        return response
+
+    def _record(self, request, recorder: QueryRecorder, duration: float) -> None:
+        match = request.resolver_match
+        view = match.view_name if match else "<unresolved>"
+        registry.record(view, RequestSample(duration, recorder.queries, recorder.duration), recorder.slow)
+
+        if duration >= self.slow_request_seconds:
+            logger.warning(
+                f"Requisição lenta ({duration * 1000:.0f} ms, {recorder.queries} queries, "
+                f"{recorder.duration * 1000:.0f} ms no banco): {request.method} {request.path} [{view}]"
+            )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Identifica a view no log das queries lentas assim que a URL é resolvida
+        request._query_recorder.view = request.resolver_match.view_name
@@ -0,0 +1,82 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:25
+
+from django.db import migrations, models
+
+from orcamento_2026.core.services.utils.text_utils import normalize_key
+
+
+def collisions(rows) -> list[tuple[object, list[str]]]:
+    """
+    Nomes que passam a colidir após a normalização (ex.: "Alimentação" e "alimentacao").
+
+    Args:
+        rows: Pares (escopo, nome); nomes só colidem dentro do mesmo escopo (a categoria, para subcategorias)
+
+    Returns:
+        (escopo, nomes) de cada grupo com a mesma chave
+    """
+    groups: dict[tuple, list[str]] = {}
+    for scope, name in rows:
+        groups.setdefault((scope, normalize_key(name)), []).append(name)
+    return [(scope, names) for (scope, _key), names in groups.items() if len(names) > 1]
+
+
+def fill_name_keys(apps, schema_editor):
+    """
+    Preenche name_key das categorias e subcategorias existentes.
+
+    Antes, confere se algum nome colide após a normalização: a restrição única
+    criada a seguir falharia com IntegrityError. Os nomes repetidos são
+    listados para serem renomeados ou unificados antes de migrar.
+    """
+    Category = apps.get_model("core", "Category")
+    SubCategory = apps.get_model("core", "SubCategory")
+    repeated = [
+        f"categorias {names}" for _scope, names in collisions((None, name) for name in Category.objects.values_list("name", flat=True))
+    ]
+    repeated += [
+        f"subcategorias {names} (categoria {category_id})"
+        for category_id, names in collisions(SubCategory.objects.values_list("category_id", "name"))
+    ]
+    if repeated:
+        raise RuntimeError(
+            f"Nomes repetidos após ignorar maiúsculas e acentos: {'; '.join(repeated)}. Renomeie ou unifique-os antes de migrar."
+        )
+
+    for model in (Category, SubCategory):
+        objects = list(model.objects.only("id", "name"))
+        for obj in objects:
+            obj.name_key = normalize_key(obj.name)
+        model.objects.bulk_update(objects, ["name_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="name_key",
+            field=models.CharField(default="", editable=False, max_length=100),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="subcategory",
+            name="name_key",
+            field=models.CharField(default="", editable=False, max_length=100),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_name_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="category",
+            name="name_key",
+            field=models.CharField(editable=False, max_length=100, unique=True),
+        ),
+        migrations.AddConstraint(
+            model_name="subcategory",
+            constraint=models.UniqueConstraint(fields=("category", "name_key"), name="core_subcategory_unique_name_key"),
+        ),
+    ]
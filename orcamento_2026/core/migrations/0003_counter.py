@@ -0,0 +1,46 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:29
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def create_counters(apps, schema_editor):
+    """Cria os contadores já reconciliados com os dados existentes."""
+    Counter = apps.get_model("core", "Counter")
+    Transaction = apps.get_model("core", "Transaction")
+    TransactionSuggestion = apps.get_model("core", "TransactionSuggestion")
+
+    now = timezone.now()
+    Counter.objects.create(
+        name="pending_suggestions",
+        value=TransactionSuggestion.objects.filter(status="PENDENTE").count(),
+        reconciled_at=now,
+    )
+    Counter.objects.create(
+        name="unconsolidated_transactions",
+        value=Transaction.objects.filter(expense__isnull=True).count(),
+        reconciled_at=now,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_name_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                ("name", models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ("value", models.BigIntegerField(default=0)),
+                ("reconciled_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Contador",
+                "verbose_name_plural": "Contadores",
+            },
+        ),
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def create_version_counters(apps, schema_editor):
+    """Cria os contadores de versão dos dados, para que bump() seja sempre um único UPDATE."""
+    Counter = apps.get_model("core", "Counter")
+    for name in ("data_version", "data_rewrites"):
+        Counter.objects.get_or_create(name=name, defaults={"value": 0})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_counter"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_version_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:02
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Budget",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField(help_text="Mês de referência (gravado como o dia 1)")),
+                ("limit", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("actual", models.DecimalField(decimal_places=2, default=Decimal("0"), editable=False, max_digits=12)),
+                (
+                    "subcategory",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="budgets", to="core.subcategory"),
+                ),
+            ],
+            options={
+                "verbose_name": "Orçamento",
+                "verbose_name_plural": "Orçamentos",
+                "constraints": [models.UniqueConstraint(fields=("subcategory", "month"), name="core_budget_unique_subcategory_month")],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:36
+
+from datetime import date, timedelta
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from orcamento_2026.core.services.utils.date_utils import reference_month
+
+CALENDAR_START = date(2020, 1, 1)
+CALENDAR_END = date(2035, 12, 31)
+
+
+def seed_calendar(apps, schema_editor):
+    """Gera o calendário do fechamento padrão e do mês civil (31); os demais são gerados sob demanda."""
+    CalendarDay = apps.get_model("core", "CalendarDay")
+    days = [CALENDAR_START + timedelta(days=offset) for offset in range((CALENDAR_END - CALENDAR_START).days + 1)]
+    for closing_day in sorted({settings.BILLING_CLOSING_DAY, 31}):
+        CalendarDay.objects.bulk_create(
+            (CalendarDay(closing_day=closing_day, day=day, reference_month=reference_month(day, closing_day)) for day in days),
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_budget"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BillingCycle",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "closing_day",
+                    models.PositiveSmallIntegerField(
+                        help_text="Dia de fechamento da fatura (31 = mês civil, para contas correntes)",
+                        validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(31)],
+                    ),
+                ),
+                (
+                    "account",
+                    models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="billing_cycle", to="core.account"),
+                ),
+            ],
+            options={
+                "verbose_name": "Ciclo de Faturamento",
+                "verbose_name_plural": "Ciclos de Faturamento",
+            },
+        ),
+        migrations.CreateModel(
+            name="CalendarDay",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("closing_day", models.PositiveSmallIntegerField()),
+                ("day", models.DateField()),
+                ("reference_month", models.DateField()),
+            ],
+            options={
+                "verbose_name": "Dia do Calendário",
+                "verbose_name_plural": "Dias do Calendário",
+                "indexes": [models.Index(fields=["closing_day", "reference_month", "day"], name="core_calendarday_cycle_idx")],
+                "constraints": [models.UniqueConstraint(fields=("closing_day", "day"), name="core_calendarday_unique_day")],
+            },
+        ),
+        migrations.RunPython(seed_calendar, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_billing_calendar"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecurringCharge",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("memo_key", models.CharField(max_length=255)),
+                ("description", models.CharField(help_text="Memo da cobrança mais recente", max_length=255)),
+                ("cadence", models.CharField(choices=[("M", "Mensal"), ("A", "Anual")], max_length=1)),
+                ("amount", models.DecimalField(decimal_places=2, help_text="Valor típico (mediana)", max_digits=10)),
+                ("occurrences", models.PositiveIntegerField()),
+                ("first_date", models.DateField()),
+                ("last_date", models.DateField()),
+                ("next_date", models.DateField(help_text="Próxima cobrança prevista")),
+                ("is_active", models.BooleanField(default=True)),
+                ("detected_at", models.DateTimeField()),
+                (
+                    "account",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="recurring_charges", to="core.account"),
+                ),
+            ],
+            options={
+                "verbose_name": "Cobrança Recorrente",
+                "verbose_name_plural": "Cobranças Recorrentes",
+                "constraints": [models.UniqueConstraint(fields=("account", "memo_key"), name="core_recurringcharge_unique_key")],
+            },
+        ),
+    ]
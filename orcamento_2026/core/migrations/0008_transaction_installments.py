@@ -0,0 +1,44 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:47
+
+from django.db import migrations, models
+
+from orcamento_2026.core.services.installments import annotate
+
+
+def parse_existing_installments(apps, schema_editor):
+    """Extrai as parcelas dos memos das transações já importadas."""
+    Transaction = apps.get_model("core", "Transaction")
+    candidates = Transaction.objects.filter(models.Q(memo__icontains="PARC") | models.Q(memo__icontains="PCL"))
+    candidates = candidates.only("id", "memo", "amount", "date")
+    installments = [tx for tx in candidates.iterator(chunk_size=2000) if annotate(tx)]
+    Transaction.objects.bulk_update(installments, ["installment_number", "installment_total", "installment_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_recurring_charge"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="installment_key",
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="installment_number",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="installment_total",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["account", "installment_key", "installment_number"], name="core_tx_installment_idx"),
+        ),
+        migrations.RunPython(parse_existing_installments, migrations.RunPython.noop),
+    ]
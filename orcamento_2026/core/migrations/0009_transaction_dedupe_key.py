@@ -0,0 +1,38 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:58
+
+from django.db import migrations, models
+
+from orcamento_2026.core.services.dedupe import annotate
+
+
+def fill_dedupe_keys(apps, schema_editor):
+    """Calcula o dedupe_key das transações já importadas."""
+    Transaction = apps.get_model("core", "Transaction")
+    batch = []
+    for tx in Transaction.objects.only("id", "account_id", "date", "amount", "memo").iterator(chunk_size=2000):
+        annotate(tx)
+        batch.append(tx)
+        if len(batch) >= 2000:
+            Transaction.objects.bulk_update(batch, ["dedupe_key"], batch_size=500)
+            batch = []
+    Transaction.objects.bulk_update(batch, ["dedupe_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_transaction_installments"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="dedupe_key",
+            field=models.CharField(blank=True, editable=False, max_length=40, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["dedupe_key"], name="core_tx_dedupe_key_idx"),
+        ),
+        migrations.RunPython(fill_dedupe_keys, migrations.RunPython.noop),
+    ]
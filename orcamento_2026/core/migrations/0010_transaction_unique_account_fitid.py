@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_transaction_dedupe_key"),
+    ]
+
+    operations = [
+        # O FITID ainda é único na tabela inteira, então nenhum par (conta, FITID) se repete.
+        # O índice por conta é criado antes de remover o global: a tabela nunca fica sem unicidade
+        migrations.AddConstraint(
+            model_name="transaction",
+            constraint=models.UniqueConstraint(fields=("account", "fitid"), name="core_transaction_unique_account_fitid"),
+        ),
+        migrations.AlterField(
+            model_name="transaction",
+            name="fitid",
+            field=models.CharField(max_length=255),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_transaction_unique_account_fitid"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Merchant",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(help_text="Memo mais frequente do grupo", max_length=255)),
+            ],
+            options={
+                "verbose_name": "Estabelecimento",
+                "verbose_name_plural": "Estabelecimentos",
+            },
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="merchant",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="transactions",
+                to="core.merchant",
+            ),
+        ),
+        migrations.CreateModel(
+            name="MerchantAlias",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("memo_key", models.CharField(max_length=255, unique=True)),
+                ("signature", models.BinaryField()),
+                ("merchant", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="aliases", to="core.merchant")),
+            ],
+            options={
+                "verbose_name": "Variação de Estabelecimento",
+                "verbose_name_plural": "Variações de Estabelecimento",
+            },
+        ),
+        migrations.CreateModel(
+            name="MerchantBucket",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("bucket", models.BigIntegerField()),
+                ("alias", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="buckets", to="core.merchantalias")),
+            ],
+            options={
+                "verbose_name": "Bucket LSH",
+                "verbose_name_plural": "Buckets LSH",
+                "indexes": [models.Index(fields=["bucket"], name="core_merchantbucket_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:13
+
+from django.db import migrations, models
+
+from orcamento_2026.core.services.installments import rebuild_key
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
+
+
+def fill_memo_normalized(apps, schema_editor):
+    """
+    Calcula o memo_normalized das transações já importadas e recalcula a chave das parcelas.
+
+    normalize_memo passou a remover parcelas e final do cartão, e a chave da
+    compra (0008) usa o memo normalizado. Cobranças recorrentes e
+    estabelecimentos também agrupam por ele, mas dependem do código atual dos
+    serviços: depois de migrar, rode `manage.py normalizar_memos` para refazê-los.
+    """
+    Transaction = apps.get_model("core", "Transaction")
+    batch = []
+    for tx in Transaction.objects.only("id", "memo", "amount", "date", "installment_key").iterator(chunk_size=2000):
+        tx.memo_normalized = normalize_memo(tx.memo)[:255]
+        if tx.installment_key:
+            tx.installment_key = rebuild_key(tx)
+        batch.append(tx)
+        if len(batch) >= 2000:
+            Transaction.objects.bulk_update(batch, ["memo_normalized", "installment_key"], batch_size=500)
+            batch = []
+    Transaction.objects.bulk_update(batch, ["memo_normalized", "installment_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_merchants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="memo_normalized",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_memo_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["memo_normalized", "account"], name="core_tx_memo_normalized_idx"),
+        ),
+    ]
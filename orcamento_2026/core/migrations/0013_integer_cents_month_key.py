@@ -0,0 +1,50 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:18
+
+from django.db import migrations, models
+from django.db.models import F, Max, Min
+from django.db.models.functions import Cast, ExtractMonth, ExtractYear, Round
+
+# Faixa de ids atualizada por UPDATE no preenchimento
+CHUNK_SIZE = 10000
+
+
+def _update_in_chunks(queryset, **values):
+    bounds = queryset.aggregate(first=Min("id"), last=Max("id"))
+    if bounds["first"] is None:
+        return
+    for start in range(bounds["first"], bounds["last"] + 1, CHUNK_SIZE):
+        queryset.filter(id__gte=start, id__lt=start + CHUNK_SIZE).update(**values)
+
+
+def fill_integer_columns(apps, schema_editor):
+    """Preenche amount_cents e month_key no banco, com UPDATEs por faixa de ids (sem carregar as linhas)."""
+    Transaction = apps.get_model("core", "Transaction")
+    Expense = apps.get_model("core", "Expense")
+    # Round antes do Cast: no SQLite o decimal é REAL e o CAST trunca
+    _update_in_chunks(Transaction.objects.all(), amount_cents=Cast(Round(F("amount") * 100), models.BigIntegerField()))
+    _update_in_chunks(Expense.objects.all(), month_key=ExtractYear("reference_month") * 100 + ExtractMonth("reference_month"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_transaction_memo_normalized"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="expense",
+            name="month_key",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="amount_cents",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_integer_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(fields=["subcategory", "month_key"], name="core_expense_subcat_month_idx"),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:40
+
+from django.conf import settings
+from django.db import migrations
+
+from orcamento_2026.core.services.partitioning import partition_tables
+
+
+def partition(apps, schema_editor):
+    """Particiona transações e despesas por ano quando DB_PARTITIONING está ligado (apenas PostgreSQL)."""
+    if settings.DB_PARTITIONING and schema_editor.connection.vendor == "postgresql":
+        partition_tables(schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_integer_cents_month_key"),
+    ]
+
+    operations = [
+        # Sem volta automática: a tabela particionada continua compatível com os modelos
+        migrations.RunPython(partition, migrations.RunPython.noop),
+    ]
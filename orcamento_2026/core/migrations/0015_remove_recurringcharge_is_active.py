@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_partition_tables"),
+    ]
+
+    operations = [
+        # Calculado na leitura a partir de next_date (services.recurring.active_charges)
+        migrations.RemoveField(
+            model_name="recurringcharge",
+            name="is_active",
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_remove_recurringcharge_is_active"),
+    ]
+
+    operations = [
+        # Transações já gravadas ficam sem importação conhecida (services.dedupe não as funde entre si)
+        migrations.AddField(
+            model_name="transaction",
+            name="import_id",
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:30
+
+from django.db import migrations
+
+from orcamento_2026.core.services.merchants import BULK_BATCH_SIZE, band_buckets
+
+
+def rebuild_buckets(apps, schema_editor):
+    """Recalcula os buckets LSH das variações gravadas com as faixas atuais (as assinaturas não mudam)."""
+    import numpy as np
+
+    MerchantAlias = apps.get_model("core", "MerchantAlias")
+    MerchantBucket = apps.get_model("core", "MerchantBucket")
+    MerchantBucket.objects.all().delete()
+    batch = []
+    for alias_id, signature in MerchantAlias.objects.values_list("id", "signature").iterator(chunk_size=BULK_BATCH_SIZE):
+        batch.extend(
+            MerchantBucket(alias_id=alias_id, bucket=bucket) for bucket in band_buckets(np.frombuffer(bytes(signature), dtype=np.uint32))
+        )
+        if len(batch) >= BULK_BATCH_SIZE:
+            MerchantBucket.objects.bulk_create(batch)
+            batch = []
+    MerchantBucket.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0016_transaction_import_id"),
+    ]
+
+    operations = [
+        # Faixas do LSH passaram de 32x4 para 25x5 (services.merchants)
+        migrations.RunPython(rebuild_buckets, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,15 @@
 """Modelos do core do Orçamento 2026."""
 
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 
 from django.contrib.auth.models import AbstractUser
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+from orcamento_2026.core.services.utils.date_utils import month_key
+from orcamento_2026.core.services.utils.text_utils import normalize_key, normalize_memo
+
 
 class User(AbstractUser):
     """Modelo de usuário customizado."""
@@ -17,10 +21,15 @@ class Category(models.Model):
     """Categoria de despesa."""
 
     name: str = models.CharField(max_length=100, unique=True)
+    name_key: str = models.CharField(max_length=100, unique=True, editable=False)
 
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs) -> None:
+        self.name_key = normalize_key(self.name)
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Categoria"
         verbose_name_plural = "Categorias"
@@ -31,13 +40,21 @@ class SubCategory(models.Model):
 
     category: Category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="subcategories")
     name: str = models.CharField(max_length=100)
+    name_key: str = models.CharField(max_length=100, editable=False)
 
     def __str__(self) -> str:
         return f"{self.category.name} - {self.name}"
 
+    def save(self, *args, **kwargs) -> None:
+        self.name_key = normalize_key(self.name)
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Subcategoria"
         verbose_name_plural = "Subcategorias"
+        constraints = [
+            models.UniqueConstraint(fields=["category", "name_key"], name="core_subcategory_unique_name_key"),
+        ]
 
 
 class Account(models.Model):
@@ -59,22 +76,165 @@ class Account(models.Model):
         verbose_name_plural = "Contas"
 
 
+class BillingCycle(models.Model):
+    """Ciclo de faturamento de uma conta: compras após o dia de fechamento entram no mês seguinte."""
+
+    account: Account = models.OneToOneField(Account, on_delete=models.CASCADE, related_name="billing_cycle")
+    closing_day: int = models.PositiveSmallIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(31)],
+        help_text="Dia de fechamento da fatura (31 = mês civil, para contas correntes)",
+    )
+
+    def __str__(self) -> str:
+        return f"{self.account} (fecha dia {self.closing_day})"
+
+    def save(self, *args, **kwargs) -> None:
+        from orcamento_2026.core.services.billing_calendar import ensure_calendar
+
+        super().save(*args, **kwargs)
+        ensure_calendar(self.closing_day)
+
+    class Meta:
+        verbose_name = "Ciclo de Faturamento"
+        verbose_name_plural = "Ciclos de Faturamento"
+
+
+class CalendarDay(models.Model):
+    """Calendário pré-calculado: o mês de referência de cada dia, para cada dia de fechamento."""
+
+    closing_day: int = models.PositiveSmallIntegerField()
+    day: date = models.DateField()
+    reference_month: date = models.DateField()
+
+    def __str__(self) -> str:
+        return f"{self.day} -> {self.reference_month:%m/%Y} (fecha dia {self.closing_day})"
+
+    class Meta:
+        verbose_name = "Dia do Calendário"
+        verbose_name_plural = "Dias do Calendário"
+        constraints = [
+            # Também é o índice da busca dia -> mês de referência
+            models.UniqueConstraint(fields=["closing_day", "day"], name="core_calendarday_unique_day"),
+        ]
+        indexes = [
+            # Intervalo de um ciclo: dias de um mês de referência
+            models.Index(fields=["closing_day", "reference_month", "day"], name="core_calendarday_cycle_idx"),
+        ]
+
+
+class Merchant(models.Model):
+    """Estabelecimento: agrupa as variações de memo (cidade, terminal, datas) de um mesmo lugar."""
+
+    name: str = models.CharField(max_length=255, help_text="Memo mais frequente do grupo")
+
+    def __str__(self) -> str:
+        return self.name
+
+    class Meta:
+        verbose_name = "Estabelecimento"
+        verbose_name_plural = "Estabelecimentos"
+
+
+class MerchantAlias(models.Model):
+    """Variação de memo (normalize_memo) de um estabelecimento, com a assinatura MinHash (services.merchants)."""
+
+    merchant: Merchant = models.ForeignKey(Merchant, on_delete=models.CASCADE, related_name="aliases")
+    memo_key: str = models.CharField(max_length=255, unique=True)
+    signature: bytes = models.BinaryField()
+
+    def __str__(self) -> str:
+        return self.memo_key
+
+    class Meta:
+        verbose_name = "Variação de Estabelecimento"
+        verbose_name_plural = "Variações de Estabelecimento"
+
+
+class MerchantBucket(models.Model):
+    """Bucket LSH de uma faixa da assinatura de uma variação: variações parecidas caem no mesmo bucket."""
+
+    alias: MerchantAlias = models.ForeignKey(MerchantAlias, on_delete=models.CASCADE, related_name="buckets")
+    bucket: int = models.BigIntegerField()
+
+    class Meta:
+        verbose_name = "Bucket LSH"
+        verbose_name_plural = "Buckets LSH"
+        indexes = [
+            # Candidatas de um lote de memos: bucket IN (...)
+            models.Index(fields=["bucket"], name="core_merchantbucket_idx"),
+        ]
+
+
+class PartitionedQuerySet(models.QuerySet):
+    """QuerySet das tabelas particionáveis por ano (services.partitioning)."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from orcamento_2026.core.services.partitioning import PARTITIONED_TABLES, ensure_partitions
+
+        # Com as tabelas particionadas (PostgreSQL), cria antes as partições dos anos novos, como save()
+        objs = list(objs)
+        column = PARTITIONED_TABLES[self.model._meta.db_table]
+        ensure_partitions(self.model, [getattr(obj, column) for obj in objs], using=self.db)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class Transaction(models.Model):
     """Transação bancária importada de arquivo OFX."""
 
-    fitid: str = models.CharField(max_length=255, unique=True)
+    # Único por conta (core_transaction_unique_account_fitid): instituições diferentes podem repetir FITIDs
+    fitid: str = models.CharField(max_length=255)
     account: Account = models.ForeignKey(Account, on_delete=models.CASCADE)
     amount: Decimal = models.DecimalField(max_digits=10, decimal_places=2)
+    # amount em centavos (com sinal): as agregações somam inteiros em vez de numeric/Decimal
+    amount_cents: int = models.BigIntegerField(default=0, editable=False)
     date: date = models.DateField()
     reference_date: date | None = models.DateField(null=True, blank=True)
     memo: str = models.TextField()
+    # Memo sem acentos, caixa, parcelas, final do cartão, datas e números (normalize_memo), calculado uma vez na gravação
+    memo_normalized: str = models.CharField(max_length=255, blank=True, default="", editable=False)
+    # Compra parcelada ("PARC 03/10"), extraída do memo na importação (services.installments)
+    installment_number: int | None = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    installment_total: int | None = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    installment_key: str | None = models.CharField(max_length=255, null=True, blank=True, editable=False)
+    # Hash de conta, data, valor e memo normalizado: detecta a mesma linha reexportada com outro FITID (services.dedupe)
+    dedupe_key: str | None = models.CharField(max_length=40, null=True, blank=True, editable=False)
+    # Importação que gravou a transação (uma por chamada de import_ofx): repetições da mesma importação não são duplicatas
+    import_id: str | None = models.CharField(max_length=32, null=True, blank=True, editable=False)
+    # Estabelecimento do memo, atribuído na importação pelo índice LSH (services.merchants)
+    merchant: Merchant | None = models.ForeignKey(
+        Merchant, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name="transactions"
+    )
+
+    objects = PartitionedQuerySet.as_manager()
 
     def __str__(self) -> str:
         return f"{self.date} - {self.amount} ({self.memo[:20]})"
 
+    def save(self, *args, **kwargs) -> None:
+        from orcamento_2026.core.services.dedupe import annotate
+        from orcamento_2026.core.services.partitioning import ensure_partitions
+
+        self.amount_cents = int(Decimal(str(self.amount)) * 100)
+        self.memo_normalized = normalize_memo(self.memo)[:255]
+        annotate(self)
+        ensure_partitions(Transaction, [self.date])
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Transação"
         verbose_name_plural = "Transações"
+        constraints = [
+            # Também é o índice da checagem de FITIDs existentes na importação (IN por conta)
+            models.UniqueConstraint(fields=["account", "fitid"], name="core_transaction_unique_account_fitid"),
+        ]
+        indexes = [
+            # Parcelas da mesma compra, em ordem
+            models.Index(fields=["account", "installment_key", "installment_number"], name="core_tx_installment_idx"),
+            # Busca das chaves de um lote na importação e varredura de duplicatas
+            models.Index(fields=["dedupe_key"], name="core_tx_dedupe_key_idx"),
+            # Grupos de cobrança recorrente por conta e memo, e buscas por memo
+            models.Index(fields=["memo_normalized", "account"], name="core_tx_memo_normalized_idx"),
+        ]
 
 
 class Expense(models.Model):
@@ -84,14 +244,96 @@ class Expense(models.Model):
     description: str = models.CharField(max_length=255)
     subcategory: SubCategory = models.ForeignKey(SubCategory, on_delete=models.PROTECT)
     reference_month: date = models.DateField()
+    # reference_month como inteiro AAAAMM: chave de agrupamento mensal sem TruncMonth
+    month_key: int = models.PositiveIntegerField(default=0, editable=False)
     is_ignored: bool = models.BooleanField(default=False)
 
+    objects = PartitionedQuerySet.as_manager()
+
     def __str__(self) -> str:
         return self.description
 
+    def save(self, *args, **kwargs) -> None:
+        from orcamento_2026.core.services.partitioning import ensure_partitions
+
+        self.month_key = month_key(self.reference_month)
+        ensure_partitions(Expense, [self.reference_month])
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Despesa"
         verbose_name_plural = "Despesas"
+        indexes = [
+            # Realizado dos orçamentos por subcategoria e mês
+            models.Index(fields=["subcategory", "month_key"], name="core_expense_subcat_month_idx"),
+        ]
+
+
+class Budget(models.Model):
+    """Meta de gastos de uma subcategoria num mês de referência."""
+
+    subcategory: SubCategory = models.ForeignKey(SubCategory, on_delete=models.CASCADE, related_name="budgets")
+    month: date = models.DateField(help_text="Mês de referência (gravado como o dia 1)")
+    limit: Decimal = models.DecimalField(max_digits=10, decimal_places=2)
+    # Realizado do mês, mantido incrementalmente pelos sinais de Expense e pelas consolidações em lote
+    actual: Decimal = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0"), editable=False)
+
+    def __str__(self) -> str:
+        return f"{self.subcategory} ({self.month:%m/%Y})"
+
+    def save(self, *args, **kwargs) -> None:
+        from orcamento_2026.core.services.budgets import compute_actual, month_start
+
+        self.month = month_start(self.month)
+        # Meta nova (ou movida de mês/subcategoria) parte do realizado atual
+        self.actual = compute_actual(self.subcategory_id, self.month)
+        super().save(*args, **kwargs)
+
+    @property
+    def remaining(self) -> Decimal:
+        return self.limit - self.actual
+
+    @property
+    def is_overspent(self) -> bool:
+        return self.actual > self.limit
+
+    class Meta:
+        verbose_name = "Orçamento"
+        verbose_name_plural = "Orçamentos"
+        constraints = [
+            models.UniqueConstraint(fields=["subcategory", "month"], name="core_budget_unique_subcategory_month"),
+        ]
+
+
+class RecurringCharge(models.Model):
+    """Cobrança recorrente (assinatura ou conta fixa) detectada no histórico de transações."""
+
+    CADENCES: list[tuple[str, str]] = [
+        ("M", "Mensal"),
+        ("A", "Anual"),
+    ]
+
+    account: Account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="recurring_charges")
+    # Memo normalizado (normalize_memo) que agrupa as cobranças
+    memo_key: str = models.CharField(max_length=255)
+    description: str = models.CharField(max_length=255, help_text="Memo da cobrança mais recente")
+    cadence: str = models.CharField(max_length=1, choices=CADENCES)
+    amount: Decimal = models.DecimalField(max_digits=10, decimal_places=2, help_text="Valor típico (mediana)")
+    occurrences: int = models.PositiveIntegerField()
+    first_date: date = models.DateField()
+    last_date: date = models.DateField()
+    next_date: date = models.DateField(help_text="Próxima cobrança prevista")
+    detected_at: datetime = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.description} ({self.get_cadence_display()}, {self.amount})"
+
+    class Meta:
+        verbose_name = "Cobrança Recorrente"
+        verbose_name_plural = "Cobranças Recorrentes"
+        constraints = [
+            models.UniqueConstraint(fields=["account", "memo_key"], name="core_recurringcharge_unique_key"),
+        ]
 
 
 class TransactionSuggestion(models.Model):
@@ -117,3 +359,18 @@ class TransactionSuggestion(models.Model):
     class Meta:
         verbose_name = "Sugestão de Transação"
         verbose_name_plural = "Sugestões de Transação"
+
+
+class Counter(models.Model):
+    """Contador desnormalizado (ex.: sugestões pendentes), mantido por sinais e hooks de operações em lote."""
+
+    name: str = models.CharField(max_length=50, primary_key=True)
+    value: int = models.BigIntegerField(default=0)
+    reconciled_at: datetime | None = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.name}={self.value}"
+
+    class Meta:
+        verbose_name = "Contador"
+        verbose_name_plural = "Contadores"
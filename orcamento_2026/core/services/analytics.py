@@ -0,0 +1,266 @@
+"""
+Snapshot colunar das despesas para as agregações do dashboard.
+
+Cada worker mantém em memória um DataFrame do pandas com todas as despesas:
+nomes de categoria, subcategoria e conta como categóricos, valores em
+centavos inteiros e meses como chaves AAAAMM, lidos direto das colunas
+inteiras Transaction.amount_cents e Expense.month_key (sem Decimal, float
+nem conversão de datas por linha). Filtrar um período é uma busca
+binária no mês de referência (o DataFrame fica ordenado por ele) e as quebras,
+comparações e médias móveis são group-bys vetorizados.
+
+O snapshot é revalidado a cada uso pelos contadores DATA_VERSION e
+DATA_REWRITES (uma query): se só DATA_VERSION mudou, as despesas novas são
+acrescentadas; se DATA_REWRITES mudou (edição ou exclusão), é recarregado.
+DATA_VERSION soma uma unidade por despesa criada, então o número de despesas
+acrescentadas tem de bater com o quanto ele andou.
+"""
+
+import logging
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+
+from orcamento_2026.core.services import counters
+from orcamento_2026.core.services.utils.date_utils import month_from_key
+from orcamento_2026.core.services.utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Linhas lidas do banco por vez ao carregar o snapshot
+CHUNK_SIZE: int = 5000
+# Meses da média móvel do gráfico de evolução mensal
+ROLLING_WINDOW: int = 3
+TOP_SUBCATEGORIES: int = 10
+FIELDS: tuple[str, ...] = (
+    "id",
+    "reference_month",
+    "month_key",
+    "subcategory__category__name",
+    "subcategory__name",
+    "transaction__account__name",
+    "transaction__amount_cents",
+    "is_ignored",
+)
+CATEGORICAL: tuple[str, ...] = ("category", "subcategory", "account")
+
+
+def _decimal(cents: int) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def _build(rows: list[tuple]):
+    ids, months, keys, categories, subcategories, accounts, amounts, ignored = zip(*rows) if rows else ((),) * 8
+    frame = pd.DataFrame(
+        {
+            "id": pd.Series(ids, dtype="int64"),
+            "reference_month": pd.to_datetime(pd.Series(months, dtype="object")),
+            "month_key": pd.Series(keys, dtype="int64"),
+            "category": pd.Series(categories, dtype="category"),
+            "subcategory": pd.Series(subcategories, dtype="category"),
+            "account": pd.Series(accounts, dtype="category"),
+            # Despesas sem transação (lançamento manual) não somam valor, como no Sum do ORM
+            "amount_cents": pd.Series(amounts, dtype="Int64").fillna(0).abs().astype("int64"),
+            "is_ignored": pd.Series(ignored, dtype="bool"),
+        }
+    )
+    return frame.sort_values("reference_month", kind="stable", ignore_index=True)
+
+
+def _read_rows(**filters) -> list[tuple]:
+    from orcamento_2026.core.models import Expense
+
+    return list(Expense.objects.filter(**filters).order_by().values_list(*FIELDS).iterator(chunk_size=CHUNK_SIZE))
+
+
+def _read_versions() -> tuple[int, int]:
+    from orcamento_2026.core.models import Counter
+
+    values = dict(Counter.objects.filter(name__in=[counters.DATA_VERSION, counters.DATA_REWRITES]).values_list("name", "value"))
+    return values.get(counters.DATA_VERSION, 0), values.get(counters.DATA_REWRITES, 0)
+
+
+class Snapshot:
+    """DataFrame das despesas do processo, revalidado pela versão dos dados."""
+
+    def __init__(self) -> None:
+        self.frame = None
+        self.versions: tuple[int, int] | None = None
+        # "full", "append" ou "cached": como foi obtido o frame na última chamada de refresh()
+        self.last_refresh: str = ""
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Descarta o snapshot: o próximo refresh() recarrega tudo."""
+        with self._lock:
+            self.frame = None
+            self.versions = None
+
+    def refresh(self):
+        """
+        Retorna o DataFrame atualizado.
+
+        Returns:
+            DataFrame com id, reference_month, month_key, category, subcategory,
+            account, amount_cents e is_ignored, ordenado por reference_month
+        """
+        with self._lock:
+            versions = _read_versions()
+            if self.frame is not None and versions == self.versions:
+                self.last_refresh = "cached"
+            elif self.frame is not None and versions[1] == self.versions[1] and (appended := self._append()):
+                versions = appended
+                self.last_refresh = "append"
+            else:
+                self.frame = _build(_read_rows())
+                self.last_refresh = "full"
+                logger.debug(f"Snapshot analítico recarregado: {len(self.frame)} despesas")
+            self.versions = versions
+            return self.frame
+
+    def _append(self) -> tuple[int, int] | None:
+        """Acrescenta as despesas novas; retorna as versões que o frame passa a refletir ou None se for preciso recarregar."""
+        last_id = int(self.frame["id"].max()) if len(self.frame) else 0
+        new = _build(_read_rows(id__gt=last_id))
+        # Lidas depois das linhas: toda despesa contada já estava confirmada na leitura acima.
+        # Ids confirmados fora de ordem (transações concorrentes) ficam abaixo de last_id e a conta não bate.
+        versions = _read_versions()
+        if versions[1] != self.versions[1] or len(new) != versions[0] - self.versions[0]:
+            return None
+        frame = pd.concat([self.frame, new], ignore_index=True) if len(new) else self.frame
+        for column in CATEGORICAL:
+            # Categóricos com categorias diferentes viram object no concat
+            frame[column] = frame[column].astype("category")
+        self.frame = frame.sort_values("reference_month", kind="stable", ignore_index=True)
+        return versions
+
+
+snapshot = Snapshot()
+
+
+def _period(frame, start: date | None, end: date | None):
+    """Despesas não ignoradas com mês de referência no período (datas inclusivas)."""
+    months = frame["reference_month"]
+    lower = months.searchsorted(pd.Timestamp(start), side="left") if start else 0
+    upper = months.searchsorted(pd.Timestamp(end), side="right") if end else len(frame)
+    period = frame.iloc[lower:upper]
+    return period[~period["is_ignored"].to_numpy()]
+
+
+def _totals(period, column: str) -> "pd.Series":
+    totals = period.groupby(column, observed=True, sort=False)["amount_cents"].sum()
+    return totals.sort_values(ascending=False, kind="stable")
+
+
+def summary(frame, start: date | None, end: date | None) -> dict:
+    """
+    Quebras do dashboard no período, no mesmo formato das agregações do ORM.
+
+    Args:
+        frame: DataFrame do snapshot
+        start: Início do período (mês de referência), inclusivo
+        end: Fim do período, inclusivo
+
+    Returns:
+        total_expenses, total_amount, expenses_by_category, monthly_data,
+        top_subcategories e expenses_by_account
+    """
+    period = _period(frame, start, end)
+    monthly = period.groupby("month_key")["amount_cents"].sum()
+    return {
+        "total_expenses": len(period),
+        "total_amount": _decimal(period["amount_cents"].sum()),
+        "expenses_by_category": [
+            {"subcategory__category__name": name, "total": _decimal(cents)} for name, cents in _totals(period, "category").items()
+        ],
+        "monthly_data": [{"month": month_from_key(key), "total": _decimal(cents)} for key, cents in monthly.items()],
+        "top_subcategories": [
+            {"subcategory__name": name, "total": _decimal(cents)}
+            for name, cents in _totals(period, "subcategory").iloc[:TOP_SUBCATEGORIES].items()
+        ],
+        "expenses_by_account": [
+            {"transaction__account__name": name, "total": _decimal(cents)} for name, cents in _totals(period, "account").items()
+        ],
+    }
+
+
+def compare_periods(frame, start: date, end: date) -> dict:
+    """
+    Compara o período com o anterior de mesma duração, no total e por categoria.
+
+    Returns:
+        previous_start, previous_end, current, previous, delta, delta_pct
+        (None sem gastos no período anterior) e by_category, ordenado pela
+        maior variação absoluta
+    """
+    previous_end = start - timedelta(days=1)
+    previous_start = previous_end - (end - start)
+    by_category = (
+        pd.concat(
+            {
+                "current": _period(frame, start, end).groupby("category", observed=True)["amount_cents"].sum(),
+                "previous": _period(frame, previous_start, previous_end).groupby("category", observed=True)["amount_cents"].sum(),
+            },
+            axis=1,
+        )
+        .fillna(0)
+        .astype("int64")
+    )
+    by_category["delta"] = by_category["current"] - by_category["previous"]
+    by_category = by_category.iloc[by_category["delta"].abs().to_numpy().argsort(kind="stable")[::-1]]
+
+    current, previous = int(by_category["current"].sum()), int(by_category["previous"].sum())
+    return {
+        "previous_start": previous_start,
+        "previous_end": previous_end,
+        "current": _decimal(current),
+        "previous": _decimal(previous),
+        "delta": _decimal(current - previous),
+        "delta_pct": round((current - previous) / previous * 100, 1) if previous else None,
+        "by_category": [
+            {"category": str(name), **{key: _decimal(value) for key, value in row.items()}}
+            for name, row in by_category.to_dict("index").items()
+        ],
+    }
+
+
+def rolling_average(frame, start: date | None, end: date | None, window: int = ROLLING_WINDOW) -> list[dict]:
+    """
+    Total mensal e média móvel de `window` meses, para os meses do período.
+
+    A média considera os meses anteriores ao início do período, e meses sem
+    despesas contam como zero.
+    """
+    monthly = _period(frame, None, end).groupby("month_key")["amount_cents"].sum()
+    if monthly.empty:
+        return []
+    # Chaves AAAAMM viram índices de meses corridos (ano * 12 + mês) para preencher os meses sem despesas
+    keys = monthly.index.to_numpy()
+    monthly.index = keys // 100 * 12 + keys % 100 - 1
+    monthly = monthly.reindex(range(monthly.index.min(), monthly.index.max() + 1), fill_value=0)
+    average = monthly.rolling(window, min_periods=1).mean()
+    if start:
+        since = start.year * 12 + start.month - 1
+        monthly, average = monthly.loc[since:], average.loc[since:]
+    return [
+        {"month": date(index // 12, index % 12 + 1, 1), "total": _decimal(cents), "average": _decimal(round(mean))}
+        for index, cents, mean in zip(monthly.index, monthly, average)
+    ]
+
+
+def dashboard_data(start: date, end: date) -> dict:
+    """
+    Todos os dados do dashboard a partir do snapshot (revalidado uma vez).
+
+    Returns:
+        As chaves de summary(), mais comparison (compare_periods) e
+        rolling_average
+    """
+    frame = snapshot.refresh()
+    return {
+        **summary(frame, start, end),
+        "comparison": compare_periods(frame, start, end),
+        "rolling_average": rolling_average(frame, start, end),
+    }
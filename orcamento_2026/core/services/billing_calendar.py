@@ -0,0 +1,174 @@
+"""
+Calendário de ciclos de faturamento (mês de referência de cada dia).
+
+A tabela CalendarDay guarda, para cada dia de fechamento em uso, o mês de
+referência de cada data. A importação resolve o mês de todas as transações
+de um lote com uma busca por intervalo no índice (closing_day, day), e o
+intervalo de um ciclo (ex.: 21/09 a 20/10) sai de uma única query pelo
+índice (closing_day, reference_month, day), sem aritmética de datas no Python.
+Dias fora do calendário são preenchidos na primeira vez que são pedidos.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Iterable
+
+from django.conf import settings
+from django.db.models import Max, Min, OuterRef, Subquery
+
+from orcamento_2026.core.services.utils.date_utils import reference_month
+
+if TYPE_CHECKING:
+    from orcamento_2026.core.models import Account, Transaction
+
+logger = logging.getLogger(__name__)
+
+# Anos gerados por padrão antes e depois do ano corrente
+HISTORY_YEARS: int = 5
+HORIZON_YEARS: int = 5
+BULK_BATCH_SIZE: int = 1000
+
+
+def _default_range() -> tuple[date, date]:
+    year = date.today().year
+    return date(year - HISTORY_YEARS, 1, 1), date(year + HORIZON_YEARS, 12, 31)
+
+
+def ensure_calendar(closing_day: int, start: date | None = None, end: date | None = None) -> int:
+    """
+    Gera os dias que faltam no calendário de um dia de fechamento.
+
+    Args:
+        closing_day: Dia de fechamento (1 a 31)
+        start: Primeiro dia (padrão: 1º de janeiro, HISTORY_YEARS anos atrás)
+        end: Último dia (padrão: 31 de dezembro, HORIZON_YEARS anos à frente)
+
+    Returns:
+        Quantidade de dias criados
+    """
+    from orcamento_2026.core.models import CalendarDay
+
+    default_start, default_end = _default_range()
+    start, end = start or default_start, end or default_end
+    days = (end - start).days + 1
+    if CalendarDay.objects.filter(closing_day=closing_day, day__gte=start, day__lte=end).count() == days:
+        return 0
+
+    CalendarDay.objects.bulk_create(
+        (
+            CalendarDay(closing_day=closing_day, day=day, reference_month=reference_month(day, closing_day))
+            for day in (start + timedelta(days=offset) for offset in range(days))
+        ),
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    logger.info(f"Calendário do fechamento dia {closing_day} gerado de {start} a {end}")
+    return days
+
+
+def _year_range(first: date, last: date) -> tuple[date, date]:
+    return date(first.year, 1, 1), date(last.year, 12, 31)
+
+
+def closing_day_for(account: "Account") -> int:
+    """Dia de fechamento da conta (settings.BILLING_CLOSING_DAY se ela não tiver ciclo próprio)."""
+    from orcamento_2026.core.models import BillingCycle
+
+    closing_day = BillingCycle.objects.filter(account_id=account.pk).values_list("closing_day", flat=True).first()
+    return closing_day or settings.BILLING_CLOSING_DAY
+
+
+def reference_months(days: Iterable[date], closing_day: int) -> dict[date, date]:
+    """
+    Mês de referência de cada data, com uma busca por intervalo no calendário.
+
+    Returns:
+        Dicionário data -> mês de referência (dia 1)
+    """
+    from orcamento_2026.core.models import CalendarDay
+
+    days = set(days)
+    if not days:
+        return {}
+    first, last = min(days), max(days)
+    months = dict(CalendarDay.objects.filter(closing_day=closing_day, day__gte=first, day__lte=last).values_list("day", "reference_month"))
+    missing = days - months.keys()
+    if missing:
+        ensure_calendar(closing_day, *_year_range(min(missing), max(missing)))
+        months.update({day: reference_month(day, closing_day) for day in missing})
+    return {day: months[day] for day in days}
+
+
+def assign_reference_dates(transactions: list["Transaction"], closing_day: int) -> None:
+    """Preenche reference_date das transações que não têm, pelo ciclo de faturamento (uma query)."""
+    pending = [tx for tx in transactions if tx.reference_date is None]
+    months = reference_months((tx.date for tx in pending), closing_day)
+    for tx in pending:
+        tx.reference_date = months[tx.date]
+
+
+def _cycle_bounds(day: date, closing_day: int) -> dict:
+    from orcamento_2026.core.models import CalendarDay
+
+    month = CalendarDay.objects.filter(closing_day=closing_day, day=day).values("reference_month")
+    return CalendarDay.objects.filter(closing_day=closing_day, reference_month=Subquery(month)).aggregate(start=Min("day"), end=Max("day"))
+
+
+def cycle_range(day: date, closing_day: int | None = None, cycles: int = 1) -> tuple[date, date]:
+    """
+    Primeiro e último dia do ciclo de faturamento que contém `day`.
+
+    Uma query por ciclo: o mês de referência do dia (subquery) e os limites
+    dos dias desse mês de referência, ambos pelos índices do calendário.
+
+    Args:
+        day: Dia contido no primeiro ciclo
+        closing_day: Dia de fechamento (padrão: settings.BILLING_CLOSING_DAY)
+        cycles: Quantidade de ciclos consecutivos no intervalo
+
+    Returns:
+        Início do primeiro ciclo e fim do último
+    """
+    closing_day = closing_day or settings.BILLING_CLOSING_DAY
+    start = end = None
+    for _ in range(cycles):
+        bounds = _cycle_bounds(day, closing_day)
+        if bounds["start"] is None:
+            # Fora do calendário: gera o ano do dia e os vizinhos (o ciclo pode cruzar a virada do ano)
+            ensure_calendar(closing_day, date(day.year - 1, 1, 1), date(day.year + 1, 12, 31))
+            bounds = _cycle_bounds(day, closing_day)
+        start = start or bounds["start"]
+        end = bounds["end"]
+        day = end + timedelta(days=1)
+    return start, end
+
+
+def reassign_reference_dates() -> int:
+    """
+    Recalcula reference_date de todas as transações pelo ciclo de cada conta.
+
+    Um UPDATE por dia de fechamento, com o mês de referência vindo do
+    calendário (subquery pelo índice). Sobrescreve datas informadas à mão na
+    importação; o mês de referência das despesas já consolidadas não muda.
+
+    Returns:
+        Quantidade de transações atualizadas
+    """
+    from orcamento_2026.core.models import Account, BillingCycle, CalendarDay, Transaction
+
+    bounds = Transaction.objects.aggregate(first=Min("date"), last=Max("date"))
+    if bounds["first"] is None:
+        return 0
+
+    cycles = dict(BillingCycle.objects.values_list("account_id", "closing_day"))
+    accounts_by_closing_day: dict[int, list[int]] = defaultdict(list)
+    for account_id in Account.objects.values_list("id", flat=True):
+        accounts_by_closing_day[cycles.get(account_id, settings.BILLING_CLOSING_DAY)].append(account_id)
+
+    updated = 0
+    for closing_day, account_ids in accounts_by_closing_day.items():
+        ensure_calendar(closing_day, *_year_range(bounds["first"], bounds["last"]))
+        month = CalendarDay.objects.filter(closing_day=closing_day, day=OuterRef("date")).values("reference_month")[:1]
+        updated += Transaction.objects.filter(account_id__in=account_ids).update(reference_date=Subquery(month))
+    return updated
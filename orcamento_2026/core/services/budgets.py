@@ -0,0 +1,157 @@
+"""
+Orçamentos por subcategoria: realizado incremental e variação (orçado x realizado).
+
+O realizado de cada Budget é mantido por `record`: cada despesa criada,
+editada ou excluída soma (ou subtrai) o seu valor com um único UPDATE no
+orçamento da sua subcategoria e mês, sem somar as despesas de novo.
+`rebuild` recalcula tudo a partir das despesas (comando `recalcular_orcamentos`).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, NamedTuple
+
+from django.db import transaction as db_transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Abs
+
+from orcamento_2026.core.services.utils.date_utils import month_from_key, month_key
+
+logger = logging.getLogger(__name__)
+
+CENTS: Decimal = Decimal("0.01")
+ZERO: Decimal = Decimal("0.00")
+
+# (subcategoria, mês de referência) de uma despesa e o valor que ela soma ao realizado
+Contribution = tuple[int, date, Decimal]
+
+
+class BudgetStatus(NamedTuple):
+    """Orçado x realizado de uma subcategoria no período."""
+
+    category: str
+    subcategory: str
+    limit: Decimal
+    actual: Decimal
+
+    @property
+    def remaining(self) -> Decimal:
+        return self.limit - self.actual
+
+    @property
+    def usage(self) -> float:
+        """Percentual do orçamento já gasto."""
+        return round(float(self.actual / self.limit) * 100, 1) if self.limit else 0.0
+
+    @property
+    def is_overspent(self) -> bool:
+        return self.actual > self.limit
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def compute_actual(subcategory_id: int, month: date) -> Decimal:
+    """Soma as despesas (não ignoradas) da subcategoria no mês de referência (soma inteira de centavos)."""
+    from orcamento_2026.core.models import Expense
+
+    # O ano é redundante com month_key, mas é a coluna da partição: no PostgreSQL particionado só a partição do ano é lida
+    total = Expense.objects.filter(
+        subcategory_id=subcategory_id, month_key=month_key(month), reference_month__year=month.year, is_ignored=False
+    ).aggregate(total=Sum(Abs("transaction__amount_cents")))["total"]
+    return Decimal(total or 0).scaleb(-2)
+
+
+def contribution(subcategory_id: int, reference_month: date, amount: Decimal | None, is_ignored: bool) -> Contribution | None:
+    """Quanto uma despesa soma ao realizado, ou None se não soma nada (ignorada ou sem valor)."""
+    if is_ignored or amount is None:
+        return None
+    return subcategory_id, month_start(reference_month), abs(amount)
+
+
+def record(subcategory_id: int, month: date, delta: Decimal) -> None:
+    """Soma `delta` ao realizado do orçamento (um UPDATE; sem orçamento no mês, não faz nada)."""
+    from orcamento_2026.core.models import Budget
+
+    if delta:
+        Budget.objects.filter(subcategory_id=subcategory_id, month=month_start(month)).update(actual=F("actual") + delta)
+
+
+def record_change(previous: Contribution | None, current: Contribution | None) -> None:
+    """Troca a contribuição anterior de uma despesa pela atual (no máximo dois UPDATEs)."""
+    if previous == current:
+        return
+    if previous and current and previous[:2] == current[:2]:
+        record(current[0], current[1], current[2] - previous[2])
+        return
+    if previous:
+        record(previous[0], previous[1], -previous[2])
+    if current:
+        record(*current)
+
+
+def record_many(contributions: Iterable[Contribution | None]) -> None:
+    """Soma as contribuições de um lote de despesas novas, com um UPDATE por subcategoria e mês."""
+    totals: dict[tuple[int, date], Decimal] = defaultdict(Decimal)
+    for item in filter(None, contributions):
+        subcategory_id, month, amount = item
+        totals[subcategory_id, month] += amount
+    for (subcategory_id, month), amount in totals.items():
+        record(subcategory_id, month, amount)
+
+
+def rebuild() -> tuple[int, int]:
+    """
+    Recalcula o realizado de todos os orçamentos a partir das despesas.
+
+    Returns:
+        Quantidade de orçamentos e quantos estavam divergentes
+    """
+    from orcamento_2026.core.models import Budget, Expense
+
+    with db_transaction.atomic():
+        budgets = list(Budget.objects.select_for_update().only("id", "subcategory_id", "month", "actual"))
+        totals = (
+            Expense.objects.filter(is_ignored=False, subcategory_id__in={budget.subcategory_id for budget in budgets})
+            .values_list("subcategory_id", "month_key")
+            .annotate(total=Sum(Abs("transaction__amount_cents")))
+            .order_by()
+        )
+        actuals = {(subcategory_id, month_from_key(key)): Decimal(total or 0).scaleb(-2) for subcategory_id, key, total in totals}
+
+        changed = []
+        for budget in budgets:
+            actual = actuals.get((budget.subcategory_id, budget.month), ZERO)
+            if budget.actual != actual:
+                logger.warning(f"Realizado divergente no orçamento {budget.id}: {budget.actual} -> {actual}")
+                budget.actual = actual
+                changed.append(budget)
+        Budget.objects.bulk_update(changed, ["actual"], batch_size=500)
+    return len(budgets), len(changed)
+
+
+def variance(start: date, end: date) -> list[BudgetStatus]:
+    """
+    Orçado x realizado por subcategoria nos meses de referência do período (uma query).
+
+    Usa o mesmo critério do dashboard: entram os meses cujo dia 1 está no período.
+
+    Returns:
+        Subcategorias com orçamento no período, da maior para a menor utilização
+    """
+    from orcamento_2026.core.models import Budget
+
+    rows = (
+        Budget.objects.filter(month__gte=start, month__lte=end)
+        .values_list("subcategory__category__name", "subcategory__name")
+        .annotate(total_limit=Sum("limit"), total_actual=Sum("actual"))
+        .order_by()
+    )
+    statuses = [
+        BudgetStatus(category, subcategory, Decimal(limit).quantize(CENTS), Decimal(actual).quantize(CENTS))
+        for category, subcategory, limit, actual in rows
+    ]
+    return sorted(statuses, key=lambda status: status.usage, reverse=True)
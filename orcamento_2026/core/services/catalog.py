@@ -0,0 +1,95 @@
+"""Catálogo em memória de categorias e subcategorias para lookups em lote."""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Iterator
+
+from orcamento_2026.core.services.utils.text_utils import normalize_key
+
+if TYPE_CHECKING:
+    from orcamento_2026.core.models import Category, SubCategory
+
+logger = logging.getLogger(__name__)
+
+# Sentinela para "o catálogo não sabe responder esta consulta"
+MISSING: Any = object()
+
+
+class Catalog:
+    """Índices por name_key de todas as categorias e subcategorias."""
+
+    def __init__(self, categories: list["Category"], subcategories: list["SubCategory"]) -> None:
+        self.categories: dict[str, "Category"] = {c.name_key: c for c in categories}
+        by_id = {c.id: c for c in categories}
+        self.subcategories: dict[tuple[int, str], "SubCategory"] = {}
+        for sub in subcategories:
+            # Reaproveita a instância da categoria para evitar queries em sub.category
+            sub.category = by_id[sub.category_id]
+            self.subcategories[(sub.category_id, sub.name_key)] = sub
+
+    @classmethod
+    def load(cls) -> "Catalog":
+        from orcamento_2026.core.models import Category, SubCategory
+
+        return cls(list(Category.objects.all()), list(SubCategory.objects.all()))
+
+    def get_category(self, name: str | None) -> "Category | None":
+        return self.categories.get(normalize_key(name))
+
+    def get_subcategory(self, category: "Category | int | None", name: str | None) -> "SubCategory | None":
+        if category is None:
+            return None
+        category_id = category if isinstance(category, int) else category.id
+        return self.subcategories.get((category_id, normalize_key(name)))
+
+    def lookup(self, queryset, field_name: str, value: str | None, filters: dict) -> Any:
+        """
+        Responde um case_insensitive_get a partir da memória, quando possível.
+
+        Só atende querysets sem filtros prévios sobre o campo `name` de
+        Category (sem filtros extras) ou SubCategory (filtrado apenas por categoria).
+
+        Returns:
+            O objeto encontrado, None, ou MISSING se a consulta precisa ir ao banco
+        """
+        if field_name != "name" or queryset.query.where:
+            return MISSING
+
+        label = queryset.model._meta.label
+        if label == "core.Category" and not filters:
+            return self.get_category(value)
+        if label == "core.SubCategory" and len(filters) == 1:
+            (key, category), *_ = filters.items()
+            if key in ("category", "category_id"):
+                return self.get_subcategory(category, value)
+        return MISSING
+
+
+_current: ContextVar[Catalog | None] = ContextVar("catalog", default=None)
+
+
+def current_catalog() -> Catalog | None:
+    """Retorna o catálogo aquecido no contexto atual, se houver."""
+    return _current.get()
+
+
+@contextmanager
+def warm_catalog() -> Iterator[Catalog]:
+    """
+    Carrega o catálogo (2 queries) e o mantém ativo dentro do bloco.
+
+    Enquanto ativo, case_insensitive_get resolve categorias e subcategorias
+    sem ir ao banco. O catálogo é descartado ao sair do bloco, então nunca
+    fica desatualizado entre requisições ou comandos.
+    """
+    catalog = _current.get()
+    if catalog is not None:
+        yield catalog
+        return
+
+    token = _current.set(Catalog.load())
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
@@ -2,20 +2,57 @@
 
 import logging
 from datetime import date
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, NamedTuple
 
 from decouple import config
+from django.db import transaction as db_transaction
 
+from orcamento_2026.core.services import budgets, counters
+from orcamento_2026.core.services.catalog import warm_catalog
+from orcamento_2026.core.services.utils.date_utils import month_key
 from orcamento_2026.core.services.utils.db_utils import case_insensitive_get
+from orcamento_2026.core.services.utils.query_budget import query_budget
 
 if TYPE_CHECKING:
-    from orcamento_2026.core.models import Expense, Transaction
+    from orcamento_2026.core.models import Expense, SubCategory, Transaction
 
 logger = logging.getLogger(__name__)
 
 OLLAMA_URL: str = config("OLLAMA_URL", default="http://localhost:11434")
 OLLAMA_MODEL: str = config("OLLAMA_MODEL", default="qwen2.5:1.5b")
 
+# Tamanho dos lotes de INSERT/UPDATE (mantém o número de parâmetros abaixo do limite do SQLite)
+BULK_BATCH_SIZE: int = 500
+
+
+class ConsolidationItem(NamedTuple):
+    """
+    Uma transação a consolidar.
+
+    `subcategory` pode ser a instância de SubCategory ou o par
+    (nome da categoria, nome da subcategoria), resolvido sem diferenciar caixa/acentos.
+    """
+
+    transaction: "Transaction"
+    subcategory: "SubCategory | tuple[str, str]"
+    description: str
+    reference_month: date
+    is_ignored: bool = False
+
+
+class ConsolidationFailure(NamedTuple):
+    """Item que não pôde ser consolidado e o motivo."""
+
+    item: ConsolidationItem
+    error: str
+
+
+class ConsolidationResult(NamedTuple):
+    """Despesas criadas e falhas de uma consolidação em lote."""
+
+    expenses: list["Expense"]
+    failures: list[ConsolidationFailure]
+
 
 def get_unconsolidated_transactions() -> Transaction.QuerySet:
     """Retorna transações que ainda não possuem despesa associada."""
@@ -24,6 +61,8 @@ def get_unconsolidated_transactions() -> Transaction.QuerySet:
     return Transaction.objects.filter(expense__isnull=True).order_by("date")
 
 
+# Inclui os UPDATEs do realizado do orçamento e dos contadores (um só, via counters.deferred), disparados pelos sinais
+@query_budget(7)
 def consolidate_transaction(
     transaction: "Transaction",
     category_name: str,
@@ -47,37 +86,135 @@ def consolidate_transaction(
     Raises:
         ValueError: Se categoria ou subcategoria não forem encontradas
     """
-    from orcamento_2026.core.models import Category, Expense, SubCategory
+    from orcamento_2026.core.models import Expense
+
+    try:
+        subcategory = _resolve_subcategory((category_name, subcategory_name))
+    except ValueError as e:
+        logger.error(str(e))
+        raise
+
+    # Os sinais da despesa e da sugestão ajustam três contadores: gravados juntos, numa query
+    with counters.deferred():
+        expense = Expense.objects.create(
+            transaction=transaction,
+            description=description,
+            subcategory=subcategory,
+            reference_month=reference_month,
+            is_ignored=False,
+        )
+
+        # Atualiza status da sugestão se existir
+        if hasattr(transaction, "suggestion"):
+            transaction.suggestion.status = "ACEITO"
+            transaction.suggestion.save()
+            logger.info(f"Sugestão aceita para transação {transaction.id}")
+
+    logger.info(f"Transação {transaction.id} consolidada como despesa {expense.id}")
+    return expense
+
+
+def _resolve_subcategory(subcategory: "SubCategory | tuple[str, str]") -> "SubCategory":
+    """Resolve o par (categoria, subcategoria) pelo catálogo aquecido; levanta ValueError se não existir."""
+    from orcamento_2026.core.models import Category, SubCategory
 
+    if isinstance(subcategory, SubCategory):
+        return subcategory
+
+    category_name, subcategory_name = subcategory
     category = case_insensitive_get(Category.objects.all(), "name", category_name)
     if not category:
-        error_msg = f"Categoria '{category_name}' não encontrada"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-
-    subcategory = case_insensitive_get(
-        SubCategory.objects.filter(category=category),
-        "name",
-        subcategory_name,
-    )
-    if not subcategory:
-        error_msg = f"Subcategoria '{subcategory_name}' não encontrada na categoria '{category_name}'"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-
-    expense = Expense.objects.create(
-        transaction=transaction,
-        description=description,
-        subcategory=subcategory,
-        reference_month=reference_month,
-        is_ignored=False,
-    )
+        raise ValueError(f"Categoria '{category_name}' não encontrada")
 
-    # Atualiza status da sugestão se existir
-    if hasattr(transaction, "suggestion"):
-        transaction.suggestion.status = "ACEITO"
-        transaction.suggestion.save()
-        logger.info(f"Sugestão aceita para transação {transaction.id}")
+    resolved = case_insensitive_get(SubCategory.objects.all(), "name", subcategory_name, category=category)
+    if not resolved:
+        raise ValueError(f"Subcategoria '{subcategory_name}' não encontrada na categoria '{category_name}'")
+    return resolved
 
-    logger.info(f"Transação {transaction.id} consolidada como despesa {expense.id}")
-    return expense
+
+def consolidate_transactions(items: Iterable[ConsolidationItem | tuple]) -> ConsolidationResult:
+    """
+    Consolida várias transações de uma vez, com número constante de queries.
+
+    Os nomes são resolvidos em memória (catálogo aquecido), as despesas são
+    criadas com bulk_create e as sugestões marcadas como aceitas com bulk_update.
+    Itens inválidos (nomes inexistentes, transação já consolidada ou repetida
+    no lote) são reportados em `failures` sem abortar os demais.
+
+    Args:
+        items: Itens (transação, subcategoria, descrição, mês de referência e, opcionalmente, se é ignorada)
+
+    Returns:
+        Despesas criadas e falhas por item
+    """
+    from orcamento_2026.core.models import Expense, TransactionSuggestion
+
+    items = [ConsolidationItem(*item) for item in items]
+    failures: list[ConsolidationFailure] = []
+
+    already_consolidated = set(
+        Expense.objects.filter(transaction_id__in=[item.transaction.id for item in items]).values_list("transaction_id", flat=True)
+    )
+
+    pending: list[tuple[ConsolidationItem, "SubCategory"]] = []
+    seen: set[int] = set()
+    with warm_catalog():
+        for item in items:
+            transaction_id = item.transaction.id
+            if transaction_id in already_consolidated:
+                failures.append(ConsolidationFailure(item, f"Transação {transaction_id} já consolidada"))
+                continue
+            if transaction_id in seen:
+                failures.append(ConsolidationFailure(item, f"Transação {transaction_id} repetida no lote"))
+                continue
+            try:
+                subcategory = _resolve_subcategory(item.subcategory)
+            except ValueError as e:
+                failures.append(ConsolidationFailure(item, str(e)))
+                continue
+            seen.add(transaction_id)
+            pending.append((item, subcategory))
+
+    for failure in failures:
+        logger.error(f"Falha ao consolidar transação {failure.item.transaction.id}: {failure.error}")
+
+    if not pending:
+        return ConsolidationResult(expenses=[], failures=failures)
+
+    expenses = [
+        Expense(
+            transaction=item.transaction,
+            description=item.description,
+            subcategory=subcategory,
+            reference_month=item.reference_month,
+            # bulk_create não chama save(), que preenche a chave do mês
+            month_key=month_key(item.reference_month),
+            is_ignored=item.is_ignored,
+        )
+        for item, subcategory in pending
+    ]
+
+    with db_transaction.atomic():
+        Expense.objects.bulk_create(expenses, batch_size=BULK_BATCH_SIZE)
+
+        suggestions = list(TransactionSuggestion.objects.filter(transaction_id__in=seen).exclude(status="ACEITO").only("id", "status"))
+        accepted_pending = sum(1 for suggestion in suggestions if suggestion.status == "PENDENTE")
+        for suggestion in suggestions:
+            suggestion.status = "ACEITO"
+        TransactionSuggestion.objects.bulk_update(suggestions, ["status"], batch_size=BULK_BATCH_SIZE)
+
+        # bulk_create/bulk_update não disparam sinais: os contadores são ajustados aqui
+        counters.adjust(counters.UNCONSOLIDATED_TRANSACTIONS, -len(expenses))
+        counters.adjust(counters.PENDING_SUGGESTIONS, -accepted_pending)
+        counters.adjust(counters.DATA_VERSION, len(expenses))
+        budgets.record_many(
+            budgets.contribution(expense.subcategory_id, expense.reference_month, expense.transaction.amount, expense.is_ignored)
+            for expense in expenses
+        )
+
+    # Sugestões em cache nas transações do chamador estão desatualizadas
+    for item, _ in pending:
+        item.transaction._state.fields_cache.pop("suggestion", None)
+
+    logger.info(f"{len(expenses)} transações consolidadas em lote ({len(failures)} falhas)")
+    return ConsolidationResult(expenses=expenses, failures=failures)
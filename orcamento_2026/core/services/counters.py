@@ -0,0 +1,175 @@
+"""Serviço de contadores desnormalizados (sugestões pendentes, transações não consolidadas)."""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.db import transaction as db_transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PENDING_SUGGESTIONS: str = "pending_suggestions"
+UNCONSOLIDATED_TRANSACTIONS: str = "unconsolidated_transactions"
+# Versões dos dados de despesas: só crescem e não têm fonte para reconciliar (ver bump)
+DATA_VERSION: str = "data_version"
+DATA_REWRITES: str = "data_rewrites"
+# Versão das subcategorias (services.subcategory_options), compartilhada entre os workers
+CATALOG_VERSION: str = "catalog_version"
+
+
+def _count_pending_suggestions() -> int:
+    from orcamento_2026.core.models import TransactionSuggestion
+
+    return TransactionSuggestion.objects.filter(status="PENDENTE").count()
+
+
+def _count_unconsolidated_transactions() -> int:
+    from orcamento_2026.core.models import Transaction
+
+    return Transaction.objects.filter(expense__isnull=True).count()
+
+
+# Nome do contador -> função que recalcula o valor a partir dos dados de origem
+COUNTER_SOURCES: dict[str, Callable[[], int]] = {
+    PENDING_SUGGESTIONS: _count_pending_suggestions,
+    UNCONSOLIDATED_TRANSACTIONS: _count_unconsolidated_transactions,
+}
+
+# Deltas acumulados pelo bloco deferred() em andamento (None = ajustes gravados na hora)
+_pending: ContextVar[dict[str, int] | None] = ContextVar("counters_pending", default=None)
+
+
+def get_counter(name: str) -> int:
+    """
+    Lê o valor de um contador (uma query por chave primária).
+
+    Se o contador ainda não existir, é criado via reconciliação.
+    """
+    from orcamento_2026.core.models import Counter
+
+    value = Counter.objects.filter(name=name).values_list("value", flat=True).first()
+    if value is None:
+        return reconcile([name])[name][1]
+    return value
+
+
+async def aget_counter(name: str) -> int:
+    """Versão assíncrona de get_counter, para views assíncronas."""
+    from orcamento_2026.core.models import Counter
+
+    value = await Counter.objects.filter(name=name).values_list("value", flat=True).afirst()
+    if value is None:
+        return (await sync_to_async(reconcile)([name]))[name][1]
+    return value
+
+
+def adjust(name: str, delta: int) -> None:
+    """
+    Soma `delta` ao contador de forma atômica no banco (UPDATE ... SET value = value + delta).
+
+    Deve ser chamado por toda operação em lote que não dispara sinais
+    (bulk_create, bulk_update, QuerySet.update) e altera os dados de origem.
+    Dentro de deferred(), o delta só é gravado ao fim do bloco.
+    """
+    pending = _pending.get()
+    if pending is not None:
+        pending[name] = pending.get(name, 0) + delta
+        return
+    _apply({name: delta})
+
+
+def _apply(deltas: dict[str, int]) -> None:
+    """Grava os deltas numa única query (UPDATE ... SET value = value + CASE name ...)."""
+    from orcamento_2026.core.models import Counter
+
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    increment = Case(*(When(name=name, then=Value(delta)) for name, delta in deltas.items()), output_field=IntegerField())
+    if Counter.objects.filter(name__in=deltas).update(value=F("value") + increment) == len(deltas):
+        return
+    existing = set(Counter.objects.filter(name__in=deltas).values_list("name", flat=True))
+    missing = [name for name in deltas if name not in existing]
+    # Contadores com fonte: o recálculo já inclui a alteração atual; versões começam do delta
+    reconcile([name for name in missing if name in COUNTER_SOURCES])
+    for name in missing:
+        if name not in COUNTER_SOURCES:
+            Counter.objects.get_or_create(name=name, defaults={"value": deltas[name]})
+
+
+@contextmanager
+def deferred() -> Iterator[None]:
+    """
+    Acumula os ajustes de adjust() e bump() do bloco e os grava ao sair, numa única query.
+
+    Salvar ou excluir linhas uma a uma (exclusões em cascata, consolidação com
+    sugestão) faz um UPDATE na linha do contador por linha, e a linha fica
+    bloqueada até o commit: importações e consolidações concorrentes esperam
+    umas pelas outras. Com os deltas somados em memória, a linha só é tocada
+    no fim do bloco. Se o bloco falha dentro de uma transação, nada é gravado,
+    como os dados desfeitos; fora de transação, o que já foi salvo é contado.
+    Blocos aninhados acumulam no mais externo.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    pending: dict[str, int] = {}
+    token = _pending.set(pending)
+    try:
+        yield
+    except BaseException:
+        _pending.reset(token)
+        if not db_transaction.get_connection().in_atomic_block:
+            _apply(pending)
+        raise
+    _pending.reset(token)
+    _apply(pending)
+
+
+def bump(*names: str) -> None:
+    """
+    Incrementa contadores de versão numa única query, criando os que ainda não existem.
+
+    Contadores de versão (DATA_VERSION, DATA_REWRITES, CATALOG_VERSION) só indicam que algo mudou:
+    não entram em COUNTER_SOURCES e nunca são reconciliados.
+    """
+    pending = _pending.get()
+    if pending is not None:
+        for name in names:
+            pending[name] = pending.get(name, 0) + 1
+        return
+    _apply(dict.fromkeys(names, 1))
+
+
+def reconcile(names: list[str] | None = None) -> dict[str, tuple[int | None, int]]:
+    """
+    Recalcula os contadores a partir dos dados de origem e grava o resultado.
+
+    Args:
+        names: Contadores a reconciliar (padrão: todos)
+
+    Returns:
+        Dicionário nome -> (valor anterior, valor recalculado)
+    """
+    from orcamento_2026.core.models import Counter
+
+    results = {}
+    pending = _pending.get()
+    for name in names or list(COUNTER_SOURCES):
+        if pending is not None:
+            # O recálculo já inclui os ajustes acumulados até aqui
+            pending.pop(name, None)
+        with db_transaction.atomic():
+            counter = Counter.objects.select_for_update().filter(name=name).first()
+            previous = counter.value if counter else None
+            value = COUNTER_SOURCES[name]()
+            Counter.objects.update_or_create(name=name, defaults={"value": value, "reconciled_at": timezone.now()})
+
+        if previous is not None and previous != value:
+            logger.warning(f"Contador '{name}' divergente: {previous} -> {value}")
+        results[name] = (previous, value)
+    return results
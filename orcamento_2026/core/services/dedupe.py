@@ -0,0 +1,184 @@
+"""
+Deduplicação de transações por conteúdo.
+
+Alguns bancos geram FITIDs novos para os mesmos lançamentos quando o extrato
+é exportado de novo, e o FITID deixa de identificar a linha. A chave
+secundária é um hash de (conta, data, valor, memo normalizado) gravado numa
+coluna indexada: a importação consulta as chaves do lote de uma vez, então o
+custo depende do tamanho do lote e não do histórico.
+
+Lançamentos legítimos repetidos (dois cafés iguais no mesmo dia) têm a mesma
+chave, então a comparação é por contagem: uma linha do arquivo só é
+duplicata se ainda sobrar, no banco, uma transação com a mesma chave que não
+corresponda a outra linha do arquivo. O memo é normalizado com normalize_key
+(caixa, acentos e espaços), preservando os números: códigos de autorização
+diferentes continuam separando compras iguais no mesmo dia.
+
+Cada importação grava o seu `Transaction.import_id`. Linhas da mesma
+importação nunca são duplicatas umas das outras (nem entre lotes do mesmo
+arquivo, nem na varredura do histórico): um grupo com a mesma chave mantém
+tantas transações quanto a importação que trouxe mais repetições. As
+transações sem importação registrada (anteriores à coluna ou criadas à mão)
+contam como uma mesma importação e não são fundidas entre si.
+"""
+
+import hashlib
+import logging
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, Iterator, NamedTuple
+
+from django.conf import settings
+from django.db import transaction as db_transaction
+from django.db.models import Count, Q
+
+from orcamento_2026.core.services import counters
+from orcamento_2026.core.services.utils.text_utils import normalize_key
+
+if TYPE_CHECKING:
+    from orcamento_2026.core.models import Account, Transaction
+
+logger = logging.getLogger(__name__)
+
+# Chaves duplicadas lidas por query na varredura do histórico
+SCAN_CHUNK_SIZE: int = 1000
+
+
+def dedupe_key(account_id: int, day: date, amount: Decimal, memo: str | None) -> str:
+    """Hash (SHA-1, hexadecimal) de conta, data, valor em centavos e memo normalizado."""
+    content = f"{account_id}|{day:%Y-%m-%d}|{int(amount * 100)}|{normalize_key(memo)}"
+    return hashlib.sha1(content.encode(), usedforsecurity=False).hexdigest()
+
+
+def annotate(transaction: "Transaction") -> str:
+    """Preenche e retorna o dedupe_key da transação."""
+    transaction.dedupe_key = dedupe_key(transaction.account_id, transaction.date, transaction.amount, transaction.memo)
+    return transaction.dedupe_key
+
+
+def _shifted_keys(transaction: "Transaction", tolerance_days: int) -> list[str]:
+    """Chave da data da transação seguida das chaves das datas vizinhas (±1, ±2, ...)."""
+    keys = [transaction.dedupe_key]
+    for offset in range(1, tolerance_days + 1):
+        for day in (transaction.date - timedelta(days=offset), transaction.date + timedelta(days=offset)):
+            keys.append(dedupe_key(transaction.account_id, day, transaction.amount, transaction.memo))
+    return keys
+
+
+class BatchDedupe(NamedTuple):
+    """Linhas de um lote que são novas e quantas eram duplicatas por conteúdo."""
+
+    new: list["Transaction"]
+    duplicates: int
+
+
+def filter_batch(account: "Account", transactions: list["Transaction"], tolerance_days: int | None = None) -> BatchDedupe:
+    """
+    Separa as transações novas do lote: FITID inédito na conta e nenhuma transação com o mesmo conteúdo (uma query).
+
+    As transações devem ter o dedupe_key preenchido (annotate). Linhas cujo
+    FITID já existe consomem a transação correspondente do banco, para não
+    marcar como duplicata uma repetição legítima no mesmo arquivo.
+
+    Args:
+        account: Conta do extrato
+        transactions: Lote do arquivo, sem FITIDs repetidos
+        tolerance_days: Diferença de datas aceita entre duplicatas (padrão: settings.DEDUPE_TOLERANCE_DAYS)
+
+    Returns:
+        Transações novas e quantidade de duplicatas por conteúdo descartadas
+    """
+    from orcamento_2026.core.models import Transaction
+
+    tolerance_days = settings.DEDUPE_TOLERANCE_DAYS if tolerance_days is None else tolerance_days
+    candidate_keys = {tx.fitid: _shifted_keys(tx, tolerance_days) for tx in transactions}
+    import_ids = {tx.import_id for tx in transactions} - {None}
+    rows = list(
+        Transaction.objects.filter(
+            Q(account=account, fitid__in=list(candidate_keys)) | Q(dedupe_key__in={key for keys in candidate_keys.values() for key in keys})
+        ).values_list("fitid", "dedupe_key", "import_id")
+    )
+
+    existing_fitids: set[str] = set()
+    available: Counter[str] = Counter()
+    for fitid, key, import_id in rows:
+        # Lotes anteriores do mesmo arquivo são repetições legítimas, não importações anteriores
+        if import_id not in import_ids:
+            available[key] += 1
+        if fitid in candidate_keys:
+            existing_fitids.add(fitid)
+    # Linhas com FITID conhecido correspondem à própria transação do banco
+    for fitid, key, import_id in rows:
+        if fitid in candidate_keys and import_id not in import_ids:
+            available[key] -= 1
+
+    new: list[Transaction] = []
+    duplicates = 0
+    for tx in transactions:
+        if tx.fitid in existing_fitids:
+            continue
+        match = next((key for key in candidate_keys[tx.fitid] if available[key] > 0), None)
+        if match is None:
+            new.append(tx)
+            continue
+        available[match] -= 1
+        duplicates += 1
+        logger.info(f"Transação {tx.fitid} ignorada: mesmo conteúdo de uma transação já importada com outro FITID")
+    return BatchDedupe(new, duplicates)
+
+
+def duplicate_groups(chunk_size: int = SCAN_CHUNK_SIZE) -> Iterator[list["Transaction"]]:
+    """
+    Percorre o histórico e gera os grupos de transações com o mesmo dedupe_key, em ordem de id.
+
+    As chaves repetidas vêm de um GROUP BY sobre a coluna indexada; as
+    transações são carregadas em blocos de `chunk_size` chaves.
+    """
+    from orcamento_2026.core.models import Transaction
+
+    keys = list(
+        Transaction.objects.filter(dedupe_key__isnull=False)
+        .values("dedupe_key")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .order_by("dedupe_key")
+        .values_list("dedupe_key", flat=True)
+    )
+    for start in range(0, len(keys), chunk_size):
+        end = start + chunk_size
+        groups: dict[str, list[Transaction]] = defaultdict(list)
+        chunk = Transaction.objects.filter(dedupe_key__in=keys[start:end]).select_related("expense").order_by("id")
+        for tx in chunk:
+            groups[tx.dedupe_key].append(tx)
+        yield from groups.values()
+
+
+def removable(group: list["Transaction"]) -> list["Transaction"]:
+    """
+    Transações do grupo que excedem as repetições vistas numa mesma importação.
+
+    Fica a quantidade de transações da importação com mais linhas no grupo,
+    preferindo as consolidadas e depois as mais antigas; as que também têm
+    despesa nunca são excluídas, para não perder classificações.
+    """
+    keep = max(Counter(tx.import_id for tx in group).values())
+    ordered = sorted(group, key=lambda tx: not hasattr(tx, "expense"))
+    return [tx for tx in ordered[keep:] if not hasattr(tx, "expense")]
+
+
+def merge(group: list["Transaction"]) -> list["Transaction"]:
+    """
+    Exclui as transações do grupo que são duplicatas entre importações (removable).
+
+    Returns:
+        Transações excluídas
+    """
+    from orcamento_2026.core.models import Transaction
+
+    removed = removable(group)
+    if removed:
+        # Cada transação excluída ajusta o contador pelo sinal: uma só query no fim
+        with db_transaction.atomic(), counters.deferred():
+            Transaction.objects.filter(id__in=[tx.id for tx in removed]).delete()
+    return removed
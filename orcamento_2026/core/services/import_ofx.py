@@ -1,50 +1,177 @@
 """Serviço de importação de arquivos OFX."""
 
 import logging
+import math
+import uuid
 from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from ofxparse import OfxParser
+from orcamento_2026.core.services import billing_calendar, counters, dedupe, installments, merchants, recurring, transfers
+from orcamento_2026.core.services.utils.lazy_import import lazy_import
+from orcamento_2026.core.services.utils.profiling import phase
+from orcamento_2026.core.services.utils.query_budget import query_budget
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
 
 if TYPE_CHECKING:
-    from orcamento_2026.core.models import Account
+    from orcamento_2026.core.models import Account, Transaction
 
 logger = logging.getLogger(__name__)
 
+# ofxparse (e o BeautifulSoup que ele importa) só é carregado na primeira importação
+ofxparse = lazy_import("ofxparse")
+
+
+# Transações por lote: cada lote custa uma consulta de FITIDs e chaves de conteúdo existentes e os INSERTs
+IMPORT_BATCH_SIZE: int = 500
+# Transações por INSERT: até 19 colunas cabem no limite de 999 parâmetros por query do SQLite, então um lote custa
+# o mesmo número de INSERTs em qualquer banco
+TRANSACTION_INSERT_SIZE: int = 50
+
+# Queries de um lote cheio: dedupe, índice de estabelecimentos, compras conhecidas das parcelas, calendário de
+# faturamento, contador e os INSERTs das transações. Depende só de IMPORT_BATCH_SIZE, não do conteúdo do arquivo
+BATCH_QUERY_BUDGET: int = 4 + merchants.max_assign_queries(IMPORT_BATCH_SIZE) + math.ceil(IMPORT_BATCH_SIZE / TRANSACTION_INSERT_SIZE)
+
+
+@query_budget(BATCH_QUERY_BUDGET)
+def _import_batch(account: "Account", transactions: list["Transaction"], closing_day: int | None = None) -> dedupe.BatchDedupe:
+    """
+    Grava as transações do lote que ainda não existem na conta; retorna as criadas e as duplicatas descartadas.
+
+    Uma transação já existe se o FITID já foi importado na conta ou se há
+    outra com o mesmo conteúdo (dedupe_key), para bancos que geram FITIDs
+    novos ao reexportar o extrato. As novas recebem o estabelecimento pelo
+    índice LSH de variações de memo (services.merchants) e as parcelas, a
+    chave da compra já conhecida (services.installments). Com `closing_day`,
+    as novas sem reference_date recebem o mês de referência do ciclo de
+    faturamento, com uma única busca no calendário para o lote.
+    """
+    from orcamento_2026.core.models import Transaction
+
+    with phase("dedupe"):
+        new, duplicates = dedupe.filter_batch(account, transactions)
+    if not new:
+        return dedupe.BatchDedupe([], duplicates)
+
+    with phase("merchants"):
+        merchants.assign(new)
+
+    if any(tx.installment_key for tx in new):
+        with phase("installments"):
+            installments.resolve_keys(new)
+
+    if closing_day:
+        with phase("calendar"):
+            billing_calendar.assign_reference_dates(new, closing_day)
+
+    with phase("insert"):
+        Transaction.objects.bulk_create(new, batch_size=TRANSACTION_INSERT_SIZE)
+        # bulk_create não dispara os sinais que mantêm os contadores
+        counters.adjust(counters.UNCONSOLIDATED_TRANSACTIONS, len(new))
+    for tx in new:
+        logger.debug(f"Transação criada: {tx.fitid} - {tx.amount} - {tx.memo}")
+    return dedupe.BatchDedupe(new, duplicates)
+
 
 def import_ofx(file_path: str, account: "Account", reference_date: date | None = None) -> dict[str, int]:
     """
     Importa transações de um arquivo OFX para uma conta específica.
 
+    As transações são gravadas em lotes de IMPORT_BATCH_SIZE, com número
+    constante de queries por lote. O FITID é a chave para evitar duplicatas;
+    linhas com FITID novo mas com o mesmo conteúdo (conta, data, valor e memo)
+    de uma transação existente também são descartadas (services.dedupe, com
+    a tolerância de datas de settings.DEDUPE_TOLERANCE_DAYS).
+
+    Sem `reference_date`, cada transação recebe o mês de referência do ciclo
+    de faturamento da conta (BillingCycle ou settings.BILLING_CLOSING_DAY),
+    pela data da transação. Parcelas ("PARC 03/10") são identificadas pelo
+    memo e, se outra parcela da mesma compra já foi consolidada, consolidadas
+    com a mesma classificação (services.installments). Transferências e
+    pagamentos de fatura que formam par com transações de outras contas viram
+    despesas ignoradas (services.transfers). Ao final, as cobranças
+    recorrentes dos memos importados são recalculadas (services.recurring).
+
     Args:
         file_path: Caminho do arquivo OFX
         account: Conta para associar as transações
-        reference_date: Data de referência opcional
+        reference_date: Data de referência única para todas as transações (opcional)
 
     Returns:
         Dicionário com estatísticas da importação
     """
-    with open(file_path, "rb") as f:
-        ofx = OfxParser.parse(f)
+    from orcamento_2026.core.models import Transaction
 
-    new_transactions_count = 0
+    with phase("parse"), open(file_path, "rb") as f:
+        ofx = ofxparse.OfxParser.parse(f)
+
+    # Identifica as linhas deste arquivo: repetições entre lotes da mesma importação não são duplicatas
+    import_id = uuid.uuid4().hex
+    closing_day = None
+    if reference_date is None:
+        with phase("calendar"):
+            closing_day = billing_calendar.closing_day_for(account)
+    created: list[Transaction] = []
+    duplicates = 0
+    batch: list[Transaction] = []
+    seen: set[str] = set()
+    memos: set[str] = set()
 
     for tx in ofx.account.statement.transactions:
+        # FITID repetido no mesmo arquivo: mantém apenas a primeira ocorrência
+        if tx.id in seen:
+            continue
+        seen.add(tx.id)
+        memos.add(tx.memo or "")
+
         # ofxparse retorna amount como float ou decimal, garantimos Decimal
         amount = Decimal(str(tx.amount))
-        date_obj: date = tx.date.date()
-
-        # Cria a transação se não existir (baseado no fitid)
-        # O FITID é a chave para evitar duplicatas
-        _, created = account.transaction_set.get_or_create(
+        transaction = Transaction(
+            account=account,
             fitid=tx.id,
-            defaults={"amount": amount, "date": date_obj, "memo": tx.memo or "", "reference_date": reference_date},
+            amount=amount,
+            amount_cents=int(amount * 100),
+            date=tx.date.date(),
+            memo=tx.memo or "",
+            memo_normalized=normalize_memo(tx.memo)[:255],
+            reference_date=reference_date,
+            import_id=import_id,
         )
+        installments.annotate(transaction)
+        dedupe.annotate(transaction)
+        batch.append(transaction)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            result = _import_batch(account, batch, closing_day)
+            created.extend(result.new)
+            duplicates += result.duplicates
+            batch = []
+
+    if batch:
+        result = _import_batch(account, batch, closing_day)
+        created.extend(result.new)
+        duplicates += result.duplicates
+
+    reused = 0
+    new_installments = [tx for tx in created if tx.installment_key]
+    if new_installments:
+        # Parcelas de compras já classificadas não vão para o Ollama
+        with phase("installments"):
+            reused = installments.reuse_consolidations(new_installments)
 
-        if created:
-            new_transactions_count += 1
-            logger.debug(f"Transação criada: {tx.id} - {amount} - {tx.memo}")
+    new_transactions_count = len(created)
+    matched = 0
+    if new_transactions_count:
+        # Pareia só as transações novas com as de outras contas na janela de datas
+        with phase("transfers"):
+            matched = transfers.match(created)
+        # Recalcula só os grupos de cobrança recorrente dos memos do arquivo
+        with phase("recurring"):
+            recurring.refresh([account.pk], memos)
 
-    logger.info(f"Importação concluída: {new_transactions_count} novas transações")
-    return {"transactions_created": new_transactions_count}
+    logger.info(f"Importação concluída: {new_transactions_count} novas transações, {duplicates} duplicatas por conteúdo")
+    return {
+        "transactions_created": new_transactions_count,
+        "duplicates_skipped": duplicates,
+        "installments_consolidated": reused,
+        "transfers_matched": matched,
+    }
@@ -0,0 +1,253 @@
+"""
+Compras parceladas ("LOJA X PARC 03/10").
+
+O número e o total da parcela são extraídos do memo na importação (uma
+expressão regular compilada) e gravados em colunas indexadas da transação,
+junto com a chave da compra: memo sem a parcela, total, valor da parcela e
+mês da primeira parcela. Parcelas com a mesma chave (na mesma conta) são da
+mesma compra, então a classificação de uma parcela vale para as outras sem
+passar pelo Ollama, e as parcelas que ainda não chegaram podem ser
+projetadas nos meses seguintes. O mês da primeira parcela é calculado pela
+data de cada parcela no extrato (a parcela N é lançada N-1 meses depois).
+Como o fechamento da fatura pode adiantar ou atrasar uma parcela em um mês,
+na importação a chave calculada é trocada pela de uma compra já conhecida
+com primeira parcela no mês vizinho (`resolve_keys`).
+"""
+
+import logging
+import re
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from dateutil.relativedelta import relativedelta
+from django.db.models import Exists, Max, OuterRef
+from django.db.models.functions import Abs
+
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
+
+if TYPE_CHECKING:
+    from orcamento_2026.core.models import Transaction
+
+logger = logging.getLogger(__name__)
+
+# "PARC 03/10", "PARCELA 3/10", "PARC. 3 DE 10", "PCL 03/10" (sem a palavra-chave, "12/03" seria uma data)
+INSTALLMENT_PATTERN = re.compile(r"\b(?:PARCELA|PARC|PCL)\.?\s*0*(\d{1,2})\s*(?:/|DE)\s*0*(\d{1,2})\b", re.IGNORECASE)
+# Mês da primeira parcela no fim da chave da compra
+FIRST_MONTH_PATTERN = re.compile(r"\|(\d{4}-\d{2})$")
+# Separadores que sobram no memo depois de remover a parcela ("LOJA X - PARC 3/10")
+TRAILING_SEPARATORS: str = " -*/"
+# Meses projetados no dashboard
+PROJECTION_MONTHS: int = 12
+# Deslocamentos do mês da primeira parcela aceitos ao procurar a compra, do mais próximo ao mais distante
+FIRST_MONTH_OFFSETS: tuple[int, ...] = (0, -1, 1)
+
+
+class Installment(NamedTuple):
+    """Parcela extraída de um memo."""
+
+    number: int
+    total: int
+    # Memo sem a parcela (identifica a compra)
+    base: str
+
+
+def parse(memo: str | None) -> Installment | None:
+    """
+    Extrai a parcela do memo.
+
+    Args:
+        memo: Memo da transação
+
+    Returns:
+        Número, total e memo sem a parcela; None se o memo não indica parcela
+        (ou indica uma parcela inválida, como 11/10 ou 1/1)
+    """
+    match = INSTALLMENT_PATTERN.search(memo or "")
+    if not match:
+        return None
+    number, total = int(match.group(1)), int(match.group(2))
+    if not 1 <= number <= total or total < 2:
+        return None
+    base = INSTALLMENT_PATTERN.sub(" ", memo, count=1).strip(TRAILING_SEPARATORS)
+    return Installment(number, total, " ".join(base.split()))
+
+
+def _month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _first_month(installment: Installment, day: date) -> date:
+    return _month(day) - relativedelta(months=installment.number - 1)
+
+
+def _key(installment: Installment, amount: Decimal, first_month: date) -> str:
+    return f"{normalize_memo(installment.base)}|{installment.total}|{int(abs(amount) * 100)}|{first_month:%Y-%m}"[:255]
+
+
+def purchase_key(installment: Installment, amount: Decimal, day: date) -> str:
+    """Chave da compra: memo normalizado, total, valor da parcela (centavos) e mês da primeira parcela."""
+    return _key(installment, amount, _first_month(installment, day))
+
+
+def rebuild_key(transaction: "Transaction") -> str | None:
+    """
+    Recalcula a chave da compra com as regras atuais de normalize_memo.
+
+    O mês da primeira parcela gravado na chave é mantido: a chave pode ter
+    sido trocada pela de uma compra vizinha na importação (resolve_keys).
+
+    Returns:
+        Nova chave; None se o memo não indica parcela
+    """
+    installment = parse(transaction.memo)
+    if installment is None:
+        return None
+    match = FIRST_MONTH_PATTERN.search(transaction.installment_key or "")
+    first_month = date.fromisoformat(f"{match.group(1)}-01") if match else _first_month(installment, transaction.date)
+    return _key(installment, transaction.amount, first_month)
+
+
+def annotate(transaction: "Transaction") -> bool:
+    """Preenche installment_number, installment_total e installment_key a partir do memo; retorna se é parcela."""
+    installment = parse(transaction.memo)
+    if installment is None:
+        return False
+    transaction.installment_number = installment.number
+    transaction.installment_total = installment.total
+    transaction.installment_key = purchase_key(installment, transaction.amount, transaction.date)
+    return True
+
+
+def resolve_keys(transactions: Iterable["Transaction"]) -> int:
+    """
+    Troca a chave de parcelas cujo mês da primeira parcela ficou um mês antes ou depois do da compra (uma query).
+
+    A chave calculada pela data supõe que a parcela N é lançada exatamente N-1
+    meses depois da primeira. Se a compra (mesma conta, memo, total e valor)
+    já existe com a primeira parcela no mês vizinho e ainda não tem essa
+    parcela, a transação recebe a chave dela. Parcelas do mesmo lote são
+    resolvidas em ordem de data, umas contra as outras.
+
+    Args:
+        transactions: Transações anotadas por annotate(), ainda não gravadas
+
+    Returns:
+        Quantidade de chaves trocadas
+    """
+    from orcamento_2026.core.models import Transaction
+
+    # Transações ainda sem id não podem ser chaves de dicionário
+    candidates = [
+        (tx, [purchase_key(parse(tx.memo), tx.amount, tx.date + relativedelta(months=offset)) for offset in FIRST_MONTH_OFFSETS])
+        for tx in sorted(transactions, key=lambda tx: tx.date)
+        if tx.installment_key
+    ]
+    if not candidates:
+        return 0
+
+    # (conta, chave) -> números de parcela já lançados
+    numbers: dict[tuple[int, str], set[int]] = defaultdict(set)
+    existing = Transaction.objects.filter(
+        account_id__in={tx.account_id for tx, _ in candidates}, installment_key__in={key for _, keys in candidates for key in keys}
+    )
+    for account_id, key, number in existing.values_list("account_id", "installment_key", "installment_number"):
+        numbers[account_id, key].add(number)
+
+    changed = 0
+    for tx, keys in candidates:
+        known = [key for key in keys if (tx.account_id, key) in numbers]
+        # A compra conhecida que já tem esta parcela é outra compra igual
+        key = next((key for key in known if tx.installment_number not in numbers[tx.account_id, key]), tx.installment_key)
+        changed += key != tx.installment_key
+        tx.installment_key = key
+        numbers[tx.account_id, key].add(tx.installment_number)
+    return changed
+
+
+def reuse_consolidations(transactions: Iterable["Transaction"] | None = None) -> int:
+    """
+    Consolida parcelas pendentes com a classificação de outra parcela da mesma compra.
+
+    A subcategoria e a descrição vêm da parcela consolidada de menor número;
+    o mês de referência é o de cada parcela. Nenhuma chamada ao Ollama.
+
+    Args:
+        transactions: Parcelas recém-importadas (padrão: todas as parcelas sem despesa)
+
+    Returns:
+        Quantidade de parcelas consolidadas
+    """
+    from orcamento_2026.core.models import Expense, Transaction
+    from orcamento_2026.core.services.consolidation import consolidate_transactions
+
+    if transactions is None:
+        consolidated = Expense.objects.filter(
+            transaction__account_id=OuterRef("account_id"), transaction__installment_key=OuterRef("installment_key")
+        )
+        pending = list(Transaction.objects.filter(expense__isnull=True, installment_key__isnull=False).filter(Exists(consolidated)))
+    else:
+        pending = [tx for tx in transactions if tx.installment_key]
+    if not pending:
+        return 0
+
+    sources: dict[tuple[int, str], "Expense"] = {}
+    expenses = (
+        Expense.objects.filter(
+            transaction__account_id__in={tx.account_id for tx in pending},
+            transaction__installment_key__in={tx.installment_key for tx in pending},
+        )
+        .select_related("subcategory", "transaction")
+        .order_by("-transaction__installment_number")
+    )
+    for expense in expenses:
+        # Ordem decrescente: a parcela de menor número fica por último e prevalece
+        sources[expense.transaction.account_id, expense.transaction.installment_key] = expense
+
+    items = [
+        (tx, source.subcategory, source.description, tx.reference_date or tx.date)
+        for tx in pending
+        if (source := sources.get((tx.account_id, tx.installment_key)))
+    ]
+    if not items:
+        return 0
+    result = consolidate_transactions(items)
+    logger.info(f"{len(result.expenses)} parcelas consolidadas pela classificação de outra parcela da compra")
+    return len(result.expenses)
+
+
+def projection(since: date | None = None, months: int = PROJECTION_MONTHS) -> list[dict]:
+    """
+    Parcelas que ainda vão chegar, somadas por mês (uma query).
+
+    Para cada compra, as parcelas seguintes à última importada são projetadas
+    nos meses seguintes ao dessa parcela, com o mesmo valor.
+
+    Args:
+        since: Meses a partir do seguinte a este dia (padrão: hoje)
+        months: Quantos meses projetar
+
+    Returns:
+        Lista de {"month", "total", "count"} em ordem de mês, só com meses que têm parcelas
+    """
+    from orcamento_2026.core.models import Transaction
+
+    first = _month(since or date.today()) + relativedelta(months=1)
+    last = first + relativedelta(months=months - 1)
+    purchases = (
+        Transaction.objects.filter(installment_key__isnull=False)
+        .values("account_id", "installment_key")
+        .annotate(number=Max("installment_number"), total=Max("installment_total"), last_date=Max("date"), amount=Max(Abs("amount")))
+        .order_by()
+    )
+
+    totals: dict[date, Decimal] = defaultdict(Decimal)
+    counts: dict[date, int] = defaultdict(int)
+    for purchase in purchases:
+        for offset in range(1, purchase["total"] - purchase["number"] + 1):
+            month = _month(purchase["last_date"]) + relativedelta(months=offset)
+            if first <= month <= last:
+                totals[month] += Decimal(purchase["amount"]).quantize(Decimal("0.01"))
+                counts[month] += 1
+    return [{"month": month, "total": totals[month], "count": counts[month]} for month in sorted(totals)]
@@ -0,0 +1,300 @@
+"""
+Estabelecimentos (Merchant) a partir das variações de memo.
+
+O mesmo estabelecimento aparece com dezenas de memos diferentes (cidade,
+terminal, datas). Cada memo normalizado (Transaction.memo_normalized) é quebrado em
+shingles de SHINGLE_SIZE caracteres e resumido numa assinatura MinHash de
+NUM_PERM valores: a fração de posições iguais entre duas assinaturas estima
+a similaridade de Jaccard dos shingles. Para não comparar todos os pares, a
+assinatura é dividida em BANDS faixas (LSH banding); variações que coincidem
+em alguma faixa caem no mesmo bucket, e só esses candidatos são comparados.
+
+Cada variação conhecida fica em MerchantAlias, com os buckets das faixas em
+MerchantBucket (coluna indexada): a importação encontra o estabelecimento
+de um lote de memos com uma consulta `bucket IN (...)`. `rebuild` refaz o
+agrupamento sobre todo o histórico.
+"""
+
+import hashlib
+import logging
+import math
+import zlib
+from collections import Counter, defaultdict
+from functools import cache
+from typing import TYPE_CHECKING, Iterable
+
+from django.db import transaction as db_transaction
+
+from orcamento_2026.core.services.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from orcamento_2026.core.models import Transaction
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE: int = 3
+NUM_PERM: int = 128
+# 25 faixas de 5 valores (125 das 128 posições): pares com similaridade 0.7 colidem em alguma faixa em ~99% das vezes,
+# com 0.8 em ~100% e com 0.5 em ~55%. Mudar as faixas exige recalcular os buckets gravados (migração 0017)
+BANDS: int = 25
+ROWS: int = 5
+# Similaridade estimada mínima para duas variações serem do mesmo estabelecimento. Com shingles de 3 caracteres,
+# memos que diferem numa palavra ("uber trip sao paulo" x "uber eats sao paulo") ficam perto de 0.5
+SIMILARITY_THRESHOLD: float = 0.7
+# Memos por bloco no cálculo das assinaturas (limita a matriz NUM_PERM x shingles)
+SIGNATURE_CHUNK_SIZE: int = 5000
+BULK_BATCH_SIZE: int = 1000
+# Linhas por INSERT de estabelecimentos, variações e buckets: cabem no limite de 999 parâmetros por query do SQLite
+# (um por coluna; com uma coluna só, 500 linhas), então um lote custa o mesmo número de INSERTs em qualquer banco
+MERCHANT_INSERT_SIZE: int = 500
+ALIAS_INSERT_SIZE: int = 999 // 3
+BUCKET_INSERT_SIZE: int = 999 // 2
+# Maior primo abaixo de 2**32: a*x + b cabe em 64 bits
+_PRIME: int = 4_294_967_291
+_SEED: int = 2026
+
+
+@cache
+def _coefficients() -> tuple["np.ndarray", "np.ndarray"]:
+    """Coeficientes (a, b) das NUM_PERM funções de hash universais, fixos entre execuções."""
+    rng = np.random.default_rng(_SEED)
+    a = rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+def shingles(key: str) -> set[str]:
+    """Trechos de SHINGLE_SIZE caracteres da chave, com espaços nas pontas (palavras curtas também contam)."""
+    padded = f" {key} "
+    return {"".join(chars) for chars in zip(*(padded[offset:] for offset in range(SHINGLE_SIZE)))}
+
+
+def signatures(keys: list[str]) -> "np.ndarray":
+    """
+    Assinaturas MinHash das chaves, calculadas em blocos com numpy.
+
+    Returns:
+        Matriz (len(keys), NUM_PERM) de uint32
+    """
+    a, b = _coefficients()
+    result = np.empty((len(keys), NUM_PERM), dtype=np.uint32)
+    for start in range(0, len(keys), SIGNATURE_CHUNK_SIZE):
+        end = start + SIGNATURE_CHUNK_SIZE
+        hashes = [[zlib.crc32(shingle.encode()) for shingle in shingles(key)] for key in keys[start:end]]
+        offsets = np.cumsum([0] + [len(values) for values in hashes[:-1]])
+        flat = np.fromiter((value for values in hashes for value in values), dtype=np.uint64)
+        # Cada coluna é um shingle; o mínimo por chave de cada linha (permutação) é a assinatura
+        result[start:end] = np.minimum.reduceat((a * flat + b) % _PRIME, offsets, axis=1).T
+    return result
+
+
+def similarity(first: "np.ndarray", second: "np.ndarray") -> float:
+    """Similaridade de Jaccard estimada: fração de posições iguais das assinaturas."""
+    return float(np.count_nonzero(first == second)) / NUM_PERM
+
+
+def band_buckets(signature: "np.ndarray") -> list[int]:
+    """Um bucket (inteiro de 64 bits com sinal) por faixa da assinatura."""
+    bands = signature[: BANDS * ROWS].reshape(BANDS, ROWS)
+    return [
+        int.from_bytes(hashlib.blake2b(bytes([band]) + values.tobytes(), digest_size=8).digest(), "big", signed=True)
+        for band, values in enumerate(bands)
+    ]
+
+
+def cluster(matrix: "np.ndarray") -> list[int]:
+    """
+    Agrupa as assinaturas: candidatas da mesma faixa com similaridade >= SIMILARITY_THRESHOLD ficam juntas.
+
+    Cada grupo de um bucket é comparado com o seu primeiro membro (union-find),
+    então o custo é linear no número de assinaturas por faixa.
+
+    Returns:
+        Rótulo do grupo de cada assinatura, numerados a partir de 0 na ordem de entrada
+    """
+    parent = list(range(len(matrix)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    bands = matrix[:, : BANDS * ROWS].reshape(len(matrix), BANDS, ROWS)
+    for band in range(BANDS if len(matrix) > 1 else 0):
+        _, inverse = np.unique(bands[:, band], axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind="stable")
+        boundaries = np.flatnonzero(np.diff(inverse[order])) + 1
+        for group in np.split(order, boundaries):
+            first = int(group[0])
+            for other in group[1:]:
+                other = int(other)
+                root_first, root_other = find(first), find(other)
+                if root_first != root_other and similarity(matrix[first], matrix[other]) >= SIMILARITY_THRESHOLD:
+                    parent[root_other] = root_first
+
+    labels: dict[int, int] = {}
+    return [labels.setdefault(find(i), len(labels)) for i in range(len(matrix))]
+
+
+def _most_common_memo(memos: Iterable[Counter]) -> str:
+    total: Counter = Counter()
+    for counts in memos:
+        total.update(counts)
+    return total.most_common(1)[0][0][:255]
+
+
+def _create_aliases(merchant_ids: dict[str, int], matrix: "np.ndarray", index: dict[str, int]) -> None:
+    """Grava as variações novas e os buckets de cada uma."""
+    from orcamento_2026.core.models import MerchantAlias, MerchantBucket
+
+    aliases = MerchantAlias.objects.bulk_create(
+        [
+            MerchantAlias(merchant_id=merchant_id, memo_key=key, signature=matrix[index[key]].tobytes())
+            for key, merchant_id in merchant_ids.items()
+        ],
+        batch_size=ALIAS_INSERT_SIZE,
+    )
+    MerchantBucket.objects.bulk_create(
+        [MerchantBucket(alias=alias, bucket=bucket) for alias in aliases for bucket in band_buckets(matrix[index[alias.memo_key]])],
+        batch_size=BUCKET_INSERT_SIZE,
+    )
+
+
+def _match_known(keys: list[str], matrix: "np.ndarray") -> tuple[dict[str, int], set[str]]:
+    """
+    Procura o estabelecimento de cada chave entre as variações que compartilham algum bucket (uma query).
+
+    Returns:
+        Estabelecimento das chaves encontradas e quais delas já são variações gravadas
+    """
+    from orcamento_2026.core.models import MerchantBucket
+
+    buckets = [band_buckets(signature) for signature in matrix]
+    candidates: dict[int, list[tuple[int, str, bytes]]] = defaultdict(list)
+    rows = MerchantBucket.objects.filter(bucket__in={bucket for values in buckets for bucket in values}).values_list(
+        "bucket", "alias__merchant_id", "alias__memo_key", "alias__signature"
+    )
+    for bucket, merchant_id, alias_key, signature in rows:
+        candidates[bucket].append((merchant_id, alias_key, bytes(signature)))
+
+    merchant_ids: dict[str, int] = {}
+    known: set[str] = set()
+    for key, signature, key_buckets in zip(keys, matrix, buckets):
+        best, best_similarity = None, SIMILARITY_THRESHOLD
+        for merchant_id, alias_key, alias_signature in (candidate for bucket in key_buckets for candidate in candidates[bucket]):
+            if alias_key == key:
+                best = merchant_id
+                known.add(key)
+                break
+            score = similarity(signature, np.frombuffer(alias_signature, dtype=np.uint32))
+            if score >= best_similarity:
+                best, best_similarity = merchant_id, score
+        if best is not None:
+            merchant_ids[key] = best
+    return merchant_ids, known
+
+
+def _create_merchants(memos: dict[str, Counter], keys: list[str], matrix: "np.ndarray") -> dict[str, int]:
+    """Agrupa as chaves e cria um estabelecimento por grupo, com o nome do memo mais frequente; retorna chave -> id."""
+    from orcamento_2026.core.models import Merchant
+
+    groups: dict[int, list[str]] = defaultdict(list)
+    for key, label in zip(keys, cluster(matrix)):
+        groups[label].append(key)
+    merchants = Merchant.objects.bulk_create(
+        [Merchant(name=_most_common_memo(memos[key] for key in group)) for group in groups.values()], batch_size=MERCHANT_INSERT_SIZE
+    )
+    return {key: merchant.id for merchant, group in zip(merchants, groups.values()) for key in group}
+
+
+def max_assign_queries(memos: int) -> int:
+    """Queries de `assign` para um lote com até `memos` memos distintos, no pior caso (todos sem estabelecimento)."""
+    inserts = [(memos, MERCHANT_INSERT_SIZE), (memos, ALIAS_INSERT_SIZE), (memos * BANDS, BUCKET_INSERT_SIZE)]
+    return 1 + sum(math.ceil(rows / size) for rows, size in inserts)
+
+
+def assign(transactions: list["Transaction"]) -> int:
+    """
+    Preenche o merchant das transações (ainda não gravadas, com memo_normalized) pelo índice LSH.
+
+    Cada memo é comparado com as variações que compartilham algum bucket;
+    memos sem estabelecimento parecido são agrupados entre si e viram
+    estabelecimentos novos. Variações novas passam a fazer parte do índice.
+    Uma busca e os INSERTs em blocos de tamanho fixo: no máximo
+    max_assign_queries(memos distintos) queries por lote.
+
+    Args:
+        transactions: Transações de um lote da importação
+
+    Returns:
+        Quantidade de estabelecimentos criados
+    """
+    memos: dict[str, Counter] = defaultdict(Counter)
+    for tx in transactions:
+        if tx.memo_normalized:
+            memos[tx.memo_normalized][tx.memo] += 1
+    if not memos:
+        return 0
+
+    keys = list(memos)
+    index = {key: i for i, key in enumerate(keys)}
+    matrix = signatures(keys)
+    merchant_ids, known = _match_known(keys, matrix)
+
+    unmatched = [key for key in keys if key not in merchant_ids]
+    created = {}
+    if unmatched:
+        created = _create_merchants(memos, unmatched, matrix[[index[key] for key in unmatched]])
+        merchant_ids.update(created)
+
+    new_aliases = {key: merchant_id for key, merchant_id in merchant_ids.items() if key not in known}
+    if new_aliases:
+        _create_aliases(new_aliases, matrix, index)
+
+    for tx in transactions:
+        tx.merchant_id = merchant_ids.get(tx.memo_normalized)
+    return len(set(created.values()))
+
+
+def rebuild() -> int:
+    """
+    Refaz os estabelecimentos a partir de todos os memos do histórico.
+
+    Os estabelecimentos existentes são excluídos, as variações são agrupadas
+    por MinHash/LSH e todas as transações recebem o novo merchant.
+
+    Returns:
+        Quantidade de estabelecimentos criados
+    """
+    from orcamento_2026.core.models import Merchant, Transaction
+
+    memos: dict[str, Counter] = defaultdict(Counter)
+    rows = Transaction.objects.exclude(memo_normalized="").values_list("memo_normalized", "memo")
+    for key, memo in rows.iterator(chunk_size=BULK_BATCH_SIZE):
+        memos[key][memo] += 1
+
+    keys = list(memos)
+    index = {key: i for i, key in enumerate(keys)}
+    matrix = signatures(keys)
+
+    with db_transaction.atomic():
+        Merchant.objects.all().delete()
+        merchant_ids = _create_merchants(memos, keys, matrix)
+        _create_aliases(merchant_ids, matrix, index)
+
+        batch: list[Transaction] = []
+        for tx in Transaction.objects.only("id", "memo_normalized").iterator(chunk_size=BULK_BATCH_SIZE):
+            tx.merchant_id = merchant_ids.get(tx.memo_normalized)
+            batch.append(tx)
+            if len(batch) >= BULK_BATCH_SIZE:
+                Transaction.objects.bulk_update(batch, ["merchant"])
+                batch = []
+        Transaction.objects.bulk_update(batch, ["merchant"])
+
+    created = len(set(merchant_ids.values()))
+    logger.info(f"{created} estabelecimentos a partir de {len(keys)} variações de memo")
+    return created
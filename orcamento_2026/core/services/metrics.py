@@ -0,0 +1,123 @@
+"""Métricas de desempenho por view mantidas em memória e exportadas no formato texto do Prometheus."""
+
+import math
+import os
+import threading
+from collections import deque
+from typing import NamedTuple
+
+from decouple import config
+
+WINDOW: int = config("PERF_METRICS_WINDOW", default=1000, cast=int)
+QUANTILES: tuple[float, ...] = (0.5, 0.9, 0.99)
+PREFIX: str = "orcamento"
+
+
+class RequestSample(NamedTuple):
+    """Medições de uma requisição."""
+
+    duration: float
+    queries: int
+    db_duration: float
+
+
+class ViewStats:
+    """Janela móvel das últimas WINDOW amostras de uma view, mais totais acumulados."""
+
+    def __init__(self, window: int) -> None:
+        self.samples: deque[RequestSample] = deque(maxlen=window)
+        self.count = 0
+        self.duration_sum = 0.0
+        self.queries_sum = 0
+        self.db_duration_sum = 0.0
+        self.slow_queries = 0
+
+
+class MetricsRegistry:
+    """Registro das métricas do processo (cada worker do gunicorn tem o seu)."""
+
+    def __init__(self, window: int = WINDOW) -> None:
+        self.window = window
+        self._views: dict[str, ViewStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, view: str, sample: RequestSample, slow_queries: int = 0) -> None:
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = ViewStats(self.window)
+            stats.samples.append(sample)
+            stats.count += 1
+            stats.duration_sum += sample.duration
+            stats.queries_sum += sample.queries
+            stats.db_duration_sum += sample.db_duration
+            stats.slow_queries += slow_queries
+
+    def snapshot(self) -> dict[str, ViewStats]:
+        """Cópia consistente das estatísticas, para calcular percentis fora do lock."""
+        with self._lock:
+            copies = {}
+            for view, stats in self._views.items():
+                copy = ViewStats(self.window)
+                copy.samples.extend(stats.samples)
+                copy.count = stats.count
+                copy.duration_sum = stats.duration_sum
+                copy.queries_sum = stats.queries_sum
+                copy.db_duration_sum = stats.db_duration_sum
+                copy.slow_queries = stats.slow_queries
+                copies[view] = copy
+            return copies
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+def percentile(sorted_values: list[float], quantile: float) -> float:
+    """Percentil pelo método nearest-rank sobre valores já ordenados."""
+    if not sorted_values:
+        return math.nan
+    index = max(0, math.ceil(quantile * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(metrics: MetricsRegistry | None = None) -> str:
+    """
+    Renderiza as métricas no formato de exposição texto do Prometheus.
+
+    Tempo de resposta, queries e tempo de banco são exportados como summaries:
+    os quantis vêm da janela móvel; _sum e _count são acumulados desde o início do processo.
+    """
+    snapshot = (metrics or registry).snapshot()
+    pid = os.getpid()
+    summaries = [
+        ("request_duration_seconds", "Tempo de resposta por view", "duration", "duration_sum"),
+        ("db_queries", "Queries ao banco por requisição", "queries", "queries_sum"),
+        ("db_duration_seconds", "Tempo gasto no banco por requisição", "db_duration", "db_duration_sum"),
+    ]
+
+    lines = []
+    for name, help_text, field, sum_attr in summaries:
+        metric = f"{PREFIX}_{name}"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+        for view, stats in sorted(snapshot.items()):
+            labels = f'view="{_escape(view)}",pid="{pid}"'
+            values = sorted(getattr(sample, field) for sample in stats.samples)
+            for quantile in QUANTILES:
+                lines.append(f'{metric}{{{labels},quantile="{quantile}"}} {percentile(values, quantile):.6g}')
+            lines.append(f"{metric}_sum{{{labels}}} {getattr(stats, sum_attr):.6g}")
+            lines.append(f"{metric}_count{{{labels}}} {stats.count}")
+
+    metric = f"{PREFIX}_slow_queries_total"
+    lines += [f"# HELP {metric} Queries acima do limite PERF_SLOW_QUERY_MS", f"# TYPE {metric} counter"]
+    for view, stats in sorted(snapshot.items()):
+        lines.append(f'{metric}{{view="{_escape(view)}",pid="{pid}"}} {stats.slow_queries}')
+
+    return "\n".join(lines) + "\n"
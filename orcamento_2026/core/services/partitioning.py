@@ -0,0 +1,450 @@
+"""
+Particionamento por ano das tabelas de transações e despesas (PostgreSQL).
+
+Com as tabelas particionadas (RANGE por `Transaction.date` e
+`Expense.reference_month`, uma partição por ano), as consultas que filtram
+pela coluna da partição só leem as partições do período (partition pruning)
+e anos antigos podem ser desanexados e arquivados sem DELETE. No SQLite (e
+no PostgreSQL sem particionamento) tudo aqui é no-op.
+
+A conversão de uma tabela existente (`partition_tables`) recria a tabela
+como particionada e copia os dados, numa transação. O PostgreSQL exige a
+coluna da partição em toda chave única de uma tabela particionada, então as
+chaves sem ela passam para uma tabela comum ao lado, `<tabela>_key`:
+
+- a chave primária da tabela passa a ser (id, coluna da partição), e
+  `<tabela>_key` guarda o id e as colunas das restrições únicas, que
+  continuam valendo para a tabela inteira (id; FITID por conta; uma despesa
+  por transação), com os nomes originais;
+- um trigger atualiza `<tabela>_key` em cada INSERT, UPDATE e DELETE, na
+  mesma transação: a violação de unicidade sai do comando que a causou;
+- as chaves estrangeiras que apontavam para a tabela (despesas e sugestões ->
+  transação) passam a apontar para o id em `<tabela>_key`.
+
+Buscas por id (get(pk=...), joins despesa -> transação) consultam o índice
+de cada partição; o ganho está nas consultas por período.
+"""
+
+import logging
+import re
+from datetime import date
+from typing import Iterable
+
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction as db_transaction
+
+from orcamento_2026.core.services.utils.query_budget import unbudgeted
+
+logger = logging.getLogger(__name__)
+
+# Tabela particionada -> coluna (DateField) da partição
+PARTITIONED_TABLES: dict[str, str] = {
+    "core_transaction": "date",
+    "core_expense": "reference_month",
+}
+# Schema para onde `archive` move as partições desanexadas
+ARCHIVE_SCHEMA: str = "arquivo"
+
+_BOUND_YEAR = re.compile(r"FROM \('(\d{4})-")
+_REFERENCES = re.compile(r"REFERENCES \S+?\(")
+
+# Anos com partição por (alias, tabela); None = tabela não particionada
+_years: dict[tuple[str, str], set[int] | None] = {}
+
+
+def reset() -> None:
+    """Descarta o cache das partições existentes (após converter ou arquivar, ou ao desfazer uma transação)."""
+    _years.clear()
+
+
+def partition_name(table: str, year: int) -> str:
+    return f"{table}_{year}"
+
+
+def key_table(table: str) -> str:
+    """Tabela comum com o id e as colunas das restrições únicas da tabela particionada."""
+    return f"{table}_key"
+
+
+def partition_statement(table: str, year: int, parent: str | None = None) -> str:
+    """CREATE TABLE da partição do ano `year` da tabela (anexada a `parent`, se informado)."""
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table, year)}" PARTITION OF "{parent or table}" '
+        f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+    )
+
+
+def _partition_years(cursor, table: str) -> dict[int, str] | None:
+    """Ano -> nome de cada partição da tabela, ou None se ela não é particionada."""
+    cursor.execute(
+        "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+        "FROM pg_partitioned_table pt "
+        "JOIN pg_class parent ON parent.oid = pt.partrelid "
+        "LEFT JOIN pg_inherits i ON i.inhparent = parent.oid "
+        "LEFT JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.oid = to_regclass(%s)",
+        [table],
+    )
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+    return {int(_BOUND_YEAR.search(bound).group(1)): name for name, bound in rows if bound and _BOUND_YEAR.search(bound)}
+
+
+def partitions(table: str, using: str = DEFAULT_DB_ALIAS) -> dict[int, str] | None:
+    """Ano -> nome das partições da tabela (None se não é particionada ou o banco não é PostgreSQL)."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        return _partition_years(cursor, table)
+
+
+def ensure_partitions(model: type[models.Model], days: Iterable[date | None], using: str = DEFAULT_DB_ALIAS) -> list[str]:
+    """
+    Cria as partições que faltam para os anos de `days` antes de inserir linhas no modelo.
+
+    A primeira chamada por processo consulta o catálogo (uma query); depois,
+    só anos novos custam um CREATE TABLE. Sem particionamento, não faz nada.
+    Essas queries dependem do processo e dos anos já vistos, não da view: não
+    contam nos orçamentos de queries (unbudgeted).
+
+    Returns:
+        Nomes das partições criadas
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor != "postgresql" or table not in PARTITIONED_TABLES:
+        return []
+    key = (using, table)
+    with unbudgeted():
+        if key not in _years:
+            existing = partitions(table, using)
+            _years[key] = None if existing is None else set(existing)
+        known = _years[key]
+        if known is None:
+            return []
+
+        missing = sorted({day.year for day in days if day} - known)
+        if not missing:
+            return []
+        with connection.cursor() as cursor:
+            for year in missing:
+                cursor.execute(partition_statement(table, year))
+                logger.info(f"Partição {partition_name(table, year)} criada")
+    # Só entra no cache após o commit: um rollback também desfaz o CREATE TABLE
+    db_transaction.on_commit(lambda: known.update(missing), using=using)
+    return [partition_name(table, year) for year in missing]
+
+
+# =============================================================================
+# Conversão
+# =============================================================================
+
+
+def _quoted(names: Iterable[str]) -> str:
+    return ", ".join(f'"{name}"' for name in names)
+
+
+def _columns(cursor, table: str) -> list[str]:
+    """Colunas da tabela, sem as geradas (que não aceitam INSERT)."""
+    cursor.execute(
+        "SELECT attname FROM pg_attribute WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped AND attgenerated = '' "
+        "ORDER BY attnum",
+        [table],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _column_types(cursor, table: str, names: list[str]) -> list[tuple[str, str]]:
+    """Nome e tipo (ex.: bigint, character varying(255)) das colunas `names` da tabela."""
+    cursor.execute(
+        "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = %s::regclass AND attname = ANY(%s) ORDER BY attnum",
+        [table, names],
+    )
+    return cursor.fetchall()
+
+
+def _constraints(cursor, table: str) -> list[tuple[str, str, str, list[str]]]:
+    """Nome, tipo (p/u/f), definição e colunas das chaves da tabela."""
+    cursor.execute(
+        "SELECT c.conname, c.contype, pg_get_constraintdef(c.oid), "
+        "ARRAY(SELECT a.attname FROM unnest(c.conkey) WITH ORDINALITY k(attnum, ord) "
+        "JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum ORDER BY k.ord) "
+        "FROM pg_constraint c WHERE c.conrelid = %s::regclass AND c.contype IN ('p', 'u', 'f') ORDER BY c.contype DESC, c.conname",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _indexes(cursor, table: str) -> list[str]:
+    """CREATE INDEX dos índices da tabela que não pertencem a uma restrição."""
+    cursor.execute(
+        "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i WHERE i.indrelid = %s::regclass "
+        "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid AND c.conrelid = i.indrelid)",
+        [table],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _referencing(cursor, table: str) -> list[tuple[str, str, str]]:
+    """Tabela, nome e definição das chaves estrangeiras de outras tabelas que apontam para esta."""
+    cursor.execute(
+        "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE confrelid = %s::regclass AND conrelid <> confrelid AND contype = 'f' AND conparentid = 0",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _constraint_statements(
+    table: str, column: str, constraints: list[tuple[str, str, str, list[str]]]
+) -> tuple[list[str], list[tuple[str, list[str]]]]:
+    """
+    Recria as chaves da tabela convertida.
+
+    A chave primária ganha a coluna da partição; restrições únicas sem ela
+    vão para `<tabela>_key` (_key_statements).
+
+    Returns:
+        Statements da tabela e as restrições únicas (nome, colunas) de `<tabela>_key`
+    """
+    statements, moved = [], []
+    for name, kind, definition, keys in constraints:
+        if kind == "f":
+            statements.append(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+        elif kind == "u" and column not in keys:
+            moved.append((name, keys))
+        else:
+            columns = _quoted(keys if column in keys else [*keys, column])
+            unique = "PRIMARY KEY" if kind == "p" else "UNIQUE"
+            statements.append(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {unique} ({columns})')
+    return statements, moved
+
+
+def _key_statements(table: str, columns: list[tuple[str, str]], uniques: list[tuple[str, list[str]]]) -> list[str]:
+    """
+    Cria `<tabela>_key` com as linhas atuais e o trigger que a mantém junto com a tabela.
+
+    Args:
+        columns: Nome e tipo das colunas de `<tabela>_key` (id e colunas das restrições únicas)
+        uniques: Restrições únicas (nome, colunas) a criar em `<tabela>_key`
+    """
+    key = key_table(table)
+    names = _quoted(name for name, _ in columns)
+    values = ", ".join(f'NEW."{name}"' for name, _ in columns)
+    assignments = ", ".join(f'"{name}" = NEW."{name}"' for name, _ in columns)
+    definitions = ", ".join(f'"{name}" {type_}{" PRIMARY KEY" if name == "id" else ""}' for name, type_ in columns)
+    return [
+        f'CREATE TABLE "{key}" ({definitions})',
+        f'INSERT INTO "{key}" ({names}) SELECT {names} FROM "{table}"',
+        # Depois da cópia: dados que já violam a restrição abortam a conversão
+        *(f'ALTER TABLE "{key}" ADD CONSTRAINT "{name}" UNIQUE ({_quoted(keys)})' for name, keys in uniques),
+        f'CREATE FUNCTION "{key}_sync"() RETURNS trigger LANGUAGE plpgsql AS $$\n'
+        "BEGIN\n"
+        f"    IF TG_OP = 'INSERT' THEN\n"
+        f'        INSERT INTO "{key}" ({names}) VALUES ({values});\n'
+        "    ELSIF TG_OP = 'UPDATE' THEN\n"
+        f'        UPDATE "{key}" SET {assignments} WHERE "id" = OLD."id";\n'
+        "    ELSIF TG_OP = 'DELETE' THEN\n"
+        f'        DELETE FROM "{key}" WHERE "id" = OLD."id";\n'
+        "    ELSE\n"
+        f'        DELETE FROM "{key}";\n'
+        "    END IF;\n"
+        "    RETURN NULL;\n"
+        "END\n"
+        "$$",
+        f'CREATE TRIGGER "{key}_sync" AFTER INSERT OR UPDATE OF {names} OR DELETE ON "{table}" '
+        f'FOR EACH ROW EXECUTE FUNCTION "{key}_sync"()',
+        f'CREATE TRIGGER "{key}_truncate" AFTER TRUNCATE ON "{table}" FOR EACH STATEMENT EXECUTE FUNCTION "{key}_sync"()',
+    ]
+
+
+def _years_range(cursor, table: str, column: str) -> range:
+    """Anos com dados na tabela, até o ano seguinte ao atual."""
+    cursor.execute(f'SELECT min(extract(year FROM "{column}")), max(extract(year FROM "{column}")) FROM "{table}"')
+    first, last = cursor.fetchone()
+    this_year = date.today().year
+    return range(int(first or this_year), max(int(last or this_year), this_year) + 2)
+
+
+def _partition_table(cursor, table: str, column: str) -> list[str]:
+    """Recria a tabela como particionada por `column`, com os dados, índices, chaves e `<tabela>_key`; retorna as partições criadas."""
+    staging = f"{table}__partitioned"
+    key = key_table(table)
+    cursor.execute(f'LOCK TABLE "{table}" IN ACCESS EXCLUSIVE MODE')
+    columns = _quoted(_columns(cursor, table))
+    statements, uniques = _constraint_statements(table, column, _constraints(cursor, table))
+    key_columns = _column_types(cursor, table, ["id", *(name for _, keys in uniques for name in keys)])
+    indexes = _indexes(cursor, table)
+    references = _referencing(cursor, table)
+    years = _years_range(cursor, table, column)
+
+    cursor.execute(
+        f'CREATE TABLE "{staging}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING GENERATED '
+        f'INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ("{column}")'
+    )
+    for year in years:
+        cursor.execute(partition_statement(table, year, parent=staging))
+    cursor.execute(f'INSERT INTO "{staging}" ({columns}) SELECT {columns} FROM "{table}"')
+
+    # Os nomes de índices e restrições são únicos no schema: recriados só depois de remover a tabela antiga
+    cursor.execute(f'DROP TABLE "{table}" CASCADE')
+    cursor.execute(f'ALTER TABLE "{staging}" RENAME TO "{table}"')
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+    sequence = cursor.fetchone()[0]
+    if sequence:
+        cursor.execute(f'ALTER SEQUENCE {sequence} RENAME TO "{table}_id_seq"')
+        cursor.execute(f'SELECT setval(\'"{table}_id_seq"\', coalesce(max(id), 0) + 1, false) FROM "{table}"')
+
+    for statement in [*statements, *indexes, *_key_statements(table, key_columns, uniques)]:
+        cursor.execute(statement)
+    # O PostgreSQL não aceita FK para uma tabela particionada sem a coluna da partição: aponta para o id em <tabela>_key
+    for referencing, name, definition in references:
+        cursor.execute(f'ALTER TABLE {referencing} ADD CONSTRAINT "{name}" {_REFERENCES.sub(f"REFERENCES {key}(", definition, count=1)}')
+    cursor.execute(f'ANALYZE "{table}"')
+    cursor.execute(f'ANALYZE "{key}"')
+    return [partition_name(table, year) for year in years]
+
+
+def partition_tables(using: str = DEFAULT_DB_ALIAS) -> dict[str, list[str]]:
+    """
+    Converte as tabelas de PARTITIONED_TABLES em tabelas particionadas por ano, com os dados existentes.
+
+    Cria uma partição por ano com dados, até o ano seguinte ao atual; as
+    demais são criadas sob demanda (ensure_partitions). Tabelas já
+    particionadas são mantidas. A tabela fica bloqueada durante a cópia.
+
+    Returns:
+        Tabela -> partições criadas
+
+    Raises:
+        ValueError: Se o banco não é PostgreSQL
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        raise ValueError(f"Particionamento disponível apenas no PostgreSQL (banco atual: {connection.vendor})")
+
+    created: dict[str, list[str]] = {}
+    with db_transaction.atomic(using=using), connection.cursor() as cursor:
+        # Checagens de FK adiadas (DEFERRABLE) de INSERTs da mesma transação impedem o DROP TABLE
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        for table, column in PARTITIONED_TABLES.items():
+            if _partition_years(cursor, table) is not None:
+                logger.info(f"{table} já é particionada")
+                created[table] = []
+                continue
+            created[table] = _partition_table(cursor, table, column)
+            logger.info(f"{table} particionada por {column}: {len(created[table])} partições")
+    reset()
+    return created
+
+
+# =============================================================================
+# Arquivamento
+# =============================================================================
+
+
+def boundary_links(before: int) -> int:
+    """
+    Linhas que o corte em `before` separa das suas transações.
+
+    São as despesas de um lado do corte cuja transação fica do outro (ex.:
+    compras do fim de dezembro na fatura de janeiro) e as sugestões das
+    transações arquivadas, que ficam numa tabela sem partições. `archive`
+    as arquiva (ou remove) junto com as transações.
+    """
+    from orcamento_2026.core.models import Expense, TransactionSuggestion
+
+    cutoff = date(before, 1, 1)
+    kept = Expense.objects.filter(reference_month__gte=cutoff, transaction__date__lt=cutoff).count()
+    archived = Expense.objects.filter(reference_month__lt=cutoff, transaction__date__gte=cutoff).count()
+    suggestions = TransactionSuggestion.objects.filter(transaction__date__lt=cutoff).count()
+    return kept + archived + suggestions
+
+
+def _dependents(cursor, table: str) -> list[tuple[str, str]]:
+    """Tabela e coluna das chaves estrangeiras para o id em `<tabela>_key` (ex.: despesas e sugestões da transação)."""
+    cursor.execute(
+        "SELECT c.conrelid::regclass::text, a.attname FROM pg_constraint c "
+        "JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1] "
+        "WHERE c.confrelid = to_regclass(%s) AND c.contype = 'f' AND c.conparentid = 0",
+        [key_table(table)],
+    )
+    return cursor.fetchall()
+
+
+def _archive_partition(cursor, table: str, name: str, drop: bool) -> None:
+    """Desanexa a partição e arquiva (ou remove) com ela as linhas de outras tabelas que apontam para as suas."""
+    cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+    ids = f'SELECT "id" FROM "{name}"'
+    for dependent, column in _dependents(cursor, table):
+        if not drop:
+            cursor.execute(
+                f'CREATE TABLE "{ARCHIVE_SCHEMA}"."{dependent}__{name}" AS SELECT * FROM {dependent} WHERE "{column}" IN ({ids})'
+            )
+        cursor.execute(f'DELETE FROM {dependent} WHERE "{column}" IN ({ids})')
+    cursor.execute(f'DELETE FROM "{key_table(table)}" WHERE "id" IN ({ids})')
+    if drop:
+        cursor.execute(f'DROP TABLE "{name}"')
+        return
+    # Arquivada, a partição não pode impedir exclusões nas tabelas do sistema
+    for constraint, *_ in (row for row in _constraints(cursor, name) if row[1] == "f"):
+        cursor.execute(f'ALTER TABLE "{name}" DROP CONSTRAINT "{constraint}"')
+    cursor.execute(f'ALTER TABLE "{name}" SET SCHEMA "{ARCHIVE_SCHEMA}"')
+
+
+def _refresh_derived() -> None:
+    """Recalcula os dados derivados das transações e despesas que saíram do sistema."""
+    from orcamento_2026.core.services import budgets, counters, recurring
+
+    counters.reconcile()
+    # Linhas removidas: o snapshot analítico é recarregado
+    counters.bump(counters.DATA_VERSION, counters.DATA_REWRITES)
+    budgets.rebuild()
+    recurring.refresh()
+
+
+def archive(before: int, *, drop: bool = False, dry_run: bool = False, using: str = DEFAULT_DB_ALIAS) -> list[str]:
+    """
+    Desanexa as partições dos anos anteriores a `before` das tabelas particionadas.
+
+    As partições desanexadas saem das consultas do sistema e vão para o
+    schema ARCHIVE_SCHEMA (ou são removidas, com `drop`), sem DELETE de linhas.
+    As linhas de outras tabelas ligadas às arquivadas (boundary_links) vão
+    junto, em tabelas `<tabela>__<partição>` do mesmo schema. Na mesma
+    transação, contadores, realizado dos orçamentos, cobranças recorrentes
+    e snapshot analítico são recalculados.
+
+    Args:
+        before: Primeiro ano mantido
+        drop: Remove as partições em vez de arquivá-las
+        dry_run: Apenas lista as partições que seriam arquivadas
+
+    Returns:
+        Nomes das partições arquivadas (ou removidas)
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        raise ValueError(f"Particionamento disponível apenas no PostgreSQL (banco atual: {connection.vendor})")
+
+    archived: list[str] = []
+    with db_transaction.atomic(using=using), connection.cursor() as cursor:
+        # Checagens de FK adiadas de INSERTs da mesma transação impedem o DETACH PARTITION
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        if not drop and not dry_run:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{ARCHIVE_SCHEMA}"')
+        # Despesas antes das transações: as despesas arquivadas não impedem a remoção das chaves das transações
+        for table in reversed(PARTITIONED_TABLES):
+            for year, name in sorted((_partition_years(cursor, table) or {}).items()):
+                if year >= before:
+                    continue
+                archived.append(name)
+                if dry_run:
+                    continue
+                _archive_partition(cursor, table, name, drop)
+                logger.info(f"Partição {name} {'removida' if drop else 'arquivada'}")
+        if archived and not dry_run:
+            _refresh_derived()
+    reset()
+    return archived
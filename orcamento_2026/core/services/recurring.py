@@ -0,0 +1,232 @@
+"""
+Detecção de cobranças recorrentes (assinaturas e contas fixas).
+
+As transações de débito são agrupadas por conta e memo normalizado
+(Transaction.memo_normalized) e cada grupo vira uma cobrança recorrente quando os
+intervalos entre as cobranças seguem uma cadência (mensal ou anual) e os
+valores ficam dentro de AMOUNT_TOLERANCE da mediana. Todo o cálculo é feito
+com operações vetorizadas do pandas sobre o histórico inteiro: a chave vem da
+coluna gravada na importação (ou é calculada uma vez por memo distinto para
+DataFrames montados fora do banco) e os intervalos, medianas e proporções saem
+de group-bys.
+
+`refresh` grava o resultado em RecurringCharge. Depois de cada importação
+só as transações com as chaves dos memos importados são lidas (pelo índice
+de memo_normalized) e recalculadas. Se a recorrência segue ativa depende do
+dia da consulta e é decidido na leitura (`active_charges`), não gravado.
+"""
+
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable
+
+from django.utils import timezone
+
+from orcamento_2026.core.services.utils.lazy_import import lazy_import
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+# Linhas lidas do banco por vez
+CHUNK_SIZE: int = 5000
+BULK_BATCH_SIZE: int = 1000
+# Cadência -> (intervalo mínimo e máximo em dias entre cobranças, ocorrências mínimas).
+# Duas compras parecidas com um ano de intervalo são comuns demais para contar como anuidade
+CADENCES: dict[str, tuple[int, int, int]] = {
+    "M": (25, 35, 3),
+    "A": (350, 380, 3),
+}
+# Variação aceita em torno do valor mediano (0.15 = 15%)
+AMOUNT_TOLERANCE: float = 0.15
+# Fração mínima dos intervalos na cadência e dos valores na tolerância
+MIN_REGULAR_RATIO: float = 0.8
+# Dias de atraso após a próxima cobrança prevista até a recorrência ser considerada encerrada
+GRACE_DAYS: int = 10
+FIELDS: tuple[str, ...] = ("id", "account_id", "date", "amount", "memo")
+UPDATE_FIELDS: list[str] = [
+    "description",
+    "cadence",
+    "amount",
+    "occurrences",
+    "first_date",
+    "last_date",
+    "next_date",
+    "detected_at",
+]
+
+
+def build_frame(rows: list[tuple]):
+    """
+    DataFrame das transações a partir de tuplas (id, account_id, date, amount, memo).
+
+    Returns:
+        DataFrame com id, account_id, date (datetime64), amount_cents (int64, com sinal) e memo
+    """
+    ids, accounts, dates, amounts, memos = zip(*rows) if rows else ((),) * 5
+    return pd.DataFrame(
+        {
+            "id": pd.Series(ids, dtype="int64"),
+            "account_id": pd.Series(accounts, dtype="int64"),
+            "date": pd.to_datetime(pd.Series(dates, dtype="object")),
+            "amount_cents": pd.Series([int(amount * 100) for amount in amounts], dtype="int64"),
+            "memo": pd.Series(memos, dtype="object"),
+        }
+    )
+
+
+def memo_keys(memos) -> "np.ndarray":
+    """Chave normalizada de cada memo, calculada uma vez por memo distinto."""
+    codes, uniques = pd.factorize(memos)
+    keys = np.array([normalize_memo(memo) for memo in uniques], dtype=object)
+    return keys[codes]
+
+
+def _ratio(mask, groups, denominators):
+    return mask.groupby(groups, sort=False).sum() / denominators
+
+
+def detect(frame):
+    """
+    Encontra as cobranças recorrentes no DataFrame de transações.
+
+    Args:
+        frame: DataFrame de build_frame(), opcionalmente com a coluna memo_key já calculada
+
+    Returns:
+        DataFrame com account_id, memo_key, description, cadence, amount_cents,
+        occurrences, first_date, last_date e next_date (uma linha por cobrança
+        recorrente)
+    """
+    debits = frame[frame["amount_cents"].to_numpy() < 0]
+    keys = debits["memo_key"].to_numpy() if "memo_key" in debits else memo_keys(debits["memo"])
+    debits = debits.assign(memo_key=keys, amount=-debits["amount_cents"])[keys != ""]
+    debits = debits.sort_values(["account_id", "memo_key", "date"], kind="stable", ignore_index=True)
+
+    by = [debits["account_id"], debits["memo_key"]]
+    groups = debits.groupby(by, sort=False)
+    stats = groups.agg(
+        occurrences=("id", "size"),
+        first_date=("date", "first"),
+        last_date=("date", "last"),
+        amount_cents=("amount", "median"),
+        description=("memo", "last"),
+    )
+    intervals = groups["date"].diff().dt.days
+    median_amount = groups["amount"].transform("median")
+    stable = _ratio((debits["amount"] - median_amount).abs() <= median_amount * AMOUNT_TOLERANCE, by, stats["occurrences"])
+
+    cadence = pd.Series("", index=stats.index, dtype="object")
+    for code, (low, high, min_occurrences) in CADENCES.items():
+        regular = _ratio(intervals.between(low, high), by, stats["occurrences"] - 1)
+        matches = (stats["occurrences"] >= min_occurrences) & (regular >= MIN_REGULAR_RATIO) & (cadence == "")
+        cadence[matches] = code
+    matched = (cadence != "") & (stable >= MIN_REGULAR_RATIO)
+
+    charges = stats[matched].assign(cadence=cadence[matched]).reset_index()
+    monthly = charges["cadence"].to_numpy() == "M"
+    charges["next_date"] = (charges["last_date"] + pd.DateOffset(months=1)).where(monthly, charges["last_date"] + pd.DateOffset(years=1))
+    charges["amount_cents"] = charges["amount_cents"].round().astype("int64")
+    return charges
+
+
+def _read_frame(account_ids: Iterable[int] | None = None, keys: set[str] | None = None):
+    from orcamento_2026.core.models import Transaction
+
+    # Parcelas têm fim conhecido e são projetadas à parte (services.installments)
+    transactions = Transaction.objects.filter(amount__lt=0, installment_key__isnull=True)
+    if account_ids is not None:
+        transactions = transactions.filter(account_id__in=list(account_ids))
+    if keys is not None:
+        transactions = transactions.filter(memo_normalized__in=keys)
+    rows = list(transactions.order_by().values_list(*FIELDS, "memo_normalized").iterator(chunk_size=CHUNK_SIZE))
+    frame = build_frame([row[:-1] for row in rows])
+    return frame.assign(memo_key=pd.Series([row[-1] for row in rows], dtype="object"))
+
+
+def _save(charges, scope) -> None:
+    from orcamento_2026.core.models import RecurringCharge
+
+    now = timezone.now()
+    RecurringCharge.objects.bulk_create(
+        [
+            RecurringCharge(
+                account_id=row.account_id,
+                memo_key=row.memo_key[:255],
+                description=row.description[:255],
+                cadence=row.cadence,
+                amount=Decimal(int(row.amount_cents)).scaleb(-2),
+                occurrences=row.occurrences,
+                first_date=row.first_date.date(),
+                last_date=row.last_date.date(),
+                next_date=row.next_date.date(),
+                detected_at=now,
+            )
+            for row in charges.itertuples(index=False)
+        ],
+        batch_size=BULK_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["account", "memo_key"],
+        update_fields=UPDATE_FIELDS,
+    )
+    # Grupos do escopo que deixaram de ser recorrentes
+    scope.filter(detected_at__lt=now).delete()
+
+
+def refresh(account_ids: Iterable[int] | None = None, memos: Iterable[str] | None = None) -> int:
+    """
+    Detecta as cobranças recorrentes e atualiza RecurringCharge.
+
+    Sem argumentos, analisa o histórico inteiro. Com `account_ids` e `memos`
+    (o caso da importação), lê só as transações dessas contas e recalcula só
+    os grupos das chaves desses memos.
+
+    Args:
+        account_ids: Contas a analisar (padrão: todas)
+        memos: Memos das transações novas (padrão: todos os grupos)
+
+    Returns:
+        Quantidade de cobranças recorrentes no escopo analisado
+    """
+    from orcamento_2026.core.models import RecurringCharge
+
+    keys = None
+    scope = RecurringCharge.objects.all()
+    if account_ids is not None:
+        scope = scope.filter(account_id__in=list(account_ids))
+    if memos is not None:
+        keys = {normalize_memo(memo)[:255] for memo in memos} - {""}
+        scope = scope.filter(memo_key__in=keys)
+    frame = _read_frame(account_ids, keys)
+
+    charges = detect(frame)
+    _save(charges, scope)
+    logger.info(f"Cobranças recorrentes: {len(charges)} detectadas em {len(frame)} transações")
+    return len(charges)
+
+
+def is_active(charge, today: date | None = None) -> bool:
+    """A próxima cobrança prevista, mais GRACE_DAYS de atraso, ainda não passou."""
+    return charge.next_date + timedelta(days=GRACE_DAYS) >= (today or date.today())
+
+
+def active_charges(today: date | None = None) -> list:
+    """
+    Cobranças recorrentes ativas, da maior para a menor (para o dashboard).
+
+    Args:
+        today: Data da consulta (padrão: hoje)
+    """
+    from orcamento_2026.core.models import RecurringCharge
+
+    cutoff = (today or date.today()) - timedelta(days=GRACE_DAYS)
+    return list(RecurringCharge.objects.filter(next_date__gte=cutoff).select_related("account").order_by("-amount"))
+
+
+def monthly_commitment(charges: Iterable) -> Decimal:
+    """Quanto as cobranças comprometem por mês (as anuais entram com 1/12 do valor)."""
+    total = sum((charge.amount if charge.cadence == "M" else charge.amount / 12 for charge in charges), Decimal("0"))
+    return total.quantize(Decimal("0.01"))
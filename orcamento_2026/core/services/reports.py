@@ -0,0 +1,275 @@
+"""
+Relatórios de fechamento do mês e exportação em CSV, XLSX e Parquet.
+
+As linhas saem de `values_list().iterator()` (sem instâncias de modelo) e são
+gravadas em lotes de CHUNK_SIZE, então a memória não cresce com o histórico:
+CSV com o módulo csv, XLSX com o openpyxl em modo write-only e Parquet com um
+row group do pyarrow por lote. Relatórios pivotados (mês × categoria) são
+agregados no banco e só o resultado agregado é montado em memória.
+"""
+
+import csv
+import io
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+from typing import IO, AsyncIterator, Callable, Iterator, NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet, Sum
+from django.db.models.functions import Abs
+
+from orcamento_2026.core.services.utils.date_utils import month_from_key
+from orcamento_2026.core.services.utils.lazy_import import lazy_import
+from orcamento_2026.core.services.utils.profiling import phase
+
+pa = lazy_import("pyarrow")
+openpyxl = lazy_import("openpyxl")
+
+# Linhas lidas do banco e gravadas por vez
+CHUNK_SIZE: int = 2000
+ZERO: Decimal = Decimal("0.00")
+# Tamanho aproximado, em caracteres, de cada bloco enviado no download em streaming
+STREAM_BLOCK_SIZE: int = 64 * 1024
+FORMATS: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class Column(NamedTuple):
+    """Coluna exportada: cabeçalho, tipo no Parquet ("date", "decimal", "str" ou "bool") e campo no values_list."""
+
+    header: str
+    kind: str
+    field: str = ""
+
+
+class Report:
+    """
+    Relatório exportável.
+
+    Relatórios de linhas (`queryset`) são lidos do banco em streaming; os
+    pivotados (`pivot`) recebem o período e devolvem colunas e linhas já agregadas.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        columns: list[Column] | None = None,
+        queryset: Callable[[date | None, date | None], QuerySet] | None = None,
+        pivot: Callable[[date | None, date | None], tuple[list[Column], list[tuple]]] | None = None,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self._columns = columns or []
+        self._queryset = queryset
+        self._pivot = pivot
+
+    def open(self, start: date | None = None, end: date | None = None) -> tuple[list[Column], Iterator[tuple]]:
+        """Colunas e iterador de linhas do período (datas inclusivas)."""
+        if self._pivot:
+            columns, rows = self._pivot(start, end)
+            return columns, iter(rows)
+        fields = [column.field for column in self._columns]
+        return self._columns, self._queryset(start, end).values_list(*fields).iterator(chunk_size=CHUNK_SIZE)
+
+    async def aopen(self, start: date | None = None, end: date | None = None) -> tuple[list[Column], AsyncIterator[tuple]]:
+        """Versão assíncrona de `open`, para views servidas via ASGI."""
+        columns, rows = await sync_to_async(self.open)(start, end)
+        return columns, _aiter_chunks(rows)
+
+
+async def _aiter_chunks(rows: Iterator[tuple]) -> AsyncIterator[tuple]:
+    # Cada lote é lido na thread do ORM. O aiterator() não serve: com values_list
+    # ele executa a query ainda no event loop (SynchronousOnlyOperation).
+    next_chunk = sync_to_async(lambda: list(islice(rows, CHUNK_SIZE)))
+    while chunk := await next_chunk():
+        for row in chunk:
+            yield row
+
+
+def _period(queryset: QuerySet, field: str, start: date | None, end: date | None) -> QuerySet:
+    if start:
+        queryset = queryset.filter(**{f"{field}__gte": start})
+    if end:
+        queryset = queryset.filter(**{f"{field}__lte": end})
+    return queryset
+
+
+def _expenses(start: date | None, end: date | None) -> QuerySet:
+    from orcamento_2026.core.models import Expense
+
+    return _period(Expense.objects.order_by("reference_month", "id"), "reference_month", start, end)
+
+
+def _transactions(start: date | None, end: date | None) -> QuerySet:
+    from orcamento_2026.core.models import Transaction
+
+    return _period(Transaction.objects.order_by("date", "id"), "date", start, end)
+
+
+def _category_by_month(start: date | None, end: date | None) -> tuple[list[Column], list[tuple]]:
+    """Total de despesas (não ignoradas) por mês de referência e categoria, com o total do mês."""
+    # Soma inteira de centavos agrupada pela chave AAAAMM (sem TruncMonth nem numeric)
+    totals = (
+        _expenses(start, end)
+        .filter(is_ignored=False)
+        .order_by()
+        .values_list("month_key", "subcategory__category__name")
+        .annotate(total=Sum(Abs("transaction__amount_cents")))
+    )
+    table: dict[date, dict[str, Decimal]] = defaultdict(dict)
+    for key, category, total in totals:
+        table[month_from_key(key)][category] = Decimal(total or 0).scaleb(-2)
+
+    categories = sorted({category for row in table.values() for category in row})
+    columns = [Column("mes", "date"), *(Column(category, "decimal") for category in categories), Column("total", "decimal")]
+    rows = [
+        (month, *(table[month].get(category, ZERO) for category in categories), sum(table[month].values(), ZERO)) for month in sorted(table)
+    ]
+    return columns, rows
+
+
+REPORTS: dict[str, Report] = {
+    report.name: report
+    for report in (
+        Report(
+            "despesas",
+            "Despesas com categoria, conta e valor da transação",
+            columns=[
+                Column("mes_referencia", "date", "reference_month"),
+                Column("categoria", "str", "subcategory__category__name"),
+                Column("subcategoria", "str", "subcategory__name"),
+                Column("descricao", "str", "description"),
+                Column("valor", "decimal", "transaction__amount"),
+                Column("data", "date", "transaction__date"),
+                Column("conta", "str", "transaction__account__name"),
+                Column("fitid", "str", "transaction__fitid"),
+                Column("ignorada", "bool", "is_ignored"),
+            ],
+            queryset=_expenses,
+        ),
+        Report(
+            "transacoes",
+            "Transações importadas, com a despesa consolidada (se houver)",
+            columns=[
+                Column("data", "date", "date"),
+                Column("conta", "str", "account__name"),
+                Column("valor", "decimal", "amount"),
+                Column("memo", "str", "memo"),
+                Column("fitid", "str", "fitid"),
+                Column("data_referencia", "date", "reference_date"),
+                Column("categoria", "str", "expense__subcategory__category__name"),
+                Column("subcategoria", "str", "expense__subcategory__name"),
+                Column("descricao", "str", "expense__description"),
+            ],
+            queryset=_transactions,
+        ),
+        Report("categorias_por_mes", "Total de despesas por mês e categoria (pivotado)", pivot=_category_by_month),
+    )
+}
+
+
+def _chunks(rows: Iterator[tuple], size: int | None = None) -> Iterator[list[tuple]]:
+    size = size or CHUNK_SIZE
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_csv(columns: list[Column], rows: Iterator[tuple], file: IO[str]) -> int:
+    writer = csv.writer(file)
+    writer.writerow([column.header for column in columns])
+    count = 0
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+    return count
+
+
+def write_xlsx(columns: list[Column], rows: Iterator[tuple], file: IO[bytes]) -> int:
+    # write_only grava cada linha num arquivo temporário em vez de manter a planilha em memória
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([column.header for column in columns])
+    count = 0
+    for count, row in enumerate(rows, start=1):
+        sheet.append(row)
+    workbook.save(file)
+    return count
+
+
+def _arrow_schema(columns: list[Column]):
+    types = {"date": pa.date32(), "decimal": pa.decimal128(12, 2), "str": pa.string(), "bool": pa.bool_()}
+    return pa.schema([(column.header, types[column.kind]) for column in columns])
+
+
+def write_parquet(columns: list[Column], rows: Iterator[tuple], file: IO[bytes]) -> int:
+    # Submódulo não pode ser adiado: localizá-lo já executaria o pyarrow
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(columns)
+    count = 0
+    with pq.ParquetWriter(file, schema) as writer:
+        for chunk in _chunks(rows):
+            # Um row group por lote: só o lote atual fica em memória
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(chunk)
+        if not count:
+            writer.write_table(schema.empty_table())
+    return count
+
+
+WRITERS: dict[str, Callable[[list[Column], Iterator[tuple], IO], int]] = {
+    "csv": write_csv,
+    "xlsx": write_xlsx,
+    "parquet": write_parquet,
+}
+
+
+def export(report: str, fmt: str, file: IO, start: date | None = None, end: date | None = None) -> int:
+    """
+    Exporta um relatório para um arquivo aberto.
+
+    Args:
+        report: Nome do relatório (chave de REPORTS)
+        fmt: "csv" (arquivo texto) ou "xlsx"/"parquet" (arquivo binário)
+        file: Arquivo de destino
+        start: Início do período, inclusivo (mês de referência nas despesas, data nas transações)
+        end: Fim do período, inclusivo
+
+    Returns:
+        Número de linhas exportadas (sem o cabeçalho)
+
+    Raises:
+        KeyError: Se o relatório ou o formato não existir
+    """
+    writer = WRITERS[fmt]
+    with phase("select"):
+        columns, rows = REPORTS[report].open(start, end)
+    with phase("write"):
+        return writer(columns, rows, file)
+
+
+async def astream_csv(report: str, start: date | None = None, end: date | None = None) -> AsyncIterator[bytes]:
+    """Blocos do CSV de um relatório para StreamingHttpResponse, lidos do banco com o ORM assíncrono."""
+    columns, rows = await REPORTS[report].aopen(start, end)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.header for column in columns])
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= STREAM_BLOCK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
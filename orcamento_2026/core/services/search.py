@@ -0,0 +1,240 @@
+"""Serviço de busca textual (full-text) sobre memos, descrições e nomes."""
+
+import logging
+import re
+from typing import TypeVar
+
+from django.db import connection as default_connection, connections
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Tabelas indexadas: label do modelo -> (tabela, coluna de texto)
+SEARCH_INDEXES: dict[str, tuple[str, str]] = {
+    "core.Transaction": ("core_transaction", "memo"),
+    "core.Expense": ("core_expense", "description"),
+    "core.Category": ("core_category", "name"),
+}
+
+SEARCH_CONFIG: str = "portuguese"
+SEARCH_VECTOR_COLUMN: str = "search_vector"
+UNACCENT_FUNCTION: str = "core_immutable_unaccent"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokenize(term: str | None) -> list[str]:
+    """Quebra o termo de busca em tokens alfanuméricos (descarta operadores e pontuação)."""
+    if not term:
+        return []
+    return _TOKEN_RE.findall(term)
+
+
+def _is_blank(term: str | None) -> bool:
+    return not term or not term.strip()
+
+
+def _fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+
+def _sqlite_match_expression(tokens: list[str]) -> str:
+    """Monta a expressão MATCH do FTS5: todos os tokens, com busca por prefixo."""
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _postgres_tsquery(tokens: list[str]) -> str:
+    """Monta a tsquery do PostgreSQL: todos os tokens, com busca por prefixo."""
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def _vendor(queryset: QuerySet) -> str:
+    return connections[queryset.db].vendor
+
+
+def matching_ids(model: type, term: str | None, using: str | None = None) -> RawSQL | None:
+    """
+    Retorna uma subquery com os ids do modelo que casam com o termo de busca.
+
+    Args:
+        model: Modelo indexado (ver SEARCH_INDEXES)
+        term: Termo digitado pelo usuário
+        using: Alias do banco de dados
+
+    Returns:
+        RawSQL com os ids encontrados, ou None se o banco não suporta full-text
+        (nesse caso o chamador deve cair no icontains).
+    """
+    tokens = _tokenize(term)
+    table, _ = SEARCH_INDEXES[model._meta.label]
+    vendor = connections[using or "default"].vendor
+
+    if vendor == "sqlite":
+        return RawSQL(
+            f'SELECT rowid FROM "{_fts_table(table)}" WHERE "{_fts_table(table)}" MATCH %s',
+            [_sqlite_match_expression(tokens)],
+        )
+    if vendor == "postgresql":
+        return RawSQL(
+            f'SELECT id FROM "{table}" WHERE "{SEARCH_VECTOR_COLUMN}" @@ to_tsquery(%s::regconfig, {UNACCENT_FUNCTION}(%s))',
+            [SEARCH_CONFIG, _postgres_tsquery(tokens)],
+        )
+    return None
+
+
+def _rank_expression(queryset: QuerySet, tokens: list[str]) -> RawSQL:
+    """Expressão de relevância (quanto maior, mais relevante) para a tabela do queryset."""
+    table, _ = SEARCH_INDEXES[queryset.model._meta.label]
+
+    if _vendor(queryset) == "sqlite":
+        fts = _fts_table(table)
+        return RawSQL(
+            f'(SELECT -bm25("{fts}") FROM "{fts}" WHERE "{fts}" MATCH %s AND "{fts}".rowid = "{table}"."id")',
+            [_sqlite_match_expression(tokens)],
+        )
+    return RawSQL(
+        f'ts_rank("{table}"."{SEARCH_VECTOR_COLUMN}", to_tsquery(%s::regconfig, {UNACCENT_FUNCTION}(%s)))',
+        [SEARCH_CONFIG, _postgres_tsquery(tokens)],
+    )
+
+
+def search(queryset: QuerySet[T], term: str | None, *, rank: bool = False) -> QuerySet[T]:
+    """
+    Filtra o queryset pelo termo de busca usando o índice full-text do modelo.
+
+    A busca ignora acentos e caixa, e cada palavra é tratada como prefixo
+    ("merc" encontra "Mercado"). Todas as palavras precisam estar presentes.
+    Termos sem palavras (como "*" ou "-") são buscados com icontains.
+
+    Args:
+        queryset: QuerySet de um modelo indexado (ver SEARCH_INDEXES)
+        term: Termo de busca
+        rank: Se True, anota `search_rank` e ordena pelos mais relevantes
+
+    Returns:
+        QuerySet filtrado
+    """
+    if _is_blank(term):
+        return queryset.none()
+
+    tokens = _tokenize(term)
+    ids = matching_ids(queryset.model, term, using=queryset.db) if tokens else None
+    if ids is None:
+        _, column = SEARCH_INDEXES[queryset.model._meta.label]
+        return queryset.filter(**{f"{column}__icontains": term})
+
+    queryset = queryset.filter(pk__in=ids)
+    if rank:
+        queryset = queryset.annotate(search_rank=_rank_expression(queryset, tokens)).order_by("-search_rank")
+    return queryset
+
+
+def search_expenses(queryset: QuerySet[T], term: str | None) -> QuerySet[T]:
+    """
+    Filtra despesas pela descrição ou pelo memo da transação associada.
+
+    Args:
+        queryset: QuerySet de Expense
+        term: Termo de busca
+
+    Returns:
+        QuerySet filtrado
+    """
+    from orcamento_2026.core.models import Transaction
+
+    if _is_blank(term):
+        return queryset.none()
+
+    if _tokenize(term):
+        expense_ids = matching_ids(queryset.model, term, using=queryset.db)
+        transaction_ids = matching_ids(Transaction, term, using=queryset.db)
+    else:
+        expense_ids = transaction_ids = None
+    if expense_ids is None or transaction_ids is None:
+        # Sem full-text ou sem palavras: o memo normalizado dispensa o LOWER() do icontains (senão usa o memo original)
+        memo_term = normalize_memo(term)
+        memo_query = Q(transaction__memo_normalized__contains=memo_term) if memo_term else Q(transaction__memo__icontains=term)
+        return queryset.filter(Q(description__icontains=term) | memo_query)
+
+    return queryset.filter(Q(pk__in=expense_ids) | Q(transaction_id__in=transaction_ids))
+
+
+# =============================================================================
+# Esquema dos índices
+# =============================================================================
+
+
+def _sqlite_statements(table: str, column: str) -> list[str]:
+    fts = _fts_table(table)
+    return [
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS "{fts}" USING fts5('
+        f"{column}, content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f'CREATE TRIGGER IF NOT EXISTS "{fts}_ai" AFTER INSERT ON "{table}" BEGIN '
+        f'INSERT INTO "{fts}"(rowid, {column}) VALUES (new.id, new.{column}); END',
+        f'CREATE TRIGGER IF NOT EXISTS "{fts}_ad" AFTER DELETE ON "{table}" BEGIN '
+        f'INSERT INTO "{fts}"("{fts}", rowid, {column}) VALUES (\'delete\', old.id, old.{column}); END',
+        f'CREATE TRIGGER IF NOT EXISTS "{fts}_au" AFTER UPDATE OF {column} ON "{table}" BEGIN '
+        f'INSERT INTO "{fts}"("{fts}", rowid, {column}) VALUES (\'delete\', old.id, old.{column}); '
+        f'INSERT INTO "{fts}"(rowid, {column}) VALUES (new.id, new.{column}); END',
+    ]
+
+
+def _postgres_statements(table: str, column: str) -> list[str]:
+    return [
+        f'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS "{SEARCH_VECTOR_COLUMN}" tsvector '
+        f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', {UNACCENT_FUNCTION}(coalesce(\"{column}\", '')))) STORED",
+        f'CREATE INDEX IF NOT EXISTS "{table}_search_idx" ON "{table}" USING GIN ("{SEARCH_VECTOR_COLUMN}")',
+    ]
+
+
+def _sqlite_missing_triggers(cursor, table: str) -> bool:
+    fts = _fts_table(table)
+    names = [f"{fts}_ai", f"{fts}_ad", f"{fts}_au"]
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)", names)
+    return cursor.fetchone()[0] < len(names)
+
+
+def ensure_search_schema(connection=None) -> None:
+    """
+    Cria (de forma idempotente) as estruturas de busca textual do banco.
+
+    - PostgreSQL: coluna gerada `search_vector` (config portuguese + unaccent) com índice GIN.
+    - SQLite: tabela FTS5 sombra por tabela indexada, sincronizada por triggers.
+
+    É chamada após cada `migrate`, pois o SQLite recria tabelas em algumas
+    alterações de esquema e descarta os triggers junto.
+    """
+    connection = connection or default_connection
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+            cursor.execute(
+                f"CREATE OR REPLACE FUNCTION {UNACCENT_FUNCTION}(text) RETURNS text AS "
+                "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$ "
+                "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT"
+            )
+            for table, column in SEARCH_INDEXES.values():
+                for statement in _postgres_statements(table, column):
+                    cursor.execute(statement)
+        elif connection.vendor == "sqlite":
+            for table, column in SEARCH_INDEXES.values():
+                needs_rebuild = _sqlite_missing_triggers(cursor, table)
+                for statement in _sqlite_statements(table, column):
+                    cursor.execute(statement)
+                if needs_rebuild:
+                    fts = _fts_table(table)
+                    cursor.execute(f'INSERT INTO "{fts}"("{fts}") VALUES (\'rebuild\')')
+                    logger.info(f"Índice de busca reconstruído para {table}")
+        else:
+            logger.warning(f"Busca textual indisponível para o banco '{connection.vendor}', usando icontains")
+
+
+def ensure_search_schema_on_migrate(sender, using: str = "default", **kwargs) -> None:
+    """Handler de post_migrate que garante o esquema de busca no banco migrado."""
+    ensure_search_schema(connections[using])
@@ -0,0 +1,92 @@
+"""
+Cache dos fragmentos de <option> de subcategorias usados nos selects dependentes.
+
+Os fragmentos ficam no cache local de cada processo, mas a versão que entra
+na chave é o contador CATALOG_VERSION do banco (uma query por chave
+primária): uma subcategoria alterada em um worker invalida os fragmentos e
+ETags de todos os outros na requisição seguinte, sem esperar o TTL.
+"""
+
+import hashlib
+import logging
+from typing import NamedTuple
+
+from decouple import config
+from django.core.cache import cache
+from django.utils.html import format_html_join
+
+from orcamento_2026.core.services import counters
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUT: int = config("SUBCATEGORY_OPTIONS_CACHE_TIMEOUT", default=300, cast=int)
+EMPTY_OPTION: str = '<option value="">---------</option>'
+
+
+class OptionsFragment(NamedTuple):
+    """HTML pré-renderizado das opções e seu ETag."""
+
+    html: str
+    etag: str
+
+
+def _version() -> int:
+    from orcamento_2026.core.models import Counter
+
+    return Counter.objects.filter(name=counters.CATALOG_VERSION).values_list("value", flat=True).first() or 0
+
+
+def invalidate() -> None:
+    """Invalida todos os fragmentos e o mapa categoria -> subcategorias, em todos os processos."""
+    counters.bump(counters.CATALOG_VERSION)
+    logger.debug("Cache de opções de subcategorias invalidado")
+
+
+def _render(subcategories: list[tuple[int, str]]) -> OptionsFragment:
+    html = EMPTY_OPTION + format_html_join("", '<option value="{}">{}</option>', subcategories)
+    return OptionsFragment(html=html, etag=hashlib.md5(html.encode(), usedforsecurity=False).hexdigest())
+
+
+def get_options_fragment(category_id: str | int | None) -> OptionsFragment:
+    """
+    Retorna as <option> das subcategorias da categoria, renderizadas uma única vez.
+
+    Args:
+        category_id: Id da categoria (valores inválidos retornam apenas a opção vazia)
+
+    Returns:
+        Fragmento HTML e ETag correspondente
+    """
+    from orcamento_2026.core.models import SubCategory
+
+    try:
+        category_id = int(category_id)
+    except (TypeError, ValueError):
+        return _render([])
+
+    key = f"subcategory_options:{_version()}:{category_id}"
+    fragment = cache.get(key)
+    if fragment is None:
+        subcategories = list(SubCategory.objects.filter(category_id=category_id).order_by("name").values_list("id", "name"))
+        fragment = _render(subcategories)
+        cache.set(key, tuple(fragment), CACHE_TIMEOUT)
+        return fragment
+    return OptionsFragment(*fragment)
+
+
+def get_subcategory_map() -> dict[str, list[list]]:
+    """
+    Retorna o mapa completo {id da categoria: [[id, nome], ...]} para embutir na página.
+
+    Com o mapa no HTML, trocar a categoria no formulário não exige nenhuma requisição.
+    """
+    from orcamento_2026.core.models import SubCategory
+
+    key = f"subcategory_map:{_version()}"
+    mapping = cache.get(key)
+    if mapping is None:
+        mapping = {}
+        for sub_id, category_id, name in SubCategory.objects.order_by("name").values_list("id", "category_id", "name"):
+            mapping.setdefault(str(category_id), []).append([sub_id, name])
+        cache.set(key, mapping, CACHE_TIMEOUT)
+    return mapping
@@ -1,54 +1,83 @@
 """Serviço de sugestões de IA para categorização de transações."""
 
+import asyncio
 import json
 import logging
+from typing import TYPE_CHECKING
 
-import requests
+from asgiref.sync import sync_to_async
 from decouple import config
-from django.db.models import Q
+from django.db import transaction as db_transaction
+from django.db.models import Case, Q, QuerySet, When
 
+from orcamento_2026.core.services import counters, installments
+from orcamento_2026.core.services.catalog import warm_catalog
 from orcamento_2026.core.services.utils.db_utils import case_insensitive_get
-from orcamento_2026.core.models import Transaction, TransactionSuggestion, Expense
+from orcamento_2026.core.services.utils.lazy_import import lazy_import
+from orcamento_2026.core.services.utils.profiling import phase
+from orcamento_2026.core.services.utils.query_budget import query_budget
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
+
+if TYPE_CHECKING:
+    from orcamento_2026.core.models import Expense, Transaction, TransactionSuggestion
 
 logger = logging.getLogger(__name__)
 
+# Clientes HTTP só são carregados na primeira chamada ao Ollama
+httpx = lazy_import("httpx")
+requests = lazy_import("requests")
+
 OLLAMA_URL: str = config("OLLAMA_URL", default="http://localhost:11434")
 OLLAMA_MODEL: str = config("OLLAMA_MODEL", default="qwen2.5:1.5b")
+OLLAMA_TIMEOUT: float = config("OLLAMA_TIMEOUT", default=30, cast=float)
+# Chamadas simultâneas ao Ollama na geração em lote (o Ollama enfileira o excedente)
+OLLAMA_CONCURRENCY: int = config("OLLAMA_CONCURRENCY", default=2, cast=int)
 
 
-def get_pending_suggestions() -> TransactionSuggestion:
+def get_pending_suggestions() -> "QuerySet[TransactionSuggestion]":
     """Retorna sugestões pendentes de revisão."""
-    return TransactionSuggestion.objects.filter(status="PENDENTE").select_related("transaction", "category", "subcategory")
+    from orcamento_2026.core.models import TransactionSuggestion
+
+    return TransactionSuggestion.objects.filter(status="PENDENTE").select_related("transaction__account", "category", "subcategory")
 
 
-def find_similar_expenses(description: str, limit: int = 3) -> list[Expense]:
+def find_similar_expenses(description: str, limit: int = 3, merchant_id: int | None = None) -> list["Expense"]:
     """
     Encontra despesas passadas com descrições similares.
 
-    Usa um filtro simples por conter parte da string.
+    Despesas do mesmo estabelecimento (merchant) vêm primeiro; depois, as que
+    contêm uma das duas primeiras palavras do memo normalizado (normalize_memo)
+    na coluna Transaction.memo_normalized. Uma única query.
 
     Args:
         description: Descrição para buscar similares
         limit: Número máximo de resultados
+        merchant_id: Estabelecimento da transação (opcional)
 
     Returns:
         Lista de despesas similares
     """
-    # Simplificação: pega as primeiras 2 palavras
-    parts = description.split()[:2]
+    # Simplificação: pega as primeiras 2 palavras, já sem caixa, acentos, datas e números
+    parts = normalize_memo(description).split()[:2]
     query = Q()
     for part in parts:
         if len(part) > 2:
-            query |= Q(transaction__memo__icontains=part)
+            query |= Q(transaction__memo_normalized__contains=part)
+    ordering = ["-reference_month"]
+    if merchant_id is not None:
+        query |= Q(transaction__merchant_id=merchant_id)
+        ordering.insert(0, Case(When(transaction__merchant_id=merchant_id, then=0), default=1))
 
     if not query:
         return []
 
-    return list(Expense.objects.filter(query).select_related("subcategory", "subcategory__category").order_by("-reference_month")[:limit])
+    from orcamento_2026.core.models import Expense
+
+    return list(Expense.objects.filter(query).select_related("transaction", "subcategory__category").order_by(*ordering)[:limit])
 
 
 def _build_prompt(
-    transaction: Transaction,
+    transaction: "Transaction",
     similar_expenses: list,
     categories: list,
 ) -> str:
@@ -93,12 +122,14 @@ def _build_prompt(
     """
 
 
+def _ollama_payload(prompt: str) -> dict:
+    return {"model": OLLAMA_MODEL, "prompt": prompt, "stream": False, "format": "json"}
+
+
 def _call_ollama_api(prompt: str) -> dict | None:
     """Chama a API do Ollama e retorna a resposta parseada."""
-    payload = {"model": OLLAMA_MODEL, "prompt": prompt, "stream": False, "format": "json"}
-
     try:
-        response = requests.post(f"{OLLAMA_URL}/api/generate", json=payload, timeout=30)
+        response = requests.post(f"{OLLAMA_URL}/api/generate", json=_ollama_payload(prompt), timeout=OLLAMA_TIMEOUT)
         response.raise_for_status()
         result = response.json()
         return json.loads(result["response"])
@@ -112,51 +143,146 @@ def _call_ollama_api(prompt: str) -> dict | None:
     return None
 
 
+async def _acall_ollama_api(client: "httpx.AsyncClient", prompt: str) -> dict | None:
+    """Versão assíncrona de _call_ollama_api: não ocupa uma thread enquanto o modelo responde."""
+    try:
+        response = await client.post(f"{OLLAMA_URL}/api/generate", json=_ollama_payload(prompt), timeout=OLLAMA_TIMEOUT)
+        response.raise_for_status()
+        result = response.json()
+        return json.loads(result["response"])
+    except httpx.HTTPError as e:
+        logger.error(f"Erro na chamada à API do Ollama: {e}")
+    except json.JSONDecodeError as e:
+        logger.error(f"Erro ao parsear resposta JSON: {e}")
+    except Exception as e:
+        logger.error(f"Erro inesperado na chamada à API: {e}")
+
+    return None
+
+
+def _load_categories() -> list:
+    from orcamento_2026.core.models import Category
+
+    return list(Category.objects.prefetch_related("subcategories").all())
+
+
+def _build_suggestion(transaction: "Transaction", data: dict) -> "TransactionSuggestion":
+    """Monta (sem gravar) a sugestão pendente, resolvendo categoria e subcategoria da resposta do modelo."""
+    from orcamento_2026.core.models import Category, SubCategory, TransactionSuggestion
+
+    # Tenta encontrar a categoria e subcategoria
+    category = case_insensitive_get(Category.objects.all(), "name", data.get("category"))
+    subcategory = None
+    if category:
+        subcategory = case_insensitive_get(SubCategory.objects.all(), "name", data.get("subcategory"), category=category)
+
+    return TransactionSuggestion(
+        transaction=transaction,
+        category=category,
+        subcategory=subcategory,
+        description=data.get("description"),
+        status="PENDENTE",
+    )
+
+
+@query_budget(8)
 def generate_suggestion_for_transaction(
     transaction: "Transaction",
+    categories: list | None = None,
 ) -> "TransactionSuggestion | None":
     """
     Gera uma sugestão via Ollama e salva no banco de dados.
 
     Args:
         transaction: Transação para analisar
+        categories: Categorias com subcategorias pré-carregadas, para reaproveitar
+            entre várias transações (padrão: carregadas a cada chamada)
 
     Returns:
         A sugestão criada ou None se houver erro
     """
-    from orcamento_2026.core.models import Category, TransactionSuggestion
-
     # Verifica se já existe sugestão
     if hasattr(transaction, "suggestion"):
         logger.debug(f"Sugestão já existe para transação {transaction.id}")
         return transaction.suggestion
 
-    similar_expenses = find_similar_expenses(transaction.memo)
-    categories = list(Category.objects.prefetch_related("subcategories").all())
+    with phase("similar_expenses"):
+        similar_expenses = find_similar_expenses(transaction.memo, merchant_id=transaction.merchant_id)
+        if categories is None:
+            categories = _load_categories()
 
     prompt = _build_prompt(transaction, similar_expenses, categories)
-    data = _call_ollama_api(prompt)
+    with phase("ollama"):
+        data = _call_ollama_api(prompt)
 
     if data is None:
         return None
 
-    # Tenta encontrar a categoria e subcategoria
-    category = case_insensitive_get(Category.objects.all(), "name", data.get("category"))
-    subcategory = None
-    if category:
-        subcategory = case_insensitive_get(
-            category.subcategories.all(),
-            "name",
-            data.get("subcategory"),
-        )
-
-    suggestion = TransactionSuggestion.objects.create(
-        transaction=transaction,
-        category=category,
-        subcategory=subcategory,
-        description=data.get("description"),
-        status="PENDENTE",
-    )
+    with phase("save"):
+        suggestion = _build_suggestion(transaction, data)
+        suggestion.save()
 
     logger.info(f"Sugestão gerada para transação {transaction.id}")
     return suggestion
+
+
+def _prepare_batch(limit: int) -> list[tuple["Transaction", str]]:
+    """Seleciona até `limit` transações sem sugestão e monta o prompt de cada uma."""
+    from orcamento_2026.core.models import Transaction
+
+    # Parcelas de compras já classificadas são consolidadas direto, sem passar pelo Ollama
+    installments.reuse_consolidations()
+    transactions = Transaction.objects.filter(expense__isnull=True, suggestion__isnull=True).order_by("date", "id")[:limit]
+    categories = _load_categories()
+    return [(tx, _build_prompt(tx, find_similar_expenses(tx.memo, merchant_id=tx.merchant_id), categories)) for tx in transactions]
+
+
+def _save_batch(results: list[tuple["Transaction", dict]]) -> int:
+    from orcamento_2026.core.models import Transaction, TransactionSuggestion
+
+    # Outra requisição pode ter gerado sugestões para o mesmo lote enquanto o Ollama respondia. As transações
+    # do lote ficam bloqueadas (FOR UPDATE) da consulta até o commit: a outra espera e então as encontra com sugestão
+    with db_transaction.atomic():
+        locked = Transaction.objects.select_for_update(of=("self",)).filter(id__in=[tx.id for tx, _ in results])
+        taken = {transaction_id for transaction_id, suggestion_id in locked.values_list("id", "suggestion__id") if suggestion_id}
+        with warm_catalog():
+            suggestions = [_build_suggestion(transaction, data) for transaction, data in results if transaction.id not in taken]
+        TransactionSuggestion.objects.bulk_create(suggestions)
+        # bulk_create não dispara os sinais que mantêm os contadores
+        counters.adjust(counters.PENDING_SUGGESTIONS, len(suggestions))
+    logger.info(f"{len(suggestions)} sugestões geradas")
+    return len(suggestions)
+
+
+# Inclui o SAVEPOINT/RELEASE da gravação do lote quando chamado dentro de uma transação (como nos testes)
+@query_budget(21)
+async def agenerate_suggestions(limit: int = 10) -> int:
+    """
+    Gera sugestões para até `limit` transações sem sugestão, consultando o Ollama em paralelo.
+
+    O acesso ao banco roda em sync_to_async; as chamadas HTTP são assíncronas
+    (até OLLAMA_CONCURRENCY simultâneas), então a espera pelo modelo não ocupa
+    threads do servidor.
+
+    Args:
+        limit: Número máximo de transações processadas
+
+    Returns:
+        Quantidade de sugestões criadas
+    """
+    batch = await sync_to_async(_prepare_batch)(limit)
+    if not batch:
+        return 0
+
+    semaphore = asyncio.Semaphore(OLLAMA_CONCURRENCY)
+
+    async def call(client: "httpx.AsyncClient", prompt: str) -> dict | None:
+        async with semaphore:
+            return await _acall_ollama_api(client, prompt)
+
+    with phase("ollama"):
+        async with httpx.AsyncClient() as client:
+            responses = await asyncio.gather(*(call(client, prompt) for _, prompt in batch))
+
+    results = [(tx, data) for (tx, _), data in zip(batch, responses) if data is not None]
+    return await sync_to_async(_save_batch)(results)
@@ -0,0 +1,226 @@
+"""Geração de dados sintéticos (banco e arquivos OFX) para testes de carga e benchmarks."""
+
+import io
+import logging
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, TextIO
+
+from django.core.management import call_command
+
+from orcamento_2026.core.services import budgets, counters
+from orcamento_2026.core.services.utils.date_utils import month_key
+from orcamento_2026.core.services.utils.text_utils import normalize_memo, strip_accents
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE: int = 5_000
+MERCHANTS: int = 400
+
+# Padrões de memo por subcategoria; as demais usam DEFAULT_MEMOS
+MEMO_PATTERNS: dict[str, list[str]] = {
+    "Supermercado": ["SUPERMERCADO {merchant}", "COMPRA CARTAO {merchant} MERCADO"],
+    "Restaurante": ["RESTAURANTE {merchant}", "PAG*{merchant}"],
+    "Delivery": ["IFOOD *{merchant}", "RAPPI*{merchant}"],
+    "Abastecimento": ["POSTO {merchant}", "AUTO POSTO {merchant}"],
+    "Transporte APP": ["UBER *TRIP", "99APP *CORRIDA"],
+    "Farmácia": ["DROGARIA {merchant}", "FARMACIA {merchant}"],
+    "Streaming": ["NETFLIX.COM", "SPOTIFY", "DISNEY PLUS"],
+    "Tarifas": ["TARIFA PACOTE SERVICOS", "ANUIDADE CARTAO"],
+    "Energia": ["PAGTO CONTA ENERGIA {merchant}"],
+    "Internet": ["DEBITO AUT INTERNET {merchant}"],
+}
+DEFAULT_MEMOS: list[str] = ["COMPRA CARTAO {merchant}", "PIX ENVIADO {merchant}", "PAG*{merchant}"]
+
+OFX_HEADER: str = """OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+SECURITY:NONE
+ENCODING:USASCII
+CHARSET:1252
+COMPRESSION:NONE
+OLDFILEUID:NONE
+NEWFILEUID:NONE
+
+"""
+
+
+def _faker(seed: int | None) -> "Faker":
+    """Cria o Faker (dependência de desenvolvimento, importada só quando usada)."""
+    from faker import Faker
+
+    faker = Faker("pt_BR")
+    if seed is not None:
+        faker.seed_instance(seed)
+    return faker
+
+
+def _merchants(faker: "Faker", count: int) -> list[str]:
+    """Nomes de estabelecimentos em caixa alta e sem acentos, como nos extratos."""
+    return [strip_accents(faker.company().split(" ")[0]).upper()[:20] for _ in range(count)]
+
+
+def _memo(rng: random.Random, subcategory_name: str, merchants: list[str]) -> str:
+    pattern = rng.choice(MEMO_PATTERNS.get(subcategory_name, DEFAULT_MEMOS))
+    return pattern.format(merchant=rng.choice(merchants))
+
+
+def _amount(rng: random.Random) -> Decimal:
+    # Distribuição log-normal: muitas compras pequenas e poucas grandes
+    return -Decimal(f"{min(rng.lognormvariate(4, 1), 20_000):.2f}")
+
+
+def generate_dataset(
+    transactions: int,
+    *,
+    months: int = 24,
+    consolidated_ratio: float = 0.6,
+    suggestion_ratio: float = 0.3,
+    seed: int | None = None,
+    anchor: date | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> dict[str, int]:
+    """
+    Gera contas, categorias, transações, despesas e sugestões sintéticas.
+
+    As contas e categorias vêm do comando `popular`. As transações são
+    inseridas em lotes com bulk_create, ajustando os contadores a cada lote.
+    Com a mesma `seed` e a mesma `anchor`, os dados (inclusive os FITIDs) são
+    idênticos entre execuções; por isso, repetir a semente no mesmo banco
+    colide com os FITIDs já gerados.
+
+    Args:
+        transactions: Número de transações a gerar
+        months: Quantos meses para trás as datas se espalham
+        consolidated_ratio: Fração das transações que vira despesa
+        suggestion_ratio: Fração das transações restantes que recebe sugestão pendente
+        seed: Semente para resultados reproduzíveis
+        anchor: Data mais recente das transações (padrão: hoje)
+        progress: Função chamada com o total gerado após cada lote
+
+    Returns:
+        Dicionário com a quantidade de transações, despesas e sugestões criadas
+    """
+    from orcamento_2026.core.models import Account, Expense, SubCategory, Transaction, TransactionSuggestion
+
+    call_command("popular", stdout=io.StringIO())
+
+    faker = _faker(seed)
+    rng = random.Random(seed)
+    merchants = _merchants(faker, MERCHANTS)
+    accounts = list(Account.objects.all())
+    subcategories = list(SubCategory.objects.select_related("category"))
+    anchor = anchor or date.today()
+    # Prefixo dos FITIDs derivado da semente: sem semente, cada execução tem o seu
+    run_id = f"{rng.getrandbits(32):08x}"
+
+    stats = {"transactions": 0, "expenses": 0, "suggestions": 0}
+    for start in range(0, transactions, BATCH_SIZE):
+        size = min(BATCH_SIZE, transactions - start)
+        chosen = [rng.choice(subcategories) for _ in range(size)]
+        batch = [
+            Transaction(
+                account=rng.choice(accounts),
+                fitid=f"syn-{run_id}-{start + i}",
+                amount=_amount(rng),
+                date=anchor - timedelta(days=rng.randrange(months * 30)),
+                memo=_memo(rng, subcategory.name, merchants),
+            )
+            for i, subcategory in enumerate(chosen)
+        ]
+        # bulk_create não chama save(), que preenche os centavos e o memo normalizado
+        for tx in batch:
+            tx.amount_cents = int(tx.amount * 100)
+            tx.memo_normalized = normalize_memo(tx.memo)[:255]
+        Transaction.objects.bulk_create(batch)
+
+        expenses, suggestions = [], []
+        for tx, subcategory in zip(batch, chosen):
+            if rng.random() < consolidated_ratio:
+                expenses.append(
+                    Expense(
+                        transaction=tx,
+                        subcategory=subcategory,
+                        description=tx.memo.title(),
+                        reference_month=tx.date.replace(day=1),
+                        month_key=month_key(tx.date),
+                    )
+                )
+            elif rng.random() < suggestion_ratio:
+                suggestions.append(
+                    TransactionSuggestion(
+                        transaction=tx,
+                        category=subcategory.category,
+                        subcategory=subcategory,
+                        description=tx.memo.title(),
+                    )
+                )
+        Expense.objects.bulk_create(expenses)
+        TransactionSuggestion.objects.bulk_create(suggestions)
+
+        # bulk_create não dispara os sinais que mantêm os contadores
+        counters.adjust(counters.UNCONSOLIDATED_TRANSACTIONS, len(batch) - len(expenses))
+        counters.adjust(counters.PENDING_SUGGESTIONS, len(suggestions))
+        counters.adjust(counters.DATA_VERSION, len(expenses))
+        budgets.record_many(
+            budgets.contribution(expense.subcategory_id, expense.reference_month, expense.transaction.amount, expense.is_ignored)
+            for expense in expenses
+        )
+
+        stats["transactions"] += len(batch)
+        stats["expenses"] += len(expenses)
+        stats["suggestions"] += len(suggestions)
+        if progress:
+            progress(stats["transactions"])
+
+    logger.info(f"Dados sintéticos gerados: {stats}")
+    return stats
+
+
+def write_ofx(target: str | Path | TextIO, transactions: int, *, seed: int | None = None, end_date: date | None = None) -> None:
+    """
+    Escreve um extrato OFX (SGML 1.02) sintético, legível pelo ofxparse.
+
+    Args:
+        target: Caminho do arquivo ou arquivo texto aberto
+        transactions: Número de lançamentos no extrato
+        seed: Semente para resultados reproduzíveis
+        end_date: Data do último lançamento (padrão: hoje)
+    """
+    if not isinstance(target, (str, Path)):
+        _write_ofx(target, transactions, seed, end_date or date.today())
+        return
+    with open(target, "w", encoding="ascii") as f:
+        _write_ofx(f, transactions, seed, end_date or date.today())
+
+
+def _write_ofx(f: TextIO, transactions: int, seed: int | None, end_date: date) -> None:
+    faker = _faker(seed)
+    rng = random.Random(seed)
+    merchants = _merchants(faker, MERCHANTS)
+    subcategory_names = [*MEMO_PATTERNS, "Outros"]
+    start_date = end_date - timedelta(days=max(transactions // 10, 30))
+    run_id = f"{rng.getrandbits(32):08x}"
+
+    f.write(OFX_HEADER)
+    f.write(
+        "<OFX><SIGNONMSGSRSV1><SONRS><STATUS><CODE>0<SEVERITY>INFO</STATUS>"
+        f"<DTSERVER>{end_date:%Y%m%d}<LANGUAGE>POR</SONRS></SIGNONMSGSRSV1>\n"
+        "<BANKMSGSRSV1><STMTTRNRS><TRNUID>1<STATUS><CODE>0<SEVERITY>INFO</STATUS><STMTRS><CURDEF>BRL\n"
+        "<BANKACCTFROM><BANKID>001<ACCTID>00000-0<ACCTTYPE>CHECKING</BANKACCTFROM>\n"
+        f"<BANKTRANLIST><DTSTART>{start_date:%Y%m%d}<DTEND>{end_date:%Y%m%d}\n"
+    )
+    span = (end_date - start_date).days + 1
+    for i in range(transactions):
+        posted = start_date + timedelta(days=rng.randrange(span))
+        memo = _memo(rng, rng.choice(subcategory_names), merchants)
+        f.write(
+            f"<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>{posted:%Y%m%d}120000<TRNAMT>{_amount(rng)}"
+            f"<FITID>ofx-{run_id}-{i}<MEMO>{memo}</STMTTRN>\n"
+        )
+    f.write(f"</BANKTRANLIST><LEDGERBAL><BALAMT>0.00<DTASOF>{end_date:%Y%m%d}</LEDGERBAL>" "</STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n")
@@ -0,0 +1,171 @@
+"""
+Transferências entre contas e pagamentos de fatura.
+
+O pagamento da fatura do cartão aparece duas vezes: como um débito grande
+na conta corrente e como um crédito no cartão, cujas compras já estão
+lançadas uma a uma. Pares de transações de contas diferentes com valores
+opostos e datas próximas são consolidados como despesas ignoradas, para
+não somarem nos totais.
+
+O pareamento é um hash join pelo valor absoluto (em centavos) seguido de
+um sort-merge por data dentro de cada valor: débitos e créditos em ordem de
+data, com um ponteiro que descarta os créditos que ficaram antes da janela.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from django.conf import settings
+
+from orcamento_2026.core.services.utils.text_utils import normalize_key
+
+if TYPE_CHECKING:
+    from orcamento_2026.core.models import SubCategory, Transaction
+
+logger = logging.getLogger(__name__)
+
+# Classificação das despesas ignoradas criadas para os pares (criadas se não existirem)
+TRANSFER_CATEGORY: str = "Financeiro"
+TRANSFER_SUBCATEGORY: str = "Transferências"
+
+
+class Candidate(NamedTuple):
+    """Transação candidata a um par: valor com sinal, em centavos."""
+
+    id: int
+    account_id: int
+    date: date
+    cents: int
+
+
+def _nearest_credit(
+    debit: Candidate, credits: list[Candidate], start: int, window: timedelta, used: set[int], new_ids: set[int] | None
+) -> Candidate | None:
+    """Crédito livre de data mais próxima do débito, percorrendo a janela a partir de `start`."""
+    best = None
+    for index in range(start, len(credits)):
+        credit = credits[index]
+        if credit.date > debit.date + window:
+            break
+        if credit.id in used or credit.account_id == debit.account_id:
+            continue
+        if new_ids is not None and debit.id not in new_ids and credit.id not in new_ids:
+            continue
+        if best is None or abs(credit.date - debit.date) < abs(best.date - debit.date):
+            best = credit
+    return best
+
+
+def pair(candidates: Iterable[Candidate], window_days: int, new_ids: set[int] | None = None) -> list[tuple[int, int]]:
+    """
+    Pareia débitos e créditos de mesmo valor absoluto, de contas diferentes, com até `window_days` dias de distância.
+
+    Cada débito fica com o crédito livre de data mais próxima; cada transação
+    entra em no máximo um par.
+
+    Args:
+        candidates: Transações candidatas
+        window_days: Distância máxima, em dias, entre as datas do par
+        new_ids: Se informado, só pares com pelo menos uma destas transações
+
+    Returns:
+        Lista de (id do débito, id do crédito)
+    """
+    groups: dict[int, list[Candidate]] = defaultdict(list)
+    for candidate in candidates:
+        if candidate.cents:
+            groups[abs(candidate.cents)].append(candidate)
+
+    window = timedelta(days=window_days)
+    pairs: list[tuple[int, int]] = []
+    for group in groups.values():
+        credits = sorted((candidate for candidate in group if candidate.cents > 0), key=lambda candidate: candidate.date)
+        if not credits or len(credits) == len(group):
+            continue
+        debits = sorted((candidate for candidate in group if candidate.cents < 0), key=lambda candidate: candidate.date)
+
+        used: set[int] = set()
+        start = 0
+        for debit in debits:
+            # Débitos em ordem de data: créditos antes da janela deste débito ficam antes da janela dos próximos
+            while start < len(credits) and credits[start].date < debit.date - window:
+                start += 1
+            credit = _nearest_credit(debit, credits, start, window, used, new_ids)
+            if credit is not None:
+                used.add(credit.id)
+                pairs.append((debit.id, credit.id))
+    return pairs
+
+
+def _cents(amount: Decimal) -> int:
+    return int(amount * 100)
+
+
+def _transfer_subcategory() -> "SubCategory":
+    """Subcategoria das transferências, criada na primeira vez."""
+    from orcamento_2026.core.models import Category, SubCategory
+
+    category, _ = Category.objects.get_or_create(name_key=normalize_key(TRANSFER_CATEGORY), defaults={"name": TRANSFER_CATEGORY})
+    subcategory, _ = SubCategory.objects.get_or_create(
+        category=category, name_key=normalize_key(TRANSFER_SUBCATEGORY), defaults={"name": TRANSFER_SUBCATEGORY}
+    )
+    return subcategory
+
+
+def _description(debit: "Transaction", credit: "Transaction") -> str:
+    if credit.account.type == "K":
+        return f"Pagamento de fatura {credit.account.name} ({debit.account.name})"
+    return f"Transferência {debit.account.name} -> {credit.account.name}"
+
+
+def match(transactions: Iterable["Transaction"] | None = None, window_days: int | None = None) -> int:
+    """
+    Encontra transferências e pagamentos de fatura e os consolida como despesas ignoradas.
+
+    Só transações sem despesa e que não são parcelas entram no pareamento.
+
+    Args:
+        transactions: Transações recém-importadas; os pares precisam incluir pelo
+            menos uma delas, e só o intervalo de datas delas (mais a janela) é lido
+            (padrão: todo o histórico)
+        window_days: Distância máxima entre as datas do par (padrão: settings.TRANSFER_WINDOW_DAYS)
+
+    Returns:
+        Quantidade de pares encontrados
+    """
+    from orcamento_2026.core.models import Transaction
+    from orcamento_2026.core.services.consolidation import ConsolidationItem, consolidate_transactions
+
+    window_days = settings.TRANSFER_WINDOW_DAYS if window_days is None else window_days
+    queryset = Transaction.objects.filter(expense__isnull=True, installment_key__isnull=True)
+    new_ids = None
+    if transactions is not None:
+        new = [tx for tx in transactions if not tx.installment_key]
+        if not new:
+            return 0
+        new_ids = {tx.id for tx in new}
+        window = timedelta(days=window_days)
+        queryset = queryset.filter(date__gte=min(tx.date for tx in new) - window, date__lte=max(tx.date for tx in new) + window)
+
+    candidates = (
+        Candidate(pk, account_id, day, _cents(amount))
+        for pk, account_id, day, amount in queryset.values_list("id", "account_id", "date", "amount")
+    )
+    pairs = pair(candidates, window_days, new_ids)
+    if not pairs:
+        return 0
+
+    loaded = Transaction.objects.select_related("account").in_bulk([pk for ids in pairs for pk in ids])
+    subcategory = _transfer_subcategory()
+    items = []
+    for debit_id, credit_id in pairs:
+        debit, credit = loaded[debit_id], loaded[credit_id]
+        description = _description(debit, credit)
+        for tx in (debit, credit):
+            items.append(ConsolidationItem(tx, subcategory, description, tx.reference_date or tx.date, is_ignored=True))
+    consolidate_transactions(items)
+    logger.info(f"{len(pairs)} transferências entre contas consolidadas como despesas ignoradas")
+    return len(pairs)
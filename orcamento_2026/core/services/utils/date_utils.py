@@ -1,33 +1,63 @@
 """Utilitários para manipulação de datas."""
 
+from calendar import monthrange
 from datetime import date
 
 from dateutil.relativedelta import relativedelta
+from django.conf import settings
+
+
+def month_key(day: date) -> int:
+    """Mês da data como inteiro AAAAMM (2026-03-15 -> 202603), chave de agrupamento das agregações mensais."""
+    return day.year * 100 + day.month
+
+
+def month_from_key(key: int) -> date:
+    """Dia 1 do mês de uma chave AAAAMM (202603 -> 2026-03-01)."""
+    return date(key // 100, key % 100, 1)
+
+
+def reference_month(day: date, closing_day: int) -> date:
+    """
+    Retorna o mês de referência (dia 1) da fatura em que cai uma compra.
+
+    Compras até o dia de fechamento entram na fatura do próprio mês; depois
+    dele, na do mês seguinte. Fechamento após o fim do mês (ex.: 31 em
+    fevereiro) vale como o último dia; 31 equivale ao mês civil.
+
+    Args:
+        day: Data da compra
+        closing_day: Dia de fechamento do ciclo (1 a 31)
+    """
+    month = day.replace(day=1)
+    if day.day <= min(closing_day, monthrange(day.year, day.month)[1]):
+        return month
+    return month + relativedelta(months=1)
 
 
 def get_period_options(
     base_date: date | None = None,
     num_options: int = 3,
-    ref_day: int = 20,
+    closing_day: int | None = None,
 ) -> list[tuple[date, str]]:
     """
-    Retorna uma lista de opções de datas de referência baseadas na data base.
+    Retorna uma lista de opções de mês de referência baseadas na data base.
 
-    As opções são: mês passado, mês corrente, próximo mês.
+    As opções são: mês passado, mês corrente, próximo mês. O mês corrente é
+    o do ciclo de faturamento que contém a data base.
 
     Args:
         base_date: Data base para o cálculo. Se None, usa o dia atual.
         num_options: Número de opções a retornar (default 3).
-        ref_day: Dia do mês para usar como referência.
+        closing_day: Dia de fechamento do ciclo (padrão: settings.BILLING_CLOSING_DAY).
 
     Returns:
-        Lista de tuplas (data_referencia, label_descritiva)
+        Lista de tuplas (mes_referencia, label_descritiva), com o mês no dia 1
     """
     if base_date is None:
         base_date = date.today()
 
-    # Normaliza para o dia de referência do mês
-    current_month = base_date.replace(day=ref_day)
+    current_month = reference_month(base_date, closing_day or settings.BILLING_CLOSING_DAY)
 
     options: list[tuple[date, str]] = []
 
@@ -2,18 +2,33 @@
 
 from typing import TypeVar
 
+from django.core.exceptions import FieldDoesNotExist
 from django.db.models import QuerySet
 from django.db.models.functions import Lower
 
+from orcamento_2026.core.services.utils.text_utils import normalize_key
+
 T = TypeVar("T")
 
 
+def _key_field(queryset: QuerySet, field_name: str) -> str | None:
+    """Retorna o nome da coluna normalizada (`<campo>_key`) do modelo, se existir."""
+    key_field = f"{field_name}_key"
+    try:
+        queryset.model._meta.get_field(key_field)
+    except FieldDoesNotExist:
+        return None
+    return key_field
+
+
 def case_insensitive_lookup(queryset: QuerySet[T], field_name: str, value: str | None) -> QuerySet[T]:
     """
     Realiza um lookup case-insensitive que funciona corretamente com caracteres acentuados.
 
-    O __iexact padrão do SQLite pode ter problemas com acentos em maiúsculo.
-    Esta função usa Lower() annotation para garantir comparação case-insensitive correta.
+    Quando o modelo possui a coluna normalizada `<campo>_key` (ex.: Category.name_key),
+    o lookup é uma igualdade simples sobre ela, atendida pelo índice único e
+    insensível também a acentos. Nos demais modelos usa Lower() annotation, já que
+    o __iexact padrão do SQLite pode ter problemas com acentos em maiúsculo.
 
     Args:
         queryset: QuerySet do Django
@@ -26,6 +41,10 @@ def case_insensitive_lookup(queryset: QuerySet[T], field_name: str, value: str |
     if value is None:
         return queryset.none()
 
+    key_field = _key_field(queryset, field_name)
+    if key_field:
+        return queryset.filter(**{key_field: normalize_key(value)})
+
     # Usa Lower() para garantir comparação case-insensitive correta
     return queryset.annotate(_lower_field=Lower(field_name)).filter(_lower_field=value.lower())
 
@@ -39,6 +58,9 @@ def case_insensitive_get(
     """
     Obtém um objeto usando lookup case-insensitive.
 
+    Dentro de um bloco `warm_catalog()`, categorias e subcategorias são
+    resolvidas em memória, sem query.
+
     Args:
         queryset: QuerySet do Django
         field_name: Nome do campo para filtrar
@@ -48,10 +70,21 @@ def case_insensitive_get(
     Returns:
         Objeto encontrado ou None
     """
+    from orcamento_2026.core.services.catalog import MISSING, current_catalog
+
+    if value is None:
+        return None
+
+    catalog = current_catalog()
+    if catalog is not None:
+        found = catalog.lookup(queryset, field_name, value, kwargs)
+        if found is not MISSING:
+            return found
+
     filtered = case_insensitive_lookup(queryset, field_name, value)
 
     # Aplica filtros adicionais
-    for key, val in kwargs.items():
-        filtered = filtered.filter(**{key: val})
+    if kwargs:
+        filtered = filtered.filter(**kwargs)
 
     return filtered.first()
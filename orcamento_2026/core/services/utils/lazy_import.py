@@ -0,0 +1,66 @@
+"""
+Importação adiada de bibliotecas pesadas.
+
+plotly, requests, httpx e ofxparse levam dezenas de milissegundos cada para
+importar e só são usados por algumas views e comandos. `lazy_import` devolve
+o módulo sem executá-lo: o import real acontece no primeiro acesso a um
+atributo, então o custo sai do boot de cada worker.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+# Módulos adiados pela aplicação; warm_up() os carrega antes do fork com --preload
+LAZY_MODULES: set[str] = set()
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Retorna o módulo `name`, adiando sua execução até o primeiro acesso a um atributo.
+
+    Se o módulo já foi importado, retorna o próprio módulo. O módulo adiado é
+    registrado em sys.modules, então `import name` em outro lugar recebe o
+    mesmo objeto (e `mock.patch("pacote.modulo.name.atributo")` continua funcionando).
+
+    Em submódulos ("pacote.modulo") o pacote pai é importado na hora: só
+    vale a pena quando o pai é leve (caso do plotly, que já adia os seus).
+
+    Args:
+        name: Nome completo do módulo (ex.: "plotly.utils")
+
+    Returns:
+        Módulo (carregado ou adiado)
+
+    Raises:
+        ModuleNotFoundError: Se o módulo não estiver instalado
+    """
+    LAZY_MODULES.add(name)
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def is_loaded(name: str) -> bool:
+    """Indica se o módulo já foi executado (importado e não apenas adiado)."""
+    module = sys.modules.get(name)
+    if module is None:
+        return False
+    # Enquanto adiado, o módulo é um _LazyModule; ao carregar, vira um módulo comum
+    return type(module) is not importlib.util._LazyModule
+
+
+def load(name: str) -> ModuleType:
+    """Força a execução de um módulo adiado (qualquer acesso a atributo o carrega)."""
+    module = sys.modules[name]
+    module.__name__  # qualquer atributo dispara o carregamento
+    return module
@@ -0,0 +1,217 @@
+"""
+Profiling dos comandos de gerenciamento.
+
+`ProfiledCommandMixin` adiciona aos comandos as opções --profile (cProfile),
+--trace-sql (queries e tempo de banco) e --memory (tracemalloc). O código
+marca fases com `phase("nome")`: fora de uma execução com profiling o
+context manager não faz nada, então serviços também podem usá-lo.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import ContextManager, Iterator
+
+from django.conf import settings
+from django.db import connections
+
+# Queries executadas fora de qualquer fase
+OUTSIDE: str = "(fora de fases)"
+
+_active: ContextVar["Profiler | None"] = ContextVar("profiler", default=None)
+
+
+class PhaseStats:
+    """Medições acumuladas de uma fase (somadas entre chamadas)."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.db_duration = 0.0
+        self.memory_peak = 0
+
+
+class Profiler:
+    """
+    Coleta tempo, queries e pico de memória por fase.
+
+    O tempo de uma fase inclui o das fases aninhadas; queries são atribuídas
+    à fase mais interna em execução.
+    """
+
+    def __init__(self, *, trace_sql: bool = False, memory: bool = False, cprofile: bool = False) -> None:
+        self.trace_sql = trace_sql
+        self.memory = memory
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self.phases: dict[str, PhaseStats] = {}
+        self.duration = 0.0
+        self.memory_peak = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+        # Fases em execução com o maior pico de memória observado em cada uma
+        self._stack: list[list] = []
+
+    def _stats(self, name: str) -> PhaseStats:
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        return stats
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats = self._stats(self._stack[-1][0] if self._stack else OUTSIDE)
+            stats.queries += 1
+            stats.db_duration += time.perf_counter() - start
+
+    def _fold_memory_peak(self) -> None:
+        # reset_peak() é global: o pico atual é repassado a todas as fases abertas antes de zerá-lo
+        peak = tracemalloc.get_traced_memory()[1]
+        self.memory_peak = max(self.memory_peak, peak)
+        for entry in self._stack:
+            entry[1] = max(entry[1], peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if self.memory:
+            self._fold_memory_peak()
+        self._stack.append([name, 0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.memory:
+                self._fold_memory_peak()
+            _, peak = self._stack.pop()
+            stats = self._stats(name)
+            stats.calls += 1
+            stats.duration += elapsed
+            stats.memory_peak = max(stats.memory_peak, peak)
+
+    @contextmanager
+    def activate(self) -> Iterator["Profiler"]:
+        """Liga as medições pedidas e torna o profiler visível para `phase()`."""
+        token = _active.set(self)
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            if self.trace_sql:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self))
+            if self.memory:
+                tracemalloc.start()
+            if self.cprofile:
+                self.cprofile.enable()
+            try:
+                yield self
+            finally:
+                if self.cprofile:
+                    self.cprofile.disable()
+                if self.memory:
+                    self._fold_memory_peak()
+                    self.snapshot = tracemalloc.take_snapshot()
+                    tracemalloc.stop()
+                self.duration = time.perf_counter() - start
+                _active.reset(token)
+
+    def report(self, top: int = 20) -> list[str]:
+        """Linhas do relatório: tabela de fases, funções mais caras e maiores alocações."""
+        return [*self._phase_table(), *self._function_table(top), *self._allocation_table(top)]
+
+    def _row(self, name: str, calls: object, duration: float, queries: object, db_duration: float, memory_peak: int) -> str:
+        line = f"  {name:<20} {calls:>8} {duration:>10.3f}"
+        if self.trace_sql:
+            line += f" {queries:>8} {db_duration:>10.3f}"
+        if self.memory:
+            line += f" {memory_peak / 2**20:>10.1f}"
+        return line
+
+    def _phase_table(self) -> list[str]:
+        """Tempo, queries e pico de memória por fase, com a linha de total."""
+        header = f"  {'fase':<20} {'chamadas':>8} {'tempo (s)':>10}"
+        if self.trace_sql:
+            header += f" {'queries':>8} {'banco (s)':>10}"
+        if self.memory:
+            header += f" {'pico (MiB)':>10}"
+        lines = ["Fases:", header]
+        for name, stats in self.phases.items():
+            lines.append(self._row(name, stats.calls, stats.duration, stats.queries, stats.db_duration, stats.memory_peak))
+        phases = self.phases.values()
+        lines.append(
+            self._row("total", "", self.duration, sum(s.queries for s in phases), sum(s.db_duration for s in phases), self.memory_peak)
+        )
+        return lines
+
+    def _function_table(self, top: int) -> list[str]:
+        """Funções mais caras pelo cProfile (tempo acumulado)."""
+        if not self.cprofile:
+            return []
+        stream = io.StringIO()
+        pstats.Stats(self.cprofile, stream=stream).sort_stats("cumulative").print_stats(top)
+        return ["", f"Funções mais caras (top {top}, tempo acumulado):", stream.getvalue().strip("\n")]
+
+    def _allocation_table(self, top: int) -> list[str]:
+        """Maiores alocações do snapshot do tracemalloc."""
+        if not self.snapshot:
+            return []
+        return ["", f"Maiores alocações (top {top}):", *(f"  {statistic}" for statistic in self.snapshot.statistics("lineno")[:top])]
+
+
+def phase(name: str) -> ContextManager:
+    """Marca uma fase do profiling em andamento; sem profiling ativo, não faz nada."""
+    profiler = _active.get()
+    return profiler.phase(name) if profiler else nullcontext()
+
+
+class ProfiledCommandMixin:
+    """
+    Adiciona --profile, --trace-sql e --memory a um BaseCommand.
+
+    Com qualquer uma das opções, o comando roda sob um Profiler e, ao final,
+    imprime o tempo por fase. --profile grava as estatísticas do cProfile em
+    um arquivo .prof (abrível com snakeviz ou pstats).
+    """
+
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        group = parser.add_argument_group("profiling")
+        group.add_argument("--profile", action="store_true", help="Executa sob o cProfile e grava as estatísticas em um arquivo .prof")
+        group.add_argument("--profile-output", default=None, help="Arquivo .prof (padrão: benchmarks/<comando>-<data>.prof)")
+        group.add_argument("--trace-sql", action="store_true", help="Conta queries e tempo de banco por fase")
+        group.add_argument("--memory", action="store_true", help="Mede o pico de memória e as maiores alocações (tracemalloc)")
+        group.add_argument("--top", type=int, default=20, help="Quantidade de funções e alocações no relatório")
+        return parser
+
+    def execute(self, *args, **options):
+        if not (options.get("profile") or options.get("trace_sql") or options.get("memory")):
+            return super().execute(*args, **options)
+
+        profiler = Profiler(trace_sql=options["trace_sql"], memory=options["memory"], cprofile=options["profile"])
+        try:
+            with profiler.activate():
+                return super().execute(*args, **options)
+        finally:
+            self.write_profile(profiler, options)
+
+    def write_profile(self, profiler: Profiler, options: dict) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING("\nProfiling"))
+        self.stdout.write("\n".join(profiler.report(options["top"])))
+
+        if profiler.cprofile:
+            path = Path(options["profile_output"] or self._default_profile_path())
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.cprofile.dump_stats(path)
+            self.stdout.write(f"\nEstatísticas do cProfile gravadas em {path}")
+
+    def _default_profile_path(self) -> Path:
+        command = self.__module__.rsplit(".", 1)[-1]
+        return Path(settings.BASE_DIR) / "benchmarks" / f"{command}-{datetime.now():%Y%m%d-%H%M%S}.prof"
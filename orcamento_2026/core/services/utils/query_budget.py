@@ -0,0 +1,153 @@
+"""
+Orçamentos de queries por view e por função de serviço.
+
+`@query_budget(n)` declara quantas queries uma view ou função pode executar,
+independentemente do volume de dados. O orçamento inclui as queries das
+funções chamadas. Com QUERY_BUDGETS_ENFORCED=True (ligado nos testes), exceder
+o orçamento levanta QueryBudgetExceeded listando o SQL executado; desligado, o
+decorator só faz uma checagem de configuração por chamada.
+
+Views que retornam TemplateResponse (ListView, DetailView...) só consultam a
+página e os objetos do template ao renderizar, depois do retorno da view:
+com o orçamento ligado, a resposta é renderizada dentro da medição, para que
+N+1 no template contem no orçamento.
+
+Queries de manutenção que não dependem da view nem do volume de dados (criar
+a partição de um ano novo na primeira inserção) rodam em `unbudgeted()` e não
+contam em nenhum orçamento.
+"""
+
+import functools
+import inspect
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.response import SimpleTemplateResponse
+
+# Nome qualificado -> número máximo de queries
+BUDGETS: dict[str, int] = {}
+
+# Ligado dentro de unbudgeted(): as queries não são coletadas
+_unbudgeted: ContextVar[bool] = ContextVar("unbudgeted", default=False)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Uma view ou função executou mais queries que o seu orçamento."""
+
+
+def _qualified_name(target: Any) -> str:
+    # Funções geradas por as_view() são identificadas pela classe da view
+    target = getattr(target, "view_class", target)
+    return f"{target.__module__}.{target.__qualname__}"
+
+
+@contextmanager
+def capture_queries() -> Iterator[list[str]]:
+    """Coleta o SQL de todas as queries executadas no bloco, em todas as conexões."""
+    queries: list[str] = []
+
+    def wrapper(execute, sql, params, many, context):
+        if not _unbudgeted.get():
+            queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield queries
+
+
+@contextmanager
+def unbudgeted() -> Iterator[None]:
+    """Executa o bloco sem contar as suas queries nos orçamentos (capture_queries não as coleta)."""
+    token = _unbudgeted.set(True)
+    try:
+        yield
+    finally:
+        _unbudgeted.reset(token)
+
+
+def check_budget(name: str, budget: int, queries: list[str]) -> None:
+    """Levanta QueryBudgetExceeded com o SQL executado se `queries` passar de `budget`."""
+    if len(queries) <= budget:
+        return
+    listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(queries, 1))
+    raise QueryBudgetExceeded(f"{name} executou {len(queries)} queries (orçamento: {budget}):\n{listing}")
+
+
+def get_budget(view_or_func: Callable) -> int | None:
+    """Orçamento declarado para a função, view baseada em função ou view baseada em classe (as_view())."""
+    budget = getattr(view_or_func, "query_budget", None)
+    if budget is None:
+        budget = getattr(getattr(view_or_func, "view_class", None), "query_budget", None)
+    return budget
+
+
+def _render(result: Any) -> Any:
+    """Renderiza respostas preguiçosas (TemplateResponse), que consultam o banco só ao renderizar."""
+    if isinstance(result, SimpleTemplateResponse) and not result.is_rendered:
+        result.render()
+    return result
+
+
+def _enforced(name: str, budget: int, func: Callable) -> Callable:
+    if inspect.iscoroutinefunction(func):
+        return _enforced_async(name, budget, func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not settings.QUERY_BUDGETS_ENFORCED:
+            return func(*args, **kwargs)
+        with capture_queries() as queries:
+            result = _render(func(*args, **kwargs))
+        check_budget(name, budget, queries)
+        return result
+
+    return wrapper
+
+
+def _enforced_async(name: str, budget: int, func: Callable) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not settings.QUERY_BUDGETS_ENFORCED:
+            return await func(*args, **kwargs)
+        # O ORM assíncrono executa as queries via sync_to_async: o coletor é instalado nas conexões dessa thread
+        capture = capture_queries()
+        queries = await sync_to_async(capture.__enter__)()
+        try:
+            result = await sync_to_async(_render)(await func(*args, **kwargs))
+        finally:
+            await sync_to_async(capture.__exit__)(None, None, None)
+        check_budget(name, budget, queries)
+        return result
+
+    return wrapper
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declara o número máximo de queries de uma função ou view.
+
+    Em views baseadas em classe, o orçamento cobre o dispatch inteiro e a
+    renderização do template. Funções e views assíncronas também são suportadas.
+
+    Args:
+        max_queries: Limite de queries por chamada (ou por requisição)
+    """
+
+    def decorator(target):
+        name = _qualified_name(target)
+        BUDGETS[name] = max_queries
+        if inspect.isclass(target):
+            target.dispatch = _enforced(name, max_queries, target.dispatch)
+            target.query_budget = max_queries
+            return target
+        wrapper = _enforced(name, max_queries, target)
+        wrapper.query_budget = max_queries
+        return wrapper
+
+    return decorator
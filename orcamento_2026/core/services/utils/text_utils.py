@@ -0,0 +1,54 @@
+"""Utilitários para normalização de texto."""
+
+import re
+import unicodedata
+
+# Marcadores de memo removidos com a palavra-chave, sobre o texto já sem acentos e em caixa baixa:
+# parcelas ("parc 03/10", "parcela 3 de 10", "pcl 03/10") e final do cartão ("cartao final 1234", "*1234", "xxxx1234")
+_MEMO_MARKERS = re.compile(
+    r"\b(?:parcela|parc|pcl)\.?\s*\d{1,3}\s*(?:/|de)\s*\d{1,3}\b" r"|\b(?:cartao\s+)?(?:final|fim)\s*\d{4}\b|\*+\s*\d{2,}\b|\bx{4,}\d{4}\b"
+)
+# Números e pontuação restantes (datas, códigos de autorização, terminais)
+_MEMO_NOISE = re.compile(r"[\d\W_]+")
+
+
+def strip_accents(value: str) -> str:
+    """Remove acentos e demais marcas diacríticas do texto ("Alimentação" -> "Alimentacao")."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def normalize_key(value: str | None) -> str:
+    """
+    Gera a chave de comparação de um nome: sem acentos, casefold e espaços colapsados.
+
+    Dois nomes com a mesma chave são considerados o mesmo registro
+    (ex.: "Alimentação", "ALIMENTACAO" e " alimentação ").
+
+    Args:
+        value: Texto original
+
+    Returns:
+        Chave normalizada ("" para valores vazios)
+    """
+    if not value:
+        return ""
+    return " ".join(strip_accents(value).casefold().split())
+
+
+def normalize_memo(memo: str | None) -> str:
+    """
+    Gera a chave de agrupamento de um memo: normalize_key sem parcelas, final do cartão, datas, números nem pontuação.
+
+    Cobranças do mesmo estabelecimento com datas ou códigos diferentes
+    ficam com a mesma chave ("NETFLIX.COM 12/03" e "Netflix.com 01/04" -> "netflix com";
+    "LOJA X PARC 03/10 FINAL 1234" -> "loja x"). É gravada na importação em
+    Transaction.memo_normalized, usada pelas buscas e agrupamentos por memo.
+
+    Args:
+        memo: Memo original da transação
+
+    Returns:
+        Chave normalizada ("" se o memo só tem números e pontuação)
+    """
+    return " ".join(_MEMO_NOISE.sub(" ", _MEMO_MARKERS.sub(" ", normalize_key(memo))).split())
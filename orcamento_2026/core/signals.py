@@ -0,0 +1,211 @@
+"""Receivers de sinais do core: mantêm caches e estruturas derivadas em dia."""
+
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from orcamento_2026.core.models import Account, Category, Expense, SubCategory, Transaction, TransactionSuggestion
+from orcamento_2026.core.services import budgets, counters, subcategory_options
+
+# Marca usada quando o valor original do campo não foi carregado (campo adiado)
+_UNKNOWN = object()
+
+
+@receiver(post_save, sender=SubCategory)
+@receiver(post_delete, sender=SubCategory)
+def invalidate_subcategory_options(sender, **kwargs) -> None:
+    """Descarta os fragmentos de <option> quando uma subcategoria muda."""
+    subcategory_options.invalidate()
+
+
+# =============================================================================
+# Contadores
+# =============================================================================
+
+
+@receiver(post_init, sender=TransactionSuggestion)
+def remember_suggestion_status(sender, instance, **kwargs) -> None:
+    # Lê do __dict__ para não disparar query em campos adiados (.only/.defer)
+    instance._counted_status = instance.__dict__.get("status", _UNKNOWN)
+
+
+@receiver(post_save, sender=TransactionSuggestion)
+def count_suggestion_save(sender, instance, created, **kwargs) -> None:
+    """Atualiza o contador de sugestões pendentes conforme o status muda."""
+    previous = None if created else instance._counted_status
+    if previous is _UNKNOWN:
+        counters.reconcile([counters.PENDING_SUGGESTIONS])
+    else:
+        delta = int(instance.status == "PENDENTE") - int(previous == "PENDENTE")
+        counters.adjust(counters.PENDING_SUGGESTIONS, delta)
+    instance._counted_status = instance.status
+
+
+@receiver(pre_delete, sender=TransactionSuggestion)
+def load_suggestion_status(sender, instance, **kwargs) -> None:
+    """Carrega o status adiado (.only/.defer) enquanto a linha ainda existe, para o contador não divergir."""
+    if instance._counted_status is _UNKNOWN:
+        instance._counted_status = TransactionSuggestion.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+
+
+@receiver(post_delete, sender=TransactionSuggestion)
+def count_suggestion_delete(sender, instance, **kwargs) -> None:
+    if instance._counted_status == "PENDENTE":
+        counters.adjust(counters.PENDING_SUGGESTIONS, -1)
+
+
+@receiver(post_save, sender=Transaction)
+def count_transaction_save(sender, instance, created, **kwargs) -> None:
+    """Toda transação nova nasce sem despesa."""
+    if created:
+        counters.adjust(counters.UNCONSOLIDATED_TRANSACTIONS, 1)
+
+
+@receiver(post_delete, sender=Transaction)
+def count_transaction_delete(sender, instance, **kwargs) -> None:
+    # A despesa em cascata é excluída antes (e devolve +1), então o saldo é sempre -1
+    counters.adjust(counters.UNCONSOLIDATED_TRANSACTIONS, -1)
+
+
+@receiver(post_init, sender=Expense)
+def remember_expense_transaction(sender, instance, **kwargs) -> None:
+    instance._counted_transaction_id = instance.__dict__.get("transaction_id", _UNKNOWN)
+
+
+@receiver(post_save, sender=Expense)
+def count_expense_save(sender, instance, created, **kwargs) -> None:
+    """Vincular uma transação a uma despesa a consolida; desvincular a devolve à fila."""
+    previous = None if created else instance._counted_transaction_id
+    if previous is _UNKNOWN:
+        counters.reconcile([counters.UNCONSOLIDATED_TRANSACTIONS])
+    else:
+        delta = int(previous is not None) - int(instance.transaction_id is not None)
+        counters.adjust(counters.UNCONSOLIDATED_TRANSACTIONS, delta)
+    instance._counted_transaction_id = instance.transaction_id
+
+
+@receiver(pre_delete, sender=Expense)
+def load_expense_transaction(sender, instance, **kwargs) -> None:
+    """Carrega a transação adiada (.only/.defer) enquanto a linha ainda existe, para o contador não divergir."""
+    if instance._counted_transaction_id is _UNKNOWN:
+        instance._counted_transaction_id = Expense.objects.filter(pk=instance.pk).values_list("transaction_id", flat=True).first()
+
+
+@receiver(post_delete, sender=Expense)
+def count_expense_delete(sender, instance, **kwargs) -> None:
+    if instance._counted_transaction_id is not None:
+        counters.adjust(counters.UNCONSOLIDATED_TRANSACTIONS, 1)
+
+
+# =============================================================================
+# Versão dos dados (snapshot analítico do dashboard)
+# =============================================================================
+
+
+@receiver(post_save, sender=Expense)
+def bump_expense_version(sender, instance, created, **kwargs) -> None:
+    """Despesa nova só é acrescentada ao snapshot; alterar uma existente exige recarregá-lo."""
+    if created:
+        counters.bump(counters.DATA_VERSION)
+    else:
+        counters.bump(counters.DATA_VERSION, counters.DATA_REWRITES)
+
+
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=Account)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=SubCategory)
+def bump_rewrite_version_on_delete(sender, **kwargs) -> None:
+    counters.bump(counters.DATA_VERSION, counters.DATA_REWRITES)
+
+
+# Colunas lidas pelo snapshot (services.analytics): só alterá-las muda linhas já carregadas
+SNAPSHOT_FIELDS: dict[type, tuple[str, ...]] = {
+    Transaction: ("amount_cents", "account_id"),
+    Account: ("name",),
+    Category: ("name",),
+    SubCategory: ("name", "category_id"),
+}
+
+
+def _snapshot_state(instance) -> tuple:
+    return tuple(instance.__dict__.get(name, _UNKNOWN) for name in SNAPSHOT_FIELDS[type(instance)])
+
+
+@receiver(post_init, sender=Transaction)
+@receiver(post_init, sender=Account)
+@receiver(post_init, sender=Category)
+@receiver(post_init, sender=SubCategory)
+def remember_snapshot_state(sender, instance, **kwargs) -> None:
+    instance._snapshot_state = _snapshot_state(instance)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Account)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=SubCategory)
+def bump_rewrite_version_on_update(sender, instance, created, **kwargs) -> None:
+    """Valor, conta ou nomes alterados mudam linhas já carregadas; registros novos ainda não aparecem em despesas."""
+    state = _snapshot_state(instance)
+    # Campos adiados (.only/.defer) não têm valor anterior conhecido: conta como alteração
+    if not created and state != instance._snapshot_state:
+        counters.bump(counters.DATA_VERSION, counters.DATA_REWRITES)
+    instance._snapshot_state = state
+
+
+# =============================================================================
+# Realizado dos orçamentos
+# =============================================================================
+
+
+def _expense_amount(instance: Expense, transaction_id: int | None):
+    if transaction_id is None:
+        return None
+    if instance.transaction_id == transaction_id and Expense.transaction.is_cached(instance):
+        # Caso comum: consolidação e formulários já carregaram a transação
+        return instance.transaction.amount
+    return Transaction.objects.filter(id=transaction_id).values_list("amount", flat=True).first()
+
+
+# Colunas da despesa que definem a sua contribuição ao realizado
+BUDGET_FIELDS: tuple[str, ...] = ("subcategory_id", "reference_month", "transaction_id", "is_ignored")
+
+
+@receiver(post_init, sender=Expense)
+def remember_expense_budget_key(sender, instance, **kwargs) -> None:
+    fields = instance.__dict__
+    instance._budget_state = tuple(fields.get(name, _UNKNOWN) for name in BUDGET_FIELDS)
+
+
+@receiver(pre_save, sender=Expense)
+def load_expense_budget_state(sender, instance, **kwargs) -> None:
+    """Carrega os campos adiados (.only/.defer) do estado anterior enquanto a linha ainda não foi gravada."""
+    if _UNKNOWN not in instance._budget_state or instance.pk is None:
+        return
+    stored = Expense.objects.filter(pk=instance.pk).values_list(*BUDGET_FIELDS).first() or (None,) * len(BUDGET_FIELDS)
+    instance._budget_state = tuple(
+        stored_value if value is _UNKNOWN else value for value, stored_value in zip(instance._budget_state, stored)
+    )
+
+
+def _previous_contribution(instance: Expense):
+    subcategory_id, reference_month, transaction_id, is_ignored = instance._budget_state
+    return budgets.contribution(subcategory_id, reference_month, _expense_amount(instance, transaction_id), is_ignored)
+
+
+def _current_contribution(instance: Expense):
+    amount = _expense_amount(instance, instance.transaction_id)
+    return budgets.contribution(instance.subcategory_id, instance.reference_month, amount, instance.is_ignored)
+
+
+@receiver(post_save, sender=Expense)
+def record_expense_budget(sender, instance, created, **kwargs) -> None:
+    """Atualiza o realizado do orçamento com a diferença entre o estado anterior e o atual da despesa."""
+    budgets.record_change(None if created else _previous_contribution(instance), _current_contribution(instance))
+    remember_expense_budget_key(sender, instance)
+
+
+# pre_delete: na exclusão em cascata a transação (e o seu valor) ainda existe
+@receiver(pre_delete, sender=Expense)
+def record_expense_budget_delete(sender, instance, **kwargs) -> None:
+    load_expense_budget_state(sender, instance)
+    budgets.record_change(_previous_contribution(instance), None)
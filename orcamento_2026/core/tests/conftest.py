@@ -0,0 +1,52 @@
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Iterable
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """Nos testes, exceder um orçamento de queries (@query_budget) falha o teste."""
+    settings.QUERY_BUDGETS_ENFORCED = True
+
+
+@pytest.fixture(autouse=True)
+def reset_analytics_snapshot():
+    """O rollback de cada teste desfaz a versão dos dados, mas não o snapshot em memória do processo."""
+    from orcamento_2026.core.services.analytics import snapshot
+
+    snapshot.reset()
+    yield
+    snapshot.reset()
+
+
+@pytest.fixture
+def account():
+    from orcamento_2026.core.models import Account
+
+    return Account.objects.create(name="Nubank", type="C")
+
+
+@pytest.fixture
+def ofx_import() -> Callable[..., dict]:
+    """
+    Importa um extrato OFX simulado (sem arquivo nem ofxparse) numa conta.
+
+    Uso: `ofx_import(account, [(fitid, valor, memo, data), ...])`, com o
+    `reference_date` opcional de import_ofx; retorna as estatísticas da importação.
+    """
+    from orcamento_2026.core.services.import_ofx import import_ofx
+
+    def run(account, lines: Iterable[tuple[str, str | Decimal, str, date]], reference_date: date | None = None) -> dict:
+        ofx = MagicMock()
+        ofx.account.statement.transactions = [
+            MagicMock(id=fitid, amount=float(amount), memo=memo, date=MagicMock(date=MagicMock(return_value=day)))
+            for fitid, amount, memo, day in lines
+        ]
+        with patch("orcamento_2026.core.services.import_ofx.ofxparse.OfxParser") as parser, patch("builtins.open", new_callable=MagicMock):
+            parser.parse.return_value = ofx
+            return import_ofx("extrato.ofx", account, reference_date)
+
+    return run
@@ -0,0 +1,216 @@
+"""Testes para o snapshot analítico do dashboard."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+from orcamento_2026.core.models import Account, Category, Expense, SubCategory, Transaction
+from orcamento_2026.core.services import counters
+from orcamento_2026.core.services.analytics import compare_periods, dashboard_data, rolling_average, snapshot, summary
+from orcamento_2026.core.services.consolidation import consolidate_transactions
+
+
+@pytest.fixture
+def account():
+    return Account.objects.create(name="Nubank", type="C")
+
+
+@pytest.fixture
+def market():
+    return SubCategory.objects.create(name="Supermercado", category=Category.objects.create(name="Alimentação"))
+
+
+@pytest.fixture
+def fuel():
+    return SubCategory.objects.create(name="Abastecimento", category=Category.objects.create(name="Transporte"))
+
+
+def _expense(account, subcategory, fitid: str, amount: str, month: date, ignored: bool = False) -> Expense:
+    tx = Transaction.objects.create(fitid=fitid, account=account, amount=Decimal(amount), date=month, memo=f"Compra {fitid}")
+    return Expense.objects.create(
+        transaction=tx, subcategory=subcategory, description=f"Despesa {fitid}", reference_month=month, is_ignored=ignored
+    )
+
+
+@pytest.fixture
+def expenses(account, market, fuel):
+    """Despesas de janeiro a abril de 2026 (março sem nenhuma), uma delas ignorada."""
+    return [
+        _expense(account, market, "1", "-100.50", date(2026, 1, 1)),
+        _expense(account, fuel, "2", "-50.00", date(2026, 1, 1)),
+        _expense(account, market, "3", "-30.25", date(2026, 2, 1)),
+        _expense(account, fuel, "4", "-999.00", date(2026, 2, 1), ignored=True),
+        _expense(account, fuel, "5", "-80.00", date(2026, 4, 1)),
+    ]
+
+
+@pytest.mark.django_db
+class TestSnapshot:
+    """Testes para Snapshot.refresh."""
+
+    def test_compact_dtypes(self, expenses):
+        """Testa que nomes viram categóricos e valores, centavos inteiros positivos."""
+        frame = snapshot.refresh()
+
+        assert str(frame["category"].dtype) == "category"
+        assert str(frame["amount_cents"].dtype) == "int64"
+        assert frame["amount_cents"].tolist() == [10050, 5000, 3025, 99900, 8000]
+
+    def test_cached_while_version_unchanged(self, expenses, django_assert_num_queries):
+        """Testa que, sem mudanças, revalidar o snapshot custa uma única query."""
+        snapshot.refresh()
+
+        with django_assert_num_queries(1):
+            snapshot.refresh()
+        assert snapshot.last_refresh == "cached"
+
+    def test_new_expenses_are_appended(self, expenses, account, market):
+        """Testa que despesas novas (inclusive em lote) são acrescentadas sem recarregar o snapshot."""
+        snapshot.refresh()
+        _expense(account, Category.objects.create(name="Lazer").subcategories.create(name="Cinema"), "6", "-20.00", date(2026, 1, 1))
+        tx = Transaction.objects.create(fitid="7", account=account, amount=Decimal("-5.00"), date=date(2026, 2, 1), memo="Padaria")
+        consolidate_transactions([(tx, market, "Padaria", date(2026, 2, 1))])
+
+        frame = snapshot.refresh()
+
+        assert snapshot.last_refresh == "append"
+        assert len(frame) == 7
+        assert "Lazer" in frame["category"].cat.categories
+        assert frame["reference_month"].is_monotonic_increasing
+
+    def test_edits_reload(self, expenses):
+        """Testa que editar uma despesa existente recarrega o snapshot."""
+        snapshot.refresh()
+        expenses[0].is_ignored = True
+        expenses[0].save()
+
+        frame = snapshot.refresh()
+
+        assert snapshot.last_refresh == "full"
+        assert frame.loc[frame["id"] == expenses[0].id, "is_ignored"].item()
+
+    def test_append_checks_versions_instead_of_counting(self, expenses, account, market, django_assert_num_queries):
+        """Testa que acrescentar confere o avanço de DATA_VERSION (sem COUNT na tabela de despesas)."""
+        snapshot.refresh()
+        _expense(account, market, "6", "-20.00", date(2026, 1, 1))
+
+        with django_assert_num_queries(3) as captured:
+            snapshot.refresh()
+
+        assert snapshot.last_refresh == "append"
+        assert not any("COUNT" in query["sql"] for query in captured.captured_queries)
+
+    def test_unrelated_transaction_edits_keep_snapshot(self, expenses):
+        """Testa que editar campos de transação que o snapshot não lê não o recarrega."""
+        snapshot.refresh()
+        tx = expenses[0].transaction
+        tx.memo = "Outro memo"
+        tx.save()
+        Transaction.objects.get(id=tx.id).save()
+
+        snapshot.refresh()
+
+        assert snapshot.last_refresh == "cached"
+
+    def test_amount_edits_reload(self, expenses):
+        """Testa que alterar o valor de uma transação consolidada recarrega o snapshot."""
+        snapshot.refresh()
+        tx = Transaction.objects.only("id", "amount").get(id=expenses[0].transaction_id)
+        tx.amount = Decimal("-10.00")
+        tx.save()
+
+        frame = snapshot.refresh()
+
+        assert snapshot.last_refresh == "full"
+        assert frame.loc[frame["id"] == expenses[0].id, "amount_cents"].item() == 1000
+
+    def test_out_of_order_ids_reload(self, expenses, account, fuel):
+        """Testa que uma despesa com id menor que o último carregado força o recarregamento."""
+        snapshot.refresh()
+        missing = expenses[1]
+        Expense.objects.filter(id=missing.id).delete()
+        snapshot.refresh()
+        # Recria com o mesmo id, sem passar pelo sinal de exclusão/edição
+        Expense.objects.bulk_create([Expense(id=missing.id, subcategory=fuel, description="Volta", reference_month=date(2026, 1, 1))])
+        counters.bump(counters.DATA_VERSION)
+
+        assert len(snapshot.refresh()) == 5
+        assert snapshot.last_refresh == "full"
+
+
+@pytest.mark.django_db
+class TestAggregations:
+    """Testes para summary, compare_periods e rolling_average."""
+
+    def test_summary(self, expenses):
+        """Testa as quebras do dashboard no período, sem despesas ignoradas."""
+        data = summary(snapshot.refresh(), date(2026, 1, 1), date(2026, 2, 28))
+
+        assert data["total_expenses"] == 3
+        assert data["total_amount"] == Decimal("180.75")
+        assert data["expenses_by_category"] == [
+            {"subcategory__category__name": "Alimentação", "total": Decimal("130.75")},
+            {"subcategory__category__name": "Transporte", "total": Decimal("50.00")},
+        ]
+        assert data["monthly_data"] == [
+            {"month": date(2026, 1, 1), "total": Decimal("150.50")},
+            {"month": date(2026, 2, 1), "total": Decimal("30.25")},
+        ]
+        assert data["expenses_by_account"] == [{"transaction__account__name": "Nubank", "total": Decimal("180.75")}]
+
+    def test_empty_snapshot(self):
+        """Testa que sem despesas as agregações voltam zeradas."""
+        frame = snapshot.refresh()
+
+        assert summary(frame, date(2026, 1, 1), date(2026, 1, 31))["total_amount"] == Decimal("0.00")
+        assert compare_periods(frame, date(2026, 1, 1), date(2026, 1, 31))["delta_pct"] is None
+        assert rolling_average(frame, None, None) == []
+
+    def test_compare_periods(self, expenses):
+        """Testa a comparação com o período anterior de mesma duração."""
+        comparison = compare_periods(snapshot.refresh(), date(2026, 2, 1), date(2026, 2, 28))
+
+        assert comparison["previous_start"] == date(2026, 1, 4)
+        assert comparison["previous_end"] == date(2026, 1, 31)
+        # Janeiro (01/01) fica fora do período anterior de 28 dias
+        assert comparison["previous"] == Decimal("0.00")
+
+        comparison = compare_periods(snapshot.refresh(), date(2026, 2, 1), date(2026, 3, 31))
+        assert comparison["current"] == Decimal("30.25")
+        assert comparison["previous"] == Decimal("150.50")
+        assert comparison["delta_pct"] == -79.9
+        assert comparison["by_category"][0] == {
+            "category": "Alimentação",
+            "current": Decimal("30.25"),
+            "previous": Decimal("100.50"),
+            "delta": Decimal("-70.25"),
+        }
+
+    def test_rolling_average(self, expenses):
+        """Testa a média móvel com meses sem despesas como zero e meses anteriores ao período."""
+        months = rolling_average(snapshot.refresh(), date(2026, 2, 1), date(2026, 4, 30), window=2)
+
+        assert [(item["month"], item["total"], item["average"]) for item in months] == [
+            (date(2026, 2, 1), Decimal("30.25"), Decimal("90.38")),
+            (date(2026, 3, 1), Decimal("0.00"), Decimal("15.12")),
+            (date(2026, 4, 1), Decimal("80.00"), Decimal("40.00")),
+        ]
+
+
+@pytest.mark.django_db
+class TestDashboardView:
+    """Testes do dashboard servido pelo snapshot."""
+
+    def test_dashboard_uses_snapshot(self, client, django_user_model, expenses):
+        """Testa que o dashboard mostra totais e comparação calculados no snapshot."""
+        client.force_login(django_user_model.objects.create_user(username="user", password="password"))
+
+        response = client.get(reverse("dashboard"), {"start_date": "2026-02-01", "end_date": "2026-03-31"})
+
+        assert response.status_code == 200
+        assert response.context["total_amount"] == Decimal("30.25")
+        assert response.context["comparison"]["delta_pct"] == -79.9
+        assert "vs período anterior" in response.content.decode()
+        assert dashboard_data(date(2026, 2, 1), date(2026, 3, 31))["total_expenses"] == 1
@@ -0,0 +1,120 @@
+"""Testes para o ciclo de faturamento e o calendário de meses de referência."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from orcamento_2026.core.models import Account, BillingCycle, CalendarDay, Transaction
+from orcamento_2026.core.services.billing_calendar import cycle_range, ensure_calendar, reassign_reference_dates, reference_months
+from orcamento_2026.core.services.import_ofx import import_ofx
+from orcamento_2026.core.services.synthetic import write_ofx
+from orcamento_2026.core.services.utils.date_utils import reference_month
+
+
+@pytest.fixture
+def card():
+    account = Account.objects.create(name="Nubank", type="K")
+    BillingCycle.objects.create(account=account, closing_day=5)
+    return account
+
+
+@pytest.mark.django_db
+class TestCalendar:
+    """Testes para o calendário pré-calculado."""
+
+    def test_seeded_by_migration(self):
+        """Testa que o fechamento padrão já vem gerado pela migração."""
+        assert CalendarDay.objects.get(closing_day=20, day=date(2026, 10, 21)).reference_month == date(2026, 11, 1)
+        assert CalendarDay.objects.get(closing_day=31, day=date(2026, 10, 31)).reference_month == date(2026, 10, 1)
+
+    def test_ensure_calendar_is_idempotent(self):
+        """Testa que gerar de novo um intervalo completo não cria nada."""
+        assert ensure_calendar(7, date(2026, 1, 1), date(2026, 12, 31)) == 365
+        assert ensure_calendar(7, date(2026, 1, 1), date(2026, 12, 31)) == 0
+
+    def test_reference_months_fills_missing_days(self, django_assert_num_queries):
+        """Testa o mês de referência de várias datas com uma query, gerando os dias que faltam."""
+        days = [date(2026, 2, 5), date(2026, 2, 6), date(2026, 12, 31)]
+
+        assert reference_months(days, 5) == {
+            date(2026, 2, 5): date(2026, 2, 1),
+            date(2026, 2, 6): date(2026, 3, 1),
+            date(2026, 12, 31): date(2027, 1, 1),
+        }
+        with django_assert_num_queries(1):
+            reference_months(days, 5)
+
+    @pytest.mark.parametrize(
+        ("day", "closing_day", "expected"),
+        [
+            (date(2026, 10, 19), 20, (date(2026, 9, 21), date(2026, 10, 20))),
+            (date(2026, 12, 25), 20, (date(2026, 12, 21), date(2027, 1, 20))),
+            (date(2026, 2, 10), 31, (date(2026, 2, 1), date(2026, 2, 28))),
+            (date(2026, 3, 1), 30, (date(2026, 3, 1), date(2026, 3, 30))),
+        ],
+    )
+    def test_cycle_range(self, day, closing_day, expected):
+        """Testa os limites do ciclo que contém o dia, inclusive na virada do ano e em meses curtos."""
+        assert cycle_range(day, closing_day) == expected
+
+    def test_cycle_range_multiple_cycles(self, django_assert_num_queries):
+        """Testa um intervalo de dois ciclos, com uma query por ciclo."""
+        with django_assert_num_queries(2):
+            assert cycle_range(date(2026, 10, 19), 20, cycles=2) == (date(2026, 9, 21), date(2026, 11, 20))
+
+
+@pytest.mark.django_db
+class TestImportReferenceDate:
+    """Testes para a data de referência atribuída na importação."""
+
+    def test_import_assigns_by_cycle(self, tmp_path, card):
+        """Testa que cada transação recebe o mês de referência pelo fechamento da conta."""
+        path = tmp_path / "extrato.ofx"
+        write_ofx(str(path), 40)
+
+        import_ofx(str(path), card)
+
+        transactions = list(Transaction.objects.all())
+        assert transactions
+        assert all(tx.reference_date == reference_month(tx.date, 5) for tx in transactions)
+
+    def test_explicit_reference_date_wins(self, tmp_path, card):
+        """Testa que a data de referência informada vale para todas as transações."""
+        path = tmp_path / "extrato.ofx"
+        write_ofx(str(path), 10)
+
+        import_ofx(str(path), card, date(2026, 2, 1))
+
+        assert set(Transaction.objects.values_list("reference_date", flat=True)) == {date(2026, 2, 1)}
+
+
+@pytest.mark.django_db
+class TestReassign:
+    """Testes para reassign_reference_dates e o comando gerar_calendario."""
+
+    def test_reassign_uses_account_cycle(self, card):
+        """Testa que o recálculo usa o fechamento de cada conta (ou o padrão)."""
+        checking = Account.objects.create(name="Itaú", type="C")
+        for account, fitid in ((card, "1"), (checking, "2")):
+            Transaction.objects.create(fitid=fitid, account=account, amount=Decimal("-10.00"), date=date(2026, 1, 10), memo="Compra")
+
+        assert reassign_reference_dates() == 2
+        assert dict(Transaction.objects.values_list("account__name", "reference_date")) == {
+            "Nubank": date(2026, 2, 1),
+            "Itaú": date(2026, 1, 1),
+        }
+
+    def test_command(self, card):
+        """Testa a saída do comando gerar_calendario."""
+        Transaction.objects.create(fitid="1", account=card, amount=Decimal("-10.00"), date=date(2026, 1, 10), memo="Compra")
+        out = StringIO()
+
+        call_command("gerar_calendario", "--closing-day", "12", "--start", "2026-01-01", "--end", "2026-01-31", "--reassign", stdout=out)
+
+        output = out.getvalue()
+        assert "Fechamento dia 12: 31 dias gerados." in output
+        assert "1 transações com data de referência recalculada." in output
+        assert Transaction.objects.get().reference_date == date(2026, 2, 1)
@@ -0,0 +1,185 @@
+"""Testes para os orçamentos por subcategoria e o realizado incremental."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from orcamento_2026.core.models import Account, Budget, Category, Expense, SubCategory, Transaction
+from orcamento_2026.core.services.budgets import rebuild, variance
+from orcamento_2026.core.services.consolidation import consolidate_transaction, consolidate_transactions
+
+JANUARY = date(2026, 1, 1)
+FEBRUARY = date(2026, 2, 1)
+
+
+@pytest.fixture
+def account():
+    return Account.objects.create(name="Nubank", type="C")
+
+
+@pytest.fixture
+def market():
+    return SubCategory.objects.create(name="Supermercado", category=Category.objects.create(name="Alimentação"))
+
+
+@pytest.fixture
+def fuel():
+    return SubCategory.objects.create(name="Abastecimento", category=Category.objects.create(name="Transporte"))
+
+
+@pytest.fixture
+def budget(market):
+    return Budget.objects.create(subcategory=market, month=JANUARY, limit=Decimal("500.00"))
+
+
+def _transaction(account, fitid: str, amount: str) -> Transaction:
+    return Transaction.objects.create(fitid=fitid, account=account, amount=Decimal(amount), date=date(2026, 1, 10), memo=f"Compra {fitid}")
+
+
+def _actual(budget: Budget) -> Decimal:
+    budget.refresh_from_db()
+    return budget.actual
+
+
+@pytest.mark.django_db
+class TestBudgetModel:
+    """Testes para o modelo Budget."""
+
+    def test_month_normalized_and_actual_computed(self, account, market):
+        """Testa que o mês vira o dia 1 e que um orçamento novo já parte do realizado existente."""
+        consolidate_transaction(_transaction(account, "1", "-120.50"), "Alimentação", "Supermercado", "Mercado", JANUARY)
+
+        budget = Budget.objects.create(subcategory=market, month=date(2026, 1, 15), limit=Decimal("100.00"))
+
+        assert budget.month == JANUARY
+        assert budget.actual == Decimal("120.50")
+        assert budget.is_overspent
+        assert budget.remaining == Decimal("-20.50")
+
+
+@pytest.mark.django_db
+class TestIncrementalActual:
+    """Testes para a atualização incremental do realizado."""
+
+    def test_consolidation_adds_amount(self, account, budget):
+        """Testa que consolidar uma transação soma o valor ao orçamento do mês."""
+        consolidate_transaction(_transaction(account, "1", "-80.00"), "Alimentação", "Supermercado", "Mercado", JANUARY)
+        consolidate_transaction(_transaction(account, "2", "-20.25"), "Alimentação", "Supermercado", "Padaria", JANUARY)
+        consolidate_transaction(_transaction(account, "3", "-999.00"), "Alimentação", "Supermercado", "Outro mês", FEBRUARY)
+
+        assert _actual(budget) == Decimal("100.25")
+
+    def test_bulk_consolidation(self, account, market, budget):
+        """Testa que a consolidação em lote soma todas as despesas ao orçamento."""
+        items = [(_transaction(account, str(i), "-10.00"), market, f"Compra {i}", JANUARY) for i in range(3)]
+
+        consolidate_transactions(items)
+
+        assert _actual(budget) == Decimal("30.00")
+
+    def test_edit_moves_amount(self, account, fuel, budget):
+        """Testa que mudar a subcategoria ou ignorar a despesa tira o valor do orçamento."""
+        expense = consolidate_transaction(_transaction(account, "1", "-80.00"), "Alimentação", "Supermercado", "Mercado", JANUARY)
+        other = consolidate_transaction(_transaction(account, "2", "-20.00"), "Alimentação", "Supermercado", "Padaria", JANUARY)
+
+        expense = Expense.objects.get(pk=expense.pk)
+        expense.subcategory = fuel
+        expense.save()
+        other.is_ignored = True
+        other.save()
+
+        assert _actual(budget) == Decimal("0.00")
+
+    def test_delete_subtracts_amount(self, account, budget):
+        """Testa que excluir a despesa (inclusive em cascata, pela transação) subtrai o valor."""
+        first = consolidate_transaction(_transaction(account, "1", "-80.00"), "Alimentação", "Supermercado", "Mercado", JANUARY)
+        second = consolidate_transaction(_transaction(account, "2", "-20.00"), "Alimentação", "Supermercado", "Padaria", JANUARY)
+
+        first.delete()
+        Transaction.objects.get(pk=second.transaction_id).delete()
+
+        assert _actual(budget) == Decimal("0.00")
+
+    def test_deferred_fields_update_incrementally(self, account, fuel, budget):
+        """Testa que editar ou excluir despesas com campos adiados (.only/.defer) ajusta o realizado sem recalcular tudo."""
+        fuel_budget = Budget.objects.create(subcategory=fuel, month=JANUARY, limit=Decimal("500.00"))
+        expense = consolidate_transaction(_transaction(account, "1", "-80.00"), "Alimentação", "Supermercado", "Mercado", JANUARY)
+        other = consolidate_transaction(_transaction(account, "2", "-20.00"), "Alimentação", "Supermercado", "Padaria", JANUARY)
+
+        with patch("orcamento_2026.core.services.budgets.rebuild") as mock_rebuild:
+            expense = Expense.objects.only("description").get(pk=expense.pk)
+            expense.subcategory = fuel
+            expense.save()
+            Expense.objects.defer("subcategory", "transaction").get(pk=other.pk).delete()
+
+        mock_rebuild.assert_not_called()
+        assert _actual(budget) == Decimal("0.00")
+        assert _actual(fuel_budget) == Decimal("80.00")
+
+    def test_consolidation_is_one_update(self, account, budget, django_assert_num_queries):
+        """Testa que o orçamento custa um UPDATE por consolidação, independente do número de despesas no mês."""
+        for i in range(5):
+            consolidate_transaction(_transaction(account, str(i), "-1.00"), "Alimentação", "Supermercado", "Compra", JANUARY)
+        tx = _transaction(account, "x", "-1.00")
+
+        with django_assert_num_queries(4):
+            # INSERT, contador de não consolidadas, versão dos dados e o orçamento
+            Expense.objects.create(transaction=tx, subcategory=budget.subcategory, description="Compra", reference_month=JANUARY)
+
+
+@pytest.mark.django_db
+class TestRebuild:
+    """Testes para rebuild e o comando recalcular_orcamentos."""
+
+    def test_rebuild_fixes_drift(self, account, budget):
+        """Testa que o recálculo corrige um realizado divergente."""
+        consolidate_transaction(_transaction(account, "1", "-80.00"), "Alimentação", "Supermercado", "Mercado", JANUARY)
+        Budget.objects.filter(pk=budget.pk).update(actual=Decimal("1.00"))
+
+        assert rebuild() == (1, 1)
+        assert _actual(budget) == Decimal("80.00")
+        assert rebuild() == (1, 0)
+
+    def test_command(self, budget):
+        """Testa a saída do comando recalcular_orcamentos."""
+        Budget.objects.filter(pk=budget.pk).update(actual=Decimal("1.00"))
+        out = StringIO()
+
+        call_command("recalcular_orcamentos", stdout=out)
+
+        assert "1 de 1 orçamentos estavam divergentes" in out.getvalue()
+        assert _actual(budget) == Decimal("0.00")
+
+
+@pytest.mark.django_db
+class TestVariance:
+    """Testes para variance e o painel do dashboard."""
+
+    def test_variance_sorted_by_usage(self, account, market, fuel, budget):
+        """Testa orçado x realizado por subcategoria, da maior para a menor utilização."""
+        Budget.objects.create(subcategory=fuel, month=JANUARY, limit=Decimal("100.00"))
+        consolidate_transaction(_transaction(account, "1", "-150.00"), "Transporte", "Abastecimento", "Posto", JANUARY)
+
+        statuses = variance(JANUARY, date(2026, 1, 31))
+
+        assert [(status.subcategory, status.usage, status.is_overspent) for status in statuses] == [
+            ("Abastecimento", 150.0, True),
+            ("Supermercado", 0.0, False),
+        ]
+
+    def test_dashboard_panel(self, client, django_user_model, account, budget):
+        """Testa que o dashboard mostra o painel e o alerta de subcategoria estourada."""
+        consolidate_transaction(_transaction(account, "1", "-600.00"), "Alimentação", "Supermercado", "Mercado", JANUARY)
+        client.force_login(django_user_model.objects.create_user(username="user", password="password"))
+
+        response = client.get(reverse("dashboard"), {"start_date": "2026-01-01", "end_date": "2026-01-31"})
+
+        content = response.content.decode()
+        assert "Orçamento x Realizado" in content
+        assert "Subcategorias acima do orçamento" in content
+        assert [status.subcategory for status in response.context["overspent_budgets"]] == ["Supermercado"]
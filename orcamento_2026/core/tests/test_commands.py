@@ -1,20 +1,30 @@
 """Testes para os management commands."""
 
+import json
 from datetime import date
 from decimal import Decimal
 from io import StringIO
 from unittest.mock import MagicMock, patch
 
 import pytest
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
+from django.db import connection
 
 from orcamento_2026.core.models import (
     Account,
     Category,
+    Expense,
+    Merchant,
+    RecurringCharge,
     SubCategory,
     Transaction,
     TransactionSuggestion,
 )
+from orcamento_2026.core.services.counters import PENDING_SUGGESTIONS, UNCONSOLIDATED_TRANSACTIONS, get_counter
+from orcamento_2026.core.services.import_ofx import import_ofx
+
+# Suítes de benchmark cujo cenário depende do banco: nos testes, só o do SQLite é verificado
+sqlite_only = pytest.mark.skipif(connection.vendor != "sqlite", reason="Cenário do SQLite")
 
 
 @pytest.mark.django_db
@@ -82,6 +92,16 @@ class TestPopularCommand:
         # Deve ter apenas uma conta Visa BB
         assert Account.objects.filter(name="Visa BB").count() == 1
 
+    def test_reuses_categories_with_other_spelling(self):
+        """Testa que categorias e subcategorias já cadastradas sem acento ou com outra caixa são reaproveitadas."""
+        category = Category.objects.create(name="alimentacao")
+        SubCategory.objects.create(category=category, name="FEIRA")
+
+        call_command("popular", stdout=StringIO())
+
+        assert Category.objects.filter(name_key="alimentacao").get().name == "alimentacao"
+        assert category.subcategories.filter(name_key="feira").count() == 1
+
     def test_outputs_success_message(self):
         """Testa que exibe mensagem de sucesso."""
         out = StringIO()
@@ -256,3 +276,227 @@ class TestConsolidarCommand:
         call_command("consolidar", stdout=out)
 
         assert "Encerrando revisão" in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestBenchmarkCommand:
+    """Testes para o comando 'benchmark'."""
+
+    def test_runs_lookups_suite_without_persisting(self):
+        """Testa que a suíte roda e descarta os dados criados."""
+        out = StringIO()
+        call_command("benchmark", "lookups", "--iterations", "3", stdout=out)
+
+        output = out.getvalue()
+        assert "legacy_lower" in output
+        assert "warm_catalog" in output
+        assert Category.objects.count() == 0
+
+    def test_runs_consolidation_suite(self):
+        """Testa a suíte de consolidação com poucas linhas."""
+        out = StringIO()
+        call_command("benchmark", "consolidation", "--rows", "20", stdout=out)
+
+        assert "bulk: rows=20" in out.getvalue()
+        assert Transaction.objects.count() == 0
+
+    def test_writes_json_report(self, tmp_path):
+        """Testa que --output grava os resultados em JSON."""
+        output = tmp_path / "benchmark.json"
+        call_command("benchmark", "import_ofx", "--rows", "20", "--output", str(output), stdout=StringIO())
+
+        report = json.loads(output.read_text())
+        assert report["suites"]["import_ofx"]["new_statement"]["rows"] == 20
+        assert report["database"] == connection.vendor
+        assert Transaction.objects.count() == 0
+
+    @sqlite_only
+    def test_runs_parallel_import_suite(self):
+        """Testa que a suíte de importação paralela importa o mesmo extrato (mesmos FITIDs) em várias contas."""
+        out = StringIO()
+        call_command("benchmark", "parallel_import", "--rows", "10", stdout=out)
+
+        output = out.getvalue()
+        assert "  sequential: rows=40," in output
+        assert "transactions=40" in output
+        # O cenário paralelo só roda no PostgreSQL
+        assert "parallel:" not in output
+        assert Transaction.objects.count() == 0
+
+    @sqlite_only
+    def test_runs_connections_suite(self):
+        """Testa que a suíte de conexões mede os cenários sem e com conexões persistentes."""
+        out = StringIO()
+        call_command("benchmark", "connections", "--rows", "12", stdout=out)
+
+        output = out.getvalue()
+        # O SQLite em memória dos testes nunca fecha conexões: só a estrutura é verificável aqui
+        assert "per_request: requests=12" in output
+        assert "persistent: requests=12" in output
+        assert "connections_opened=" in output
+
+    def test_runs_startup_suite(self):
+        """Testa que a suíte de startup mede o boot em processos novos, sem e com warm-up."""
+        out = StringIO()
+        call_command("benchmark", "startup", "--iterations", "1", stdout=out)
+
+        output = out.getvalue()
+        assert "cold: app_ready_ms=" in output
+        assert "preload: app_ready_ms=" in output
+        assert "warm_up_ms=" in output
+        assert "status=200 OK, loaded=[]," in output
+
+    def test_runs_reports_suite(self):
+        """Testa a suíte de exportação com poucas linhas, em todos os formatos."""
+        out = StringIO()
+        call_command("benchmark", "reports", "--rows", "40", stdout=out)
+
+        output = out.getvalue()
+        for case in ("csv", "xlsx", "parquet", "csv_6_months", "csv_instances"):
+            assert f"  {case}: rows=" in output
+        assert "peak_kib=" in output
+        assert Transaction.objects.count() == 0
+
+    def test_runs_analytics_suite(self):
+        """Testa a suíte do snapshot analítico: mesmos períodos pelo SQL e pelo snapshot, e acréscimo incremental."""
+        out = StringIO()
+        call_command("benchmark", "analytics", "--rows", "40", "--iterations", "3", stdout=out)
+
+        output = out.getvalue()
+        assert "  sql: iterations=3" in output
+        assert "  sql_integer: iterations=3" in output
+        assert "  snapshot: iterations=3" in output
+        assert "mode=append" in output
+        assert Transaction.objects.count() == 0
+
+    def test_runs_recurring_suite(self):
+        """Testa a suíte do detector de recorrências: séries sintéticas em memória e varredura pelo banco."""
+        out = StringIO()
+        call_command("benchmark", "recurring", "--rows", "2400", stdout=out)
+
+        output = out.getvalue()
+        assert "  detect: transactions=2400, charges=5," in output
+        assert "  full_scan: transactions=2400," in output
+        assert Transaction.objects.count() == 0
+
+    def test_runs_transfers_suite(self):
+        """Testa a suíte do pareamento de transferências: candidatas sintéticas em memória e varredura pelo banco."""
+        out = StringIO()
+        call_command("benchmark", "transfers", "--rows", "2400", stdout=out)
+
+        output = out.getvalue()
+        assert "  pair: transactions=2400, pairs=24," in output
+        assert "  full_scan: transactions=2400," in output
+        assert Transaction.objects.count() == 0
+
+    def test_runs_memos_suite(self):
+        """Testa a suíte de throughput da normalização de memos."""
+        out = StringIO()
+        call_command("benchmark", "memos", "--rows", "500", stdout=out)
+
+        assert "  normalize_memo: rows=500," in out.getvalue()
+
+    @sqlite_only
+    def test_runs_partitioning_suite(self):
+        """Testa a suíte do particionamento: no SQLite só as consultas nas tabelas comuns são medidas."""
+        out = StringIO()
+        call_command("benchmark", "partitioning", "--rows", "300", "--iterations", "3", stdout=out)
+
+        output = out.getvalue()
+        assert "  dataset: transactions=300," in output
+        assert "database=sqlite" in output
+        assert "  year_report: plain_p50_ms=" in output
+        assert "partitioned_p50_ms" not in output
+        assert Transaction.objects.count() == 0
+
+    def test_rejects_unknown_suite(self):
+        """Testa erro para suíte inexistente."""
+        with pytest.raises(CommandError, match="Suítes desconhecidas"):
+            call_command("benchmark", "inexistente", stdout=StringIO())
+
+
+@pytest.mark.django_db
+class TestGerarDadosCommand:
+    """Testes para o comando 'gerar_dados'."""
+
+    def test_generates_dataset(self):
+        """Testa que gera transações, despesas e sugestões com contadores consistentes."""
+        out = StringIO()
+        call_command("gerar_dados", "--transactions", "200", "--seed", "1", stdout=out)
+
+        assert Transaction.objects.count() == 200
+        assert Expense.objects.exists()
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == Transaction.objects.filter(expense__isnull=True).count()
+        assert get_counter(PENDING_SUGGESTIONS) == TransactionSuggestion.objects.filter(status="PENDENTE").count()
+        assert "Criadas 200 transações" in out.getvalue()
+
+    def test_same_seed_and_anchor_reproduce_dataset(self, tmp_path):
+        """Testa que a mesma semente e a mesma data âncora geram os mesmos dados e o mesmo OFX."""
+        args = ["--transactions", "50", "--seed", "7", "--anchor-date", "2025-06-30"]
+        fields = ("fitid", "date", "amount", "memo", "account__name")
+
+        call_command("gerar_dados", *args, "--ofx", str(tmp_path / "a.ofx"), stdout=StringIO())
+        first = list(Transaction.objects.order_by("fitid").values_list(*fields))
+        Transaction.objects.all().delete()
+        call_command("gerar_dados", *args, "--ofx", str(tmp_path / "b.ofx"), stdout=StringIO())
+
+        assert list(Transaction.objects.order_by("fitid").values_list(*fields)) == first
+        assert max(row[1] for row in first) <= date(2025, 6, 30)
+        assert (tmp_path / "a.ofx").read_text() == (tmp_path / "b.ofx").read_text()
+
+    def test_generates_importable_ofx(self, tmp_path):
+        """Testa que o arquivo OFX gerado é importado pelo serviço de importação."""
+        path = tmp_path / "sintetico.ofx"
+        call_command("gerar_dados", "--transactions", "0", "--ofx", str(path), "--ofx-transactions", "30", stdout=StringIO())
+
+        account = Account.objects.create(name="Test", type="C")
+        assert import_ofx(str(path), account)["transactions_created"] == 30
+
+    def test_rejects_invalid_ratio(self):
+        """Testa erro para proporções fora do intervalo."""
+        with pytest.raises(CommandError, match="entre 0 e 1"):
+            call_command("gerar_dados", "--consolidated-ratio", "2", stdout=StringIO())
+
+
+@pytest.mark.django_db
+class TestNormalizarMemosCommand:
+    """Testes para o comando 'normalizar_memos'."""
+
+    def test_updates_only_changed_memos(self):
+        """Testa que o comando recalcula em blocos e grava só os memos normalizados desatualizados."""
+        account = Account.objects.create(name="Nubank", type="K")
+        for i in range(5):
+            Transaction.objects.create(
+                fitid=str(i), account=account, amount=Decimal("-10.00"), date=date(2026, 2, 1), memo=f"Loja {i} PARC 01/02"
+            )
+        Transaction.objects.filter(fitid__in=["1", "3"]).update(memo_normalized="")
+        out = StringIO()
+
+        call_command("normalizar_memos", "--chunk-size", "2", stdout=out)
+
+        assert "2 de 5 memos atualizados" in out.getvalue()
+        assert set(Transaction.objects.values_list("memo_normalized", flat=True)) == {"loja"}
+
+    def test_rebuilds_keys_grouped_by_memo(self):
+        """Testa que chaves de parcela, recorrências e estabelecimentos calculados com as regras antigas são refeitos."""
+        account = Account.objects.create(name="Nubank", type="K")
+        tx = Transaction.objects.create(
+            fitid="p", account=account, amount=Decimal("-10.00"), date=date(2026, 3, 5), memo="LOJA X FINAL 1234 PARC 03/10"
+        )
+        # Chave antiga com o final do cartão e a primeira parcela já resolvida para fevereiro
+        Transaction.objects.filter(id=tx.id).update(installment_key="loja x final|10|1000|2026-02", installment_number=3)
+        for month in range(1, 5):
+            Transaction.objects.create(
+                fitid=f"s{month}", account=account, amount=Decimal("-21.90"), date=date(2026, month, 10), memo=f"SPOTIFY {month:02d}/26"
+            )
+        Transaction.objects.filter(memo__startswith="SPOTIFY").update(memo_normalized="spotify antigo")
+        merchant = Merchant.objects.create(name="Antigo")
+        out = StringIO()
+
+        call_command("normalizar_memos", stdout=out)
+
+        assert Transaction.objects.get(id=tx.id).installment_key == "loja x|10|1000|2026-02"
+        assert "1 chaves de parcela recalculadas" in out.getvalue()
+        assert list(RecurringCharge.objects.values_list("memo_key", flat=True)) == ["spotify"]
+        assert not Merchant.objects.filter(id=merchant.id).exists()
+        assert not Transaction.objects.filter(merchant__isnull=True).exists()
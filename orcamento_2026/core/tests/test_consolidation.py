@@ -15,8 +15,10 @@ from orcamento_2026.core.models import (
 )
 from orcamento_2026.core.services.consolidation import (
     consolidate_transaction,
+    consolidate_transactions,
     get_unconsolidated_transactions,
 )
+from orcamento_2026.core.services.counters import PENDING_SUGGESTIONS, UNCONSOLIDATED_TRANSACTIONS, get_counter
 
 
 @pytest.mark.django_db
@@ -264,3 +266,81 @@ class TestConsolidateTransaction:
                 description="Test",
                 reference_month=date(2026, 2, 1),
             )
+
+
+@pytest.mark.django_db
+class TestConsolidateTransactions:
+    """Testes para consolidate_transactions (consolidação em lote)."""
+
+    @pytest.fixture
+    def setup(self):
+        account = Account.objects.create(name="Test", type="C")
+        category = Category.objects.create(name="Alimentação")
+        subcategory = SubCategory.objects.create(category=category, name="Supermercado")
+        transactions = [
+            Transaction.objects.create(
+                fitid=f"tx{i}", account=account, amount=Decimal("-10.00"), date=date(2026, 2, 15), memo=f"Compra {i}"
+            )
+            for i in range(5)
+        ]
+        return transactions, subcategory
+
+    def test_creates_expenses_for_names_and_instances(self, setup):
+        """Testa que aceita tanto a instância quanto o par de nomes."""
+        transactions, subcategory = setup
+        items = [(tx, ("ALIMENTACAO", "supermercado"), f"Despesa {tx.id}", date(2026, 2, 1)) for tx in transactions[:3]]
+        items.append((transactions[3], subcategory, "Direta", date(2026, 2, 1)))
+
+        result = consolidate_transactions(items)
+
+        assert result.failures == []
+        assert len(result.expenses) == 4
+        assert Expense.objects.filter(subcategory=subcategory).count() == 4
+        assert set(Expense.objects.values_list("month_key", flat=True)) == {202602}
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 1
+
+    def test_reports_failures_without_aborting(self, setup):
+        """Testa que itens inválidos são reportados e os demais consolidados."""
+        transactions, subcategory = setup
+        Expense.objects.create(transaction=transactions[0], subcategory=subcategory, description="Antes", reference_month=date(2026, 2, 1))
+
+        result = consolidate_transactions(
+            [
+                (transactions[0], subcategory, "Já consolidada", date(2026, 2, 1)),
+                (transactions[1], ("Inexistente", "Supermercado"), "Categoria inválida", date(2026, 2, 1)),
+                (transactions[2], ("Alimentação", "Inexistente"), "Subcategoria inválida", date(2026, 2, 1)),
+                (transactions[3], subcategory, "Ok", date(2026, 2, 1)),
+                (transactions[3], subcategory, "Repetida", date(2026, 2, 1)),
+            ]
+        )
+
+        errors = [failure.error for failure in result.failures]
+        assert len(result.expenses) == 1
+        assert "já consolidada" in errors[0]
+        assert "Categoria 'Inexistente' não encontrada" in errors[1]
+        assert "Subcategoria 'Inexistente' não encontrada" in errors[2]
+        assert "repetida" in errors[3]
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 3
+
+    def test_accepts_suggestions(self, setup):
+        """Testa que as sugestões das transações consolidadas são aceitas."""
+        transactions, subcategory = setup
+        suggestion = TransactionSuggestion.objects.create(
+            transaction=transactions[0], category=subcategory.category, subcategory=subcategory, description="Sugestão"
+        )
+
+        consolidate_transactions([(transactions[0], subcategory, "Ok", date(2026, 2, 1))])
+
+        suggestion.refresh_from_db()
+        assert suggestion.status == "ACEITO"
+        assert get_counter(PENDING_SUGGESTIONS) == 0
+
+    def test_query_count_does_not_grow_with_batch(self, setup, django_assert_max_num_queries):
+        """Testa que o número de queries independe do tamanho do lote."""
+        transactions, subcategory = setup
+        items = [(tx, ("Alimentação", "Supermercado"), "Lote", date(2026, 2, 1)) for tx in transactions]
+
+        with django_assert_max_num_queries(12):
+            result = consolidate_transactions(items)
+
+        assert len(result.expenses) == 5
@@ -0,0 +1,191 @@
+"""Testes para os contadores desnormalizados."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.urls import reverse
+
+from orcamento_2026.core.models import Account, Category, Counter, Expense, SubCategory, Transaction, TransactionSuggestion
+from orcamento_2026.core.services import counters
+from orcamento_2026.core.services.counters import PENDING_SUGGESTIONS, UNCONSOLIDATED_TRANSACTIONS, adjust, get_counter, reconcile
+from orcamento_2026.core.services.utils.query_budget import capture_queries
+
+
+@pytest.fixture
+def account():
+    return Account.objects.create(name="Test", type="C")
+
+
+@pytest.fixture
+def subcategory():
+    category = Category.objects.create(name="Alimentação")
+    return SubCategory.objects.create(category=category, name="Supermercado")
+
+
+def create_transaction(account, fitid):
+    return Transaction.objects.create(fitid=fitid, account=account, amount=Decimal("-10.00"), date=date(2026, 2, 15), memo="Test")
+
+
+def create_suggestion(transaction, subcategory):
+    return TransactionSuggestion.objects.create(
+        transaction=transaction, category=subcategory.category, subcategory=subcategory, description="Sugestão"
+    )
+
+
+@pytest.mark.django_db
+class TestCounterSignals:
+    """Testes para a manutenção dos contadores via sinais."""
+
+    def test_transaction_lifecycle(self, account, subcategory):
+        """Testa que criar, consolidar e excluir transações mantém o contador exato."""
+        tx1 = create_transaction(account, "tx1")
+        tx2 = create_transaction(account, "tx2")
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 2
+
+        expense = Expense.objects.create(transaction=tx1, subcategory=subcategory, description="D", reference_month=date(2026, 2, 1))
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 1
+
+        expense.delete()
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 2
+
+        Expense.objects.create(transaction=tx2, subcategory=subcategory, description="D", reference_month=date(2026, 2, 1))
+        tx2.delete()  # exclui a despesa em cascata
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 1
+
+    def test_suggestion_status_changes(self, account, subcategory):
+        """Testa que aceitar ou rejeitar sugestões decrementa o contador."""
+        first = create_suggestion(create_transaction(account, "tx1"), subcategory)
+        second = create_suggestion(create_transaction(account, "tx2"), subcategory)
+        assert get_counter(PENDING_SUGGESTIONS) == 2
+
+        first.status = "ACEITO"
+        first.save()
+        assert get_counter(PENDING_SUGGESTIONS) == 1
+
+        second.delete()
+        assert get_counter(PENDING_SUGGESTIONS) == 0
+
+    def test_deferred_status_falls_back_to_reconcile(self, account, subcategory):
+        """Testa que salvar sem o status original carregado ainda mantém o contador exato."""
+        create_suggestion(create_transaction(account, "tx1"), subcategory)
+
+        suggestion = TransactionSuggestion.objects.only("id").get()
+        suggestion.status = "REJEITADO"
+        suggestion.save()
+
+        assert get_counter(PENDING_SUGGESTIONS) == 0
+
+    def test_deleting_deferred_expense_restores_transaction(self, account, subcategory):
+        """Testa que excluir uma despesa carregada sem a transação (.only) devolve a transação à fila."""
+        tx = create_transaction(account, "tx1")
+        Expense.objects.create(transaction=tx, subcategory=subcategory, description="D", reference_month=date(2026, 2, 1))
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 0
+
+        Expense.objects.only("id").get().delete()
+
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 1
+
+    def test_deleting_deferred_suggestion(self, account, subcategory):
+        """Testa que excluir uma sugestão pendente carregada sem o status decrementa o contador."""
+        create_suggestion(create_transaction(account, "tx1"), subcategory)
+
+        TransactionSuggestion.objects.only("id").get().delete()
+
+        assert get_counter(PENDING_SUGGESTIONS) == 0
+
+
+@pytest.mark.django_db
+class TestDeferred:
+    """Testes para o acúmulo de ajustes em counters.deferred."""
+
+    def test_cascade_delete_updates_counters_once(self, account, subcategory, django_assert_num_queries):
+        """Testa que excluir várias transações consolidadas grava os contadores numa única query no fim."""
+        for i in range(3):
+            tx = create_transaction(account, f"tx{i}")
+            Expense.objects.create(transaction=tx, subcategory=subcategory, description="D", reference_month=date(2026, 2, 1))
+        get_counter(UNCONSOLIDATED_TRANSACTIONS)
+
+        with capture_queries() as queries, transaction.atomic(), counters.deferred():
+            Transaction.objects.all().delete()
+
+        assert len([sql for sql in queries if "core_counter" in sql]) == 1
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 0
+
+    def test_discarded_when_transaction_rolls_back(self, account):
+        """Testa que, se o bloco falha dentro de uma transação, nenhum ajuste é gravado."""
+        create_transaction(account, "tx1")
+
+        with pytest.raises(RuntimeError), transaction.atomic(), counters.deferred():
+            create_transaction(account, "tx2")
+            raise RuntimeError
+
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 1
+
+    def test_reconcile_inside_block_drops_pending_delta(self, account):
+        """Testa que um recálculo no meio do bloco não é somado de novo aos ajustes anteriores."""
+        with transaction.atomic(), counters.deferred():
+            create_transaction(account, "tx1")
+            reconcile([UNCONSOLIDATED_TRANSACTIONS])
+            create_transaction(account, "tx2")
+
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 2
+
+
+@pytest.mark.django_db
+class TestCounterService:
+    """Testes para get_counter, adjust e reconcile."""
+
+    def test_adjust_creates_missing_counter(self, account):
+        """Testa que ajustar um contador inexistente o recalcula."""
+        create_transaction(account, "tx1")
+        Counter.objects.all().delete()
+
+        adjust(UNCONSOLIDATED_TRANSACTIONS, 1)
+
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 1
+
+    def test_reconcile_fixes_drift(self, account):
+        """Testa que a reconciliação corrige contadores divergentes."""
+        create_transaction(account, "tx1")
+        Counter.objects.filter(name=UNCONSOLIDATED_TRANSACTIONS).update(value=42)
+
+        results = reconcile([UNCONSOLIDATED_TRANSACTIONS])
+
+        assert results[UNCONSOLIDATED_TRANSACTIONS] == (42, 1)
+        assert Counter.objects.get(name=UNCONSOLIDATED_TRANSACTIONS).reconciled_at is not None
+
+    def test_badge_reads_counter_with_single_query(self, client, django_user_model, account, subcategory, django_assert_num_queries):
+        """Testa que o badge de sugestões custa uma única query além da sessão."""
+        create_suggestion(create_transaction(account, "tx1"), subcategory)
+        client.force_login(django_user_model.objects.create_user(username="testuser", password="password"))
+
+        # sessão + usuário + contador
+        with django_assert_num_queries(3):
+            response = client.get(reverse("pending_suggestions_count"))
+
+        assert ">1<" in response.content.decode()
+
+
+@pytest.mark.django_db
+class TestReconciliarCommand:
+    """Testes para o comando 'reconciliar'."""
+
+    def test_reports_corrected_counters(self, account):
+        """Testa que o comando informa e corrige divergências."""
+        create_transaction(account, "tx1")
+        Counter.objects.filter(name=UNCONSOLIDATED_TRANSACTIONS).update(value=5)
+
+        out = StringIO()
+        call_command("reconciliar", stdout=out)
+
+        assert "5 -> 1" in out.getvalue()
+        assert get_counter(UNCONSOLIDATED_TRANSACTIONS) == 1
+
+    def test_rejects_unknown_counter(self):
+        """Testa erro para contador inexistente."""
+        with pytest.raises(CommandError, match="Contadores desconhecidos"):
+            call_command("reconciliar", "inexistente", stdout=StringIO())
@@ -0,0 +1,40 @@
+"""Testes para a configuração de conexões com o banco."""
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from orcamento_2026.settings.database import database_config
+
+POSTGRES_URL = "postgres://user:secret@db:5432/orcamento"
+
+
+class TestDatabaseConfig:
+    """Testes para database_config."""
+
+    def test_pool_for_postgresql(self):
+        """Testa que o pool do psycopg 3 é configurado e as conexões não persistem."""
+        config = database_config(POSTGRES_URL, pool=True, pool_min_size=1, pool_max_size=4, pool_timeout=5)
+
+        assert config["ENGINE"] == "django.db.backends.postgresql"
+        assert config["CONN_MAX_AGE"] == 0
+        assert config["OPTIONS"]["pool"] == {"min_size": 1, "max_size": 4, "timeout": 5}
+
+    def test_persistent_connections(self):
+        """Testa conexões persistentes com health checks, sem pool."""
+        config = database_config(POSTGRES_URL, conn_max_age=60)
+
+        assert config["CONN_MAX_AGE"] == 60
+        assert config["CONN_HEALTH_CHECKS"] is True
+        assert "pool" not in config.get("OPTIONS", {})
+
+    def test_pool_ignored_for_sqlite(self):
+        """Testa que o pool é ignorado em bancos sem suporte."""
+        config = database_config("sqlite:///db.sqlite3", pool=True)
+
+        assert config["ENGINE"] == "django.db.backends.sqlite3"
+        assert "pool" not in config.get("OPTIONS", {})
+
+    def test_pool_with_persistent_connections_is_rejected(self):
+        """Testa que pool e CONN_MAX_AGE > 0 não podem ser combinados."""
+        with pytest.raises(ImproperlyConfigured, match="DB_POOL"):
+            database_config(POSTGRES_URL, pool=True, conn_max_age=60)
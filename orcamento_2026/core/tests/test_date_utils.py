@@ -3,7 +3,7 @@
 from datetime import date
 
 
-from orcamento_2026.core.services.utils.date_utils import get_period_options
+from orcamento_2026.core.services.utils.date_utils import get_period_options, month_from_key, month_key, reference_month
 
 
 class TestGetPeriodOptions:
@@ -45,14 +45,12 @@ class TestGetPeriodOptions:
         assert options[2][0].year == 2026
         assert "Próximo Mês" in options[2][1]
 
-    def test_custom_ref_day(self):
-        """Testa com um dia de referência customizado."""
+    def test_custom_closing_day(self):
+        """Testa que, após o dia de fechamento, o mês corrente passa a ser o seguinte."""
         base = date(2026, 5, 15)
-        options = get_period_options(base_date=base, ref_day=10)
+        options = get_period_options(base_date=base, closing_day=10)
 
-        # Todas as datas devem ter dia 10
-        for opt, _ in options:
-            assert opt.day == 10
+        assert [opt for opt, _ in options] == [date(2026, 5, 1), date(2026, 6, 1), date(2026, 7, 1)]
 
     def test_year_boundary(self):
         """Testa comportamento na virada do ano."""
@@ -85,3 +83,28 @@ class TestGetPeriodOptions:
         # Este teste documenta o comportamento esperado
         options = get_period_options(num_options=5)
         assert len(options) == 3  # Implementação atual ignora num_options
+
+
+class TestReferenceMonth:
+    """Testes para a função reference_month."""
+
+    def test_closing_day(self):
+        """Testa que compras até o fechamento ficam no mês e as seguintes vão para o próximo."""
+        assert reference_month(date(2026, 3, 20), 20) == date(2026, 3, 1)
+        assert reference_month(date(2026, 3, 21), 20) == date(2026, 4, 1)
+        assert reference_month(date(2026, 12, 25), 20) == date(2027, 1, 1)
+
+    def test_closing_after_month_end(self):
+        """Testa que fechamento após o fim do mês vale como o último dia (31 = mês civil)."""
+        assert reference_month(date(2026, 2, 28), 30) == date(2026, 2, 1)
+        assert reference_month(date(2026, 3, 31), 31) == date(2026, 3, 1)
+
+
+class TestMonthKey:
+    """Testes para as chaves de mês AAAAMM."""
+
+    def test_round_trip(self):
+        """Testa que a chave é AAAAMM, ordena como as datas e volta para o dia 1 do mês."""
+        assert month_key(date(2026, 3, 15)) == 202603
+        assert month_key(date(2025, 12, 31)) < month_key(date(2026, 1, 1))
+        assert month_from_key(202603) == date(2026, 3, 1)
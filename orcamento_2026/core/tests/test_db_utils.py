@@ -3,6 +3,7 @@
 import pytest
 
 from orcamento_2026.core.models import Category, SubCategory
+from orcamento_2026.core.services.catalog import warm_catalog
 from orcamento_2026.core.services.utils.db_utils import (
     case_insensitive_get,
     case_insensitive_lookup,
@@ -129,3 +130,48 @@ class TestCaseInsensitiveGet:
 
         result = case_insensitive_get(Category.objects.all(), "name", "SUPERMERCADO E MERCEARIA")
         assert result == category
+
+    def test_ignores_accents(self):
+        """Testa que a busca pela chave normalizada ignora acentos."""
+        category = Category.objects.create(name="Alimentação")
+
+        result = case_insensitive_get(Category.objects.all(), "name", "ALIMENTACAO")
+        assert result == category
+
+    def test_uses_single_query(self, django_assert_num_queries):
+        """Testa que o lookup é uma única query de igualdade."""
+        Category.objects.create(name="Alimentação")
+
+        with django_assert_num_queries(1) as captured:
+            case_insensitive_get(Category.objects.all(), "name", "alimentação")
+
+        assert "LOWER" not in captured.captured_queries[0]["sql"].upper()
+
+
+@pytest.mark.django_db
+class TestWarmCatalog:
+    """Testes para o caminho em memória de case_insensitive_get."""
+
+    def test_resolves_without_queries(self, django_assert_num_queries):
+        """Testa que, com o catálogo aquecido, categorias e subcategorias não vão ao banco."""
+        category = Category.objects.create(name="Saúde")
+        subcategory = SubCategory.objects.create(category=category, name="Farmácia")
+
+        with warm_catalog():
+            with django_assert_num_queries(0):
+                found_category = case_insensitive_get(Category.objects.all(), "name", "SAUDE")
+                found_subcategory = case_insensitive_get(SubCategory.objects.all(), "name", "farmacia", category=found_category)
+                assert found_subcategory.category.name == "Saúde"
+
+        assert found_category == category
+        assert found_subcategory == subcategory
+
+    def test_falls_back_to_database_for_filtered_querysets(self):
+        """Testa que querysets já filtrados continuam indo ao banco."""
+        category = Category.objects.create(name="Lazer")
+        subcategory = SubCategory.objects.create(category=category, name="Cinema")
+
+        with warm_catalog():
+            result = case_insensitive_get(SubCategory.objects.filter(category=category), "name", "CINEMA")
+
+        assert result == subcategory
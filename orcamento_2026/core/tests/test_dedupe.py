@@ -0,0 +1,132 @@
+"""Testes para a deduplicação de transações por conteúdo."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from orcamento_2026.core.models import Category, Expense, SubCategory, Transaction
+from orcamento_2026.core.services.dedupe import dedupe_key
+
+
+def _create(
+    account, fitid: str, day: date = date(2026, 3, 10), memo: str = "PADARIA X", amount: str = "-12.50", import_id: str | None = None
+) -> Transaction:
+    return Transaction.objects.create(fitid=fitid, account=account, amount=Decimal(amount), date=day, memo=memo, import_id=import_id)
+
+
+class TestDedupeKey:
+    """Testes para a chave de conteúdo."""
+
+    def test_normalizes_memo_and_keeps_numbers(self):
+        """Testa que caixa, acentos e espaços não mudam a chave, mas números e conta mudam."""
+        key = dedupe_key(1, date(2026, 3, 10), Decimal("-12.50"), "Padaria São João 123")
+
+        assert key == dedupe_key(1, date(2026, 3, 10), Decimal("-12.5"), "  PADARIA SAO JOAO 123 ")
+        assert key != dedupe_key(1, date(2026, 3, 10), Decimal("-12.50"), "Padaria São João 124")
+        assert key != dedupe_key(2, date(2026, 3, 10), Decimal("-12.50"), "Padaria São João 123")
+        assert len(key) == 40
+
+
+@pytest.mark.django_db
+class TestImport:
+    """Testes para a checagem do conteúdo na importação."""
+
+    def test_skips_reissued_fitids(self, account, ofx_import):
+        """Testa que a mesma linha com outro FITID é descartada e linhas novas são gravadas."""
+        _create(account, "old-1")
+
+        result = ofx_import(
+            account, [("new-1", "-12.50", "PADARIA X", date(2026, 3, 10)), ("new-2", "-12.50", "PADARIA X", date(2026, 3, 11))]
+        )
+
+        assert (result["transactions_created"], result["duplicates_skipped"]) == (1, 1)
+        assert set(Transaction.objects.values_list("fitid", flat=True)) == {"old-1", "new-2"}
+
+    def test_keeps_legitimate_repeats(self, account, ofx_import):
+        """Testa que lançamentos iguais só são duplicatas até a quantidade já gravada."""
+        _create(account, "a")
+
+        result = ofx_import(account, [("a", "-12.50", "PADARIA X", date(2026, 3, 10)), ("b", "-12.50", "PADARIA X", date(2026, 3, 10))])
+
+        assert (result["transactions_created"], result["duplicates_skipped"]) == (1, 0)
+
+    def test_keeps_repeats_split_across_batches(self, account, ofx_import, monkeypatch):
+        """Testa que repetições do mesmo arquivo em lotes diferentes não viram duplicatas umas das outras."""
+        monkeypatch.setattr("orcamento_2026.core.services.import_ofx.IMPORT_BATCH_SIZE", 1)
+
+        result = ofx_import(account, [("a", "-12.50", "PADARIA X", date(2026, 3, 10)), ("b", "-12.50", "PADARIA X", date(2026, 3, 10))])
+
+        assert (result["transactions_created"], result["duplicates_skipped"]) == (2, 0)
+        assert len(set(Transaction.objects.values_list("import_id", flat=True))) == 1
+
+    def test_tolerance_days(self, account, settings, ofx_import):
+        """Testa que, com tolerância, a linha reexportada com a data de lançamento deslocada em um dia é descartada."""
+        _create(account, "old-1")
+
+        assert ofx_import(account, [("new-1", "-12.50", "PADARIA X", date(2026, 3, 11))])["duplicates_skipped"] == 0
+        Transaction.objects.filter(fitid="new-1").delete()
+        settings.DEDUPE_TOLERANCE_DAYS = 1
+        assert ofx_import(account, [("new-1", "-12.50", "PADARIA X", date(2026, 3, 11))])["duplicates_skipped"] == 1
+
+
+@pytest.mark.django_db
+class TestDeduplicarCommand:
+    """Testes para o comando 'deduplicar'."""
+
+    def test_lists_without_merge(self, account):
+        """Testa que, sem --merge, as duplicatas são apenas listadas."""
+        _create(account, "a", import_id="1")
+        _create(account, "b", import_id="2")
+        _create(account, "c", memo="OUTRA")
+        out = StringIO()
+
+        call_command("deduplicar", stdout=out)
+
+        assert "1 grupos, 1 duplicatas" in out.getvalue()
+        assert Transaction.objects.count() == 3
+
+    def test_merge_keeps_consolidated(self, account):
+        """Testa que o merge mantém a transação consolidada e exclui as demais do grupo."""
+        _create(account, "a", import_id="1")
+        consolidated = _create(account, "b", import_id="2")
+        subcategory = SubCategory.objects.create(name="Padaria", category=Category.objects.create(name="Alimentação"))
+        Expense.objects.create(transaction=consolidated, description="Pão", subcategory=subcategory, reference_month=date(2026, 3, 1))
+        out = StringIO()
+
+        call_command("deduplicar", "--merge", "--no-input", "--chunk-size", "1", stdout=out)
+
+        assert "1 grupos, 1 duplicatas excluídas" in out.getvalue()
+        assert list(Transaction.objects.values_list("fitid", flat=True)) == ["b"]
+
+    def test_merge_keeps_repeats_of_each_import(self, account):
+        """Testa que o merge mantém as repetições vistas numa mesma importação e ignora grupos de uma importação só."""
+        _create(account, "a1", import_id="1")
+        _create(account, "a2", import_id="1")
+        _create(account, "b1", import_id="2")
+        _create(account, "b2", import_id="2")
+        _create(account, "c1", memo="CAFE", import_id="1")
+        _create(account, "c2", memo="CAFE", import_id="1")
+        _create(account, "d1", memo="LEGADO")
+        _create(account, "d2", memo="LEGADO")
+        out = StringIO()
+
+        call_command("deduplicar", "--merge", "--no-input", stdout=out)
+
+        assert "1 grupos, 2 duplicatas excluídas" in out.getvalue()
+        assert set(Transaction.objects.values_list("fitid", flat=True)) == {"a1", "a2", "c1", "c2", "d1", "d2"}
+
+    def test_merge_asks_for_confirmation(self, account):
+        """Testa que, sem --no-input, o merge só exclui depois da confirmação."""
+        _create(account, "a", import_id="1")
+        _create(account, "b", import_id="2")
+        out = StringIO()
+
+        with patch("builtins.input", return_value="n"):
+            call_command("deduplicar", "--merge", stdout=out)
+
+        assert "Nada foi excluído" in out.getvalue()
+        assert Transaction.objects.count() == 2
@@ -14,7 +14,7 @@ def account():
 
 @pytest.fixture
 def mock_ofx_parser():
-    with patch("orcamento_2026.core.services.import_ofx.OfxParser") as mock:
+    with patch("orcamento_2026.core.services.import_ofx.ofxparse.OfxParser") as mock:
         yield mock
 
 
@@ -77,3 +77,34 @@ def test_import_ofx_duplicate_transaction(account, mock_ofx_parser, mock_open_fi
 
     # Nada deve ser criado
     assert result["transactions_created"] == 0
+
+
+@pytest.mark.django_db
+def test_import_ofx_same_fitid_in_other_account(account, mock_ofx_parser, mock_open_file):
+    # Outra instituição usou o mesmo FITID
+    other = Account.objects.create(name="Inter", type="C")
+    Transaction.objects.create(fitid="fitid-1", account=other, amount=Decimal("-10.00"), date=date(2026, 1, 5), memo="Outra")
+
+    mock_ofx = MagicMock()
+    mock_transaction = MagicMock(id="fitid-1", amount=-100.50, memo="Supermercado")
+    mock_transaction.date.date.return_value = date(2026, 2, 1)
+    mock_ofx.account.statement.transactions = [mock_transaction]
+    mock_ofx_parser.parse.return_value = mock_ofx
+
+    result = import_ofx("dummy.ofx", account)
+
+    assert result["transactions_created"] == 1
+    assert Transaction.objects.filter(fitid="fitid-1").count() == 2
+
+
+@pytest.mark.django_db
+def test_import_ofx_sets_memo_normalized(account, mock_ofx_parser, mock_open_file):
+    mock_ofx = MagicMock()
+    mock_transaction = MagicMock(id="fitid-1", amount=-100.50, memo="SUPERMERCADO PÃO 12/02 FINAL 1234")
+    mock_transaction.date.date.return_value = date(2026, 2, 12)
+    mock_ofx.account.statement.transactions = [mock_transaction]
+    mock_ofx_parser.parse.return_value = mock_ofx
+
+    import_ofx("dummy.ofx", account)
+
+    assert Transaction.objects.get(fitid="fitid-1").memo_normalized == "supermercado pao"
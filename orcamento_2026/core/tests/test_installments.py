@@ -0,0 +1,151 @@
+"""Testes para as compras parceladas."""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+
+from orcamento_2026.core.models import Category, Expense, SubCategory, Transaction
+from orcamento_2026.core.services.consolidation import consolidate_transaction
+from orcamento_2026.core.services.installments import Installment, annotate, parse, projection, reuse_consolidations
+from orcamento_2026.core.services.suggestions import agenerate_suggestions
+
+
+@pytest.fixture
+def subcategory():
+    return SubCategory.objects.create(name="Eletrônicos", category=Category.objects.create(name="Compras"))
+
+
+def _installment(account, number: int, total: int = 10, memo: str = "MAGAZINE LUIZA", amount: str = "-150.00") -> Transaction:
+    transaction = Transaction(
+        fitid=f"{memo}-{number}-{amount}",
+        account=account,
+        amount=Decimal(amount),
+        date=date(2026, number, 12),
+        memo=f"{memo} PARC {number:02d}/{total:02d}",
+    )
+    annotate(transaction)
+    transaction.save()
+    return transaction
+
+
+class TestParse:
+    """Testes para o parser de parcelas do memo."""
+
+    @pytest.mark.parametrize(
+        ("memo", "expected"),
+        [
+            ("LOJA X PARC 03/10", Installment(3, 10, "LOJA X")),
+            ("Loja X - Parcela 3/10", Installment(3, 10, "Loja X")),
+            ("LOJA X PARC. 3 DE 12 SAO PAULO", Installment(3, 12, "LOJA X SAO PAULO")),
+            ("PCL 01/02 LOJA Y", Installment(1, 2, "LOJA Y")),
+        ],
+    )
+    def test_parses_formats(self, memo, expected):
+        """Testa os formatos de parcela usados pelos bancos."""
+        assert parse(memo) == expected
+
+    @pytest.mark.parametrize("memo", ["NETFLIX.COM 12/03", "LOJA X PARC 11/10", "LOJA X PARC 01/01", "", None])
+    def test_ignores_dates_and_invalid(self, memo):
+        """Testa que datas sem a palavra-chave e parcelas inválidas não contam."""
+        assert parse(memo) is None
+
+
+@pytest.mark.django_db
+class TestLinking:
+    """Testes para a chave da compra e a reutilização da classificação."""
+
+    def test_installments_share_purchase_key(self, account):
+        """Testa que parcelas da mesma compra têm a mesma chave e compras diferentes não."""
+        first, second = _installment(account, 1), _installment(account, 2)
+        other = _installment(account, 2, memo="MAGAZINE LUIZA", amount="-99.00")
+
+        assert first.installment_key == second.installment_key == "magazine luiza|10|15000|2026-01"
+        assert other.installment_key != first.installment_key
+        assert (second.installment_number, second.installment_total) == (2, 10)
+
+    def test_import_reuses_consolidation(self, account, subcategory, ofx_import):
+        """Testa que a importação consolida a parcela nova com a classificação da primeira."""
+        first = _installment(account, 1)
+        consolidate_transaction(first, "Compras", "Eletrônicos", "Geladeira", date(2026, 1, 1))
+
+        result = ofx_import(account, [("n2", "-150.00", "MAGAZINE LUIZA PARC 02/10", date(2026, 2, 12))])
+
+        expense = Expense.objects.get(transaction__fitid="n2")
+        assert result["installments_consolidated"] == 1
+        assert (expense.subcategory, expense.description) == (subcategory, "Geladeira")
+        assert Transaction.objects.get(fitid="n2").installment_key == first.installment_key
+
+    def test_import_matches_purchase_shifted_by_billing_cycle(self, account, ofx_import):
+        """Testa que uma parcela lançada um mês antes ou depois do previsto fica com a chave da compra."""
+        first = _installment(account, 1)
+
+        ofx_import(
+            account,
+            [
+                ("n2", "-150.00", "MAGAZINE LUIZA PARC 02/10", date(2026, 3, 2)),
+                ("n3", "-150.00", "MAGAZINE LUIZA PARC 03/10", date(2026, 4, 2)),
+            ],
+        )
+
+        assert set(Transaction.objects.values_list("installment_key", flat=True)) == {first.installment_key}
+
+    def test_import_keeps_identical_purchases_apart(self, account, ofx_import):
+        """Testa que a mesma parcela de uma compra igual no mês vizinho não é juntada à compra conhecida."""
+        first = _installment(account, 1)
+
+        ofx_import(account, [("other-1", "-150.00", "MAGAZINE LUIZA PARC 01/10", date(2026, 2, 12))])
+
+        assert Transaction.objects.get(fitid="other-1").installment_key == "magazine luiza|10|15000|2026-02" != first.installment_key
+
+    def test_suggestions_skip_reused_installments(self, account, subcategory):
+        """Testa que parcelas de compras já classificadas são consolidadas antes de chamar o Ollama."""
+        consolidate_transaction(_installment(account, 2), "Compras", "Eletrônicos", "Geladeira", date(2026, 2, 1))
+        pending = _installment(account, 3)
+
+        with patch("orcamento_2026.core.services.suggestions._acall_ollama_api", AsyncMock()) as mock_call:
+            assert async_to_sync(agenerate_suggestions)(10) == 0
+
+        mock_call.assert_not_called()
+        assert Expense.objects.get(transaction=pending).description == "Geladeira"
+
+    def test_reuse_without_source_does_nothing(self, account):
+        """Testa que parcelas sem nenhuma parcela consolidada continuam pendentes."""
+        _installment(account, 1)
+
+        assert reuse_consolidations() == 0
+        assert not Expense.objects.exists()
+
+
+@pytest.mark.django_db
+class TestProjection:
+    """Testes para a projeção das parcelas futuras."""
+
+    def test_projects_remaining_installments(self, account):
+        """Testa que as parcelas que faltam entram nos meses seguintes à última importada."""
+        _installment(account, 1, total=3)
+        _installment(account, 2, total=3)
+        _installment(account, 1, total=4, memo="LOJA Y", amount="-50.00")
+
+        assert projection(date(2026, 1, 20)) == [
+            {"month": date(2026, 2, 1), "total": Decimal("50.00"), "count": 1},
+            {"month": date(2026, 3, 1), "total": Decimal("200.00"), "count": 2},
+            {"month": date(2026, 4, 1), "total": Decimal("50.00"), "count": 1},
+        ]
+
+    def test_dashboard_panel(self, client, django_user_model, account):
+        """Testa que o dashboard mostra as parcelas a vencer."""
+        today = date.today()
+        Transaction.objects.create(fitid="1", account=account, amount=Decimal("-80.00"), date=today, memo="LOJA Z PARC 01/03")
+        annotated = Transaction.objects.get()
+        annotate(annotated)
+        annotated.save()
+        client.force_login(django_user_model.objects.create_user(username="user", password="password"))
+
+        response = client.get(reverse("dashboard"))
+
+        assert "Parcelas a Vencer" in response.content.decode()
+        assert [item["total"] for item in response.context["future_installments"]] == [Decimal("80.00"), Decimal("80.00")]
@@ -0,0 +1,81 @@
+"""Testes para a importação adiada e o warm-up."""
+
+import importlib
+import subprocess
+import sys
+
+from orcamento_2026.core.benchmarks.startup import parse_importtime
+from orcamento_2026.core.services.utils.lazy_import import LAZY_MODULES, is_loaded, lazy_import
+from orcamento_2026.core.warmup import warm_up
+
+
+class TestLazyImport:
+    """Testes para lazy_import."""
+
+    def test_module_loads_on_first_attribute_access(self):
+        """Testa que o módulo só é executado no primeiro acesso a um atributo."""
+        name = "colorsys"
+        sys.modules.pop(name, None)
+
+        module = lazy_import(name)
+        assert not is_loaded(name)
+
+        assert callable(module.rgb_to_hsv)
+        assert is_loaded(name)
+
+    def test_returns_already_imported_module(self):
+        """Testa que um módulo já importado é devolvido sem ser adiado."""
+        assert lazy_import("json") is sys.modules["json"]
+        assert is_loaded("json")
+
+    def test_heavy_libraries_are_not_imported_at_boot(self):
+        """Testa que carregar as URLs e as views não importa as bibliotecas pesadas."""
+        code = (
+            "import django, sys; django.setup(); "
+            "from django.urls import get_resolver; get_resolver().url_patterns; "
+            "from orcamento_2026.core.services.utils.lazy_import import is_loaded; "
+            "print([m for m in ('plotly.utils', 'requests', 'httpx', 'ofxparse', 'pandas', 'pyarrow', 'openpyxl') if is_loaded(m)])"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "[]"
+
+
+class TestWarmUp:
+    """Testes para warm_up."""
+
+    def test_loads_lazy_modules_without_database(self):
+        """Testa que o warm-up carrega as bibliotecas adiadas sem acessar o banco (bloqueado sem django_db)."""
+        timings = warm_up()
+
+        assert set(timings) == {"urls", "templates", "modules"}
+        assert {"plotly.utils", "requests", "httpx", "ofxparse"} <= LAZY_MODULES
+        assert all(is_loaded(name) for name in LAZY_MODULES)
+
+    def test_asgi_application_warms_up_on_import(self, monkeypatch):
+        """Testa que cada worker ASGI se aquece ao importar a aplicação (o uvicorn não tem --preload)."""
+        calls = []
+        monkeypatch.setattr("orcamento_2026.core.warmup.warm_up", lambda: calls.append(True) or {"urls": 0.0})
+        monkeypatch.delitem(sys.modules, "orcamento_2026.asgi", raising=False)
+
+        importlib.import_module("orcamento_2026.asgi")
+
+        assert calls == [True]
+
+
+def test_parse_importtime():
+    """Testa o resumo da saída de -X importtime (apenas imports de primeiro nível)."""
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   django.utils",
+            "import time:       200 |       3000 | django",
+            "import time:       500 |       1500 | plotly.utils",
+            "import time:       400 |        400 | json",
+        ]
+    )
+
+    summary = parse_importtime(stderr, top=2)
+
+    assert summary["import_ms"] == 4.9
+    assert summary["top_imports_ms"] == {"django": 3.0, "plotly": 1.5}
@@ -0,0 +1,154 @@
+"""Testes para o agrupamento de memos em estabelecimentos (MinHash/LSH)."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from orcamento_2026.core.models import Category, Expense, Merchant, MerchantAlias, MerchantBucket, SubCategory, Transaction
+from orcamento_2026.core.services import merchants
+from orcamento_2026.core.services.suggestions import find_similar_expenses
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
+
+VARIANTS = ["UBER *TRIP SAO PAULO", "UBER TRIP 12345 SAO PAULO BR", "UBER *TRIP SAO PAULO SP"]
+
+
+def _transaction(account, fitid: str, memo: str) -> Transaction:
+    return Transaction(
+        fitid=fitid, account=account, amount=Decimal("-20.00"), date=date(2026, 3, 10), memo=memo, memo_normalized=normalize_memo(memo)
+    )
+
+
+class TestSignatures:
+    """Testes para as assinaturas MinHash e o agrupamento."""
+
+    def test_similarity_estimates_jaccard(self):
+        """Testa que variações do mesmo memo são parecidas e memos diferentes não."""
+        matrix = merchants.signatures([normalize_memo(memo) for memo in [*VARIANTS, "DROGASIL 1234"]])
+
+        assert merchants.similarity(matrix[0], matrix[0]) == 1.0
+        assert merchants.similarity(matrix[0], matrix[1]) >= merchants.SIMILARITY_THRESHOLD
+        assert merchants.similarity(matrix[0], matrix[3]) < merchants.SIMILARITY_THRESHOLD
+
+    def test_signatures_are_stable(self):
+        """Testa que a assinatura não depende da ordem nem do bloco em que o memo é calculado."""
+        first = merchants.signatures(["uber trip", "padaria"])
+        with patch.object(merchants, "SIGNATURE_CHUNK_SIZE", 1):
+            second = merchants.signatures(["padaria", "uber trip"])
+
+        assert (first[0] == second[1]).all()
+        assert len(merchants.band_buckets(first[0])) == merchants.BANDS
+
+    def test_cluster_groups_variants(self):
+        """Testa que as variações ficam no mesmo grupo e outros estabelecimentos em grupos próprios."""
+        memos = [*VARIANTS, "DROGASIL 1234 SAO PAULO", "DROGASIL 2291 SAO PAULO SP", "PADARIA PAO QUENTE"]
+
+        labels = merchants.cluster(merchants.signatures([normalize_memo(memo) for memo in memos]))
+
+        assert labels == [0, 0, 0, 1, 1, 2]
+
+    @pytest.mark.parametrize(
+        "memos", [("UBER TRIP SAO PAULO", "UBER EATS SAO PAULO"), ("PAG*JOAOSILVA", "PAG*JOSESILVA")], ids=["uber", "pix"]
+    )
+    def test_cluster_separates_memos_differing_in_one_word(self, memos):
+        """Testa que memos que só diferem numa palavra (serviço ou recebedor) ficam em estabelecimentos diferentes."""
+        matrix = merchants.signatures([normalize_memo(memo) for memo in memos])
+
+        assert merchants.similarity(matrix[0], matrix[1]) < merchants.SIMILARITY_THRESHOLD
+        assert merchants.cluster(matrix) == [0, 1]
+
+
+@pytest.mark.django_db
+class TestAssign:
+    """Testes para a atribuição do estabelecimento a transações novas."""
+
+    def test_creates_one_merchant_per_group(self, account):
+        """Testa que as variações do lote recebem o mesmo estabelecimento, com o memo mais frequente como nome."""
+        transactions = [_transaction(account, str(i), memo) for i, memo in enumerate([*VARIANTS, VARIANTS[0], "PADARIA PAO QUENTE"])]
+
+        assert merchants.assign(transactions) == 2
+
+        assert len({tx.merchant_id for tx in transactions[:4]}) == 1
+        assert transactions[4].merchant_id != transactions[0].merchant_id
+        assert Merchant.objects.get(id=transactions[0].merchant_id).name == VARIANTS[0]
+        assert MerchantAlias.objects.count() == 4
+
+    def test_reuses_known_merchant(self, account):
+        """Testa que uma variação nova encontra o estabelecimento existente pelos buckets, sem criar outro."""
+        first = [_transaction(account, "1", VARIANTS[0])]
+        merchants.assign(first)
+        second = [_transaction(account, "2", VARIANTS[1]), _transaction(account, "3", VARIANTS[0])]
+
+        assert merchants.assign(second) == 0
+
+        assert {tx.merchant_id for tx in second} == {first[0].merchant_id}
+        assert MerchantAlias.objects.filter(merchant_id=first[0].merchant_id).count() == 2
+
+    def test_query_count_is_bounded(self, account, django_assert_max_num_queries):
+        """Testa que mais de 20 memos novos (buckets em mais de um INSERT no SQLite) ficam dentro de max_assign_queries."""
+        memos = [f"LOJA {first}{second} CENTRO" for first in "ABCDEFG" for second in "HIJK"]
+        transactions = [_transaction(account, str(i), memo) for i, memo in enumerate(memos)]
+
+        with django_assert_max_num_queries(merchants.max_assign_queries(len(memos))):
+            merchants.assign(transactions)
+
+        assert MerchantAlias.objects.count() == len(memos)
+        assert MerchantBucket.objects.count() == len(memos) * merchants.BANDS
+
+    def test_ignores_memos_without_letters(self, account):
+        """Testa que memos vazios ou só com números ficam sem estabelecimento."""
+        transactions = [_transaction(account, "1", ""), _transaction(account, "2", "123456")]
+
+        assert merchants.assign(transactions) == 0
+        assert [tx.merchant_id for tx in transactions] == [None, None]
+
+    def test_import_sets_merchant(self, account, ofx_import):
+        """Testa que a importação OFX grava o estabelecimento das transações."""
+        ofx_import(
+            account, [(f"fitid-{i}", "-20.00", memo, date(2026, 3, i + 1)) for i, memo in enumerate([*VARIANTS, "PADARIA PAO QUENTE"])]
+        )
+
+        assert Merchant.objects.count() == 2
+        assert Transaction.objects.filter(merchant__isnull=True).count() == 0
+        assert Transaction.objects.values("merchant").distinct().count() == 2
+
+
+@pytest.mark.django_db
+class TestRebuild:
+    """Testes para o reagrupamento do histórico."""
+
+    def test_rebuild_command(self, account):
+        """Testa que o comando refaz os estabelecimentos de todas as transações."""
+        for i, memo in enumerate([*VARIANTS, "PADARIA PAO QUENTE", "PADARIA PAO QUENTE LTDA"]):
+            Transaction.objects.create(fitid=str(i), account=account, amount=Decimal("-20.00"), date=date(2026, 3, 10), memo=memo)
+        Merchant.objects.create(name="Antigo")
+        out = StringIO()
+
+        call_command("agrupar_estabelecimentos", stdout=out)
+
+        assert "2 estabelecimentos criados" in out.getvalue()
+        assert not Merchant.objects.filter(name="Antigo").exists()
+        assert Transaction.objects.filter(merchant__isnull=True).count() == 0
+        assert Transaction.objects.values("merchant").distinct().count() == 2
+
+
+@pytest.mark.django_db
+class TestSimilarExpenses:
+    """Testes para a busca de despesas parecidas pelo estabelecimento."""
+
+    def test_finds_expenses_of_same_merchant(self, account):
+        """Testa que despesas do mesmo estabelecimento aparecem mesmo sem palavras em comum, antes das demais."""
+        subcategory = SubCategory.objects.create(name="Transporte", category=Category.objects.create(name="Mobilidade"))
+        merchant = Merchant.objects.create(name="UBER")
+        for i, (memo, merchant_id) in enumerate([("UBR* PENDING", merchant.id), ("TRIP RIO", None)]):
+            tx = Transaction.objects.create(
+                fitid=str(i), account=account, amount=Decimal("-20.00"), date=date(2026, 3, 10), memo=memo, merchant_id=merchant_id
+            )
+            Expense.objects.create(transaction=tx, description=memo, subcategory=subcategory, reference_month=date(2026, 2 + i, 1))
+
+        similar = find_similar_expenses("TRIP SAO PAULO", merchant_id=merchant.id)
+
+        assert [expense.description for expense in similar] == ["UBR* PENDING", "TRIP RIO"]
@@ -0,0 +1,157 @@
+"""Testes para o middleware de desempenho e o endpoint /metrics."""
+
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from orcamento_2026.core.models import Category
+from orcamento_2026.core.services.metrics import MetricsRegistry, RequestSample, percentile, registry, render_prometheus
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.fixture
+def staff_client(client, django_user_model):
+    user = django_user_model.objects.create_user(username="staff", password="password", is_staff=True)
+    client.force_login(user)
+    return client
+
+
+class TestMetricsRegistry:
+    """Testes para o registro em memória e a renderização."""
+
+    def test_percentile_nearest_rank(self):
+        """Testa o cálculo de percentis."""
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([3.0], 0.9) == 3.0
+
+    def test_window_keeps_last_samples_and_totals(self):
+        """Testa que a janela é limitada mas _count e _sum são acumulados."""
+        metrics = MetricsRegistry(window=2)
+        for duration in (1.0, 2.0, 3.0):
+            metrics.record("dashboard", RequestSample(duration, 1, 0.1))
+
+        stats = metrics.snapshot()["dashboard"]
+        assert [sample.duration for sample in stats.samples] == [2.0, 3.0]
+        assert stats.count == 3
+        assert stats.duration_sum == 6.0
+
+    def test_render_prometheus(self):
+        """Testa o formato de exposição texto."""
+        metrics = MetricsRegistry()
+        metrics.record('view"x', RequestSample(0.5, 4, 0.2), slow_queries=1)
+
+        output = render_prometheus(metrics)
+
+        assert "# TYPE orcamento_request_duration_seconds summary" in output
+        assert 'orcamento_request_duration_seconds{view="view\\"x"' in output
+        assert 'quantile="0.99"} 0.5' in output
+        assert "orcamento_db_queries_sum" in output
+        assert 'orcamento_slow_queries_total{view="view\\"x"' in output
+
+
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+    """Testes para o PerformanceMiddleware."""
+
+    def test_records_view_name_and_queries(self, staff_client):
+        """Testa que a requisição é registrada com o nome da view e as queries."""
+        Category.objects.create(name="Alimentação")
+
+        staff_client.get(reverse("category_list"))
+
+        stats = registry.snapshot()["category_list"]
+        assert stats.count == 1
+        assert stats.samples[0].queries > 0
+        assert stats.samples[0].db_duration > 0
+
+    def test_logs_slow_queries(self, staff_client, settings, caplog):
+        """Testa que queries acima do limite são registradas no log."""
+        settings.PERF_SLOW_QUERY_MS = 0
+        settings.PERF_SLOW_REQUEST_MS = 0
+        # O middleware lê os limites na inicialização: força a recriação do handler
+        staff_client.handler.load_middleware()
+
+        with caplog.at_level(logging.WARNING, logger="orcamento_2026.core.middleware"):
+            staff_client.get(reverse("category_list"))
+
+        assert "Query lenta" in caplog.text
+        assert "[category_list]" in caplog.text
+        assert registry.snapshot()["category_list"].slow_queries > 0
+
+    def test_records_async_views_under_asgi(self, django_user_model):
+        """Testa a medição com o middleware em modo assíncrono (AsyncClient) e view assíncrona."""
+        client = AsyncClient()
+        client.force_login(django_user_model.objects.create_user(username="async", password="password"))
+
+        response = async_to_sync(client.get)(reverse("pending_suggestions_count"))
+
+        assert response.status_code == 200
+        stats = registry.snapshot()["pending_suggestions_count"]
+        assert stats.count == 1
+        # Sessão, usuário e contador
+        assert stats.samples[0].queries == 3
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Testes para a view metrics."""
+
+    def test_staff_gets_prometheus_text(self, staff_client):
+        """Testa que staff recebe as métricas."""
+        staff_client.get(reverse("category_list"))
+
+        response = staff_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert 'view="category_list"' in response.content.decode()
+
+    def test_non_staff_is_forbidden(self, client, django_user_model):
+        """Testa que usuários comuns e anônimos não acessam."""
+        assert client.get("/metrics").status_code == 403
+
+        client.force_login(django_user_model.objects.create_user(username="user", password="password"))
+        assert client.get("/metrics").status_code == 403
+
+    def test_bearer_token(self, client, settings):
+        """Testa o acesso com METRICS_TOKEN."""
+        settings.METRICS_TOKEN = "segredo"
+
+        assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer segredo").status_code == 200
+        assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer errado").status_code == 403
+
+
+@pytest.mark.django_db
+class TestHealthEndpoint:
+    """Testes para o health check."""
+
+    def test_anonymous_gets_ok(self, client):
+        """Testa que o health check responde sem login e consulta o banco."""
+        response = client.get(reverse("health"))
+
+        assert response.status_code == 200
+        assert response.content == b"ok"
+
+    def test_database_unavailable(self, client, monkeypatch):
+        """Testa resposta 503 quando o banco não responde."""
+        from django.db import DatabaseError, connection
+
+        def fail(*args, **kwargs):
+            raise DatabaseError("sem conexão")
+
+        monkeypatch.setattr(connection, "cursor", fail)
+        response = client.get(reverse("health"))
+
+        assert response.status_code == 503
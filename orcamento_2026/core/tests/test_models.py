@@ -1,3 +1,4 @@
+import importlib
 from datetime import date
 from decimal import Decimal
 import pytest
@@ -26,6 +27,24 @@ class TestCategoryModel:
         with pytest.raises(IntegrityError):
             Category.objects.create(name="Transporte")
 
+    def test_category_name_key(self):
+        category = Category.objects.create(name="  Cuidados PESSOAIS ")
+        assert category.name_key == "cuidados pessoais"
+
+    def test_category_unique_name_key(self):
+        Category.objects.create(name="Saúde")
+        with pytest.raises(IntegrityError):
+            Category.objects.create(name="SAUDE")
+
+
+class TestNameKeyMigration:
+    def test_collisions_after_normalization(self):
+        """Testa que a migração de name_key aponta os nomes que colidiriam na restrição única, por escopo."""
+        migration = importlib.import_module("orcamento_2026.core.migrations.0002_name_key")
+        rows = [(None, "Alimentação"), (None, "alimentacao"), (None, "Lazer"), (1, "Outros"), (2, "outros")]
+
+        assert migration.collisions(rows) == [(None, ["Alimentação", "alimentacao"])]
+
 
 @pytest.mark.django_db
 class TestSubCategoryModel:
@@ -36,6 +55,14 @@ class TestSubCategoryModel:
         assert subcategory.category == category
         assert str(subcategory) == "Lazer - Cinema"
 
+    def test_subcategory_unique_name_key_per_category(self):
+        lazer = Category.objects.create(name="Lazer")
+        saude = Category.objects.create(name="Saúde")
+        SubCategory.objects.create(category=lazer, name="Outros")
+        SubCategory.objects.create(category=saude, name="Outros")
+        with pytest.raises(IntegrityError):
+            SubCategory.objects.create(category=lazer, name="OUTROS")
+
 
 @pytest.mark.django_db
 class TestTransactionModel:
@@ -54,6 +81,43 @@ class TestTransactionModel:
         with pytest.raises(IntegrityError):
             Transaction.objects.create(fitid="unique-id", account=account, amount=Decimal("20.00"), date=date(2026, 2, 16), memo="Teste 2")
 
+    def test_transaction_fitid_unique_per_account(self):
+        Transaction.objects.create(
+            fitid="same-id",
+            account=Account.objects.create(name="Itaú", type="C"),
+            amount=Decimal("10.00"),
+            date=date(2026, 2, 15),
+            memo="A",
+        )
+        Transaction.objects.create(
+            fitid="same-id",
+            account=Account.objects.create(name="Nubank", type="K"),
+            amount=Decimal("10.00"),
+            date=date(2026, 2, 15),
+            memo="A",
+        )
+        assert Transaction.objects.filter(fitid="same-id").count() == 2
+
+    def test_transaction_memo_normalized(self):
+        account = Account.objects.create(name="Itaú", type="C")
+        transaction = Transaction.objects.create(
+            fitid="1", account=account, amount=Decimal("-10.00"), date=date(2026, 2, 15), memo="Padaria São João PARC 02/03 *1234"
+        )
+        assert transaction.memo_normalized == "padaria sao joao"
+        transaction.memo = "Mercado 15/02"
+        transaction.save()
+        transaction.refresh_from_db()
+        assert transaction.memo_normalized == "mercado"
+
+    def test_transaction_amount_cents(self):
+        account = Account.objects.create(name="Itaú", type="C")
+        transaction = Transaction.objects.create(fitid="1", account=account, amount=Decimal("-10.10"), date=date(2026, 2, 15), memo="A")
+        assert transaction.amount_cents == -1010
+        transaction.amount = 10.1
+        transaction.save()
+        transaction.refresh_from_db()
+        assert transaction.amount_cents == 1010
+
 
 @pytest.mark.django_db
 class TestExpenseModel:
@@ -74,3 +138,4 @@ class TestExpenseModel:
         assert expense.subcategory == subcategory
         assert expense.description == "Remédio Dor de Cabeça"
         assert str(expense) == "Remédio Dor de Cabeça"
+        assert expense.month_key == 202602
@@ -0,0 +1,165 @@
+"""Testes para o particionamento por ano (PostgreSQL) e o comportamento sem particionamento."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction as db_transaction
+
+from orcamento_2026.core.models import Account, Budget, Category, Expense, SubCategory, Transaction, TransactionSuggestion
+from orcamento_2026.core.services import counters, partitioning
+
+# Suíte rodando no PostgreSQL com DB_PARTITIONING=True (a migração 0014 particionou as tabelas)
+PARTITIONED: bool = connection.vendor == "postgresql" and settings.DB_PARTITIONING
+
+
+@pytest.fixture
+def subcategory():
+    return SubCategory.objects.create(category=Category.objects.create(name="Moradia"), name="Aluguel")
+
+
+def _expense(subcategory, fitid: str, day: date, reference_month: date) -> Expense:
+    account, _ = Account.objects.get_or_create(name="Nubank", type="K")
+    tx = Transaction.objects.create(fitid=fitid, account=account, amount=Decimal("-10.00"), date=day, memo="Compra")
+    return Expense.objects.create(transaction=tx, description="Compra", subcategory=subcategory, reference_month=reference_month)
+
+
+class TestStatements:
+    """Testes para o SQL das partições."""
+
+    def test_partition_statement(self):
+        """Testa que a partição cobre o ano inteiro, com o limite superior exclusivo."""
+        assert partitioning.partition_statement("core_transaction", 2024) == (
+            'CREATE TABLE IF NOT EXISTS "core_transaction_2024" PARTITION OF "core_transaction" '
+            "FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')"
+        )
+
+    def test_partition_statement_with_parent(self):
+        """Testa que, na conversão, a partição recebe o nome final mas é anexada à tabela temporária."""
+        statement = partitioning.partition_statement("core_expense", 2020, parent="core_expense__partitioned")
+
+        assert statement.startswith('CREATE TABLE IF NOT EXISTS "core_expense_2020" PARTITION OF "core_expense__partitioned"')
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor == "postgresql", reason="Comportamento sem PostgreSQL")
+class TestWithoutPartitioning:
+    """Testes para o SQLite, que mantém as tabelas comuns."""
+
+    def test_ensure_partitions_is_noop(self, django_assert_num_queries):
+        """Testa que garantir partições não consulta o banco nem cria nada."""
+        with django_assert_num_queries(0):
+            assert partitioning.ensure_partitions(Transaction, [date(2031, 1, 1)]) == []
+        assert partitioning.partitions("core_transaction") is None
+
+    def test_partition_tables_requires_postgresql(self):
+        """Testa que a conversão é recusada fora do PostgreSQL."""
+        with pytest.raises(ValueError, match="apenas no PostgreSQL"):
+            partitioning.partition_tables()
+
+    def test_commands_require_postgresql(self):
+        """Testa que os comandos de particionar e arquivar falham com mensagem clara no SQLite."""
+        with pytest.raises(CommandError, match="apenas no PostgreSQL"):
+            call_command("particionar_tabelas", stdout=StringIO())
+        with pytest.raises(CommandError, match="apenas no PostgreSQL"):
+            call_command("arquivar_particoes", "--before", "2020", stdout=StringIO())
+
+
+@pytest.mark.django_db
+class TestBoundaryLinks:
+    """Testes para as despesas que o arquivamento separaria das transações."""
+
+    def test_counts_links_across_cutoff(self, subcategory):
+        """Testa que contam as despesas de um lado do corte com a transação do outro, nos dois sentidos."""
+        _expense(subcategory, "1", date(2019, 12, 28), date(2020, 1, 1))
+        _expense(subcategory, "2", date(2020, 1, 5), date(2019, 12, 1))
+        _expense(subcategory, "3", date(2019, 6, 10), date(2019, 6, 1))
+        _expense(subcategory, "4", date(2020, 6, 10), date(2020, 6, 1))
+
+        assert partitioning.boundary_links(2020) == 2
+        assert partitioning.boundary_links(2019) == 0
+
+    def test_counts_suggestions_of_archived_transactions(self, subcategory):
+        """Testa que as sugestões das transações arquivadas contam (a tabela de sugestões não é particionada)."""
+        old = _expense(subcategory, "1", date(2019, 6, 10), date(2019, 6, 1)).transaction
+        new = _expense(subcategory, "2", date(2020, 6, 10), date(2020, 6, 1)).transaction
+        TransactionSuggestion.objects.create(transaction=old, status="ACEITO")
+        TransactionSuggestion.objects.create(transaction=new, status="ACEITO")
+
+        assert partitioning.boundary_links(2020) == 1
+
+    def test_archive_command_refuses_links(self, subcategory):
+        """Testa que o comando não arquiva se o corte separaria despesas das transações."""
+        _expense(subcategory, "1", date(2019, 12, 28), date(2020, 1, 1))
+
+        with pytest.raises(CommandError, match="1 despesas e sugestões estão ligadas a transações do outro lado do corte"):
+            call_command("arquivar_particoes", "--before", "2020", stdout=StringIO())
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not PARTITIONED, reason="Requer PostgreSQL com DB_PARTITIONING=True")
+class TestPartitioned:
+    """Testes para as tabelas particionadas (PostgreSQL com DB_PARTITIONING=True)."""
+
+    def test_fitid_stays_unique_across_partitions(self):
+        """Testa que o FITID continua único por conta com as linhas em partições (anos) diferentes."""
+        account = Account.objects.create(name="Nubank", type="K")
+        Transaction.objects.create(fitid="1", account=account, amount=Decimal("-10.00"), date=date(2019, 5, 1), memo="Compra")
+
+        with pytest.raises(IntegrityError, match="core_transaction_unique_account_fitid"), db_transaction.atomic():
+            Transaction.objects.create(fitid="1", account=account, amount=Decimal("-10.00"), date=date(2024, 5, 1), memo="Compra")
+
+    def test_one_expense_per_transaction_across_partitions(self, subcategory):
+        """Testa que a transação continua com uma única despesa, mesmo com meses de referência em anos diferentes."""
+        expense = _expense(subcategory, "1", date(2019, 12, 28), date(2019, 12, 1))
+
+        with pytest.raises(IntegrityError), db_transaction.atomic():
+            Expense.objects.create(
+                transaction=expense.transaction, description="De novo", subcategory=subcategory, reference_month=date(2020, 1, 1)
+            )
+
+    def test_expense_requires_existing_transaction(self, subcategory):
+        """Testa que a chave estrangeira despesa -> transação continua no banco."""
+        with pytest.raises(IntegrityError), db_transaction.atomic():
+            Expense.objects.create(transaction_id=999_999, description="Órfã", subcategory=subcategory, reference_month=date(2020, 1, 1))
+            connection.check_constraints()
+
+    def test_bulk_create_creates_partitions(self):
+        """Testa que bulk_create cria a partição de um ano novo antes de inserir."""
+        account = Account.objects.create(name="Nubank", type="K")
+
+        Transaction.objects.bulk_create([Transaction(fitid="1", account=account, amount=Decimal("-1.00"), date=date(2041, 3, 1), memo="X")])
+
+        assert 2041 in partitioning.partitions("core_transaction")
+        assert Transaction.objects.filter(date__year=2041).count() == 1
+
+    def test_archive_takes_dependents_and_refreshes_derived_data(self, subcategory):
+        """Testa que arquivar leva as sugestões e despesas ligadas às transações e recalcula contadores e orçamentos."""
+        old = _expense(subcategory, "1", date(2019, 12, 28), date(2020, 1, 1)).transaction
+        account = old.account
+        pending = Transaction.objects.create(fitid="2", account=account, amount=Decimal("-5.00"), date=date(2019, 3, 1), memo="Café")
+        TransactionSuggestion.objects.create(transaction=pending)
+        Budget.objects.create(subcategory=subcategory, month=date(2020, 1, 1), limit=Decimal("100.00"))
+        assert counters.get_counter(counters.PENDING_SUGGESTIONS) == 1
+        assert Budget.objects.get().actual == Decimal("10.00")
+
+        archived = partitioning.archive(2020)
+
+        assert "core_transaction_2019" in archived
+        assert not Transaction.objects.filter(date__lt=date(2020, 1, 1)).exists()
+        assert not Expense.objects.exists()
+        assert not TransactionSuggestion.objects.exists()
+        assert counters.get_counter(counters.PENDING_SUGGESTIONS) == 0
+        assert counters.get_counter(counters.UNCONSOLIDATED_TRANSACTIONS) == 0
+        assert Budget.objects.get().actual == 0
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{partitioning.ARCHIVE_SCHEMA}"."core_transactionsuggestion__core_transaction_2019"')
+            assert cursor.fetchone()[0] == 1
+            cursor.execute(f'SELECT count(*) FROM "{partitioning.ARCHIVE_SCHEMA}"."core_expense__core_transaction_2019"')
+            assert cursor.fetchone()[0] == 1
+        # O FITID arquivado pode ser importado de novo
+        Transaction.objects.create(fitid="2", account=account, amount=Decimal("-5.00"), date=date(2020, 3, 1), memo="Café")
@@ -0,0 +1,109 @@
+"""Testes para o profiling dos management commands."""
+
+import pstats
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from orcamento_2026.core.models import Account, Category
+from orcamento_2026.core.services.import_ofx import import_ofx
+from orcamento_2026.core.services.synthetic import write_ofx
+from orcamento_2026.core.services.utils.profiling import OUTSIDE, Profiler, phase
+
+
+class TestProfiler:
+    """Testes para o Profiler e o context manager phase."""
+
+    def test_phase_is_noop_without_profiler(self):
+        """Testa que phase não faz nada fora de uma execução com profiling."""
+        with phase("parse"):
+            pass
+
+    @pytest.mark.django_db
+    def test_counts_queries_per_phase(self):
+        """Testa que queries são atribuídas à fase mais interna em execução."""
+        profiler = Profiler(trace_sql=True)
+
+        with profiler.activate():
+            with phase("outer"):
+                list(Category.objects.all())
+                with phase("inner"):
+                    list(Category.objects.all())
+                    list(Category.objects.all())
+            with phase("inner"):
+                pass
+            Category.objects.count()
+
+        assert profiler.phases["outer"].queries == 1
+        assert profiler.phases["inner"].queries == 2
+        assert profiler.phases["inner"].calls == 2
+        assert profiler.phases[OUTSIDE].queries == 1
+        assert profiler.phases["outer"].duration >= profiler.phases["inner"].duration
+
+    def test_memory_peak_per_phase(self):
+        """Testa que o pico de memória de uma fase inclui o das fases aninhadas."""
+        profiler = Profiler(memory=True)
+
+        with profiler.activate():
+            with phase("outer"):
+                with phase("inner"):
+                    buffer = bytearray(4 * 2**20)
+                del buffer
+
+        assert profiler.phases["inner"].memory_peak >= 4 * 2**20
+        assert profiler.phases["outer"].memory_peak >= profiler.phases["inner"].memory_peak
+        assert profiler.memory_peak >= 4 * 2**20
+        assert "Maiores alocações" in "\n".join(profiler.report())
+
+    @pytest.mark.django_db
+    def test_import_ofx_phases(self, tmp_path):
+        """Testa que a importação OFX é dividida em parse, calendar, dedupe, merchants, insert, transfers e recurring."""
+        path = tmp_path / "extrato.ofx"
+        write_ofx(str(path), 30)
+        account = Account.objects.create(name="Test", type="C")
+        profiler = Profiler(trace_sql=True)
+
+        with profiler.activate():
+            import_ofx(str(path), account)
+
+        assert list(profiler.phases) == ["parse", "calendar", "dedupe", "merchants", "insert", "transfers", "recurring"]
+        assert profiler.phases["parse"].queries == 0
+        # Ciclo da conta e uma busca no calendário para o lote
+        assert profiler.phases["calendar"].queries == 2
+        assert profiler.phases["dedupe"].queries == 1
+        # Candidatas na janela de datas, sem pares no extrato de uma conta só
+        assert profiler.phases["transfers"].queries == 1
+
+
+@pytest.mark.django_db
+class TestProfiledCommand:
+    """Testes para as opções de profiling dos comandos."""
+
+    def test_without_flags_prints_no_report(self):
+        """Testa que sem opções o comando não é instrumentado."""
+        out = StringIO()
+        call_command("popular", stdout=out)
+
+        assert "Profiling" not in out.getvalue()
+
+    def test_trace_sql_and_memory(self):
+        """Testa o relatório por fase com --trace-sql e --memory."""
+        out = StringIO()
+        call_command("popular", "--trace-sql", "--memory", "--top", "3", stdout=out)
+
+        output = out.getvalue()
+        assert "População concluída" in output
+        assert "queries" in output
+        assert "pico (MiB)" in output
+        for name in ("accounts", "categories", "total"):
+            assert f"  {name} " in output
+
+    def test_profile_writes_stats_file(self, tmp_path):
+        """Testa que --profile grava um arquivo .prof legível pelo pstats."""
+        path = tmp_path / "popular.prof"
+        out = StringIO()
+        call_command("popular", "--profile", "--profile-output", str(path), stdout=out)
+
+        assert "Funções mais caras" in out.getvalue()
+        assert pstats.Stats(str(path)).total_calls > 0
@@ -0,0 +1,251 @@
+"""
+Orçamentos de queries: todas as URLs do core sobre dados sintéticos.
+
+Cada URL é exercitada com QUERY_BUDGETS_ENFORCED ligado (ver conftest), então
+exceder o orçamento falha com o SQL executado. A mesma bateria roda com dois
+volumes de dados e o número de queries precisa ser idêntico: orçamentos não
+podem depender da quantidade de linhas.
+"""
+
+import io
+import itertools
+import json
+import re
+import string
+from typing import Callable
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.urls import URLPattern, reverse
+from django.views import View
+
+from orcamento_2026.core import urls as core_urls
+from orcamento_2026.core.models import Account, Category, Expense, MerchantAlias, SubCategory, Transaction, TransactionSuggestion
+from orcamento_2026.core.services.import_ofx import IMPORT_BATCH_SIZE
+from orcamento_2026.core.services.synthetic import generate_dataset, write_ofx
+from orcamento_2026.core.services.utils.query_budget import QueryBudgetExceeded, capture_queries, check_budget, get_budget, query_budget
+
+# Menos de uma página das listas (paginate_by 20/25) e várias páginas: N+1 por linha muda a contagem
+SMALL: int = 24
+LARGE: int = 180
+
+# Views também exercitadas via POST: nome da URL -> função que monta os dados enviados
+POSTS: dict[str, Callable[[], dict]] = {
+    "category_create": lambda: {"name": f"Categoria {next(_sequence)}"},
+    "subcategory_create": lambda: {"category": _first(Category).pk, "name": f"Subcategoria {next(_sequence)}"},
+    "expense_create": lambda: {"description": "Manual", "subcategory": _first(SubCategory).pk, "reference_month": "2026-02-01"},
+    "expense_update": lambda: {"description": "Editada", "subcategory": _first(SubCategory).pk, "reference_month": "2026-02-01"},
+    "expense_delete": lambda: {},
+    "transaction_consolidate": lambda: {
+        "category": _first(SubCategory).category_id,
+        "subcategory": _first(SubCategory).pk,
+        "description": "Consolidada",
+        "reference_month": "2026-02-01",
+    },
+    "suggestion_generate": lambda: {},
+    "suggestion_accept": lambda: {},
+    "suggestion_reject": lambda: {},
+    "import_ofx": lambda: {"account": _first(Account).pk, "reference_date": "2026-02-01", "ofx_file": _ofx_file()},
+}
+
+_sequence = itertools.count()
+
+
+def _first(model):
+    return model.objects.order_by("id").first()
+
+
+def _ofx_file() -> SimpleUploadedFile:
+    content = io.StringIO()
+    write_ofx(content, 16, seed=next(_sequence))
+    return SimpleUploadedFile("extrato.ofx", content.getvalue().encode())
+
+
+def _url_kwargs(name: str) -> dict:
+    """Argumentos de URL apontando para objetos existentes."""
+    # As URLs são montadas antes das requisições: cada POST usa uma sugestão pendente diferente
+    pending = TransactionSuggestion.objects.filter(status="PENDENTE", transaction__expense__isnull=True).order_by("id")
+    objects = {
+        "category_": lambda: _first(Category),
+        "subcategory_": lambda: _first(SubCategory),
+        "expense_": lambda: _first(Expense),
+        # Com sugestão pendente: o caminho mais caro da consolidação
+        "transaction_": lambda: pending[0].transaction,
+        "suggestion_accept": lambda: pending[1],
+        "suggestion_reject": lambda: pending[2],
+    }
+    for prefix, get_object in objects.items():
+        if name.startswith(prefix):
+            return {"pk": get_object().pk}
+    raise AssertionError(f"Sem objeto para a URL '{name}'")
+
+
+def _requests() -> list[tuple[str, str, str, dict]]:
+    """(rótulo, método, URL, dados) para cada URL do core; logout por último."""
+    requests = []
+    for pattern in core_urls.urlpatterns:
+        kwargs = _url_kwargs(pattern.name) if pattern.pattern.converters else {}
+        url = reverse(pattern.name, kwargs=kwargs)
+        if pattern.name == "logout":
+            continue
+        params = {"category": _first(Category).pk} if pattern.name == "api_subcategories" else {}
+        requests.append((f"GET {pattern.name}", "get", url, params))
+        if pattern.name in POSTS:
+            requests.append((f"POST {pattern.name}", "post", url, POSTS[pattern.name]()))
+    requests.append(("POST logout", "post", reverse("logout"), {}))
+    return requests
+
+
+OLLAMA_DATA: dict = {"category": "Alimentação", "subcategory": "Supermercado", "description": "Compra"}
+
+
+def _ollama_response() -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = {"response": json.dumps(OLLAMA_DATA)}
+    return response
+
+
+def _exercise(client) -> dict[str, int]:
+    """Faz todas as requisições e retorna o número de queries de cada uma."""
+    # Começa sempre com o cache vazio (fragmentos de subcategorias)
+    cache.clear()
+    counts = {}
+    with (
+        patch("orcamento_2026.core.services.suggestions.requests.post", return_value=_ollama_response()),
+        patch("orcamento_2026.core.services.suggestions._acall_ollama_api", AsyncMock(return_value=OLLAMA_DATA)),
+    ):
+        for label, method, url, data in _requests():
+            with capture_queries() as queries:
+                response = getattr(client, method)(url, data)
+            assert response.status_code < 400, f"{label} respondeu {response.status_code}"
+            counts[label] = len(queries)
+    return counts
+
+
+@pytest.fixture
+def staff_client(client, django_user_model):
+    user = django_user_model.objects.create_user(username="staff", password="password", is_staff=True)
+    client.force_login(user)
+    return client
+
+
+class TestQueryBudgetDecorator:
+    """Testes para o decorator query_budget."""
+
+    def test_registers_budget(self):
+        """Testa que o orçamento fica disponível para views e funções."""
+
+        @query_budget(2)
+        def service():
+            return "ok"
+
+        assert get_budget(service) == 2
+        assert service() == "ok"
+
+    def test_error_lists_sql(self):
+        """Testa que a falha mostra o SQL executado."""
+        with pytest.raises(QueryBudgetExceeded, match=r"executou 2 queries \(orçamento: 1\):\n  1\. SELECT 1"):
+            check_budget("view", 1, ["SELECT 1", "SELECT 2"])
+
+    @pytest.mark.django_db
+    def test_enforced_when_enabled(self):
+        """Testa que exceder o orçamento levanta QueryBudgetExceeded."""
+
+        @query_budget(1)
+        def two_queries():
+            list(Category.objects.all())
+            list(SubCategory.objects.all())
+
+        with pytest.raises(QueryBudgetExceeded, match="core_subcategory"):
+            two_queries()
+
+    @pytest.mark.django_db
+    def test_counts_template_rendering_of_class_based_views(self, rf):
+        """Testa que as queries feitas ao renderizar o TemplateResponse (N+1 no template) contam no orçamento da view."""
+        Category.objects.create(name="Lazer")
+        template = engines["django"].from_string("{% for category in categories %}{{ category.subcategories.count }}{% endfor %}")
+
+        @query_budget(1)
+        class CategoriesView(View):
+            def get(self, request):
+                return TemplateResponse(request, template, {"categories": Category.objects.all()})
+
+        with pytest.raises(QueryBudgetExceeded, match="core_subcategory"):
+            CategoriesView.as_view()(rf.get("/"))
+
+    @pytest.mark.django_db
+    def test_unbudgeted_queries_are_not_counted(self):
+        """Testa que as queries de unbudgeted() (DDL de manutenção) não contam no orçamento."""
+        from orcamento_2026.core.services.utils.query_budget import unbudgeted
+
+        @query_budget(1)
+        def with_maintenance():
+            with unbudgeted():
+                list(SubCategory.objects.all())
+            return Category.objects.count()
+
+        assert with_maintenance() == 0
+
+    @pytest.mark.django_db
+    def test_not_enforced_when_disabled(self, settings):
+        """Testa que, desligado, o decorator não interfere."""
+        settings.QUERY_BUDGETS_ENFORCED = False
+
+        @query_budget(0)
+        def one_query():
+            return Category.objects.count()
+
+        assert one_query() == 0
+
+
+def test_every_core_url_has_a_budget():
+    """Testa que toda URL do core declara orçamento de queries."""
+    missing = [
+        pattern.name for pattern in core_urls.urlpatterns if isinstance(pattern, URLPattern) and get_budget(pattern.callback) is None
+    ]
+    assert missing == []
+
+
+@pytest.mark.django_db
+def test_budgets_hold_independent_of_row_count(staff_client, django_user_model):
+    """Testa todas as URLs com dois volumes de dados: dentro do orçamento e com o mesmo número de queries."""
+    # Poucas despesas, mas com sugestões pendentes (os POSTs usam três) e um lote inteiro de transações sem sugestão
+    generate_dataset(SMALL, consolidated_ratio=0.2, suggestion_ratio=0.3, seed=1)
+    small = _exercise(staff_client)
+
+    # A bateria termina com logout
+    staff_client.force_login(django_user_model.objects.get(username="staff"))
+    generate_dataset(LARGE - SMALL, seed=2)
+    large = _exercise(staff_client)
+
+    differences = {label: (small[label], large[label]) for label in small if small[label] != large[label]}
+    assert differences == {}
+
+
+def _distinct_memo(i: int) -> str:
+    # Letras diferentes em cada linha: o memo normalizado descarta os números
+    letters = "".join(string.ascii_uppercase[i // 26**position % 26] for position in range(3))
+    return f"LOJA {letters} PARC 01/10"
+
+
+@pytest.mark.django_db
+def test_import_budget_holds_for_a_full_batch_of_new_memos(staff_client):
+    """Testa a importação de um lote inteiro com memos todos diferentes: o pior caso dos INSERTs de estabelecimentos."""
+    account = Account.objects.create(name="Nubank", type="C")
+    content = io.StringIO()
+    write_ofx(content, IMPORT_BATCH_SIZE, seed=1)
+    memos = (f"<MEMO>{_distinct_memo(i)}" for i in itertools.count())
+    ofx = re.sub(r"<MEMO>[^<]*", lambda match: next(memos), content.getvalue())
+
+    # Sem data de referência: cada lote também consulta o calendário de faturamento
+    response = staff_client.post(
+        reverse("import_ofx"), {"account": account.pk, "ofx_file": SimpleUploadedFile("extrato.ofx", ofx.encode())}
+    )
+
+    assert response.status_code == 302
+    assert Transaction.objects.filter(account=account).count() == IMPORT_BATCH_SIZE
+    assert MerchantAlias.objects.count() == IMPORT_BATCH_SIZE
@@ -0,0 +1,162 @@
+"""Testes para a detecção de cobranças recorrentes."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from orcamento_2026.core.models import Account, RecurringCharge, Transaction
+from orcamento_2026.core.services.import_ofx import import_ofx
+from orcamento_2026.core.services.recurring import active_charges, build_frame, detect, refresh
+from orcamento_2026.core.services.utils.text_utils import normalize_memo
+
+TODAY = date(2026, 7, 20)
+
+
+def _monthly(account_id: int, memo: str, amount: str, months: range, day: int = 5) -> list[tuple]:
+    return [(month, account_id, date(2026, month, day), Decimal(amount), f"{memo} {month:02d}/26") for month in months]
+
+
+@pytest.fixture
+def account():
+    return Account.objects.create(name="Nubank", type="K")
+
+
+def _create(account, rows: list[tuple]) -> None:
+    Transaction.objects.bulk_create(
+        Transaction(
+            fitid=f"{account.pk}-{memo}-{day}", account=account, amount=amount, date=day, memo=memo, memo_normalized=normalize_memo(memo)
+        )
+        for _, _, day, amount, memo in rows
+    )
+
+
+class TestNormalizeMemo:
+    """Testes para a função normalize_memo."""
+
+    def test_removes_numbers_and_punctuation(self):
+        """Testa que datas, códigos e pontuação não separam cobranças do mesmo estabelecimento."""
+        assert normalize_memo("NETFLIX.COM 12/03") == "netflix com"
+        assert normalize_memo("Netflix.com 01/04 *123") == "netflix com"
+        assert normalize_memo("12/03") == ""
+
+    def test_removes_installments_and_card_suffixes(self):
+        """Testa que parcelas e o final do cartão saem com a palavra-chave, sem afetar palavras comuns."""
+        assert normalize_memo("LOJA X PARC 03/10 FINAL 1234") == "loja x"
+        assert normalize_memo("Amazon XXXX1234 parcela 2 de 5") == "amazon"
+        assert normalize_memo("Padaria São João CARTAO FINAL 9876") == "padaria sao joao"
+        assert normalize_memo("Final Fantasy Store") == "final fantasy store"
+
+
+class TestDetect:
+    """Testes para a detecção vetorizada."""
+
+    def test_monthly_and_annual(self):
+        """Testa cobranças mensais (com variação pequena de valor) e anuais."""
+        rows = _monthly(1, "NETFLIX.COM", "-55.90", range(1, 8))
+        rows[-1] = (*rows[-1][:3], Decimal("-59.90"), rows[-1][4])
+        rows += [(100 + year, 2, date(year, 3, 1), Decimal("-400.00"), "ANUIDADE CARTAO") for year in (2024, 2025, 2026)]
+
+        charges = detect(build_frame(rows))
+
+        assert charges[["account_id", "memo_key", "cadence", "amount_cents", "occurrences"]].values.tolist() == [
+            [1, "netflix com", "M", 5590, 7],
+            [2, "anuidade cartao", "A", 40000, 3],
+        ]
+        assert charges["next_date"].dt.date.tolist() == [date(2026, 8, 5), date(2027, 3, 1)]
+        assert charges["description"].tolist() == ["NETFLIX.COM 07/26", "ANUIDADE CARTAO"]
+
+    def test_rejects_irregular_patterns(self):
+        """Testa que valores muito diferentes, intervalos irregulares e créditos não contam."""
+        rows = [(month, 1, date(2026, month, 5), Decimal(-10 * month), "MERCADO X") for month in range(1, 7)]
+        rows += [
+            (10 + i, 1, day, Decimal("-30.00"), "PADARIA") for i, day in enumerate([date(2026, 1, 2), date(2026, 1, 9), date(2026, 3, 1)])
+        ]
+        rows += [(20 + month, 1, date(2026, month, 1), Decimal("5000.00"), "SALARIO") for month in range(1, 7)]
+
+        assert detect(build_frame(rows)).empty
+
+    @pytest.mark.django_db
+    def test_inactive_when_charges_stop(self, account):
+        """Testa que a recorrência fica inativa depois da tolerância sem nova cobrança, sem precisar de nova detecção."""
+        _create(account, _monthly(account.pk, "SPOTIFY", "-21.90", range(1, 5)))
+        refresh()
+
+        # Próxima cobrança prevista em 05/05: ativa até 15/05
+        assert len(active_charges(today=date(2026, 5, 15))) == 1
+        assert active_charges(today=date(2026, 5, 16)) == []
+
+
+@pytest.mark.django_db
+class TestRefresh:
+    """Testes para a gravação em RecurringCharge."""
+
+    def test_full_refresh_persists_and_removes(self, account):
+        """Testa que a varredura grava as cobranças e remove as que deixaram de ser recorrentes."""
+        _create(account, _monthly(account.pk, "NETFLIX.COM", "-55.90", range(1, 8)))
+        RecurringCharge.objects.create(
+            account=account,
+            memo_key="antiga",
+            description="ANTIGA",
+            cadence="M",
+            amount=Decimal("1.00"),
+            occurrences=3,
+            first_date=TODAY,
+            last_date=TODAY,
+            next_date=TODAY,
+            detected_at="2026-01-01T00:00:00Z",
+        )
+
+        assert refresh() == 1
+        charge = RecurringCharge.objects.get()
+        assert (charge.memo_key, charge.cadence, charge.amount, charge.occurrences) == ("netflix com", "M", Decimal("55.90"), 7)
+
+    def test_incremental_refresh_only_touches_memos(self, account):
+        """Testa que o recálculo por memos não mexe nos demais grupos da conta."""
+        _create(
+            account, _monthly(account.pk, "NETFLIX.COM", "-55.90", range(1, 8)) + _monthly(account.pk, "SPOTIFY", "-21.90", range(1, 8))
+        )
+
+        assert refresh([account.pk], ["SPOTIFY 07/26"]) == 1
+        assert list(RecurringCharge.objects.values_list("memo_key", flat=True)) == ["spotify"]
+
+    def test_import_refreshes(self, account):
+        """Testa que a importação de um extrato atualiza as cobranças recorrentes da conta."""
+        _create(account, _monthly(account.pk, "NETFLIX.COM", "-55.90", range(1, 3)))
+        ofx = MagicMock()
+        ofx.account.statement.transactions = [
+            MagicMock(id="n3", amount=-55.90, memo="NETFLIX.COM 03/26", date=MagicMock(date=MagicMock(return_value=date(2026, 3, 5))))
+        ]
+
+        with patch("orcamento_2026.core.services.import_ofx.ofxparse.OfxParser") as parser, patch("builtins.open", new_callable=MagicMock):
+            parser.parse.return_value = ofx
+            import_ofx("extrato.ofx", account)
+
+        assert RecurringCharge.objects.get().occurrences == 3
+
+    def test_command(self, account):
+        """Testa a saída do comando detectar_recorrencias."""
+        _create(account, _monthly(account.pk, "NETFLIX.COM", "-55.90", range(1, 8)))
+        out = StringIO()
+
+        call_command("detectar_recorrencias", stdout=out)
+
+        assert "1 cobranças recorrentes detectadas" in out.getvalue()
+
+    def test_dashboard_panel(self, client, django_user_model, account):
+        """Testa que o dashboard lista as cobranças ativas e o total mensal."""
+        today = date.today()
+        rows = [(i, account.pk, date(today.year - 1, month, 5), Decimal("-30.00"), "SPOTIFY") for i, month in enumerate(range(1, 13))]
+        rows += [(20, account.pk, today.replace(day=1), Decimal("-30.00"), "SPOTIFY")]
+        _create(account, rows)
+        refresh()
+        client.force_login(django_user_model.objects.create_user(username="user", password="password"))
+
+        response = client.get(reverse("dashboard"))
+
+        assert "Assinaturas e Cobranças Recorrentes" in response.content.decode()
+        assert response.context["recurring_monthly_total"] == Decimal("30.00")
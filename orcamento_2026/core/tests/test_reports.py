@@ -0,0 +1,193 @@
+"""Testes para os relatórios e a exportação."""
+
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import openpyxl
+import pyarrow.parquet as pq
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+
+from orcamento_2026.core.models import Account, Category, Expense, SubCategory, Transaction
+from orcamento_2026.core.services.reports import REPORTS, export
+
+
+@pytest.fixture
+def expenses():
+    """Três despesas em dois meses e duas categorias, uma delas ignorada."""
+    account = Account.objects.create(name="Nubank", type="C")
+    market = SubCategory.objects.create(name="Supermercado", category=Category.objects.create(name="Alimentação"))
+    fuel = SubCategory.objects.create(name="Abastecimento", category=Category.objects.create(name="Transporte"))
+    data = [
+        ("1", date(2026, 1, 5), "-100.50", market, date(2026, 1, 1), False),
+        ("2", date(2026, 1, 20), "-50.00", fuel, date(2026, 1, 1), False),
+        ("3", date(2026, 2, 3), "-30.25", market, date(2026, 2, 1), False),
+        ("4", date(2026, 2, 10), "-999.00", fuel, date(2026, 2, 1), True),
+    ]
+    for fitid, day, amount, subcategory, month, ignored in data:
+        tx = Transaction.objects.create(fitid=fitid, account=account, amount=Decimal(amount), date=day, memo=f"Compra {fitid}")
+        Expense.objects.create(
+            transaction=tx, subcategory=subcategory, description=f"Despesa {fitid}", reference_month=month, is_ignored=ignored
+        )
+    Transaction.objects.create(fitid="5", account=account, amount=Decimal("-10.00"), date=date(2026, 2, 15), memo="Sem despesa")
+
+
+def _csv(report: str, **kwargs) -> list[list[str]]:
+    buffer = io.StringIO()
+    export(report, "csv", buffer, **kwargs)
+    return list(csv.reader(io.StringIO(buffer.getvalue())))
+
+
+def _content(response) -> bytes:
+    """Conteúdo de uma resposta em streaming com iterador assíncrono."""
+
+    async def consume():
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    return async_to_sync(consume)()
+
+
+@pytest.mark.django_db
+class TestExport:
+    """Testes para export."""
+
+    def test_expenses_csv(self, expenses):
+        """Testa o CSV de despesas: cabeçalho, joins e ordem por mês de referência."""
+        rows = _csv("despesas")
+
+        assert rows[0] == [column.header for column in REPORTS["despesas"]._columns]
+        assert rows[1] == ["2026-01-01", "Alimentação", "Supermercado", "Despesa 1", "-100.50", "2026-01-05", "Nubank", "1", "False"]
+        assert len(rows) == 5
+
+    def test_period_filter(self, expenses):
+        """Testa que o período filtra o mês de referência das despesas e a data das transações."""
+        assert [row[3] for row in _csv("despesas", start=date(2026, 2, 1))[1:]] == ["Despesa 3", "Despesa 4"]
+        assert [row[4] for row in _csv("transacoes", end=date(2026, 1, 31))[1:]] == ["1", "2"]
+
+    def test_transactions_without_expense(self, expenses):
+        """Testa que transações sem despesa saem com as colunas da despesa vazias."""
+        row = _csv("transacoes")[-1]
+
+        assert row[3] == "Sem despesa"
+        assert row[6:] == ["", "", ""]
+
+    def test_category_by_month_pivot(self, expenses):
+        """Testa o relatório pivotado: meses nas linhas, categorias nas colunas, sem despesas ignoradas."""
+        rows = _csv("categorias_por_mes")
+
+        assert rows == [
+            ["mes", "Alimentação", "Transporte", "total"],
+            ["2026-01-01", "100.50", "50.00", "150.50"],
+            ["2026-02-01", "30.25", "0.00", "30.25"],
+        ]
+
+    def test_xlsx(self, expenses):
+        """Testa que o XLSX é legível e mantém datas e valores."""
+        buffer = io.BytesIO()
+        count = export("despesas", "xlsx", buffer)
+
+        sheet = openpyxl.load_workbook(buffer).active
+        rows = list(sheet.values)
+        assert count == 4
+        assert rows[0][0] == "mes_referencia"
+        assert rows[1][4] == -100.5
+        assert rows[1][0].date() == date(2026, 1, 1)
+
+    def test_parquet(self, expenses, monkeypatch):
+        """Testa o Parquet com tipos nativos e um row group por lote."""
+        monkeypatch.setattr("orcamento_2026.core.services.reports.CHUNK_SIZE", 2)
+        buffer = io.BytesIO()
+        export("transacoes", "parquet", buffer)
+
+        parquet = pq.ParquetFile(io.BytesIO(buffer.getvalue()))
+        table = parquet.read()
+        assert table.num_rows == 5
+        assert parquet.metadata.num_row_groups == 3
+        assert str(table.schema.field("valor").type) == "decimal128(12, 2)"
+        assert table.column("valor")[0].as_py() == Decimal("-100.50")
+        assert table.column("data")[0].as_py() == date(2026, 1, 5)
+
+    def test_empty_parquet(self):
+        """Testa que um relatório vazio gera um Parquet válido, só com o esquema."""
+        buffer = io.BytesIO()
+
+        assert export("despesas", "parquet", buffer) == 0
+        assert pq.read_table(io.BytesIO(buffer.getvalue())).num_rows == 0
+
+
+@pytest.mark.django_db
+class TestReportExportView:
+    """Testes para a view de relatórios."""
+
+    @pytest.fixture
+    def logged_client(self, client, django_user_model):
+        client.force_login(django_user_model.objects.create_user(username="user", password="password"))
+        return client
+
+    def test_form_page(self, logged_client):
+        """Testa que sem parâmetros a página mostra o formulário."""
+        response = logged_client.get(reverse("report_export"))
+
+        assert response.status_code == 200
+        assert "core/reports.html" in [template.name for template in response.templates]
+
+    def test_streams_csv(self, logged_client, expenses):
+        """Testa o download do CSV em streaming."""
+        response = logged_client.get(reverse("report_export"), {"report": "despesas", "format": "csv", "start_date": "2026-02-01"})
+
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        assert 'filename="despesas-' in response["Content-Disposition"]
+        rows = list(csv.reader(io.StringIO(_content(response).decode())))
+        assert [row[3] for row in rows[1:]] == ["Despesa 3", "Despesa 4"]
+
+    def test_streams_xlsx(self, logged_client, expenses):
+        """Testa o download do XLSX, gravado em arquivo temporário e enviado em blocos."""
+        response = logged_client.get(reverse("report_export"), {"report": "categorias_por_mes", "format": "xlsx"})
+
+        assert response.streaming
+        sheet = openpyxl.load_workbook(io.BytesIO(_content(response))).active
+        assert list(sheet.values)[0] == ("mes", "Alimentação", "Transporte", "total")
+
+    def test_invalid_period(self, logged_client):
+        """Testa que período invertido volta ao formulário com erro."""
+        response = logged_client.get(
+            reverse("report_export"), {"report": "despesas", "format": "csv", "start_date": "2026-02-01", "end_date": "2026-01-01"}
+        )
+
+        assert response.status_code == 200
+        assert "A data inicial deve ser anterior" in response.content.decode()
+
+
+@pytest.mark.django_db
+class TestExportarCommand:
+    """Testes para o comando 'exportar'."""
+
+    def test_format_from_output_extension(self, expenses, tmp_path):
+        """Testa que o formato vem da extensão do arquivo de saída."""
+        path = tmp_path / "transacoes.parquet"
+        out = StringIO()
+        call_command("exportar", "transacoes", "--output", str(path), "--start", "2026-02-01", stdout=out)
+
+        assert "3 linhas exportadas" in out.getvalue()
+        assert pq.read_table(path).num_rows == 3
+
+    def test_csv_with_profiling(self, expenses, tmp_path):
+        """Testa a exportação em CSV com --trace-sql: uma única query para todas as linhas."""
+        path = tmp_path / "despesas.csv"
+        out = StringIO()
+        call_command("exportar", "despesas", "--output", str(path), "--trace-sql", stdout=out)
+
+        assert path.read_text(encoding="utf-8").count("\n") == 5
+        assert "  write " in out.getvalue()
+
+    def test_unknown_format(self, tmp_path):
+        """Testa erro para extensão sem formato correspondente."""
+        with pytest.raises(CommandError, match="Formato desconhecido"):
+            call_command("exportar", "despesas", "--output", str(tmp_path / "despesas.txt"), stdout=StringIO())
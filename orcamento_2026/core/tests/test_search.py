@@ -0,0 +1,136 @@
+"""Testes para o serviço de busca textual."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from orcamento_2026.core.models import Account, Category, Expense, SubCategory, Transaction
+from orcamento_2026.core.services.search import search, search_expenses
+
+
+@pytest.fixture
+def account():
+    return Account.objects.create(name="Test", type="C")
+
+
+@pytest.fixture
+def subcategory():
+    category = Category.objects.create(name="Alimentação")
+    return SubCategory.objects.create(category=category, name="Supermercado")
+
+
+def create_transaction(account, fitid, memo):
+    return Transaction.objects.create(fitid=fitid, account=account, amount=Decimal("-10.00"), date=date(2026, 2, 15), memo=memo)
+
+
+@pytest.mark.django_db
+class TestSearch:
+    """Testes para search."""
+
+    def test_finds_by_word(self, account):
+        """Testa que encontra transações pela palavra do memo."""
+        tx = create_transaction(account, "tx1", "PADARIA PAO QUENTE")
+        create_transaction(account, "tx2", "POSTO SHELL")
+
+        result = search(Transaction.objects.all(), "padaria")
+        assert list(result) == [tx]
+
+    def test_ignores_accents_and_case(self, account):
+        """Testa que a busca ignora acentos nos dois lados."""
+        tx = create_transaction(account, "tx1", "FARMÁCIA SÃO JOÃO")
+
+        assert list(search(Transaction.objects.all(), "farmacia sao joao")) == [tx]
+        assert list(search(Transaction.objects.all(), "Farmácia")) == [tx]
+
+    def test_matches_prefix(self, account):
+        """Testa que cada palavra é tratada como prefixo."""
+        tx = create_transaction(account, "tx1", "SUPERMERCADO XYZ")
+
+        assert list(search(Transaction.objects.all(), "superm")) == [tx]
+
+    def test_requires_all_words(self, account):
+        """Testa que todas as palavras precisam estar presentes."""
+        create_transaction(account, "tx1", "POSTO SHELL")
+
+        assert not search(Transaction.objects.all(), "posto ipiranga").exists()
+
+    def test_tracks_updates_and_deletes(self, account):
+        """Testa que o índice acompanha alterações e exclusões."""
+        tx = create_transaction(account, "tx1", "UBER TRIP")
+
+        tx.memo = "99 TAXI"
+        tx.save()
+        assert not search(Transaction.objects.all(), "uber").exists()
+        assert search(Transaction.objects.all(), "taxi").exists()
+
+        tx.delete()
+        assert not search(Transaction.objects.all(), "taxi").exists()
+
+    def test_returns_empty_for_blank_term(self, account):
+        """Testa que termos em branco não retornam nada."""
+        create_transaction(account, "tx1", "POSTO SHELL")
+
+        assert not search(Transaction.objects.all(), "").exists()
+        assert not search(Transaction.objects.all(), "   ").exists()
+
+    def test_falls_back_to_icontains_for_symbols(self, account):
+        """Testa que termos sem palavras caem no icontains."""
+        tx = create_transaction(account, "tx1", "PAG*PADARIA")
+        create_transaction(account, "tx2", "POSTO SHELL")
+
+        assert list(search(Transaction.objects.all(), "*")) == [tx]
+        assert not search(Transaction.objects.all(), "%%").exists()
+
+    def test_ranks_results(self, account):
+        """Testa que o rank ordena pelos mais relevantes."""
+        weak = create_transaction(account, "tx1", "MERCADO LIVRE COMPRA ONLINE PARCELADA LOJA")
+        strong = create_transaction(account, "tx2", "MERCADO MERCADO")
+
+        result = list(search(Transaction.objects.all(), "mercado", rank=True))
+        assert result == [strong, weak]
+
+    def test_searches_category_names(self):
+        """Testa busca em nomes de categorias."""
+        category = Category.objects.create(name="Saúde")
+        Category.objects.create(name="Lazer")
+
+        assert list(search(Category.objects.all(), "saude")) == [category]
+
+
+@pytest.mark.django_db
+class TestSearchExpenses:
+    """Testes para search_expenses."""
+
+    def test_finds_by_description_or_memo(self, account, subcategory):
+        """Testa que encontra despesas pela descrição ou pelo memo."""
+        by_description = Expense.objects.create(
+            transaction=create_transaction(account, "tx1", "PAG*XYZ"),
+            description="Almoço no Restaurante",
+            subcategory=subcategory,
+            reference_month=date(2026, 2, 1),
+        )
+        by_memo = Expense.objects.create(
+            transaction=create_transaction(account, "tx2", "RESTAURANTE SABOR"),
+            description="Jantar",
+            subcategory=subcategory,
+            reference_month=date(2026, 2, 1),
+        )
+        Expense.objects.create(description="Cinema", subcategory=subcategory, reference_month=date(2026, 2, 1))
+
+        result = search_expenses(Expense.objects.all(), "restaurante")
+        assert set(result) == {by_description, by_memo}
+
+    def test_falls_back_to_icontains_for_symbols(self, account, subcategory):
+        """Testa que termos sem palavras buscam na descrição e no memo com icontains."""
+        by_memo = Expense.objects.create(
+            transaction=create_transaction(account, "tx1", "PAG*PADARIA"),
+            description="Pão",
+            subcategory=subcategory,
+            reference_month=date(2026, 2, 1),
+        )
+        by_description = Expense.objects.create(description="Cinema - estreia", subcategory=subcategory, reference_month=date(2026, 2, 1))
+        Expense.objects.create(description="Lazer", subcategory=subcategory, reference_month=date(2026, 2, 1))
+
+        assert list(search_expenses(Expense.objects.all(), "*")) == [by_memo]
+        assert list(search_expenses(Expense.objects.all(), "-")) == [by_description]
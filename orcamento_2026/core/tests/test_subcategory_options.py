@@ -0,0 +1,122 @@
+"""Testes para o cache de opções de subcategorias e o endpoint HTMX."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from orcamento_2026.core.models import Account, Category, SubCategory, Transaction
+from orcamento_2026.core.services import counters
+from orcamento_2026.core.services.subcategory_options import get_options_fragment, get_subcategory_map
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def category():
+    category = Category.objects.create(name="Alimentação")
+    SubCategory.objects.create(category=category, name="Supermercado")
+    SubCategory.objects.create(category=category, name="Bares & <Cia>")
+    return category
+
+
+@pytest.fixture
+def logged_client(client, django_user_model):
+    user = django_user_model.objects.create_user(username="testuser", password="password")
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+class TestGetOptionsFragment:
+    """Testes para get_options_fragment."""
+
+    def test_renders_escaped_options(self, category):
+        """Testa que as opções são renderizadas com escape de HTML."""
+        fragment = get_options_fragment(category.id)
+
+        assert fragment.html.startswith('<option value="">---------</option>')
+        assert "Bares &amp; &lt;Cia&gt;" in fragment.html
+        assert "Supermercado" in fragment.html
+
+    def test_second_call_hits_cache(self, category, django_assert_num_queries):
+        """Testa que a segunda chamada só lê a versão do catálogo no banco."""
+        get_options_fragment(category.id)
+
+        with django_assert_num_queries(1):
+            get_options_fragment(category.id)
+
+    def test_invalidation_is_shared_between_processes(self, category):
+        """Testa que a versão vem do banco: um fragmento em cache de outro processo deixa de valer após a alteração."""
+        before = get_options_fragment(category.id)
+        # Outro worker altera a subcategoria: o cache local deste processo não é tocado
+        SubCategory.objects.filter(category=category, name="Supermercado").update(name="Mercado")
+        counters.bump(counters.CATALOG_VERSION)
+
+        after = get_options_fragment(category.id)
+
+        assert "Mercado" in after.html and "Supermercado" not in after.html
+        assert before.etag != after.etag
+
+    def test_invalidated_when_subcategory_changes(self, category):
+        """Testa que criar uma subcategoria invalida o fragmento."""
+        before = get_options_fragment(category.id)
+        SubCategory.objects.create(category=category, name="Delivery")
+        after = get_options_fragment(category.id)
+
+        assert "Delivery" in after.html
+        assert before.etag != after.etag
+
+    def test_invalid_category_returns_empty_option(self):
+        """Testa que ids inválidos retornam apenas a opção vazia."""
+        assert get_options_fragment("abc").html == '<option value="">---------</option>'
+
+    def test_subcategory_map(self, category):
+        """Testa o mapa categoria -> subcategorias."""
+        mapping = get_subcategory_map()
+
+        assert [name for _, name in mapping[str(category.id)]] == ["Bares & <Cia>", "Supermercado"]
+
+
+@pytest.mark.django_db
+class TestSubcategoriesEndpoint:
+    """Testes para a view get_subcategories_by_category."""
+
+    def test_returns_options_with_etag(self, logged_client, category):
+        """Testa que a resposta traz ETag e Cache-Control."""
+        response = logged_client.get(reverse("api_subcategories"), {"category": category.id})
+
+        assert response.status_code == 200
+        assert "Supermercado" in response.content.decode()
+        assert response["ETag"]
+        assert "no-cache" in response["Cache-Control"]
+
+    def test_returns_304_when_etag_matches(self, logged_client, category):
+        """Testa revalidação com If-None-Match."""
+        url = reverse("api_subcategories")
+        etag = logged_client.get(url, {"category": category.id})["ETag"]
+
+        response = logged_client.get(url, {"category": category.id}, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert "no-cache" in response["Cache-Control"]
+
+    def test_consolidate_page_embeds_map(self, logged_client, category, settings):
+        """Testa que a tela de consolidação embute o mapa e dispensa o HTMX."""
+        settings.SUBCATEGORY_MAP_INLINE = True
+        account = Account.objects.create(name="Test", type="C")
+        tx = Transaction.objects.create(fitid="tx1", account=account, amount=Decimal("-10.00"), date=date(2026, 2, 15), memo="Test")
+
+        response = logged_client.get(reverse("transaction_consolidate", args=[tx.pk]))
+
+        content = response.content.decode()
+        assert 'id="subcategory-map"' in content
+        assert 'hx-get="/api/subcategories/"' not in content
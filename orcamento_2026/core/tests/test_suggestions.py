@@ -3,9 +3,11 @@
 import json
 from datetime import date
 from decimal import Decimal
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+from asgiref.sync import async_to_sync, sync_to_async
 
 from orcamento_2026.core.models import (
     Account,
@@ -15,7 +17,10 @@ from orcamento_2026.core.models import (
     Transaction,
     TransactionSuggestion,
 )
+from orcamento_2026.core.services.counters import PENDING_SUGGESTIONS, get_counter
 from orcamento_2026.core.services.suggestions import (
+    _acall_ollama_api,
+    agenerate_suggestions,
     find_similar_expenses,
     generate_suggestion_for_transaction,
     get_pending_suggestions,
@@ -301,3 +306,84 @@ class TestGenerateSuggestionForTransaction:
 
         assert "Supermercado Carrefour" in prompt
         assert "Compras Carrefour" in prompt
+
+
+@pytest.mark.django_db
+class TestAgenerateSuggestions:
+    """Testes para a geração assíncrona em lote."""
+
+    @pytest.fixture
+    def transactions(self):
+        account = Account.objects.create(name="Test", type="C")
+        category = Category.objects.create(name="Alimentação")
+        SubCategory.objects.create(category=category, name="Supermercado")
+        return [
+            Transaction.objects.create(
+                fitid=f"tx{i}", account=account, amount=Decimal("-10.00"), date=date(2026, 2, i), memo=f"Mercado {i}"
+            )
+            for i in range(1, 4)
+        ]
+
+    def test_creates_suggestions_and_updates_counter(self, transactions):
+        """Testa que o lote grava as sugestões e mantém o contador de pendentes."""
+        data = {"category": "alimentação", "subcategory": "SUPERMERCADO", "description": "Compra"}
+
+        with patch("orcamento_2026.core.services.suggestions._acall_ollama_api", AsyncMock(return_value=data)) as mock_call:
+            created = async_to_sync(agenerate_suggestions)(limit=2)
+
+        assert created == 2
+        assert mock_call.await_count == 2
+        suggestions = TransactionSuggestion.objects.order_by("transaction__date")
+        assert [s.transaction for s in suggestions] == transactions[:2]
+        assert all(s.subcategory.name == "Supermercado" and s.status == "PENDENTE" for s in suggestions)
+        assert get_counter(PENDING_SUGGESTIONS) == 2
+
+    def test_skips_failed_calls(self, transactions):
+        """Testa que respostas inválidas do Ollama não geram sugestão."""
+        data = {"category": "Alimentação", "subcategory": "Supermercado", "description": "Compra"}
+
+        with patch("orcamento_2026.core.services.suggestions._acall_ollama_api", AsyncMock(side_effect=[data, None, data])):
+            created = async_to_sync(agenerate_suggestions)()
+
+        assert created == 2
+        assert TransactionSuggestion.objects.count() == 2
+
+    def test_skips_transactions_suggested_meanwhile(self, transactions, settings):
+        """Testa que transações que receberam sugestão enquanto o Ollama respondia não ganham outra."""
+        # As queries da "outra requisição" rodam dentro da medição do orçamento
+        settings.QUERY_BUDGETS_ENFORCED = False
+        data = {"category": "Alimentação", "subcategory": "Supermercado", "description": "Compra"}
+        subcategory = SubCategory.objects.get()
+
+        def suggest_first():
+            TransactionSuggestion.objects.get_or_create(
+                transaction=transactions[0], defaults={"category": subcategory.category, "subcategory": subcategory, "description": "Outra"}
+            )
+
+        async def concurrent_call(client, prompt):
+            # Outra requisição grava a sugestão da primeira transação durante a chamada
+            await sync_to_async(suggest_first)()
+            return data
+
+        with patch("orcamento_2026.core.services.suggestions._acall_ollama_api", concurrent_call):
+            created = async_to_sync(agenerate_suggestions)()
+
+        assert created == 2
+        assert TransactionSuggestion.objects.get(transaction=transactions[0]).description == "Outra"
+        assert get_counter(PENDING_SUGGESTIONS) == 3
+
+    def test_acall_ollama_api(self):
+        """Testa a chamada assíncrona com respostas válidas e com erro HTTP."""
+        answer = {"category": "Lazer"}
+
+        def handler(request):
+            if json.loads(request.content)["prompt"] == "erro":
+                return httpx.Response(500)
+            return httpx.Response(200, json={"response": json.dumps(answer)})
+
+        async def call(prompt):
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await _acall_ollama_api(client, prompt)
+
+        assert async_to_sync(call)("ok") == answer
+        assert async_to_sync(call)("erro") is None
@@ -0,0 +1,109 @@
+"""Testes para o pareamento de transferências e pagamentos de fatura."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import call_command
+
+from orcamento_2026.core.models import Account, Expense, Transaction
+from orcamento_2026.core.services.import_ofx import import_ofx
+from orcamento_2026.core.services.transfers import Candidate, match, pair
+
+
+@pytest.fixture
+def checking():
+    return Account.objects.create(name="BB CC", type="C")
+
+
+@pytest.fixture
+def card():
+    return Account.objects.create(name="Visa BB", type="K")
+
+
+def _create(account, fitid: str, amount: str, day: date, memo: str = "PAGTO FATURA") -> Transaction:
+    return Transaction.objects.create(fitid=fitid, account=account, amount=Decimal(amount), date=day, memo=memo)
+
+
+class TestPair:
+    """Testes para o hash join por valor e o sort-merge por data."""
+
+    def test_pairs_opposite_amounts_in_window(self):
+        """Testa que débito e crédito de mesmo valor e contas diferentes formam par, com o crédito mais próximo."""
+        candidates = [
+            Candidate(1, 1, date(2026, 3, 10), -150000),
+            Candidate(2, 2, date(2026, 3, 14), 150000),
+            Candidate(3, 2, date(2026, 3, 11), 150000),
+            Candidate(4, 2, date(2026, 3, 11), 9990),
+        ]
+
+        assert pair(candidates, window_days=5) == [(1, 3)]
+
+    def test_rejects_same_account_distant_dates_and_used_credits(self):
+        """Testa que mesma conta, datas fora da janela e créditos já usados não formam par."""
+        candidates = [
+            Candidate(1, 1, date(2026, 3, 10), -5000),
+            Candidate(2, 1, date(2026, 3, 10), 5000),
+            Candidate(3, 1, date(2026, 3, 1), -7000),
+            Candidate(4, 2, date(2026, 3, 20), 7000),
+            Candidate(5, 1, date(2026, 4, 1), -8000),
+            Candidate(6, 1, date(2026, 4, 2), -8000),
+            Candidate(7, 2, date(2026, 4, 1), 8000),
+        ]
+
+        assert pair(candidates, window_days=5) == [(5, 7)]
+
+    def test_new_ids_restrict_pairs(self):
+        """Testa que, no modo incremental, só pares com uma transação nova são considerados."""
+        candidates = [Candidate(1, 1, date(2026, 3, 10), -5000), Candidate(2, 2, date(2026, 3, 10), 5000)]
+
+        assert pair(candidates, window_days=5, new_ids={3}) == []
+        assert pair(candidates, window_days=5, new_ids={2}) == [(1, 2)]
+
+
+@pytest.mark.django_db
+class TestMatch:
+    """Testes para a consolidação dos pares como despesas ignoradas."""
+
+    def test_marks_bill_payment_as_ignored(self, checking, card):
+        """Testa que o pagamento da fatura vira duas despesas ignoradas e compras avulsas continuam pendentes."""
+        _create(checking, "c1", "-1500.00", date(2026, 3, 10))
+        _create(card, "k1", "1500.00", date(2026, 3, 12), memo="PAGAMENTO RECEBIDO")
+        purchase = _create(card, "k2", "-1500.00", date(2026, 2, 1), memo="LOJA X")
+
+        assert match() == 1
+
+        expenses = Expense.objects.select_related("subcategory__category")
+        assert {expense.transaction.fitid for expense in expenses} == {"c1", "k1"}
+        assert all(expense.is_ignored for expense in expenses)
+        assert {expense.description for expense in expenses} == {"Pagamento de fatura Visa BB (BB CC)"}
+        assert (expenses[0].subcategory.category.name, expenses[0].subcategory.name) == ("Financeiro", "Transferências")
+        assert not Expense.objects.filter(transaction=purchase).exists()
+
+    def test_import_matches_new_rows_only(self, checking, card):
+        """Testa que a importação pareia as transações novas com as de outras contas."""
+        _create(card, "k1", "2000.00", date(2026, 3, 12), memo="PAGAMENTO RECEBIDO")
+        ofx = MagicMock()
+        ofx.account.statement.transactions = [
+            MagicMock(id="c1", amount=-2000.00, memo="PAGTO FATURA", date=MagicMock(date=MagicMock(return_value=date(2026, 3, 10))))
+        ]
+
+        with patch("orcamento_2026.core.services.import_ofx.ofxparse.OfxParser") as parser, patch("builtins.open", new_callable=MagicMock):
+            parser.parse.return_value = ofx
+            result = import_ofx("extrato.ofx", checking)
+
+        assert result["transfers_matched"] == 1
+        assert Expense.objects.filter(is_ignored=True).count() == 2
+
+    def test_command(self, checking, card):
+        """Testa a saída do comando conciliar_transferencias."""
+        _create(checking, "c1", "-300.00", date(2026, 3, 1), memo="TED ENVIADA")
+        _create(Account.objects.create(name="Inter", type="C"), "i1", "300.00", date(2026, 3, 1), memo="TED RECEBIDA")
+        out = StringIO()
+
+        call_command("conciliar_transferencias", stdout=out)
+
+        assert "1 transferências encontradas" in out.getvalue()
+        assert Expense.objects.get(transaction__fitid="c1").description == "Transferência BB CC -> Inter"
@@ -4,6 +4,7 @@ from django.contrib.auth import views as auth_views
 from django.urls import path
 
 from orcamento_2026.core import views
+from orcamento_2026.core.services.utils.query_budget import query_budget
 
 urlpatterns = [
     # Home
@@ -13,13 +14,15 @@ urlpatterns = [
     # Autenticação
     path(
         "login/",
-        auth_views.LoginView.as_view(
-            template_name="core/login.html",
-            redirect_authenticated_user=True,
+        query_budget(2)(
+            auth_views.LoginView.as_view(
+                template_name="core/login.html",
+                redirect_authenticated_user=True,
+            )
         ),
         name="login",
     ),
-    path("logout/", auth_views.LogoutView.as_view(next_page="login"), name="logout"),
+    path("logout/", query_budget(4)(auth_views.LogoutView.as_view(next_page="login")), name="logout"),
     # Categorias
     path("categorias/", views.CategoryListView.as_view(), name="category_list"),
     path("categorias/nova/", views.CategoryCreateView.as_view(), name="category_create"),
@@ -38,6 +41,8 @@ urlpatterns = [
     # Transações
     path("transacoes/", views.TransactionListView.as_view(), name="transaction_list"),
     path("transacoes/<int:pk>/consolidar/", views.transaction_consolidate, name="transaction_consolidate"),
+    # Relatórios
+    path("relatorios/", views.report_export, name="report_export"),
     # Sugestões (Larry)
     path("sugestoes/", views.suggestion_list, name="suggestion_list"),
     path("sugestoes/gerar/", views.suggestion_generate, name="suggestion_generate"),
@@ -48,4 +53,7 @@ urlpatterns = [
     path("importar/", views.import_ofx_view, name="import_ofx"),
     # API HTMX
     path("api/subcategories/", views.get_subcategories_by_category, name="api_subcategories"),
+    # Métricas (Prometheus)
+    path("metrics", views.metrics, name="metrics"),
+    path("health", views.health, name="health"),
 ]
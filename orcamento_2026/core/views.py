@@ -2,21 +2,26 @@
 
 import json
 import logging
+import secrets
+import tempfile
 from datetime import date
 from decimal import Decimal
 
-import plotly.graph_objs as go
-import plotly.utils
-from dateutil.relativedelta import relativedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
-from django.db.models import Q, Sum
-from django.db.models.functions import Abs, TruncMonth
-from django.http import HttpResponse
+from django.db import DatabaseError, connection
+from django.db.models import Sum
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from orcamento_2026.core.forms import (
@@ -26,69 +31,109 @@ from orcamento_2026.core.forms import (
     ExpenseForm,
     ExpenseManualForm,
     OFXImportForm,
+    ReportExportForm,
     SubCategoryForm,
 )
 from orcamento_2026.core.models import Account, Category, Expense, SubCategory, Transaction, TransactionSuggestion
-from orcamento_2026.core.services.consolidation import consolidate_transaction, get_unconsolidated_transactions
-from orcamento_2026.core.services.import_ofx import import_ofx
-from orcamento_2026.core.services.suggestions import generate_suggestion_for_transaction, get_pending_suggestions
+from orcamento_2026.core.services.analytics import dashboard_data
+from orcamento_2026.core.services.billing_calendar import cycle_range
+from orcamento_2026.core.services.budgets import variance as budget_variance
+from orcamento_2026.core.services.consolidation import consolidate_transaction
+from orcamento_2026.core.services.counters import PENDING_SUGGESTIONS, UNCONSOLIDATED_TRANSACTIONS, aget_counter, get_counter
+from orcamento_2026.core.services.import_ofx import BATCH_QUERY_BUDGET, import_ofx
+from orcamento_2026.core.services.installments import projection as installment_projection
+from orcamento_2026.core.services.metrics import render_prometheus
+from orcamento_2026.core.services.recurring import active_charges, monthly_commitment
+from orcamento_2026.core.services.reports import FORMATS, REPORTS, astream_csv, export
+from orcamento_2026.core.services.search import search, search_expenses
+from orcamento_2026.core.services.subcategory_options import get_options_fragment, get_subcategory_map
+from orcamento_2026.core.services.suggestions import agenerate_suggestions, get_pending_suggestions
+from orcamento_2026.core.services.utils.lazy_import import lazy_import
+from orcamento_2026.core.services.utils.query_budget import query_budget
+
+# plotly só é carregado no primeiro dashboard (ou no warm_up com --preload)
+go = lazy_import("plotly.graph_objs")
+plotly_utils = lazy_import("plotly.utils")
 
 logger = logging.getLogger(__name__)
 
 
+async def _arender(request, template_name: str, context: dict | None = None) -> HttpResponse:
+    """render() para views assíncronas: o template consulta o banco, então roda via sync_to_async."""
+    # request.user e request.auser() têm caches separados: reaproveita o usuário já carregado pelo login_required
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, template_name, context)
+
+
 # =============================================================================
 # Dashboard Views
 # =============================================================================
 
 
+@query_budget(11)
 @login_required
-def dashboard(request):
-    """View principal do dashboard com gráficos interativos."""
+async def dashboard(request):
+    """
+    View principal do dashboard com gráficos interativos.
+
+    Assíncrona: as quebras, comparações e médias móveis saem do snapshot
+    analítico (services.analytics) e a montagem dos gráficos (CPU) roda fora
+    do event loop.
+    """
     form = DashboardFilterForm(request.GET or None)
 
-    # Período padrão: últimos 6 meses
-    reference = date.today()
-
-    start_date = (reference - relativedelta(months=1)).replace(day=21)
-    end_date = (reference + relativedelta(months=1)).replace(day=20)
+    # Período padrão: o ciclo de faturamento atual e o próximo, pelo calendário
+    start_date, end_date = await sync_to_async(cycle_range)(date.today(), cycles=2)
 
-    # Aplicar filtros
-    if form.is_valid():
+    # Aplicar filtros (a validação do filtro de categoria consulta o banco)
+    if await sync_to_async(form.is_valid)():
         if form.cleaned_data.get("start_date"):
             start_date = form.cleaned_data["start_date"]
         if form.cleaned_data.get("end_date"):
             end_date = form.cleaned_data["end_date"]
 
-    # Estatísticas gerais
-    total_expenses = Expense.objects.filter(
-        reference_month__gte=start_date,
-        reference_month__lte=end_date,
-        is_ignored=False,
-    ).count()
+    # Agregações no snapshot em memória do worker (a revalidação consulta o banco)
+    data = await sync_to_async(dashboard_data)(start_date, end_date)
+    unconsolidated_count = await aget_counter(UNCONSOLIDATED_TRANSACTIONS)
+    pending_suggestions = await aget_counter(PENDING_SUGGESTIONS)
+    # Realizado mantido incrementalmente nos orçamentos: uma query, sem somar despesas
+    budgets = await sync_to_async(budget_variance)(start_date, end_date)
+    recurring_charges = await sync_to_async(active_charges)()
+    future_installments = await sync_to_async(installment_projection)()
+
+    charts = await sync_to_async(_dashboard_charts, thread_sensitive=False)(
+        data["expenses_by_category"], data["monthly_data"], data["top_subcategories"], data["expenses_by_account"], data["rolling_average"]
+    )
 
-    total_amount = Expense.objects.filter(
-        reference_month__gte=start_date,
-        reference_month__lte=end_date,
-        is_ignored=False,
-    ).aggregate(
-        total=Sum(Abs("transaction__amount"))
-    )["total"] or Decimal("0")
+    context = {
+        "form": form,
+        "total_expenses": data["total_expenses"],
+        "total_amount": data["total_amount"],
+        "comparison": data["comparison"],
+        "budgets": budgets,
+        "overspent_budgets": [status for status in budgets if status.is_overspent],
+        "recurring_charges": recurring_charges,
+        "recurring_monthly_total": monthly_commitment(recurring_charges),
+        "future_installments": future_installments,
+        "unconsolidated_count": unconsolidated_count,
+        "pending_suggestions": pending_suggestions,
+        **charts,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
 
-    unconsolidated_count = get_unconsolidated_transactions().count()
-    pending_suggestions = get_pending_suggestions().count()
+    return await _arender(request, "core/dashboard.html", context)
 
-    # Gráfico 1: Despesas por Categoria (Pie Chart)
-    expenses_by_category = (
-        Expense.objects.filter(
-            reference_month__gte=start_date,
-            reference_month__lte=end_date,
-            is_ignored=False,
-        )
-        .values("subcategory__category__name")
-        .annotate(total=Sum(Abs("transaction__amount")))
-        .order_by("-total")
-    )
 
+def _dashboard_charts(
+    expenses_by_category: list[dict],
+    monthly_data: list[dict],
+    top_subcategories: list[dict],
+    expenses_by_account: list[dict],
+    rolling_average: list[dict] | None = None,
+) -> dict[str, str]:
+    """Monta os gráficos do dashboard (JSON do Plotly) a partir dos dados já agregados."""
+    # Gráfico 1: Despesas por Categoria (Pie Chart)
     pie_data = go.Pie(
         labels=[item["subcategory__category__name"] for item in expenses_by_category],
         values=[float(item["total"]) for item in expenses_by_category],
@@ -104,21 +149,9 @@ def dashboard(request):
         margin=dict(l=20, r=20, t=40, b=20),
         height=350,
     )
-    pie_chart = json.dumps(go.Figure(data=[pie_data], layout=pie_layout), cls=plotly.utils.PlotlyJSONEncoder)
+    pie_chart = json.dumps(go.Figure(data=[pie_data], layout=pie_layout), cls=plotly_utils.PlotlyJSONEncoder)
 
     # Gráfico 2: Evolução Mensal (Line Chart)
-    monthly_data = (
-        Expense.objects.filter(
-            reference_month__gte=start_date,
-            reference_month__lte=end_date,
-            is_ignored=False,
-        )
-        .annotate(month=TruncMonth("reference_month"))
-        .values("month")
-        .annotate(total=Sum(Abs("transaction__amount")))
-        .order_by("month")
-    )
-
     line_data = go.Scatter(
         x=[item["month"].strftime("%b %Y") for item in monthly_data],
         y=[float(item["total"]) for item in monthly_data],
@@ -130,6 +163,14 @@ def dashboard(request):
         fill="tozeroy",
         fillcolor="rgba(99, 102, 241, 0.1)",
     )
+    # Média móvel (mesmos meses do gráfico, incluindo meses sem despesas)
+    average_data = go.Scatter(
+        x=[item["month"].strftime("%b %Y") for item in rolling_average or []],
+        y=[float(item["average"]) for item in rolling_average or []],
+        mode="lines",
+        name="Média móvel",
+        line=dict(color="#f97316", width=2, dash="dash"),
+    )
     line_layout = go.Layout(
         title="Evolução Mensal",
         xaxis=dict(showgrid=False),
@@ -140,20 +181,9 @@ def dashboard(request):
         plot_bgcolor="rgba(0,0,0,0)",
         paper_bgcolor="rgba(0,0,0,0)",
     )
-    line_chart = json.dumps(go.Figure(data=[line_data], layout=line_layout), cls=plotly.utils.PlotlyJSONEncoder)
+    line_chart = json.dumps(go.Figure(data=[line_data, average_data], layout=line_layout), cls=plotly_utils.PlotlyJSONEncoder)
 
     # Gráfico 3: Top Subcategorias (Bar Chart)
-    top_subcategories = (
-        Expense.objects.filter(
-            reference_month__gte=start_date,
-            reference_month__lte=end_date,
-            is_ignored=False,
-        )
-        .values("subcategory__name")
-        .annotate(total=Sum(Abs("transaction__amount")))
-        .order_by("-total")[:10]
-    )
-
     bar_data = go.Bar(
         x=[float(item["total"]) for item in top_subcategories],
         y=[item["subcategory__name"] for item in top_subcategories],
@@ -172,20 +202,9 @@ def dashboard(request):
         plot_bgcolor="rgba(0,0,0,0)",
         paper_bgcolor="rgba(0,0,0,0)",
     )
-    bar_chart = json.dumps(go.Figure(data=[bar_data], layout=bar_layout), cls=plotly.utils.PlotlyJSONEncoder)
+    bar_chart = json.dumps(go.Figure(data=[bar_data], layout=bar_layout), cls=plotly_utils.PlotlyJSONEncoder)
 
     # Gráfico 4: Comparativo por Conta (Bar Chart)
-    expenses_by_account = (
-        Expense.objects.filter(
-            reference_month__gte=start_date,
-            reference_month__lte=end_date,
-            is_ignored=False,
-        )
-        .values("transaction__account__name")
-        .annotate(total=Sum(Abs("transaction__amount")))
-        .order_by("-total")
-    )
-
     account_data = go.Bar(
         x=[item["transaction__account__name"] for item in expenses_by_account],
         y=[float(item["total"]) for item in expenses_by_account],
@@ -203,23 +222,9 @@ def dashboard(request):
         plot_bgcolor="rgba(0,0,0,0)",
         paper_bgcolor="rgba(0,0,0,0)",
     )
-    account_chart = json.dumps(go.Figure(data=[account_data], layout=account_layout), cls=plotly.utils.PlotlyJSONEncoder)
-
-    context = {
-        "form": form,
-        "total_expenses": total_expenses,
-        "total_amount": total_amount,
-        "unconsolidated_count": unconsolidated_count,
-        "pending_suggestions": pending_suggestions,
-        "pie_chart": pie_chart,
-        "line_chart": line_chart,
-        "bar_chart": bar_chart,
-        "account_chart": account_chart,
-        "start_date": start_date,
-        "end_date": end_date,
-    }
+    account_chart = json.dumps(go.Figure(data=[account_data], layout=account_layout), cls=plotly_utils.PlotlyJSONEncoder)
 
-    return render(request, "core/dashboard.html", context)
+    return {"pie_chart": pie_chart, "line_chart": line_chart, "bar_chart": bar_chart, "account_chart": account_chart}
 
 
 # =============================================================================
@@ -227,6 +232,7 @@ def dashboard(request):
 # =============================================================================
 
 
+@query_budget(5)
 class CategoryListView(LoginRequiredMixin, ListView):
     """Lista de categorias."""
 
@@ -237,12 +243,13 @@ class CategoryListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        search = self.request.GET.get("search")
-        if search:
-            queryset = queryset.filter(name__icontains=search)
+        search_term = self.request.GET.get("search")
+        if search_term:
+            queryset = search(queryset, search_term)
         return queryset.prefetch_related("subcategories")
 
 
+@query_budget(5)
 class CategoryCreateView(LoginRequiredMixin, CreateView):
     """Criar nova categoria."""
 
@@ -256,6 +263,7 @@ class CategoryCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+@query_budget(3)
 class CategoryUpdateView(LoginRequiredMixin, UpdateView):
     """Editar categoria."""
 
@@ -269,6 +277,7 @@ class CategoryUpdateView(LoginRequiredMixin, UpdateView):
         return super().form_valid(form)
 
 
+@query_budget(5)
 class CategoryDeleteView(LoginRequiredMixin, DeleteView):
     """Excluir categoria."""
 
@@ -286,6 +295,7 @@ class CategoryDeleteView(LoginRequiredMixin, DeleteView):
 # =============================================================================
 
 
+@query_budget(5)
 class SubCategoryListView(LoginRequiredMixin, ListView):
     """Lista de subcategorias."""
 
@@ -311,6 +321,7 @@ class SubCategoryListView(LoginRequiredMixin, ListView):
         return context
 
 
+@query_budget(7)
 class SubCategoryCreateView(LoginRequiredMixin, CreateView):
     """Criar nova subcategoria."""
 
@@ -324,6 +335,7 @@ class SubCategoryCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+@query_budget(4)
 class SubCategoryUpdateView(LoginRequiredMixin, UpdateView):
     """Editar subcategoria."""
 
@@ -337,6 +349,7 @@ class SubCategoryUpdateView(LoginRequiredMixin, UpdateView):
         return super().form_valid(form)
 
 
+@query_budget(4)
 class SubCategoryDeleteView(LoginRequiredMixin, DeleteView):
     """Excluir subcategoria."""
 
@@ -354,6 +367,7 @@ class SubCategoryDeleteView(LoginRequiredMixin, DeleteView):
 # =============================================================================
 
 
+@query_budget(7)
 class ExpenseListView(LoginRequiredMixin, ListView):
     """Lista de despesas."""
 
@@ -368,7 +382,7 @@ class ExpenseListView(LoginRequiredMixin, ListView):
         # Filtros
         category = self.request.GET.get("category")
         subcategory = self.request.GET.get("subcategory")
-        search = self.request.GET.get("search")
+        search_term = self.request.GET.get("search")
         is_ignored = self.request.GET.get("is_ignored")
         month = self.request.GET.get("month")
 
@@ -376,8 +390,8 @@ class ExpenseListView(LoginRequiredMixin, ListView):
             queryset = queryset.filter(subcategory__category_id=category)
         if subcategory:
             queryset = queryset.filter(subcategory_id=subcategory)
-        if search:
-            queryset = queryset.filter(Q(description__icontains=search) | Q(transaction__memo__icontains=search))
+        if search_term:
+            queryset = search_expenses(queryset, search_term)
         if is_ignored:
             queryset = queryset.filter(is_ignored=is_ignored == "true")
         if month:
@@ -389,10 +403,13 @@ class ExpenseListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         context["categories"] = Category.objects.all()
         context["subcategories"] = SubCategory.objects.all()
-        context["total_amount"] = self.get_queryset().aggregate(total=Sum("transaction__amount"))["total"] or Decimal("0")
+        # Soma inteira de centavos; convertida para reais só no resultado
+        total = self.get_queryset().aggregate(total=Sum("transaction__amount_cents"))["total"]
+        context["total_amount"] = Decimal(total or 0).scaleb(-2)
         return context
 
 
+@query_budget(6)
 class ExpenseCreateView(LoginRequiredMixin, CreateView):
     """Criar nova despesa manual."""
 
@@ -406,6 +423,7 @@ class ExpenseCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+@query_budget(11)
 class ExpenseUpdateView(LoginRequiredMixin, UpdateView):
     """Editar despesa."""
 
@@ -425,6 +443,7 @@ class ExpenseUpdateView(LoginRequiredMixin, UpdateView):
         return super().form_valid(form)
 
 
+@query_budget(5)
 class ExpenseDeleteView(LoginRequiredMixin, DeleteView):
     """Excluir despesa."""
 
@@ -442,6 +461,7 @@ class ExpenseDeleteView(LoginRequiredMixin, DeleteView):
 # =============================================================================
 
 
+@query_budget(6)
 class TransactionListView(LoginRequiredMixin, ListView):
     """Lista de transações."""
 
@@ -455,15 +475,15 @@ class TransactionListView(LoginRequiredMixin, ListView):
 
         # Filtros
         account = self.request.GET.get("account")
-        search = self.request.GET.get("search")
+        search_term = self.request.GET.get("search")
         has_expense = self.request.GET.get("has_expense")
         start_date = self.request.GET.get("start_date")
         end_date = self.request.GET.get("end_date")
 
         if account:
             queryset = queryset.filter(account_id=account)
-        if search:
-            queryset = queryset.filter(memo__icontains=search)
+        if search_term:
+            queryset = search(queryset, search_term)
         if has_expense == "yes":
             queryset = queryset.filter(expense__isnull=False)
         elif has_expense == "no":
@@ -478,14 +498,15 @@ class TransactionListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["accounts"] = Account.objects.all()
-        context["unconsolidated_count"] = get_unconsolidated_transactions().count()
+        context["unconsolidated_count"] = get_counter(UNCONSOLIDATED_TRANSACTIONS)
         return context
 
 
+@query_budget(13)
 @login_required
 def transaction_consolidate(request, pk):
     """View para consolidar uma transação."""
-    transaction = get_object_or_404(Transaction, pk=pk)
+    transaction = get_object_or_404(Transaction.objects.select_related("account", "suggestion__category", "suggestion__subcategory"), pk=pk)
 
     if request.method == "POST":
         form = ConsolidationForm(request.POST)
@@ -513,17 +534,24 @@ def transaction_consolidate(request, pk):
                 initial["subcategory"] = suggestion.subcategory
             if suggestion.description:
                 initial["description"] = suggestion.description
-        initial["reference_month"] = transaction.date
+        initial["reference_month"] = transaction.reference_date or transaction.date
         form = ConsolidationForm(initial=initial)
 
-    return render(
-        request,
-        "core/transaction_consolidate.html",
-        {
-            "form": form,
-            "transaction": transaction,
-        },
-    )
+    context = {
+        "form": form,
+        "transaction": transaction,
+    }
+    if settings.SUBCATEGORY_MAP_INLINE:
+        _embed_subcategory_map(form, context)
+
+    return render(request, "core/transaction_consolidate.html", context)
+
+
+def _embed_subcategory_map(form, context):
+    """Embute o mapa categoria -> subcategorias; a troca de categoria passa a ser resolvida no navegador."""
+    context["subcategory_map"] = get_subcategory_map()
+    for attr in ("hx-get", "hx-target", "hx-trigger"):
+        form.fields["category"].widget.attrs.pop(attr, None)
 
 
 # =============================================================================
@@ -531,6 +559,7 @@ def transaction_consolidate(request, pk):
 # =============================================================================
 
 
+@query_budget(4)
 @login_required
 def suggestion_list(request):
     """Lista de sugestões pendentes."""
@@ -552,23 +581,16 @@ def suggestion_list(request):
     )
 
 
+@query_budget(23)
 @login_required
-def suggestion_generate(request):
-    """Gerar sugestões para transações sem sugestão."""
+async def suggestion_generate(request):
+    """
+    Gerar sugestões para transações sem sugestão.
+
+    Assíncrona: enquanto o Ollama responde, o servidor continua atendendo outras requisições.
+    """
     if request.method == "POST":
-        # Transações sem sugestão
-        transactions_without_suggestion = Transaction.objects.filter(
-            expense__isnull=True,
-            suggestion__isnull=True,
-        )[
-            :10
-        ]  # Processa 10 por vez
-
-        count = 0
-        for transaction in transactions_without_suggestion:
-            suggestion = generate_suggestion_for_transaction(transaction)
-            if suggestion:
-                count += 1
+        count = await agenerate_suggestions(limit=10)  # Processa 10 por vez
 
         if count > 0:
             messages.success(request, f"{count} sugestões geradas com sucesso!")
@@ -577,13 +599,14 @@ def suggestion_generate(request):
 
         return redirect("suggestion_list")
 
-    return render(request, "core/suggestion_generate.html")
+    return await _arender(request, "core/suggestion_generate.html")
 
 
+@query_budget(11)
 @login_required
 def suggestion_accept(request, pk):
     """Aceitar uma sugestão e consolidar a transação."""
-    suggestion = get_object_or_404(TransactionSuggestion, pk=pk)
+    suggestion = get_object_or_404(TransactionSuggestion.objects.select_related("transaction", "category", "subcategory"), pk=pk)
 
     if request.method == "POST":
         try:
@@ -592,7 +615,7 @@ def suggestion_accept(request, pk):
                 category_name=suggestion.category.name if suggestion.category else "",
                 subcategory_name=suggestion.subcategory.name if suggestion.subcategory else "",
                 description=suggestion.description or suggestion.transaction.memo,
-                reference_month=suggestion.transaction.date,
+                reference_month=suggestion.transaction.reference_date or suggestion.transaction.date,
             )
             messages.success(request, f"Sugestão aceita! Despesa #{expense.id} criada.")
         except ValueError as e:
@@ -601,6 +624,7 @@ def suggestion_accept(request, pk):
     return redirect("suggestion_list")
 
 
+@query_budget(5)
 @login_required
 def suggestion_reject(request, pk):
     """Rejeitar uma sugestão."""
@@ -614,10 +638,11 @@ def suggestion_reject(request, pk):
     return redirect("suggestion_list")
 
 
+@query_budget(3)
 @login_required
-def pending_suggestions_count(request):
-    """Retorna o contador de sugestões pendentes (para HTMX)."""
-    count = get_pending_suggestions().count()
+async def pending_suggestions_count(request):
+    """Retorna o contador de sugestões pendentes (para HTMX), lido do contador desnormalizado."""
+    count = await aget_counter(PENDING_SUGGESTIONS)
     if count > 0:
         return HttpResponse(
             f'<span class="ml-2 inline-flex items-center rounded-full bg-red-100 px-2 py-0.5 text-xs font-medium text-red-800">{count}</span>'
@@ -630,6 +655,9 @@ def pending_suggestions_count(request):
 # =============================================================================
 
 
+# Um lote da importação (arquivos de até IMPORT_BATCH_SIZE transações), mais sessão, usuário, conta, ciclo de faturamento,
+# parcelas já classificadas, transferências e cobranças recorrentes
+@query_budget(BATCH_QUERY_BUDGET + 7)
 @login_required
 def import_ofx_view(request):
     """View para importar arquivo OFX."""
@@ -651,7 +679,14 @@ def import_ofx_view(request):
 
             try:
                 result = import_ofx(tmp_path, account, reference_date)
-                messages.success(request, f"Importação concluída! {result['transactions_created']} transações criadas.")
+                message = f"Importação concluída! {result['transactions_created']} transações criadas."
+                if result.get("duplicates_skipped"):
+                    message += f" {result['duplicates_skipped']} duplicatas (FITID diferente) ignoradas."
+                if result.get("installments_consolidated"):
+                    message += f" {result['installments_consolidated']} parcelas consolidadas automaticamente."
+                if result.get("transfers_matched"):
+                    message += f" {result['transfers_matched']} transferências entre contas ignoradas."
+                messages.success(request, message)
                 return redirect("transaction_list")
             except Exception as e:
                 messages.error(request, f"Erro na importação: {str(e)}")
@@ -663,24 +698,112 @@ def import_ofx_view(request):
     return render(request, "core/import_ofx.html", {"form": form})
 
 
+# =============================================================================
+# Report Views
+# =============================================================================
+
+# Bytes lidos do arquivo temporário por bloco no download de XLSX e Parquet
+EXPORT_FILE_BLOCK_SIZE: int = 256 * 1024
+
+
+async def _astream_file(file):
+    try:
+        while block := await sync_to_async(file.read, thread_sensitive=False)(EXPORT_FILE_BLOCK_SIZE):
+            yield block
+    finally:
+        file.close()
+
+
+@query_budget(3)
+@login_required
+@require_GET
+async def report_export(request):
+    """
+    Página de relatórios e download em streaming.
+
+    O CSV é enviado à medida que as linhas são lidas do banco. XLSX e Parquet
+    só ficam válidos ao final (índice do zip, rodapé do Parquet): são gravados
+    num arquivo temporário em disco e enviados em blocos.
+    """
+    form = ReportExportForm(request.GET or None)
+    if not form.is_valid():
+        return await _arender(request, "core/reports.html", {"form": form, "reports": REPORTS.values()})
+
+    report = form.cleaned_data["report"]
+    fmt = form.cleaned_data["format"]
+    start, end = form.cleaned_data["start_date"], form.cleaned_data["end_date"]
+
+    if fmt == "csv":
+        content = astream_csv(report, start, end)
+    else:
+        file = tempfile.TemporaryFile()
+        await sync_to_async(export)(report, fmt, file, start, end)
+        file.seek(0)
+        content = _astream_file(file)
+
+    response = StreamingHttpResponse(content, content_type=FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{report}-{date.today():%Y%m%d}.{fmt}"'
+    return response
+
+
 # =============================================================================
 # API/HTMX Views
 # =============================================================================
 
 
+@query_budget(4)
 @login_required
-def get_subcategories_by_category(request):
-    """Retorna subcategorias para uma categoria (para HTMX)."""
-    category_id = request.GET.get("category")
-    subcategories = SubCategory.objects.filter(category_id=category_id)
+@require_GET
+async def get_subcategories_by_category(request):
+    """
+    Retorna subcategorias para uma categoria (para HTMX).
+
+    O fragmento vem pré-renderizado do cache e a resposta leva ETag, então o
+    navegador revalida com 304 enquanto as subcategorias não mudarem.
+    """
+    fragment = await sync_to_async(get_options_fragment)(request.GET.get("category"))
+    etag = quote_etag(fragment.etag)
+    # O 304 leva os mesmos ETag e Cache-Control do 200 (RFC 9110): sem eles, o navegador não revalida a cópia
+    response = get_conditional_response(request, etag=etag) or HttpResponse(fragment.html)
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+# =============================================================================
+# Métricas
+# =============================================================================
+
+
+def _metrics_token_matches(request) -> bool:
+    token = settings.METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    return bool(token) and secrets.compare_digest(header, f"Bearer {token}")
+
+
+@query_budget(2)
+@require_GET
+def metrics(request):
+    """Métricas de desempenho do processo no formato Prometheus (apenas staff ou METRICS_TOKEN)."""
+    if not (request.user.is_staff or _metrics_token_matches(request)):
+        raise PermissionDenied
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
-    options = '<option value="">---------</option>'
-    for sub in subcategories:
-        options += f'<option value="{sub.id}">{sub.name}</option>'
 
-    return HttpResponse(options)
+@query_budget(1)
+@require_GET
+def health(request):
+    """Health check para o balanceador e o Docker: responde 503 se o banco não estiver acessível."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError as e:
+        logger.error(f"Health check falhou: {e}")
+        return HttpResponse("database unavailable", status=503, content_type="text/plain")
+    return HttpResponse("ok", content_type="text/plain")
 
 
+@query_budget(2)
 @login_required
 def home(request):
     """Home page redireciona para dashboard."""
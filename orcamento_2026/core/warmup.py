@@ -0,0 +1,58 @@
+"""
+Aquecimento do processo antes da primeira requisição.
+
+O Django só importa o URLconf (e com ele as views, o plotly etc.) ao atender
+a primeira requisição. `warm_up()` antecipa esse custo: com o gunicorn em
+--preload roda uma vez no master e os workers herdam tudo já carregado; com
+o uvicorn (ASGI, padrão em produção) roda em cada worker ao importar a
+aplicação, antes de aceitar conexões.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+from orcamento_2026.core.services.utils.lazy_import import LAZY_MODULES, load
+
+TEMPLATES_DIR: Path = Path(__file__).resolve().parent / "templates"
+
+
+def warm_up() -> dict[str, float]:
+    """
+    Carrega URLconf, templates e bibliotecas adiadas, sem abrir conexão com o banco.
+
+    Roda antes do fork dos workers: uma conexão aberta aqui seria
+    compartilhada entre processos.
+
+    Returns:
+        Tempo, em segundos, de cada etapa
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    get_resolver().url_patterns
+    timings["urls"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for path in sorted(TEMPLATES_DIR.rglob("*.html")):
+        get_template(path.relative_to(TEMPLATES_DIR).as_posix())
+    timings["templates"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in sorted(LAZY_MODULES):
+        load(name)
+    # Os tipos de gráfico do plotly são carregados sob demanda na primeira figura
+    from orcamento_2026.core.views import _dashboard_charts
+
+    _dashboard_charts([], [], [], [])
+    timings["modules"] = time.perf_counter() - start
+    return timings
+
+
+def log_warm_up(log: logging.Logger) -> None:
+    """Executa o warm-up e registra o tempo de cada etapa em `log`."""
+    timings = warm_up()
+    log.info("Warm-up concluído: " + ", ".join(f"{step}={seconds * 1000:.0f}ms" for step, seconds in timings.items()))
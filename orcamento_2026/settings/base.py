@@ -30,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "orcamento_2026.core.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -94,3 +95,32 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "home"
 LOGOUT_REDIRECT_URL = "login"
+
+# Cache
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("CACHE_LOCATION", default="orcamento-2026"),
+    }
+}
+
+# Dia de fechamento do ciclo de faturamento das contas sem BillingCycle (compras após ele vão para o mês seguinte)
+BILLING_CLOSING_DAY = config("BILLING_CLOSING_DAY", default=20, cast=int)
+# Distância máxima, em dias, entre os dois lados de uma transferência ou pagamento de fatura
+TRANSFER_WINDOW_DAYS = config("TRANSFER_WINDOW_DAYS", default=5, cast=int)
+# Diferença de datas aceita entre uma transação e a mesma linha reexportada com outro FITID (0 = mesma data)
+DEDUPE_TOLERANCE_DAYS = config("DEDUPE_TOLERANCE_DAYS", default=0, cast=int)
+# Particiona por ano as tabelas de transações e despesas ao migrar (apenas PostgreSQL; ver services.partitioning)
+DB_PARTITIONING = config("DB_PARTITIONING", default=False, cast=bool)
+
+# Embute o mapa categoria -> subcategorias na tela de consolidação (sem requisições ao trocar a categoria)
+SUBCATEGORY_MAP_INLINE = config("SUBCATEGORY_MAP_INLINE", default=True, cast=bool)
+
+# Instrumentação de desempenho (PerformanceMiddleware e /metrics)
+PERF_METRICS_ENABLED = config("PERF_METRICS_ENABLED", default=True, cast=bool)
+PERF_SLOW_QUERY_MS = config("PERF_SLOW_QUERY_MS", default=200, cast=int)
+PERF_SLOW_REQUEST_MS = config("PERF_SLOW_REQUEST_MS", default=1000, cast=int)
+# Token opcional para o Prometheus coletar /metrics sem sessão (Authorization: Bearer <token>)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+# Levanta QueryBudgetExceeded quando uma view/serviço passa do orçamento de queries (ligado nos testes)
+QUERY_BUDGETS_ENFORCED = config("QUERY_BUDGETS_ENFORCED", default=False, cast=bool)
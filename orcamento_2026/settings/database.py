@@ -0,0 +1,51 @@
+"""Configuração da conexão com o banco: conexões persistentes ou pool do psycopg 3."""
+
+from dj_database_url import parse as dburl
+from django.core.exceptions import ImproperlyConfigured
+
+POSTGRESQL_ENGINE: str = "django.db.backends.postgresql"
+
+
+def database_config(
+    url: str,
+    *,
+    conn_max_age: int = 0,
+    health_checks: bool = True,
+    pool: bool = False,
+    pool_min_size: int = 2,
+    pool_max_size: int = 10,
+    pool_timeout: float = 10.0,
+) -> dict:
+    """
+    Monta o dicionário DATABASES["default"] a partir da URL do banco.
+
+    Sob ASGI cada requisição usa uma thread nova, então conexões persistentes
+    (CONN_MAX_AGE) não são reaproveitadas: use o pool. Sob WSGI com threads
+    fixas (gunicorn), conexões persistentes com health checks bastam.
+
+    Args:
+        url: DATABASE_URL
+        conn_max_age: Segundos que uma conexão persiste entre requisições (0 = fecha a cada requisição)
+        health_checks: Testa conexões persistentes antes de reaproveitá-las
+        pool: Usa o pool nativo do psycopg 3 (apenas PostgreSQL; ignorado nos demais bancos)
+        pool_min_size: Conexões mantidas abertas pelo pool
+        pool_max_size: Limite de conexões do pool, por processo
+        pool_timeout: Segundos de espera por uma conexão livre antes de erro
+
+    Returns:
+        Configuração do banco para DATABASES
+
+    Raises:
+        ImproperlyConfigured: Se pool e conexões persistentes forem combinados
+    """
+    database = dburl(url, conn_max_age=conn_max_age, conn_health_checks=health_checks)
+
+    if pool and database["ENGINE"] == POSTGRESQL_ENGINE:
+        if conn_max_age:
+            raise ImproperlyConfigured("DB_POOL não pode ser combinado com DB_CONN_MAX_AGE > 0: o pool já reaproveita as conexões.")
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": pool_min_size,
+            "max_size": pool_max_size,
+            "timeout": pool_timeout,
+        }
+    return dict(database)
@@ -1,13 +1,27 @@
-from dj_database_url import parse as dburl
 from decouple import config
 
 from .base import *  # noqa: F403
+from .database import database_config
 
 DEBUG = False
 
-DATABASES = {"default": config("DATABASE_URL", cast=dburl)}
+# Pool do psycopg 3 por padrão (o servidor padrão é ASGI); com DB_POOL=False e
+# SERVER_INTERFACE=wsgi, use DB_CONN_MAX_AGE para conexões persistentes.
+DATABASES = {
+    "default": database_config(
+        config("DATABASE_URL"),
+        conn_max_age=config("DB_CONN_MAX_AGE", default=0, cast=int),
+        health_checks=config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool),
+        pool=config("DB_POOL", default=True, cast=bool),
+        pool_min_size=config("DB_POOL_MIN_SIZE", default=2, cast=int),
+        pool_max_size=config("DB_POOL_MAX_SIZE", default=10, cast=int),
+        pool_timeout=config("DB_POOL_TIMEOUT", default=10, cast=float),
+    )
+}
 
-MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
+# O WhiteNoise precisa vir logo após o SecurityMiddleware (que não é o primeiro: PerformanceMiddleware vem antes)
+_security = MIDDLEWARE.index("django.middleware.security.SecurityMiddleware")  # noqa: F405
+MIDDLEWARE.insert(_security + 1, "whitenoise.middleware.WhiteNoiseMiddleware")  # noqa: F405
 
 
 STORAGES = {
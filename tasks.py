@@ -27,6 +27,19 @@ def consolidar(c):
     c.run("uv run manage.py consolidar")
 
 
+@task
+def benchmark(c, suites="", output=""):
+    """Executa benchmarks de desempenho: inv benchmark --suites=lookups --output=resultado.json"""
+    output_arg = f"--output {output}" if output else ""
+    c.run(f"uv run manage.py benchmark {suites} {output_arg}")
+
+
+@task
+def gerar_dados(c, transactions=10000):
+    """Gera dados sintéticos para testes de carga: inv gerar-dados --transactions=1000000"""
+    c.run(f"uv run manage.py gerar_dados --transactions {transactions}")
+
+
 @task
 def runserver(c):
     """Roda o servidor"""